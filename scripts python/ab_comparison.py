@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+⚖️ A/B Comparison - Projeto M
+Comparação de dois builds (baseline × candidato) com medições intercaladas ABAB
+
+Funcionalidades:
+- Cada dist/ servido por um servidor estático local próprio (mesmo servidor, portas diferentes)
+- Runs intercaladas A, B, A, B... em cada motor: medição de carregamento (CWV), ações do
+  stress e memory profiler - carga da máquina e drift afetam os dois lados por igual
+- Mesma semente aleatória para A e B em cada par (as mesmas ações nos dois builds)
+- Comparação pareada por métrica: mediana das diferenças, IC95% bootstrap, Wilcoxon signed-rank
+- Veredito por métrica ("LCP +8% [+3%, +13%]") e código de saída != 0 se algo piorou (CI)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from suite_tracer import traced, traced_sleep
+
+AB_ENGINES = ("measurement", "stress", "memory")
+SIDES = (("A", "baseline"), ("B", "candidate"))
+
+# Wilcoxon exato até este número de pares (sem empates); acima, aproximação normal
+EXACT_WILCOXON_MAX_N = 30
+
+@dataclass
+class ABReport:
+    """Resultado de uma comparação A/B"""
+    session_id: str
+    timestamp: str
+    baseline_dir: str
+    candidate_dir: str
+    pairs: int
+    warmup_pairs: int
+    order: str  # sequência realmente executada, ex.: "ABABAB"
+    engines: List[str]
+    wall_seconds: float
+    samples: Dict[str, Dict[str, List[float]]] = field(default_factory=dict)  # métrica -> lado -> valores
+    comparisons: Dict[str, Dict] = field(default_factory=dict)
+
+    @property
+    def regressed(self) -> List[str]:
+        return [metric for metric, c in self.comparisons.items() if c['verdict'] == 'regressed']
+
+class StaticBuildServer:
+    """Serve um dist/ numa porta local (rotas desconhecidas caem no index.html, como no preview do Vite)"""
+
+    def __init__(self, directory: str, host: str = "127.0.0.1", port: int = 0):
+        self.directory = Path(directory)
+        self.host = host
+        self.requested_port = port
+        self.httpd = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.httpd.server_address[1]}/"
+
+    def start(self) -> str:
+        from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+        if not (self.directory / "index.html").exists():
+            raise FileNotFoundError(f"index.html não encontrado em {self.directory}")
+        root = str(self.directory)
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=root, **kwargs)
+
+            def send_head(self):
+                path = self.translate_path(self.path)
+                if not os.path.exists(path) and '.' not in os.path.basename(path):
+                    self.path = '/index.html'  # fallback de SPA
+                return super().send_head()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((self.host, self.requested_port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name=f"ab-{self.directory.name}", daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+def wilcoxon_signed_rank(diffs: Sequence[float]) -> float:
+    """p-valor bilateral do teste de Wilcoxon (zeros descartados; exato sem empates)"""
+    nonzero = [d for d in diffs if d != 0]
+    n = len(nonzero)
+    if n == 0:
+        return 1.0
+
+    # Postos médios dos |d| (empates recebem a média dos postos)
+    ordered = sorted(range(n), key=lambda i: abs(nonzero[i]))
+    ranks = [0.0] * n
+    ties = []
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and abs(nonzero[ordered[j + 1]]) == abs(nonzero[ordered[i]]):
+            j += 1
+        for k in range(i, j + 1):
+            ranks[ordered[k]] = (i + j) / 2 + 1
+        ties.append(j - i + 1)
+        i = j + 1
+    w_plus = sum(rank for rank, d in zip(ranks, nonzero) if d > 0)
+
+    if n <= EXACT_WILCOXON_MAX_N and all(t == 1 for t in ties):
+        # Distribuição exata de W+: número de subconjuntos de {1..n} com cada soma
+        total = n * (n + 1) // 2
+        counts = [1] + [0] * total
+        for rank in range(1, n + 1):
+            for s in range(total, rank - 1, -1):
+                counts[s] += counts[s - rank]
+        w = int(w_plus)
+        lower = sum(counts[:w + 1])
+        upper = sum(counts[w:])
+        return min(1.0, 2 * min(lower, upper) / 2 ** n)
+
+    mean = n * (n + 1) / 4
+    variance = n * (n + 1) * (2 * n + 1) / 24 - sum(t ** 3 - t for t in ties) / 48
+    if variance <= 0:
+        return 1.0
+    z = (abs(w_plus - mean) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+def percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def paired_comparison(baseline: Sequence[float], candidate: Sequence[float], alpha: float = 0.05,
+                      min_effect: float = 0.02, resamples: int = 2000, seed: int = 0,
+                      lower_is_better: bool = True) -> Dict:
+    """Compara pares (A_i, B_i) medidos lado a lado: a variação comum aos dois lados se cancela"""
+    pairs = [(a, b) for a, b in zip(baseline, candidate) if not (math.isnan(a) or math.isnan(b))]
+    n = len(pairs)
+    if n < 3:
+        return {'n': n, 'verdict': 'insufficient_data'}
+
+    diffs = [b - a for a, b in pairs]
+    median_baseline = statistics.median(a for a, _ in pairs)
+    median_candidate = statistics.median(b for _, b in pairs)
+    shift = statistics.median(diffs)
+
+    # IC da mediana das diferenças reamostrando pares inteiros
+    rng = random.Random(seed)
+    shifts = [statistics.median(rng.choices(diffs, k=n)) for _ in range(resamples)]
+    ci = [percentile(shifts, alpha / 2), percentile(shifts, 1 - alpha / 2)]
+
+    relative = shift / median_baseline if median_baseline else None
+    relative_ci = [bound / median_baseline for bound in ci] if median_baseline else None
+    p_value = wilcoxon_signed_rank(diffs)
+
+    significant = p_value < alpha and (ci[0] > 0 or ci[1] < 0)
+    relevant = relative is None or abs(relative) >= min_effect
+    if significant and relevant:
+        verdict = 'regressed' if (shift > 0) == lower_is_better else 'improved'
+    else:
+        verdict = 'no_change'
+
+    return {
+        'n': n,
+        'baseline_median': median_baseline,
+        'candidate_median': median_candidate,
+        'median_difference': shift,
+        'ci95': ci,
+        'relative_change': relative,
+        'relative_ci95': relative_ci,
+        'p_value': p_value,
+        'candidate_higher_pairs': sum(1 for d in diffs if d > 0),
+        'verdict': verdict
+    }
+
+class ABEngine:
+    """Motor de medição com uma instância por lado; run() devolve {métrica: valor} de uma run"""
+
+    name = "engine"
+
+    async def setup(self, side: str, url: str):
+        raise NotImplementedError
+
+    async def run(self, side: str) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class MeasurementEngine(ABEngine):
+    """Carregamento frio (cache desabilitado) com o agente de métricas da RealPerformanceSuite"""
+
+    name = "measurement"
+
+    def __init__(self, profile: str = "desktop"):
+        self.profile = profile
+        self.suites = {}
+
+    async def setup(self, side: str, url: str):
+        from real_performance_suite import DEVICE_PROFILES, RealPerformanceSuite
+
+        suite = RealPerformanceSuite(url)
+        suite.main_thread_tracing = False
+        suite.record_network = False
+        suite.measure_visual_progress = False
+        suite.driver = suite.setup_driver()
+        suite.driver.execute_cdp_cmd('Network.enable', {})
+        suite.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        if self.profile in DEVICE_PROFILES:
+            suite.apply_device_profile(DEVICE_PROFILES[self.profile])
+            suite.form_factor = 'mobile' if DEVICE_PROFILES[self.profile].mobile else 'desktop'
+        self.suites[side] = suite
+
+    async def run(self, side: str) -> Dict[str, float]:
+        suite = self.suites[side]
+        suite.clear_browser_state()
+        suite.navigate()
+        cwv, resources, js, _ = await suite.collect_run_metrics()
+        if not cwv.fcp:
+            return {}  # coleta falhou: o par é descartado nas métricas deste motor
+        return {'fcp': cwv.fcp, 'lcp': cwv.lcp, 'cls': cwv.cls, 'ttfb': cwv.ttfb,
+                'blocking_time': js.blocking_time, 'transfer_kb': resources.total_transfer_size / 1024}
+
+    def close(self):
+        for suite in self.suites.values():
+            if suite.driver:
+                suite.driver.quit()
+
+class StressEngine(ABEngine):
+    """Uma passada por todas as ações dos usuários virtuais (latência de cada ação)"""
+
+    name = "stress"
+
+    def __init__(self):
+        self.testers = {}
+        self.drivers = {}
+
+    async def setup(self, side: str, url: str):
+        from stress_tester import StressTester
+
+        self.testers[side] = StressTester(url, engine="selenium")
+        self.drivers[side] = self.testers[side].setup_driver()
+
+    async def run(self, side: str) -> Dict[str, float]:
+        values = {}
+        errors = 0
+        for action_name, action_func in self.testers[side].user_actions:
+            start = time.perf_counter()
+            try:
+                await action_func(self.drivers[side], 0)
+                values[action_name] = (time.perf_counter() - start) * 1000
+            except Exception:
+                errors += 1
+        values['errors'] = errors
+        return values
+
+    def close(self):
+        for driver in self.drivers.values():
+            driver.quit()
+
+class MemoryEngine(ABEngine):
+    """Página recarregada + ciclo de interações do memory profiler (heap após GC forçado)"""
+
+    name = "memory"
+
+    def __init__(self, interactions: Optional[List[str]] = None):
+        self.interactions = interactions
+        self.profilers = {}
+
+    async def setup(self, side: str, url: str):
+        from memory_profiler import MemoryProfiler
+
+        profiler = MemoryProfiler(url)
+        profiler.gc_tracing = False
+        profiler.allocation_sampling = False
+        profiler.interaction_names = self.interactions
+        profiler.driver = profiler.setup_driver()
+        self.profilers[side] = profiler
+
+    async def run(self, side: str) -> Dict[str, float]:
+        profiler = self.profilers[side]
+        profiler.snapshots.clear()
+        profiler.driver.get(profiler.base_url)
+        await traced_sleep(3)
+
+        initial = profiler.collect_memory_snapshot("initial")
+        await profiler.simulate_user_interactions()
+        final = profiler.collect_memory_snapshot("final")
+        if not initial or not final:
+            return {}
+        return {'heap_used': final.heap_used, 'heap_growth': final.heap_used - initial.heap_used,
+                'dom_nodes': final.dom_nodes}
+
+    def close(self):
+        for profiler in self.profilers.values():
+            if profiler.driver:
+                profiler.driver.quit()
+
+def build_engines(names: Sequence[str], profile: str = "desktop",
+                  memory_interactions: Optional[List[str]] = None) -> List[ABEngine]:
+    factories = {
+        "measurement": lambda: MeasurementEngine(profile),
+        "stress": StressEngine,
+        "memory": lambda: MemoryEngine(memory_interactions),
+    }
+    unknown = [name for name in names if name not in factories]
+    if unknown:
+        raise ValueError(f"motor desconhecido: {', '.join(unknown)} (use {'/'.join(AB_ENGINES)})")
+    return [factories[name]() for name in names]
+
+class ABComparison:
+    """Serve os dois builds e intercala as runs de cada motor: A, B, A, B..."""
+
+    def __init__(self, baseline_dir: str, candidate_dir: str, engines: List[ABEngine],
+                 pairs: int = 10, warmup_pairs: int = 1, alpha: float = 0.05, min_effect: float = 0.02,
+                 output_dir: str = "performance_reports"):
+        self.baseline_dir = baseline_dir
+        self.candidate_dir = candidate_dir
+        self.engines = engines
+        self.pairs = pairs
+        self.warmup_pairs = warmup_pairs
+        self.alpha = alpha
+        self.min_effect = min_effect
+        self.output_dir = Path(output_dir)
+        self.session_id = f"ab_{int(time.time())}"
+
+    async def run(self) -> ABReport:
+        started = time.time()
+        servers = {"A": StaticBuildServer(self.baseline_dir), "B": StaticBuildServer(self.candidate_dir)}
+        samples: Dict[str, Dict[str, List[float]]] = {}
+        order = []
+
+        try:
+            urls = {side: server.start() for side, server in servers.items()}
+            print(f"⚖️ A/B: baseline {self.baseline_dir} ({urls['A']}) × candidato {self.candidate_dir} ({urls['B']})")
+
+            for engine in self.engines:
+                print(f"\n🔀 Motor {engine.name}: {self.warmup_pairs} par(es) de aquecimento + {self.pairs} pares")
+                try:
+                    for side, _ in SIDES:
+                        await engine.setup(side, urls[side])
+
+                    for index in range(self.warmup_pairs + self.pairs):
+                        measured = index >= self.warmup_pairs
+                        results = {}
+                        for side, _ in SIDES:
+                            random.seed(f"{engine.name}-{index}")  # mesmas escolhas nos dois builds
+                            results[side] = await engine.run(side)
+                            order.append(side)
+                        if measured:
+                            self.record_pair(samples, engine.name, index - self.warmup_pairs, results)
+                finally:
+                    engine.close()
+        finally:
+            for server in servers.values():
+                server.stop()
+
+        report = ABReport(
+            session_id=self.session_id,
+            timestamp=datetime.now().isoformat(),
+            baseline_dir=str(self.baseline_dir),
+            candidate_dir=str(self.candidate_dir),
+            pairs=self.pairs,
+            warmup_pairs=self.warmup_pairs,
+            order="".join(order),
+            engines=[engine.name for engine in self.engines],
+            wall_seconds=time.time() - started,
+            samples=samples,
+            comparisons={
+                metric: paired_comparison(values["baseline"], values["candidate"],
+                                          alpha=self.alpha, min_effect=self.min_effect)
+                for metric, values in samples.items()
+            }
+        )
+        return report
+
+    def record_pair(self, samples: Dict, engine: str, pair: int, results: Dict[str, Dict[str, float]]):
+        """Alinha os valores pelo índice do par (métrica ausente num lado vira NaN)"""
+        for name in sorted(set(results["A"]) | set(results["B"])):
+            metric = samples.setdefault(f"{engine}.{name}", {"baseline": [], "candidate": []})
+            for side, label in SIDES:
+                values = metric[label]
+                values.extend([math.nan] * (pair - len(values)))
+                values.append(float(results[side].get(name, math.nan)))
+
+    @traced("report_write")
+    def save_report(self, report: ABReport) -> str:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"ab_comparison_{report.session_id}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(report), f, indent=2, ensure_ascii=False, default=str)
+        print(f"📁 Comparação A/B salva em: {path}")
+        return str(path)
+
+def format_comparison(metric: str, comparison: Dict) -> str:
+    if comparison['verdict'] == 'insufficient_data':
+        return f"   ⚪ {metric:<28} pares insuficientes ({comparison['n']})"
+    icon = {'regressed': '❌', 'improved': '✅'}.get(comparison['verdict'], '➖')
+    line = (f"   {icon} {metric:<28} {comparison['baseline_median']:>9.1f} → {comparison['candidate_median']:>9.1f}")
+    if comparison['relative_change'] is not None:
+        low, high = comparison['relative_ci95']
+        line += f"  {comparison['relative_change']:+7.1%} [{low:+.1%}, {high:+.1%}]"
+    return line + f"  p={comparison['p_value']:.3f} (n={comparison['n']})"
+
+def print_ab_report(report: ABReport):
+    print(f"\n⚖️ COMPARAÇÃO A/B ({report.pairs} pares, {report.wall_seconds:.0f}s): candidato vs baseline")
+    print(f"   Ordem: {report.order[:24]}{'...' if len(report.order) > 24 else ''}")
+    for metric, comparison in report.comparisons.items():
+        print(format_comparison(metric, comparison))
+    if report.regressed:
+        print(f"\n❌ Piorou: {', '.join(report.regressed)}")
+
+async def run_ab_comparison(baseline_dir: str, candidate_dir: str, engines: Sequence[str] = AB_ENGINES,
+                            pairs: int = 10, output_dir: str = "performance_reports", **options) -> int:
+    """Executa, salva e imprime; código de saída 1 se alguma métrica piorou"""
+    comparison = ABComparison(
+        baseline_dir, candidate_dir,
+        build_engines(engines, options.pop("profile", "desktop"), options.pop("memory_interactions", None)),
+        pairs=pairs, output_dir=output_dir, **options
+    )
+    report = await comparison.run()
+    comparison.save_report(report)
+    print_ab_report(report)
+    return 1 if report.regressed else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Comparação A/B de dois builds com runs intercaladas")
+    parser.add_argument("baseline", help="dist/ do build de referência (A)")
+    parser.add_argument("candidate", help="dist/ do build candidato (B)")
+    parser.add_argument("--pairs", type=int, default=10, help="Pares AB medidos por motor")
+    parser.add_argument("--warmup-pairs", type=int, default=1, help="Pares iniciais descartados")
+    parser.add_argument("--engines", nargs="+", default=list(AB_ENGINES), help="measurement stress memory")
+    parser.add_argument("--profile", default="desktop", help="Perfil de dispositivo do motor de medição")
+    parser.add_argument("--memory-interactions", nargs="*", default=None,
+                        help="Interações do motor de memória (padrão: todas)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Nível de significância")
+    parser.add_argument("--min-effect", type=float, default=0.02, help="Mudança relativa mínima relevante")
+    parser.add_argument("--output", default="performance_reports", help="Diretório de output")
+    args = parser.parse_args()
+
+    try:
+        return asyncio.run(run_ab_comparison(
+            args.baseline, args.candidate, args.engines, args.pairs, args.output,
+            warmup_pairs=args.warmup_pairs, alpha=args.alpha, min_effect=args.min_effect,
+            profile=args.profile, memory_interactions=args.memory_interactions
+        ))
+    except (ValueError, FileNotFoundError) as e:
+        print(f"❌ {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
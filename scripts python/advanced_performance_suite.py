@@ -19,7 +19,6 @@ import time
 import statistics
 import subprocess
 import os
-import sys
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, asdict
@@ -39,8 +38,11 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from webdriver_manager.chrome import ChromeDriverManager
 except ImportError as e:
-    print(f"⚠️  Dependências faltando. Execute: pip install requests psutil selenium webdriver-manager")
-    sys.exit(1)
+    raise ImportError("⚠️  Dependências faltando. Execute: pip install requests psutil selenium webdriver-manager") from e
+
+from lighthouse_scoring import score_metrics
+from network_recorder import NetworkRecorder
+from suite_tracer import instrument_driver, traced
 
 @dataclass
 class PerformanceMetrics:
@@ -99,6 +101,7 @@ class AdvancedPerformanceSuite:
         
         self.stress_levels = [1, 5, 10, 25, 50]  # Usuários simultâneos
         
+    @traced("driver_setup")
     def setup_driver(self, network_condition: Optional[Dict] = None) -> webdriver.Chrome:
         """Configura o driver do Chrome com opções avançadas"""
         options = Options()
@@ -121,7 +124,7 @@ class AdvancedPerformanceSuite:
         })
         
         service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+        driver = instrument_driver(webdriver.Chrome(service=service, options=options))
         
         # Configurar condições de rede se especificado
         if network_condition:
@@ -172,8 +175,8 @@ class AdvancedPerformanceSuite:
                 const navigation = performance.getEntriesByType('navigation')[0];
                 metrics.tti = navigation.loadEventEnd - navigation.navigationStart;
                 
-                // FID (First Input Delay) - simulação
-                metrics.fid = Math.random() * 100; // Placeholder
+                // FID só existe com interação real (medida em interaction_latency.py)
+                metrics.fid = 0;
                 
                 // Métricas de memória
                 if (performance.memory) {
@@ -192,37 +195,15 @@ class AdvancedPerformanceSuite:
         return driver.execute_async_script(script)
     
     def analyze_network_requests(self, driver: webdriver.Chrome) -> Dict:
-        """Analisa requisições de rede"""
-        logs = driver.get_log('performance')
-        
-        requests_count = 0
-        total_transfer_size = 0
-        cache_hits = 0
-        cache_misses = 0
-        
-        for log in logs:
-            message = json.loads(log['message'])
-            if message['message']['method'] == 'Network.responseReceived':
-                response = message['message']['params']['response']
-                requests_count += 1
-                
-                if 'encodedDataLength' in response:
-                    total_transfer_size += response['encodedDataLength']
-                
-                if response.get('fromDiskCache') or response.get('fromServiceWorker'):
-                    cache_hits += 1
-                else:
-                    cache_misses += 1
+        """Analisa requisições de rede (eventos Network.* indexados pelo NetworkRecorder)"""
+        recorder = NetworkRecorder(keep_headers=False)
+        recorder.feed_log(driver.get_log('performance'))
         
-        return {
-            'requests_count': requests_count,
-            'total_transfer_size': total_transfer_size,
-            'cache_hits': cache_hits,
-            'cache_misses': cache_misses
-        }
+        # Bytes transferidos vêm do loadingFinished (o encodedDataLength da resposta só cobre os headers)
+        return recorder.summary()
     
-    def get_lighthouse_scores(self, url: str) -> Dict:
-        """Executa Lighthouse e retorna scores"""
+    def get_lighthouse_scores(self, url: str, web_vitals: Optional[Dict] = None) -> Dict:
+        """Executa Lighthouse e retorna scores (sem o CLI, calcula o score de performance localmente)"""
         try:
             # Executar Lighthouse via CLI
             cmd = [
@@ -248,8 +229,17 @@ class AdvancedPerformanceSuite:
         except Exception as e:
             print(f"⚠️ Lighthouse não disponível: {e}")
         
+        # Fallback: mesmas curvas log-normais do Lighthouse a partir das métricas coletadas
+        performance_score = 0
+        if web_vitals and web_vitals.get('fcp'):
+            performance_score = score_metrics({
+                'fcp': web_vitals.get('fcp'),
+                'lcp': web_vitals.get('lcp'),
+                'cls': web_vitals.get('cls', 0)
+            }, 'desktop')['performance_score']
+        
         return {
-            'performance_score': 0,
+            'performance_score': performance_score,
             'accessibility_score': 0,
             'best_practices_score': 0,
             'seo_score': 0
@@ -305,7 +295,7 @@ class AdvancedPerformanceSuite:
             web_vitals = await self.collect_core_web_vitals(driver)
             network_metrics = self.analyze_network_requests(driver)
             bundle_metrics = self.analyze_bundle_size()
-            lighthouse_scores = self.get_lighthouse_scores(self.base_url)
+            lighthouse_scores = self.get_lighthouse_scores(self.base_url, web_vitals)
             
             # Criar objeto de métricas
             metrics = PerformanceMetrics(
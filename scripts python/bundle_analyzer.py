@@ -10,6 +10,7 @@ Funcionalidades:
 - Sugestões de otimização
 - Comparação histórica
 - Tree shaking analysis
+- Cobertura JS/CSS no navegador: bytes não utilizados por chunk (opcional)
 """
 
 import json
@@ -23,6 +24,69 @@ from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 import subprocess
 import statistics
+from urllib.parse import urlparse
+
+from metrics_exporter import METRICS
+from suite_tracer import traced
+
+# Espelho do manualChunks do vite.config.ts (usado quando o arquivo não pode ser lido)
+DEFAULT_MANUAL_CHUNKS = {
+    'vendor': ['react', 'react-dom'],
+    'ui': ['@radix-ui/react-accordion', '@radix-ui/react-dialog', '@radix-ui/react-dropdown-menu'],
+    'router': ['react-router-dom'],
+    'animations': ['lottie-react'],
+}
+
+# Nome de arquivo gerado pelo Vite: [name]-[hash].js / .css
+HASHED_ASSET_PATTERN = re.compile(r'^(?P<name>.+?)-[A-Za-z0-9_-]{8,}\.(?:js|mjs|css)$')
+
+def load_manual_chunks(config_path: str = "vite.config.ts") -> Dict[str, List[str]]:
+    """Lê o mapa manualChunks do vite.config.ts (fallback para o padrão conhecido)"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        block = re.search(r'manualChunks\s*:\s*\{(.*?)\}', content, re.DOTALL)
+        if not block:
+            return dict(DEFAULT_MANUAL_CHUNKS)
+
+        chunks = {}
+        for name, modules in re.findall(r'(\w+)\s*:\s*\[([^\]]*)\]', block.group(1)):
+            chunks[name] = re.findall(r'["\']([^"\']+)["\']', modules)
+
+        return chunks or dict(DEFAULT_MANUAL_CHUNKS)
+    except Exception:
+        return dict(DEFAULT_MANUAL_CHUNKS)
+
+def resolve_chunk_name(url: str, manual_chunks: Optional[Dict[str, List[str]]] = None) -> str:
+    """Mapeia a URL de um script (build ou dev server) para o chunk do bundle"""
+    if not url:
+        return "(native)"
+
+    manual_chunks = manual_chunks or DEFAULT_MANUAL_CHUNKS
+    path = urlparse(url).path if '://' in url else url
+    filename = path.rsplit('/', 1)[-1]
+
+    # Build de produção: dist/assets/<chunk>-<hash>.js
+    match = HASHED_ASSET_PATTERN.match(filename)
+    if match and '/assets/' in path:
+        return match.group('name')
+
+    # Dev server: dependências pré-empacotadas em node_modules/.vite/deps
+    if 'node_modules' in path:
+        module_name = filename.split('?')[0].rsplit('.', 1)[0]
+        for chunk_name, modules in manual_chunks.items():
+            for module in modules:
+                dep_name = module.replace('/', '_')
+                if (module_name == dep_name or module_name.startswith(dep_name + '_')
+                        or f"/{module}/" in path):
+                    return chunk_name
+        return "vendor"
+
+    if '/src/' in path:
+        return "index"
+
+    return "(other)"
 
 @dataclass
 class BundleFile:
@@ -48,12 +112,14 @@ class BundleAnalysis:
     optimization_suggestions: List[str]
     dependency_analysis: Dict
     performance_impact: Dict
+    coverage: Optional[Dict] = None
 
 class BundleAnalyzer:
     """Analisador avançado de bundle"""
     
-    def __init__(self, dist_path: str = "dist"):
+    def __init__(self, dist_path: str = "dist", coverage_url: Optional[str] = None):
         self.dist_path = Path(dist_path)
+        self.coverage_url = coverage_url  # URL servindo o build; None = sem cobertura
         self.analysis_history: List[BundleAnalysis] = []
         self.load_history()
     
@@ -67,12 +133,18 @@ class BundleAnalyzer:
         
         # Coletar informações dos arquivos
         files = self.collect_file_info()
+        if METRICS.enabled:
+            METRICS.publish_bundle(files)
         
         # Análises específicas
         duplicated_code = self.detect_duplicated_code(files)
         optimization_suggestions = self.generate_optimization_suggestions(files)
         dependency_analysis = self.analyze_dependencies(files)
         performance_impact = self.calculate_performance_impact(files)
+        coverage = self.collect_coverage()
+        
+        if coverage:
+            optimization_suggestions.extend(coverage['suggestions'])
         
         # Criar análise
         analysis = BundleAnalysis(
@@ -84,7 +156,8 @@ class BundleAnalyzer:
             duplicated_code=duplicated_code,
             optimization_suggestions=optimization_suggestions,
             dependency_analysis=dependency_analysis,
-            performance_impact=performance_impact
+            performance_impact=performance_impact,
+            coverage=coverage
         )
         
         self.analysis_history.append(analysis)
@@ -92,6 +165,20 @@ class BundleAnalyzer:
         
         return analysis
     
+    def collect_coverage(self) -> Optional[Dict]:
+        """Coleta cobertura JS/CSS por chunk no navegador (requer servidor e Selenium)"""
+        if not self.coverage_url:
+            return None
+        
+        try:
+            from coverage_collector import CoverageCollector
+        except ImportError as e:
+            print(f"⚠️ Cobertura indisponível: {e}")
+            return None
+        
+        report = CoverageCollector(self.coverage_url, dist_path=str(self.dist_path)).collect()
+        return asdict(report) if report else None
+    
     def build_project(self):
         """Executa build do projeto"""
         try:
@@ -106,6 +193,7 @@ class BundleAnalyzer:
             print(f"❌ Erro no build: {e.stderr}")
             raise
     
+    @traced("file_analysis")
     def collect_file_info(self) -> List[BundleFile]:
         """Coleta informações detalhadas dos arquivos"""
         files = []
@@ -217,6 +305,7 @@ class BundleAnalyzer:
         except Exception:
             return "unknown"
     
+    @traced("file_analysis")
     def detect_duplicated_code(self, files: List[BundleFile]) -> List[Dict]:
         """Detecta código duplicado entre chunks"""
         duplicated = []
@@ -301,6 +390,7 @@ class BundleAnalyzer:
         
         return suggestions
     
+    @traced("file_analysis")
     def analyze_dependencies(self, files: List[BundleFile]) -> Dict:
         """Analisa dependências do projeto"""
         all_dependencies = set()
@@ -457,6 +547,7 @@ class BundleAnalyzer:
             'removed_files': [f.name for f in previous.files if f.name not in [cf.name for cf in current.files]]
         }
     
+    @traced("report_write")
     def save_analysis(self, analysis: BundleAnalysis):
         """Salva análise em arquivo"""
         filename = f"bundle_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -485,7 +576,8 @@ class BundleAnalyzer:
                         duplicated_code=data['duplicated_code'],
                         optimization_suggestions=data['optimization_suggestions'],
                         dependency_analysis=data['dependency_analysis'],
-                        performance_impact=data['performance_impact']
+                        performance_impact=data['performance_impact'],
+                        coverage=data.get('coverage')
                     )
                     self.analysis_history.append(analysis)
             except Exception as e:
@@ -540,6 +632,17 @@ class BundleAnalyzer:
         if dep_analysis['unused_dependencies']:
             print(f"   ⚠️ Não utilizadas: {len(dep_analysis['unused_dependencies'])}")
         
+        # Cobertura no navegador
+        if analysis.coverage:
+            coverage = analysis.coverage
+            print(f"\n🧹 COBERTURA JS/CSS ({coverage['unused_bytes'] / 1024:.1f} KB não utilizados "
+                  f"de {coverage['total_bytes'] / 1024:.1f} KB):")
+            for chunk in coverage['chunks']:
+                print(f"   {chunk['chunk']} ({chunk['type']}): {chunk['used_bytes'] / 1024:.1f} / "
+                      f"{chunk['total_bytes'] / 1024:.1f} KB usados ({chunk['unused_percent']:.1f}% não utilizado)")
+            if coverage['lazy_load_candidates']:
+                print(f"   Candidatos a lazy-loading: {', '.join(coverage['lazy_load_candidates'])}")
+        
         # Código duplicado
         if analysis.duplicated_code:
             print(f"\n⚠️  CÓDIGO DUPLICADO DETECTADO:")
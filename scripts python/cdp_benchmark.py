@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+⏱️ CDP Benchmark - Projeto M
+Mede o ganho do cliente CDP assíncrono sobre o Selenium no mesmo Chrome local
+
+Funcionalidades:
+- Overhead por comando: execute_script (HTTP → chromedriver → CDP) vs Runtime.evaluate direto
+- Concorrência: N páginas carregando ao mesmo tempo nos dois motores
+  (abas de um Chrome via asyncio.gather; N drivers Selenium, cada um na sua thread)
+- Relatório em tabela e JSON em performance_reports/
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+from cdp_client import Browser, find_chrome
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_ms)
+    return {
+        "median_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "mean_ms": statistics.mean(ordered)
+    }
+
+async def benchmark_cdp(url: str, commands: int, pages: int) -> Dict:
+    """Overhead por comando e carga concorrente de `pages` abas num único Chrome"""
+    async with await Browser.launch() as browser:
+        page = await browser.new_page()
+        await page.navigate(url)
+        latencies = []
+        for _ in range(commands):
+            start = time.perf_counter()
+            await page.evaluate("1 + 1")
+            latencies.append((time.perf_counter() - start) * 1000)
+        await page.close()
+
+        tabs = await asyncio.gather(*(browser.new_page() for _ in range(pages)))
+        start = time.perf_counter()
+        await asyncio.gather(*(tab.navigate(url) for tab in tabs))
+        concurrent_seconds = time.perf_counter() - start
+
+    return {"command": summarize(latencies), "concurrent_load_seconds": concurrent_seconds}
+
+def selenium_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    from replay_proxy import apply_replay_proxy
+
+    options = Options()
+    for argument in ("--headless=new", "--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage",
+                     "--window-size=1366,768"):
+        options.add_argument(argument)
+    apply_replay_proxy(options)
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+async def benchmark_selenium(url: str, commands: int, pages: int) -> Dict:
+    """O mesmo roteiro com drivers Selenium; as cargas rodam em threads para serem concorrentes"""
+    driver = selenium_driver()
+    try:
+        driver.get(url)
+        latencies = []
+        for _ in range(commands):
+            start = time.perf_counter()
+            driver.execute_script("return 1 + 1")
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        driver.quit()
+
+    # Uma thread por driver (o pool padrão do asyncio pode ter menos workers que páginas)
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=pages) as pool:
+        created = await asyncio.gather(*(loop.run_in_executor(pool, selenium_driver) for _ in range(pages)),
+                                       return_exceptions=True)
+        drivers = [tab for tab in created if not isinstance(tab, BaseException)]
+        try:
+            if len(drivers) < pages:
+                raise next(tab for tab in created if isinstance(tab, BaseException))
+            start = time.perf_counter()
+            await asyncio.gather(*(loop.run_in_executor(pool, tab.get, url) for tab in drivers))
+            concurrent_seconds = time.perf_counter() - start
+        finally:
+            for tab in drivers:
+                tab.quit()
+
+    return {"command": summarize(latencies), "concurrent_load_seconds": concurrent_seconds}
+
+async def run_benchmark(url: str, commands: int = 200, pages: int = 8) -> Dict:
+    results = {"url": url, "commands": commands, "pages": pages, "timestamp": datetime.now().isoformat()}
+    for engine, benchmark in (("selenium", benchmark_selenium), ("cdp", benchmark_cdp)):
+        print(f"⏱️ Medindo {engine}...")
+        try:
+            results[engine] = await benchmark(url, commands, pages)
+        except Exception as e:
+            print(f"⚠️ Erro no benchmark {engine}: {e}")
+    return results
+
+def print_benchmark(results: Dict):
+    print("\n" + "=" * 70)
+    print(f"⏱️ SELENIUM vs CDP - {results['commands']} comandos, {results['pages']} páginas concorrentes")
+    print("=" * 70)
+    print(f"{'Motor':<10} {'cmd mediana':>12} {'cmd p95':>10} {'carga concorrente':>20}")
+    for engine in ("selenium", "cdp"):
+        if engine in results:
+            data = results[engine]
+            print(f"{engine:<10} {data['command']['median_ms']:>10.2f}ms {data['command']['p95_ms']:>8.2f}ms "
+                  f"{data['concurrent_load_seconds']:>19.2f}s")
+
+    if "selenium" in results and "cdp" in results:
+        command_gain = results["selenium"]["command"]["median_ms"] / max(results["cdp"]["command"]["median_ms"], 1e-6)
+        load_gain = results["selenium"]["concurrent_load_seconds"] / max(results["cdp"]["concurrent_load_seconds"], 1e-6)
+        print(f"\n🚀 Comando {command_gain:.1f}× mais rápido, {results['pages']} páginas {load_gain:.1f}× mais rápido")
+    print("=" * 70)
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Selenium vs cliente CDP assíncrono")
+    parser.add_argument("--url", default="http://localhost:8080", help="Página carregada nos dois motores")
+    parser.add_argument("--commands", type=int, default=200, help="Comandos evaluate medidos por motor")
+    parser.add_argument("--pages", type=int, default=8, help="Páginas carregadas concorrentemente")
+    parser.add_argument("--output", default="performance_reports", help="Diretório do JSON de resultados")
+    args = parser.parse_args()
+
+    if not find_chrome():
+        print("❌ Chrome/Chromium não encontrado (defina CHROME_PATH)")
+        return 1
+
+    results = await run_benchmark(args.url, args.commands, args.pages)
+    print_benchmark(results)
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(exist_ok=True)
+    output_file = output_dir / f"cdp_benchmark_{int(time.time())}.json"
+    output_file.write_text(json.dumps(results, indent=2))
+    print(f"💾 Resultados salvos em: {output_file}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
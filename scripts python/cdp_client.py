@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+🛰️ CDP Client - Projeto M
+Cliente asyncio do Chrome DevTools Protocol sobre websocket (alternativa ao Selenium bloqueante)
+
+Funcionalidades:
+- Chrome local lançado com --remote-debugging-port (sem chromedriver)
+- Uma conexão websocket para o browser inteiro: várias abas (targets) multiplexadas por sessionId
+- Navegação, evaluate e comandos CDP aguardáveis - o event loop nunca bloqueia
+- Assinatura de eventos por aba (callbacks ou wait_for com predicado)
+- Proxy de record/replay e spans do auto-profiling aplicados como nos drivers Selenium
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+from replay_proxy import apply_replay_proxy
+from suite_tracer import TRACER
+
+DEFAULT_CHROME_ARGS = [
+    "--headless=new",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+CHROME_CANDIDATES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+]
+
+DEVTOOLS_URL_PATTERN = re.compile(r"DevTools listening on (ws://\S+)")
+
+class CDPError(Exception):
+    """Erro devolvido por um comando CDP (ou exceção JavaScript no evaluate)"""
+
+    def __init__(self, method: str, message: str):
+        super().__init__(f"{method}: {message}")
+        self.method = method
+
+class ChromeArgs(list):
+    """Lista de flags com a interface de Options (para apply_replay_proxy)"""
+
+    def add_argument(self, argument: str):
+        self.append(argument)
+
+def find_chrome() -> Optional[str]:
+    """Executável do Chrome/Chromium (CHROME_PATH tem prioridade)"""
+    for candidate in [os.environ.get("CHROME_PATH"), os.environ.get("CHROME_BIN")] + CHROME_CANDIDATES:
+        if not candidate:
+            continue
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+class CDPConnection:
+    """Websocket do browser: respostas casadas por id, eventos roteados por (sessionId, método)"""
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self.session = None
+        self.ws = None
+        self.reader: Optional[asyncio.Task] = None
+        self.ids = itertools.count(1)
+        self.pending: Dict[int, tuple] = {}  # id -> (future, método)
+        self.listeners: Dict[tuple, List[Callable]] = {}
+        self.closed = False
+
+    async def connect(self) -> "CDPConnection":
+        import aiohttp
+
+        self.session = aiohttp.ClientSession()
+        self.ws = await self.session.ws_connect(self.ws_url, max_msg_size=0, autoping=True)
+        self.reader = asyncio.create_task(self.read_loop(), name="cdp-reader")
+        return self
+
+    async def read_loop(self):
+        import aiohttp
+
+        try:
+            async for message in self.ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(message.data)
+                if "id" in data:
+                    future, method = self.pending.pop(data["id"], (None, None))
+                    if future is None or future.done():
+                        continue
+                    if "error" in data:
+                        future.set_exception(CDPError(method, data["error"].get("message", str(data["error"]))))
+                    else:
+                        future.set_result(data.get("result", {}))
+                else:
+                    params = data.get("params", {})
+                    for callback in list(self.listeners.get((data.get("sessionId"), data.get("method")), [])):
+                        callback(params)
+        finally:
+            self.closed = True
+            for future, method in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"conexão CDP encerrada durante {method}"))
+            self.pending.clear()
+
+    async def send(self, method: str, params: Optional[Dict] = None, session_id: Optional[str] = None,
+                   timeout: float = 30) -> Dict:
+        if self.closed:
+            raise ConnectionError("conexão CDP encerrada")
+        message_id = next(self.ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message_id] = (future, method)
+        with TRACER.span("cdp", method):
+            await self.ws.send_str(json.dumps(message))
+            try:
+                return await asyncio.wait_for(future, timeout)
+            finally:
+                self.pending.pop(message_id, None)
+
+    def on(self, method: str, callback: Callable[[Dict], None], session_id: Optional[str] = None) -> Callable:
+        """Assina um evento; devolve a função que cancela a assinatura"""
+        key = (session_id, method)
+        self.listeners.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            if callback in self.listeners.get(key, []):
+                self.listeners[key].remove(callback)
+        return unsubscribe
+
+    async def wait_for(self, method: str, session_id: Optional[str] = None,
+                       predicate: Optional[Callable[[Dict], bool]] = None, timeout: float = 30) -> Dict:
+        """Próximo evento `method` (que satisfaça o predicado)"""
+        future = asyncio.get_running_loop().create_future()
+
+        def callback(params):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        unsubscribe = self.on(method, callback, session_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            unsubscribe()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self.reader:
+            await asyncio.gather(self.reader, return_exceptions=True)
+        if self.session:
+            await self.session.close()
+
+class CDPPage:
+    """Uma aba do browser (sessão flatten sobre a conexão compartilhada)"""
+
+    def __init__(self, connection: CDPConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+        self.enabled_domains = set()
+
+    async def send(self, method: str, timeout: float = 30, **params) -> Dict:
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    async def enable(self, domain: str):
+        if domain not in self.enabled_domains:
+            await self.send(f"{domain}.enable")
+            self.enabled_domains.add(domain)
+
+    def on(self, event: str, callback: Callable[[Dict], None]) -> Callable:
+        return self.connection.on(event, callback, self.session_id)
+
+    async def wait_for(self, event: str, predicate: Optional[Callable[[Dict], bool]] = None,
+                       timeout: float = 30) -> Dict:
+        return await self.connection.wait_for(event, self.session_id, predicate, timeout)
+
+    async def navigate(self, url: str, wait_until: str = "load", timeout: float = 30) -> Dict:
+        """Navega e aguarda o load (ou DOMContentLoaded); navegação só de #âncora não espera"""
+        await self.enable("Page")
+        event = "Page.loadEventFired" if wait_until == "load" else "Page.domContentEventFired"
+        loaded = asyncio.ensure_future(self.wait_for(event, timeout=timeout))
+        try:
+            result = await self.send("Page.navigate", timeout=timeout, url=url)
+            if result.get("errorText"):
+                raise CDPError("Page.navigate", f"{result['errorText']} ({url})")
+            if result.get("loaderId"):
+                await loaded
+            return result
+        finally:
+            loaded.cancel()
+
+    async def evaluate(self, expression: str, await_promise: bool = True, timeout: float = 30):
+        """Avalia uma expressão na página e devolve o valor (exceções JS viram CDPError)"""
+        result = await self.send("Runtime.evaluate", timeout=timeout, expression=expression,
+                                 returnByValue=True, awaitPromise=await_promise)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CDPError("Runtime.evaluate", details.get("exception", {}).get("description")
+                           or details.get("text", "exceção JavaScript"))
+        return result.get("result", {}).get("value")
+
+    async def set_viewport(self, width: int, height: int, mobile: bool = False, scale: float = 1):
+        await self.send("Emulation.setDeviceMetricsOverride", width=width, height=height,
+                        deviceScaleFactor=scale, mobile=mobile)
+
+    async def close(self):
+        try:
+            await self.connection.send("Target.closeTarget", {"targetId": self.target_id}, timeout=5)
+        except (CDPError, ConnectionError, asyncio.TimeoutError):
+            pass
+
+class Browser:
+    """Chrome local (ou já em execução) controlado por uma única conexão CDP"""
+
+    def __init__(self, connection: CDPConnection, process=None, user_data_dir: Optional[str] = None):
+        self.connection = connection
+        self.process = process
+        self.user_data_dir = user_data_dir
+        self.stderr_drain: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> "Browser":
+        return cls(await CDPConnection(ws_url).connect())
+
+    @classmethod
+    async def launch(cls, chrome_path: Optional[str] = None, args: Optional[List[str]] = None,
+                     timeout: float = 30) -> "Browser":
+        chrome_path = chrome_path or find_chrome()
+        if not chrome_path:
+            raise FileNotFoundError("Chrome/Chromium não encontrado (defina CHROME_PATH)")
+
+        user_data_dir = tempfile.mkdtemp(prefix="cdp_profile_")
+        flags = ChromeArgs(DEFAULT_CHROME_ARGS + list(args or []))
+        apply_replay_proxy(flags)
+        process = await asyncio.create_subprocess_exec(
+            chrome_path, *flags, "--remote-debugging-port=0", f"--user-data-dir={user_data_dir}", "about:blank",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+
+        try:
+            ws_url = await asyncio.wait_for(cls.read_devtools_url(process), timeout)
+            browser = cls(await CDPConnection(ws_url).connect(), process, user_data_dir)
+        except BaseException:
+            process.kill()
+            await process.wait()
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+        browser.stderr_drain = asyncio.create_task(cls.drain(process.stderr))  # pipe cheio trava o Chrome
+        return browser
+
+    @staticmethod
+    async def read_devtools_url(process) -> str:
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                raise RuntimeError("Chrome encerrou antes de abrir o DevTools")
+            match = DEVTOOLS_URL_PATTERN.search(line.decode(errors="replace"))
+            if match:
+                return match.group(1)
+
+    @staticmethod
+    async def drain(stream):
+        while await stream.read(65536):
+            pass
+
+    async def new_page(self, width: int = 1366, height: int = 768) -> CDPPage:
+        """Abre uma aba nova e anexa uma sessão flatten a ela"""
+        target = await self.connection.send("Target.createTarget", {"url": "about:blank"})
+        attached = await self.connection.send("Target.attachToTarget",
+                                              {"targetId": target["targetId"], "flatten": True})
+        page = CDPPage(self.connection, target["targetId"], attached["sessionId"])
+        await page.set_viewport(width, height)
+        return page
+
+    async def close(self):
+        try:
+            if not self.connection.closed:
+                await self.connection.send("Browser.close", timeout=5)
+        except (CDPError, ConnectionError, asyncio.TimeoutError):
+            pass
+        await self.connection.close()
+
+        if self.process:
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        if self.stderr_drain:
+            self.stderr_drain.cancel()
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+    async def __aenter__(self) -> "Browser":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
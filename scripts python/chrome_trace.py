@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+🔬 Chrome Trace Utils - Projeto M
+Leitura e análise de trace events do Chrome coletados via ChromeDriver
+
+Funcionalidades:
+- Extração de trace events do performance log (Tracing.dataCollected)
+- Análise incremental de GC do V8 (scavenge vs mark-compact, pausas, bytes liberados)
+- Correlação de pausas de GC com fases de interação (marcadores console.timeStamp)
+- Breakdown da main thread por carregamento (parse/compile, avaliação, style, layout, paint, GC)
+  atribuído por URL de script, com o tempo de script antes do LCP
+- Leitura em streaming de arquivos de trace grandes (sem carregar o JSON inteiro)
+"""
+
+import bisect
+import json
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Categorias para medir GC: eventos MinorGC/MajorGC (devtools.timeline), fases do V8 (v8.gc)
+# e tarefas de topo da main thread (toplevel) para calcular a fração de tempo em GC
+GC_TRACE_CATEGORIES = "devtools.timeline,v8,v8.gc,disabled-by-default-v8.gc,toplevel"
+
+# Prefixo dos marcadores de fase emitidos com console.timeStamp()
+PHASE_MARKER_PREFIX = "perfsuite:"
+
+# Eventos de GC com pausa na main thread
+SCAVENGE_EVENTS = {'MinorGC', 'V8.GCScavenger'}
+MARK_COMPACT_EVENTS = {'MajorGC', 'V8.GCFinalizeMC', 'V8.GCFinalizeMCReduceMemory', 'V8.GCCompactor'}
+INCREMENTAL_MARKING_EVENTS = {'V8.GCIncrementalMarking', 'V8.GCIncrementalMarkingFinalize'}
+
+# Janelas de fase mantidas após o último evento processado (µs): limita a memória no soak
+PHASE_WINDOW_RETENTION_US = 60 * 1000 * 1000
+
+# Tarefas de topo da main thread (categoria toplevel)
+TOPLEVEL_TASK_EVENTS = {'ThreadControllerImpl::RunTask', 'RunTask', 'ThreadControllerImpl::DoWork'}
+
+# Categorias para o breakdown da main thread: timeline do DevTools, compilação/execução do V8,
+# candidatos a LCP (loading) e tarefas de topo
+TIMELINE_TRACE_CATEGORIES = "devtools.timeline,v8,v8.execute,loading,blink.user_timing,toplevel"
+
+# Grupos do breakdown (nomes de eventos da timeline); só esses eventos e as tarefas de topo são
+# guardados: o tempo de um evento desconhecido fica no self time do pai
+MAIN_THREAD_GROUPS = {
+    'parse_compile': {'v8.compile', 'v8.compileModule', 'v8.produceCache', 'v8.produceModuleCache',
+                      'v8.parseOnBackground', 'v8.deserializeOnBackground'},
+    'script_evaluation': {'EvaluateScript', 'v8.evaluateModule', 'FunctionCall', 'TimerFire',
+                          'FireIdleCallback', 'FireAnimationFrame', 'RunMicrotasks', 'V8.Execute',
+                          'EventDispatch', 'XHRReadyStateChange', 'XHRLoad'},
+    'style': {'ScheduleStyleRecalculation', 'RecalculateStyles', 'UpdateLayoutTree',
+              'ParseAuthorStyleSheet', 'InvalidateLayout'},
+    'layout': {'Layout'},
+    'paint': {'PrePaint', 'Paint', 'PaintImage', 'PaintSetup', 'UpdateLayer', 'UpdateLayerTree',
+              'CompositeLayers', 'Layerize', 'Commit', 'HitTest', 'Animation', 'DecodeImage'},
+    'gc': {'MinorGC', 'MajorGC', 'GCEvent', 'BlinkGC.AtomicPhase', 'ThreadState::performIdleLazySweep',
+           'V8.GCScavenger', 'V8.GCFinalizeMC', 'V8.GCCompactor', 'V8.GCIncrementalMarking'},
+    'parse_html': {'ParseHTML'},
+}
+EVENT_GROUPS = {name: group for group, names in MAIN_THREAD_GROUPS.items() for name in names}
+SCRIPT_GROUPS = ('parse_compile', 'script_evaluation')
+
+# Resolução do tempo de script por URL ao longo do trace (µs): define a precisão do "antes do LCP"
+SCRIPT_BUCKET_US = 10 * 1000
+
+# Eventos de LCP emitidos pela categoria loading
+LCP_CANDIDATE_EVENTS = {'largestContentfulPaint::Candidate'}
+
+# Eventos do browser com o processo de cada frame (args.data.frames / args.data)
+FRAME_PROCESS_EVENTS = {'TracingStartedInBrowser', 'FrameCommittedInBrowser'}
+
+def chrome_perf_logging_prefs(trace_categories: Optional[str] = None, enable_page: bool = False,
+                              enable_network: bool = False) -> Dict:
+    """Opções do ChromeDriver para o performance log (trace events só com categorias)"""
+    prefs = {
+        'enableNetwork': enable_network,  # eventos Network.* (ex.: gravação HAR)
+        'enablePage': enable_page,  # eventos Page.* (ex.: Page.screencastFrame)
+    }
+    if trace_categories:
+        prefs['traceCategories'] = trace_categories
+    return prefs
+
+def iter_log_messages(entries: Iterable[Dict]) -> Iterator[Tuple[str, Dict]]:
+    """Converte entradas do performance log em pares (method, params)"""
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError, TypeError):
+            continue
+        yield message.get('method', ''), message.get('params', {})
+
+def iter_trace_events(entries: Iterable[Dict]) -> Iterator[Dict]:
+    """Extrai os trace events (Tracing.dataCollected) do performance log"""
+    for method, params in iter_log_messages(entries):
+        if method == 'Tracing.dataCollected':
+            for event in params.get('value', []):
+                yield event
+
+def iter_trace_file(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    """Lê trace events de um arquivo (array ou {"traceEvents": [...]}) em streaming"""
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = -1
+
+        # Localizar o início do array de eventos
+        while pos < 0:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+            stripped = buffer.lstrip()
+            if stripped.startswith('['):
+                pos = buffer.index('[') + 1
+            elif '"traceEvents"' in buffer:
+                bracket = buffer.find('[', buffer.index('"traceEvents"'))
+                pos = bracket + 1 if bracket >= 0 else -1
+
+        exhausted = False
+        while True:
+            # Pular separadores entre eventos
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+
+            try:
+                if pos >= len(buffer):
+                    raise ValueError
+                event, pos = decoder.raw_decode(buffer, pos)
+                yield event
+            except ValueError:
+                # Evento incompleto: ler mais (traces truncados terminam sem "]")
+                if exhausted:
+                    return
+                chunk = f.read(chunk_size)
+                exhausted = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+
+def gc_kind(event: Dict) -> Optional[str]:
+    """Classifica um trace event de GC"""
+    name = event.get('name', '')
+    if name in SCAVENGE_EVENTS:
+        return 'scavenge'
+    if name in MARK_COMPACT_EVENTS:
+        return 'mark_compact'
+    if name in INCREMENTAL_MARKING_EVENTS:
+        return 'incremental_marking'
+    return None
+
+class GCPhaseStats:
+    """Agregados de GC de uma fase (O(1) em memória)"""
+    __slots__ = ('count', 'total_pause_ms', 'max_pause_ms', 'bytes_reclaimed')
+
+    def __init__(self):
+        self.count = 0
+        self.total_pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self.bytes_reclaimed = 0
+
+    def add(self, pause_ms: float, reclaimed: int):
+        self.count += 1
+        self.total_pause_ms += pause_ms
+        self.max_pause_ms = max(self.max_pause_ms, pause_ms)
+        self.bytes_reclaimed += reclaimed
+
+    def merge(self, other: 'GCPhaseStats'):
+        self.count += other.count
+        self.total_pause_ms += other.total_pause_ms
+        self.max_pause_ms = max(self.max_pause_ms, other.max_pause_ms)
+        self.bytes_reclaimed += other.bytes_reclaimed
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'total_pause_ms': self.total_pause_ms,
+            'max_pause_ms': self.max_pause_ms,
+            'bytes_reclaimed': self.bytes_reclaimed
+        }
+
+class GCThreadStats:
+    """Agregados de GC e tempo ocupado de uma thread (O(1) em memória)"""
+
+    def __init__(self):
+        self.by_kind: Dict[str, GCPhaseStats] = {
+            'scavenge': GCPhaseStats(),
+            'mark_compact': GCPhaseStats(),
+            'incremental_marking': GCPhaseStats()
+        }
+        self.by_phase: Dict[str, GCPhaseStats] = {}
+
+        # Frações liberadas por ciclo (para a eficiência média)
+        self.reclaimed_fraction_total = 0.0
+        self.reclaimed_fraction_count = 0
+
+        self.busy_us = 0
+        self.first_ts: Optional[int] = None
+        self.last_ts: Optional[int] = None
+
+    def update_span(self, event: Dict):
+        ts = event['ts']
+        end = ts + event.get('dur', 0)
+        self.first_ts = ts if self.first_ts is None else min(self.first_ts, ts)
+        self.last_ts = end if self.last_ts is None else max(self.last_ts, end)
+
+    @property
+    def pause_ms(self) -> float:
+        return sum(stats.total_pause_ms for stats in self.by_kind.values())
+
+class GCTraceAnalyzer:
+    """Analisa eventos de GC do V8 de forma incremental (lotes do performance log)"""
+
+    def __init__(self):
+        # Agregados por (pid, tid): os metadados thread_name podem chegar depois dos eventos
+        # (o Chrome costuma emiti-los no fim do trace), então a escolha das threads fica para
+        # o summary em vez de descartar ou aceitar eventos na chegada
+        self.threads: Dict[Tuple[int, int], GCThreadStats] = {}
+        self.main_threads = set()  # CrRendererMain de cada renderer
+
+        # Fim do último evento processado (poda das janelas de fase)
+        self.last_ts: Optional[int] = None
+
+        # Janelas de fase: (início, fim, nome), ordenadas pelo início
+        self.phase_windows: List[Tuple[int, int, str]] = []
+        self.open_phases: Dict[str, int] = {}
+        self.batches = 0
+
+        # MinorGC/MajorGC (devtools.timeline) já englobam as subfases V8.*;
+        # as subfases só são contadas quando a categoria timeline não está ativa
+        self.timeline_gc_seen = False
+
+    def thread(self, event: Dict) -> GCThreadStats:
+        key = (event.get('pid'), event.get('tid'))
+        stats = self.threads.get(key)
+        if stats is None:
+            stats = self.threads[key] = GCThreadStats()
+        return stats
+
+    def feed(self, events: Iterable[Dict]):
+        """Processa um lote de trace events"""
+        gc_events = []
+
+        for event in events:
+            phase = event.get('ph')
+            name = event.get('name', '')
+
+            if phase == 'M':
+                if name == 'thread_name' and event.get('args', {}).get('name') == 'CrRendererMain':
+                    self.main_threads.add((event.get('pid'), event.get('tid')))
+                continue
+
+            ts = event.get('ts')
+            if ts is None:
+                continue
+
+            if name == 'TimeStamp':
+                self.handle_marker(event)
+            elif gc_kind(event):
+                if name in ('MinorGC', 'MajorGC'):
+                    self.timeline_gc_seen = True
+                gc_events.append(event)
+            elif name in TOPLEVEL_TASK_EVENTS and phase == 'X':
+                self.track_main_thread(event)
+
+        # Atribuir GCs depois de conhecer os marcadores do lote
+        for event in gc_events:
+            self.handle_gc(event)
+
+        self.prune_phase_windows()
+        self.batches += 1
+
+    def prune_phase_windows(self):
+        """Descarta janelas de fase antigas (os lotes chegam em ordem cronológica)"""
+        if self.last_ts is None:
+            return
+        cutoff = self.last_ts - PHASE_WINDOW_RETENTION_US
+        self.phase_windows = [window for window in self.phase_windows if window[1] >= cutoff]
+
+    def handle_marker(self, event: Dict):
+        """Registra início/fim de fase a partir de console.timeStamp()"""
+        message = event.get('args', {}).get('data', {}).get('message', '')
+        if not message.startswith(PHASE_MARKER_PREFIX):
+            return
+
+        # Formato: perfsuite:<start|end>:<fase>
+        try:
+            _, edge, phase_name = message.split(':', 2)
+        except ValueError:
+            return
+
+        if edge == 'start':
+            self.open_phases[phase_name] = event['ts']
+        elif edge == 'end' and phase_name in self.open_phases:
+            window = (self.open_phases.pop(phase_name), event['ts'], phase_name)
+            bisect.insort(self.phase_windows, window)
+
+    def phase_at(self, ts: int) -> str:
+        """Fase de interação ativa num instante do trace"""
+        index = bisect.bisect_right(self.phase_windows, (ts, float('inf'), '')) - 1
+        if index >= 0:
+            start, end, name = self.phase_windows[index]
+            if start <= ts <= end:
+                return name
+
+        for name, start in self.open_phases.items():
+            if ts >= start:
+                return name
+
+        return 'idle'
+
+    def track_main_thread(self, event: Dict):
+        """Acumula o tempo ocupado da thread da tarefa"""
+        stats = self.thread(event)
+        stats.busy_us += event.get('dur', 0)
+        self.update_span(stats, event)
+
+    def update_span(self, stats: GCThreadStats, event: Dict):
+        stats.update_span(event)
+        self.last_ts = stats.last_ts if self.last_ts is None else max(self.last_ts, stats.last_ts)
+
+    def handle_gc(self, event: Dict):
+        """Contabiliza um evento de GC (pausa, tipo, bytes liberados, fase) na sua thread"""
+        kind = gc_kind(event)
+        if event.get('ph') != 'X':
+            return  # só eventos completos têm duração
+
+        # Evitar dupla contagem das subfases V8.* quando há eventos da timeline
+        name = event.get('name', '')
+        if name.startswith('V8.') and kind != 'incremental_marking' and self.timeline_gc_seen:
+            return
+
+        pause_ms = event.get('dur', 0) / 1000
+        args = event.get('args', {})
+        before = args.get('usedHeapSizeBefore', 0) or 0
+        after = args.get('usedHeapSizeAfter', 0) or 0
+        reclaimed = max(0, before - after)
+
+        stats = self.thread(event)
+        stats.by_kind[kind].add(pause_ms, reclaimed)
+        if before > 0 and kind != 'incremental_marking':
+            stats.reclaimed_fraction_total += reclaimed / before
+            stats.reclaimed_fraction_count += 1
+
+        phase_name = self.phase_at(event['ts'])
+        stats.by_phase.setdefault(phase_name, GCPhaseStats()).add(pause_ms, reclaimed)
+        self.update_span(stats, event)
+
+    def selected_threads(self) -> List[GCThreadStats]:
+        """Threads CrRendererMain; sem metadados, a thread mais ocupada (ou com mais GC)"""
+        main = [stats for key, stats in self.threads.items() if key in self.main_threads]
+        if main:
+            return main
+        if not self.threads:
+            return []
+        return [max(self.threads.values(), key=lambda stats: (stats.busy_us, stats.pause_ms))]
+
+    def summary(self) -> Dict:
+        """Métricas de GC consolidadas das main threads"""
+        threads = self.selected_threads()
+        by_kind = {kind: GCPhaseStats() for kind in ('scavenge', 'mark_compact', 'incremental_marking')}
+        by_phase: Dict[str, GCPhaseStats] = {}
+        for stats in threads:
+            for kind, kind_stats in stats.by_kind.items():
+                by_kind[kind].merge(kind_stats)
+            for name, phase_stats in stats.by_phase.items():
+                by_phase.setdefault(name, GCPhaseStats()).merge(phase_stats)
+
+        cycles = by_kind['scavenge'].count + by_kind['mark_compact'].count
+        pause_total = sum(stats.total_pause_ms for stats in by_kind.values())
+        pause_max = max(stats.max_pause_ms for stats in by_kind.values())
+        reclaimed_total = by_kind['scavenge'].bytes_reclaimed + by_kind['mark_compact'].bytes_reclaimed
+        fraction_total = sum(stats.reclaimed_fraction_total for stats in threads)
+        fraction_count = sum(stats.reclaimed_fraction_count for stats in threads)
+
+        # Base: tempo ocupado das main threads; sem categoria toplevel usa o intervalo do trace
+        main_thread_ms = sum(stats.busy_us for stats in threads) / 1000
+        if main_thread_ms <= 0:
+            main_thread_ms = sum(stats.last_ts - stats.first_ts for stats in threads
+                                 if stats.first_ts is not None) / 1000
+
+        return {
+            'available': cycles > 0,
+            'gc_count': cycles,
+            'scavenge': by_kind['scavenge'].to_dict(),
+            'mark_compact': by_kind['mark_compact'].to_dict(),
+            'incremental_marking': by_kind['incremental_marking'].to_dict(),
+            'total_pause_ms': pause_total,
+            'max_pause_ms': pause_max,
+            'bytes_reclaimed': reclaimed_total,
+            'bytes_reclaimed_per_cycle': reclaimed_total / cycles if cycles else 0,
+            'reclaimed_fraction': fraction_total / fraction_count if fraction_count else 0,
+            'main_thread_ms': main_thread_ms,
+            'gc_time_share': pause_total / main_thread_ms if main_thread_ms > 0 else 0,
+            'by_phase': {name: stats.to_dict() for name, stats in sorted(by_phase.items())},
+            'trace_batches': self.batches
+        }
+
+class ThreadTimeline:
+    """Self time por grupo e por URL de uma thread (pilha de eventos aninhados)"""
+
+    def __init__(self):
+        self.stack: List[List] = []  # [fim, grupo, url, self_us, início]
+        self.totals: Dict[str, float] = {}
+        self.by_url: Dict[str, Dict[str, float]] = {}
+        self.script_buckets: Dict[str, Dict[int, float]] = {}
+        self.events = 0
+
+    def add(self, ts: float, dur: float, name: str, url: str):
+        """Processa um evento completo (chamado em ordem de início, pai antes dos filhos)"""
+        self.pop_until(ts)
+
+        parent = self.stack[-1] if self.stack else None
+        group = EVENT_GROUPS.get(name) or (parent[1] if parent else 'other')
+        url = url or (parent[2] if parent else '')
+
+        if parent:
+            parent[3] -= dur
+        self.stack.append([ts + dur, group, url, dur, ts])
+        self.events += 1
+
+    def pop_until(self, ts: float):
+        while self.stack and self.stack[-1][0] <= ts:
+            self.close(self.stack.pop())
+
+    def close(self, item: List):
+        _, group, url, self_us, start = item
+        self_us = max(0, self_us)
+        self.totals[group] = self.totals.get(group, 0) + self_us
+        if not url:
+            return
+        url_groups = self.by_url.setdefault(url, {})
+        url_groups[group] = url_groups.get(group, 0) + self_us
+        if group in SCRIPT_GROUPS:
+            buckets = self.script_buckets.setdefault(url, {})
+            bucket = int(start // SCRIPT_BUCKET_US)
+            buckets[bucket] = buckets.get(bucket, 0) + self_us
+
+    def finish(self):
+        self.pop_until(float('inf'))
+
+    @property
+    def total_us(self) -> float:
+        return sum(self.totals.values())
+
+def event_url(event: Dict) -> str:
+    """URL do script associado a um evento da timeline, se houver"""
+    args = event.get('args', {})
+    data = args.get('data') or {}
+    return data.get('url') or args.get('fileName') or data.get('scriptName') or ''
+
+class MainThreadBreakdown:
+    """Breakdown da main thread de um carregamento, processado em lotes"""
+
+    def __init__(self):
+        self.threads: Dict[Tuple[int, int], ThreadTimeline] = {}
+        # Eventos X compactos por thread até o summary: o trace não vem ordenado por ts entre
+        # lotes, e pai e filhos podem chegar em lotes diferentes. Só entram eventos de um grupo
+        # (ou tarefas de topo) dos processos do frame principal
+        self.pending: Dict[Tuple[int, int], List[Tuple[float, float, str, str]]] = {}
+        self.main_threads = set()
+        self.renderer_pids = set()  # processos do frame principal (vazio = ainda desconhecidos)
+        self.lcp_ts: Optional[float] = None
+        self.batches = 0
+
+    def feed(self, events: Iterable[Dict]):
+        """Processa um lote de trace events; só eventos completos (ph X) entram no breakdown"""
+        for event in events:
+            phase = event.get('ph')
+            name = event.get('name', '')
+            key = (event.get('pid'), event.get('tid'))
+
+            if name in FRAME_PROCESS_EVENTS:
+                self.track_renderer(event)
+                continue
+
+            # Browser, GPU, utilitários e iframes de outros processos: descartados na chegada
+            if self.renderer_pids and key[0] not in self.renderer_pids:
+                continue
+
+            if phase == 'M':
+                if name == 'thread_name' and event.get('args', {}).get('name') == 'CrRendererMain':
+                    self.main_threads.add(key)
+                continue
+
+            if name in LCP_CANDIDATE_EVENTS:
+                data = event.get('args', {}).get('data', {})
+                if data.get('isMainFrame', True) and event.get('ts') is not None:
+                    self.lcp_ts = max(self.lcp_ts or 0, event['ts'])
+                continue
+
+            if phase == 'X' and event.get('ts') is not None and (
+                    name in EVENT_GROUPS or name in TOPLEVEL_TASK_EVENTS):
+                self.pending.setdefault(key, []).append(
+                    (event['ts'], event.get('dur', 0), name, event_url(event)))
+
+        self.batches += 1
+
+    def track_renderer(self, event: Dict):
+        """Processo do frame principal (TracingStartedInBrowser e navegações seguintes)"""
+        data = event.get('args', {}).get('data') or {}
+        frames = data.get('frames', []) if event.get('name') == 'TracingStartedInBrowser' else [data]
+        for frame in frames:
+            if not frame.get('parent') and frame.get('processId') is not None:
+                self.renderer_pids.add(frame['processId'])
+
+    def build_timelines(self):
+        """Ordena uma única vez os eventos de cada thread e monta as pilhas"""
+        for key, events in self.pending.items():
+            if self.renderer_pids and key[0] not in self.renderer_pids:
+                continue  # chegou antes do TracingStartedInBrowser
+            timeline = self.threads.setdefault(key, ThreadTimeline())
+            # Pai antes dos filhos: início crescente, maior duração primeiro
+            events.sort(key=lambda e: (e[0], -e[1]))
+            for ts, dur, name, url in events:
+                timeline.add(ts, dur, name, url)
+        self.pending.clear()
+
+    def selected_threads(self) -> List[ThreadTimeline]:
+        """Threads CrRendererMain; sem metadados, a thread mais ocupada"""
+        main = [timeline for key, timeline in self.threads.items() if key in self.main_threads]
+        if main:
+            return main
+        return [max(self.threads.values(), key=lambda t: t.total_us)] if self.threads else []
+
+    def summary(self, resolve_chunk: Optional[Callable[[str], str]] = None) -> Dict:
+        """Tempos por grupo (ms), por URL e por chunk, incluindo script antes do LCP"""
+        resolve_chunk = resolve_chunk or (lambda url: url)
+        self.build_timelines()
+        timelines = self.selected_threads()
+        for timeline in timelines:
+            timeline.finish()
+
+        groups: Dict[str, float] = {}
+        by_url: Dict[str, Dict[str, float]] = {}
+        before_lcp: Dict[str, float] = {}
+        lcp_bucket = int(self.lcp_ts // SCRIPT_BUCKET_US) if self.lcp_ts is not None else None
+
+        for timeline in timelines:
+            for group, us in timeline.totals.items():
+                groups[group] = groups.get(group, 0) + us / 1000
+            for url, url_groups in timeline.by_url.items():
+                target = by_url.setdefault(url, {})
+                for group, us in url_groups.items():
+                    target[group] = target.get(group, 0) + us / 1000
+            if lcp_bucket is not None:
+                for url, buckets in timeline.script_buckets.items():
+                    before_lcp[url] = before_lcp.get(url, 0) + sum(
+                        us for bucket, us in buckets.items() if bucket < lcp_bucket) / 1000
+
+        by_chunk: Dict[str, Dict[str, float]] = {}
+        urls = []
+        for url, url_groups in by_url.items():
+            chunk = resolve_chunk(url)
+            script_ms = sum(url_groups.get(group, 0) for group in SCRIPT_GROUPS)
+            urls.append({'url': url, 'chunk': chunk, 'total_ms': sum(url_groups.values()),
+                         'script_ms': script_ms, 'groups': url_groups})
+
+            entry = by_chunk.setdefault(chunk, {'parse_compile': 0, 'script_evaluation': 0,
+                                                'total_ms': 0, 'before_lcp_ms': 0})
+            entry['parse_compile'] += url_groups.get('parse_compile', 0)
+            entry['script_evaluation'] += url_groups.get('script_evaluation', 0)
+            entry['total_ms'] += sum(url_groups.values())
+            entry['before_lcp_ms'] += before_lcp.get(url, 0)
+
+        blocking = max(by_chunk.items(), key=lambda item: item[1]['before_lcp_ms'], default=None)
+
+        return {
+            'available': bool(groups),
+            'total_ms': sum(groups.values()),
+            'groups': {group: groups.get(group, 0) for group in list(MAIN_THREAD_GROUPS) + ['other']},
+            'by_url': sorted(urls, key=lambda u: u['total_ms'], reverse=True)[:20],
+            'by_chunk': by_chunk,
+            'lcp_ts': self.lcp_ts,
+            'lcp_blocking_chunk': blocking[0] if blocking and blocking[1]['before_lcp_ms'] > 0 else None,
+            'events': sum(timeline.events for timeline in timelines),
+            'trace_batches': self.batches
+        }
+
+def main():
+    """Breakdown da main thread de um arquivo de trace (DevTools > Performance > Save profile)"""
+    if len(sys.argv) < 2:
+        print("Uso: python chrome_trace.py <trace.json>")
+        return
+
+    from bundle_analyzer import load_manual_chunks, resolve_chunk_name
+    manual_chunks = load_manual_chunks()
+
+    breakdown = MainThreadBreakdown()
+    batch = []
+    for event in iter_trace_file(sys.argv[1]):
+        batch.append(event)
+        if len(batch) >= 10000:
+            breakdown.feed(batch)
+            batch = []
+    breakdown.feed(batch)
+
+    summary = breakdown.summary(lambda url: resolve_chunk_name(url, manual_chunks))
+    print(f"🧵 Main thread: {summary['total_ms']:.0f}ms ({summary['events']} eventos)")
+    for group, ms in summary['groups'].items():
+        print(f"   {group:<18} {ms:>8.1f}ms")
+    print("📦 Por chunk:")
+    for chunk, data in sorted(summary['by_chunk'].items(), key=lambda item: item[1]['total_ms'], reverse=True):
+        print(f"   {chunk:<18} {data['total_ms']:>8.1f}ms (antes do LCP: {data['before_lcp_ms']:.1f}ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+🧹 Coverage Collector - Projeto M
+Cobertura de JS/CSS no navegador para medir bytes não utilizados por chunk
+
+Funcionalidades:
+- Cobertura precisa de JS (Profiler.startPreciseCoverage) no carregamento e nas interações
+- Uso de regras CSS (CSS.startRuleUsageTracking)
+- Mapeamento dos intervalos executados para os chunks de dist/assets (manualChunks)
+- Bytes usados vs não utilizados por chunk e candidatos a lazy-loading
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bundle_analyzer import load_manual_chunks, resolve_chunk_name
+from suite_tracer import instrument_driver, traced, traced_sleep_sync
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+except ImportError as e:
+    raise ImportError("⚠️ Instale as dependências: pip install selenium webdriver-manager") from e
+
+# Intervalo [início, fim) em offsets do texto do script/stylesheet
+Range = Tuple[int, int]
+
+@dataclass
+class ChunkCoverage:
+    """Cobertura agregada de um chunk do bundle"""
+    chunk: str
+    type: str  # js, css
+    files: List[str]
+    total_bytes: int
+    used_bytes: int
+    used_on_load_bytes: int
+    unused_bytes: int
+    unused_percent: float
+
+@dataclass
+class CoverageReport:
+    """Resultado da coleta de cobertura"""
+    timestamp: str
+    url: str
+    interactions: List[str]
+    chunks: List[ChunkCoverage]
+    total_bytes: int
+    used_bytes: int
+    unused_bytes: int
+    lazy_load_candidates: List[str] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+
+def disjoint_used_ranges(functions: List[Dict]) -> List[Range]:
+    """Converte a cobertura em blocos do V8 em intervalos executados disjuntos
+
+    Os ranges são aninhados: o range mais interno define a contagem do trecho.
+    """
+    points = []
+    for function in functions:
+        for coverage_range in function.get('ranges', []):
+            start, end = coverage_range['startOffset'], coverage_range['endOffset']
+            length = end - start
+            count = coverage_range['count']
+            # Ordem: offset, fins antes de inícios, inícios longos antes, fins curtos antes
+            points.append((start, 1, -length, count))
+            points.append((end, 0, length, count))
+
+    points.sort()
+
+    used: List[Range] = []
+    counts: List[int] = []
+    last_offset = 0
+    for offset, is_start, _, count in points:
+        if counts and last_offset < offset and counts[-1] > 0:
+            if used and used[-1][1] == last_offset:
+                used[-1] = (used[-1][0], offset)
+            else:
+                used.append((last_offset, offset))
+        last_offset = offset
+        if is_start:
+            counts.append(count)
+        elif counts:
+            counts.pop()
+
+    return used
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """União de intervalos (ex.: carregamento + interações)"""
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def ranges_bytes(text: str, ranges: List[Range]) -> int:
+    """Tamanho em bytes UTF-8 dos trechos cobertos"""
+    return sum(len(text[start:end].encode('utf-8')) for start, end in ranges)
+
+class CoverageCollector:
+    """Coleta cobertura de JS/CSS durante carregamento e interações"""
+
+    def __init__(self, base_url: str = "http://localhost:8080", dist_path: str = "dist"):
+        self.base_url = base_url
+        self.dist_path = Path(dist_path)
+        self.driver: Optional[webdriver.Chrome] = None
+
+        # Configurações
+        self.window_size = (1920, 1080)
+        self.load_settle_seconds = 3
+        self.unused_threshold = 50  # % não utilizado para sugerir lazy-loading
+        self.manual_chunks = load_manual_chunks()
+
+        # Seções da landing page percorridas nas interações
+        self.sections = ["#hero", "#features", "#contact", "#faq"]
+        self.interactions = ["scroll", "navigate", "accordion"]
+
+        # Estado da coleta: scriptId -> {url, text, load, interaction}
+        self.scripts: Dict[str, Dict] = {}
+        self.stylesheets: Dict[str, Dict] = {}
+
+    @traced("driver_setup")
+    def setup_driver(self) -> webdriver.Chrome:
+        """Configura Chrome headless para coleta de cobertura"""
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        options.add_experimental_option('excludeSwitches', ['enable-logging'])
+
+        service = Service(ChromeDriverManager().install())
+        return instrument_driver(webdriver.Chrome(service=service, options=options))
+
+    def start_coverage(self):
+        """Habilita os domínios e inicia a cobertura antes da navegação"""
+        self.driver.execute_cdp_cmd('Profiler.enable', {})
+        self.driver.execute_cdp_cmd('Debugger.enable', {})  # necessário para getScriptSource
+        self.driver.execute_cdp_cmd('Profiler.startPreciseCoverage', {'callCount': False, 'detailed': True})
+        self.driver.execute_cdp_cmd('DOM.enable', {})
+        self.driver.execute_cdp_cmd('CSS.enable', {})
+        self.driver.execute_cdp_cmd('CSS.startRuleUsageTracking', {})
+
+    def take_js_coverage(self, phase: str):
+        """Captura a cobertura JS acumulada desde a última coleta (load ou interaction)"""
+        result = self.driver.execute_cdp_cmd('Profiler.takePreciseCoverage', {})
+
+        for script in result.get('result', []):
+            url = script.get('url', '')
+            if not url.startswith('http'):
+                continue  # scripts injetados/extensões
+
+            entry = self.scripts.get(script['scriptId'])
+            if entry is None:
+                try:
+                    source = self.driver.execute_cdp_cmd(
+                        'Debugger.getScriptSource', {'scriptId': script['scriptId']}
+                    )['scriptSource']
+                except Exception as e:
+                    print(f"⚠️ Erro ao obter fonte de {url}: {e}")
+                    continue
+                entry = {'url': url, 'text': source, 'load': [], 'interaction': []}
+                self.scripts[script['scriptId']] = entry
+
+            entry[phase].extend(disjoint_used_ranges(script.get('functions', [])))
+
+    def take_css_coverage(self, phase: str):
+        """Captura o uso de regras CSS desde a última coleta"""
+        result = self.driver.execute_cdp_cmd('CSS.takeCoverageDelta', {})
+
+        for rule in result.get('coverage', []):
+            # O stylesheet entra mesmo se a regra não foi usada: o total é o texto inteiro
+            entry = self.stylesheets.get(rule['styleSheetId'])
+            if entry is None:
+                try:
+                    text = self.driver.execute_cdp_cmd(
+                        'CSS.getStyleSheetText', {'styleSheetId': rule['styleSheetId']}
+                    )['text']
+                except Exception as e:
+                    print(f"⚠️ Erro ao obter stylesheet: {e}")
+                    continue
+                entry = {'text': text, 'load': [], 'interaction': []}
+                self.stylesheets[rule['styleSheetId']] = entry
+
+            if rule.get('used'):
+                entry[phase].append((int(rule['startOffset']), int(rule['endOffset'])))
+
+    def add_unreported_stylesheets(self):
+        """Stylesheets do dist carregados pela página sem nenhuma regra na cobertura (100% não
+        utilizados). O execute_cdp_cmd não entrega o evento CSS.styleSheetAdded, então a lista
+        vem de document.styleSheets e o texto do próprio dist/assets"""
+        hrefs = self.driver.execute_script(
+            "return Array.from(document.styleSheets, sheet => sheet.href).filter(Boolean);"
+        ) or []
+        seen = {hashlib.md5(sheet['text'].strip().encode('utf-8')).hexdigest() for sheet in self.stylesheets.values()}
+
+        for href in hrefs:
+            css_file = self.dist_path / "assets" / href.split('?')[0].rsplit('/', 1)[-1]
+            if css_file.suffix != '.css' or not css_file.is_file():
+                continue
+            text = css_file.read_text(encoding='utf-8')
+            digest = hashlib.md5(text.strip().encode('utf-8')).hexdigest()
+            if digest not in seen:
+                seen.add(digest)
+                self.stylesheets[f"dist:{css_file.name}"] = {'text': text, 'load': [], 'interaction': []}
+
+    def run_interactions(self):
+        """Interações roteirizadas: scroll, navegação por seções e accordion do FAQ"""
+        height = self.driver.execute_script("return document.body.scrollHeight") or 0
+        for y in range(0, int(height), 600):
+            self.driver.execute_script(f"window.scrollTo(0, {y});")
+            traced_sleep_sync(0.2)
+
+        for section in self.sections:
+            self.driver.execute_script(f"document.querySelector('{section}')?.scrollIntoView();")
+            traced_sleep_sync(0.5)
+
+        # Abre itens de accordion (Radix) para executar o código do chunk ui
+        self.driver.execute_script(
+            "document.querySelectorAll('[data-state=\"closed\"]').forEach((el, i) => { if (i < 5) el.click(); });"
+        )
+        traced_sleep_sync(1)
+
+        self.driver.execute_script("window.scrollTo(0, 0);")
+
+    def dist_stylesheet_names(self) -> Dict[str, str]:
+        """Hash do conteúdo -> nome dos CSS de dist/assets (CDP não informa a URL do stylesheet)"""
+        names = {}
+        for css_file in (self.dist_path / "assets").glob("*.css"):
+            try:
+                content = css_file.read_text(encoding='utf-8')
+                names[hashlib.md5(content.strip().encode('utf-8')).hexdigest()] = css_file.name
+            except Exception:
+                continue
+        return names
+
+    def aggregate_chunks(self) -> List[ChunkCoverage]:
+        """Agrupa scripts e stylesheets por chunk"""
+        totals: Dict[Tuple[str, str], Dict] = {}
+
+        def add(chunk: str, file_type: str, name: str, text: str, load: List[Range], interaction: List[Range]):
+            entry = totals.setdefault((chunk, file_type), {'files': [], 'total': 0, 'used': 0, 'load': 0})
+            entry['files'].append(name)
+            entry['total'] += len(text.encode('utf-8'))
+            entry['used'] += ranges_bytes(text, merge_ranges(load + interaction))
+            entry['load'] += ranges_bytes(text, merge_ranges(load))
+
+        for script in self.scripts.values():
+            chunk = resolve_chunk_name(script['url'], self.manual_chunks)
+            add(chunk, 'js', script['url'].rsplit('/', 1)[-1], script['text'], script['load'], script['interaction'])
+
+        css_names = self.dist_stylesheet_names()
+        for sheet in self.stylesheets.values():
+            digest = hashlib.md5(sheet['text'].strip().encode('utf-8')).hexdigest()
+            name = css_names.get(digest, "(inline)")
+            chunk = resolve_chunk_name(f"/assets/{name}", self.manual_chunks) if name != "(inline)" else name
+            add(chunk, 'css', name, sheet['text'], sheet['load'], sheet['interaction'])
+
+        chunks = []
+        for (chunk, file_type), entry in totals.items():
+            unused = entry['total'] - entry['used']
+            chunks.append(ChunkCoverage(
+                chunk=chunk,
+                type=file_type,
+                files=sorted(set(entry['files'])),
+                total_bytes=entry['total'],
+                used_bytes=entry['used'],
+                used_on_load_bytes=entry['load'],
+                unused_bytes=unused,
+                unused_percent=(unused / entry['total'] * 100) if entry['total'] else 0
+            ))
+
+        return sorted(chunks, key=lambda c: c.unused_bytes, reverse=True)
+
+    def find_lazy_load_candidates(self, chunks: List[ChunkCoverage]) -> Tuple[List[str], List[str]]:
+        """Entradas do manualChunks que não precisam estar no carregamento inicial"""
+        candidates = []
+        suggestions = []
+
+        for chunk in chunks:
+            if chunk.type != 'js' or chunk.chunk not in self.manual_chunks or chunk.total_bytes == 0:
+                continue
+
+            load_percent = chunk.used_on_load_bytes / chunk.total_bytes * 100
+            if chunk.unused_percent >= self.unused_threshold or load_percent < 5:
+                candidates.append(chunk.chunk)
+                suggestions.append(
+                    f"🪓 Chunk '{chunk.chunk}': {chunk.unused_percent:.0f}% não utilizado "
+                    f"({load_percent:.0f}% usado no carregamento) - carregar com import() dinâmico"
+                )
+
+        return candidates, suggestions
+
+    def collect(self) -> Optional[CoverageReport]:
+        """Carrega a página, executa interações e retorna a cobertura por chunk"""
+        print(f"🧹 Coletando cobertura JS/CSS em {self.base_url}...")
+
+        try:
+            self.driver = self.setup_driver()
+            self.start_coverage()
+
+            self.driver.get(self.base_url)
+            traced_sleep_sync(self.load_settle_seconds)
+            self.take_js_coverage('load')
+            self.take_css_coverage('load')
+
+            self.run_interactions()
+            self.take_js_coverage('interaction')
+            self.take_css_coverage('interaction')
+            self.add_unreported_stylesheets()
+
+            self.driver.execute_cdp_cmd('Profiler.stopPreciseCoverage', {})
+            self.driver.execute_cdp_cmd('CSS.stopRuleUsageTracking', {})
+
+        except Exception as e:
+            print(f"⚠️ Erro ao coletar cobertura: {e}")
+            return None
+
+        finally:
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
+
+        chunks = self.aggregate_chunks()
+        candidates, suggestions = self.find_lazy_load_candidates(chunks)
+        total = sum(c.total_bytes for c in chunks)
+        used = sum(c.used_bytes for c in chunks)
+
+        return CoverageReport(
+            timestamp=datetime.now().isoformat(),
+            url=self.base_url,
+            interactions=list(self.interactions),
+            chunks=chunks,
+            total_bytes=total,
+            used_bytes=used,
+            unused_bytes=total - used,
+            lazy_load_candidates=candidates,
+            suggestions=suggestions
+        )
+
+    def print_report(self, report: CoverageReport):
+        """Imprime cobertura por chunk"""
+        print(f"\n🧹 COBERTURA JS/CSS ({report.unused_bytes / 1024:.1f} KB não utilizados "
+              f"de {report.total_bytes / 1024:.1f} KB):")
+        for chunk in report.chunks:
+            print(f"   {chunk.chunk} ({chunk.type}): {chunk.used_bytes / 1024:.1f} / "
+                  f"{chunk.total_bytes / 1024:.1f} KB usados ({chunk.unused_percent:.1f}% não utilizado)")
+        for suggestion in report.suggestions:
+            print(f"   {suggestion}")
+
+def main():
+    """Função principal"""
+    collector = CoverageCollector()
+    report = collector.collect()
+    if report:
+        collector.print_report(report)
+
+if __name__ == "__main__":
+    main()
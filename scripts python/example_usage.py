@@ -13,11 +13,8 @@ import time
 from pathlib import Path
 from datetime import datetime
 
-# Importar ferramentas da suíte
-from bundle_analyzer import BundleAnalyzer
-from memory_profiler import MemoryProfiler
-from stress_tester import StressTester
-from master_performance_suite import MasterPerformanceSuite, TestConfiguration
+# As ferramentas da suíte são importadas dentro de cada exemplo: selenium e aiohttp
+# só carregam quando o exemplo que usa o browser ou a carga HTTP roda
 
 class PerformanceTestingExample:
     """Classe de exemplo para demonstrar uso da suíte"""
@@ -41,6 +38,8 @@ class PerformanceTestingExample:
         print()
         
         try:
+            from bundle_analyzer import BundleAnalyzer
+            
             # Criar analisador
             analyzer = BundleAnalyzer()
             
@@ -80,6 +79,8 @@ class PerformanceTestingExample:
         print()
         
         try:
+            from memory_profiler import MemoryProfiler
+            
             # Criar profiler
             profiler = MemoryProfiler(self.base_url)
             
@@ -122,6 +123,8 @@ class PerformanceTestingExample:
         print()
         
         try:
+            from stress_tester import StressTester
+            
             # Criar tester
             tester = StressTester(self.base_url)
             
@@ -175,6 +178,8 @@ class PerformanceTestingExample:
         print()
         
         try:
+            from master_performance_suite import MasterPerformanceSuite, TestConfiguration
+            
             # Configuração customizada
             config = TestConfiguration(
                 run_bundle_analysis=True,
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+⏱️ Import Benchmark - Projeto M
+Orçamento de cold start dos entry points da suíte (baseado em python -X importtime)
+
+Funcionalidades:
+- Tempo de import de cada entry point num interpretador novo (mediana de várias execuções)
+- Dependências pesadas (selenium, aiohttp, psutil...) proibidas no import: só na etapa que as usa
+- Maiores responsáveis pelo tempo de import
+- Código de saída != 0 quando algum orçamento é estourado (guarda de CI)
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+# Orçamento de import por entry point (ms, cumulativo do próprio módulo)
+IMPORT_BUDGETS_MS = {
+    "master_performance_suite": 150,
+    "quick_start": 100,
+    "example_usage": 150,
+}
+
+# Carregadas só pela etapa que precisa delas
+HEAVY_MODULES = ["selenium", "webdriver_manager", "aiohttp", "psutil", "requests", "numpy", "pandas"]
+
+SCRIPTS_DIR = Path(__file__).parent
+
+@dataclass
+class ImportProfile:
+    """Resultado do -X importtime de um módulo"""
+    module: str
+    total_ms: float
+    budget_ms: float
+    heavy_modules: List[str]
+    top_imports: List[tuple] = field(default_factory=list)  # (módulo, ms cumulativo)
+
+    @property
+    def ok(self) -> bool:
+        return self.total_ms <= self.budget_ms and not self.heavy_modules
+
+def parse_importtime(stderr: str) -> List[tuple]:
+    """Linhas 'import time: self | cumulative | nome' → (nome, profundidade, cumulativo em µs)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        entries.append((name, depth, int(cumulative)))
+    return entries
+
+def import_once(module: str) -> List[tuple]:
+    """Importa o módulo num interpretador novo e devolve as linhas do importtime"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True, timeout=120
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} falhou: {completed.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(completed.stderr)
+
+def profile_import(module: str, runs: int = 5, budget_ms: Optional[float] = None) -> ImportProfile:
+    """Mediana de `runs` imports frios (o primeiro, que compila o bytecode, é descartado)"""
+    import_once(module)
+    totals = []
+    entries = []
+    for _ in range(runs):
+        entries = import_once(module)
+        totals.append(next(us for name, depth, us in entries if name == module and depth == 0))
+
+    # Tudo importado a partir do módulo (o que o site já carregou não conta)
+    start = max(i for i, (name, depth, _) in enumerate(entries) if name == module and depth == 0)
+    first = start
+    while first > 0 and entries[first - 1][1] > 0:
+        first -= 1
+    loaded = {name for name, _, _ in entries[first:start + 1]}
+
+    children = [(name, us / 1000) for name, depth, us in entries[first:start] if depth == 1]
+    return ImportProfile(
+        module=module,
+        total_ms=statistics.median(totals) / 1000,
+        budget_ms=budget_ms if budget_ms is not None else IMPORT_BUDGETS_MS.get(module, 200),
+        heavy_modules=[heavy for heavy in HEAVY_MODULES if heavy in loaded],
+        top_imports=sorted(children, key=lambda item: item[1], reverse=True)[:5]
+    )
+
+def print_profiles(profiles: List[ImportProfile]):
+    print("\n⏱️ COLD START DOS ENTRY POINTS (-X importtime):")
+    for profile in profiles:
+        status = "✅" if profile.ok else "❌"
+        print(f"   {status} {profile.module:<26} {profile.total_ms:>7.1f}ms (orçamento {profile.budget_ms:.0f}ms)")
+        if profile.heavy_modules:
+            print(f"      🚫 Dependências pesadas no import: {', '.join(profile.heavy_modules)}")
+        top = ", ".join(f"{name} {ms:.1f}ms" for name, ms in profile.top_imports)
+        print(f"      Maiores: {top}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Orçamento de import dos entry points da suíte")
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGETS_MS), help="Módulos a medir")
+    parser.add_argument("--runs", type=int, default=5, help="Execuções por módulo (mediana)")
+    args = parser.parse_args()
+
+    profiles = [profile_import(module, args.runs) for module in args.modules]
+    print_profiles(profiles)
+    return 0 if all(profile.ok for profile in profiles) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
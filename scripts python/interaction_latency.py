@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+👆 Interaction Latency - Projeto M
+Latência real de interação (Event Timing) com input confiável via CDP
+
+Funcionalidades:
+- Input.dispatchMouseEvent / Input.dispatchKeyEvent em Navbar, FAQ, ContactForm e CookieBanner
+- Input delay, processing time e presentation delay por interação
+- INP da sessão (p98 das interações)
+- Atribuição de interações lentas a long tasks e scripts (Long Animation Frames → chunk)
+"""
+
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional
+
+from bundle_analyzer import load_manual_chunks, resolve_chunk_name
+from metrics_agent import collect_agent_metrics
+
+# Alvos roteirizados: componente, seletor e ação (o primeiro seletor visível é usado)
+INTERACTION_TARGETS = [
+    {'name': 'cookie_customize', 'component': 'CookieBanner', 'action': 'click',
+     'selectors': ['button:has(svg.lucide-settings)', 'div[class*="fixed"] button:nth-of-type(2)']},
+    {'name': 'cookie_close', 'component': 'CookieBanner', 'action': 'click',
+     'selectors': ['button[aria-label="Fechar banner de cookies"]']},
+    {'name': 'navbar_menu', 'component': 'Navbar', 'action': 'click',
+     'selectors': ['button.menu-button', 'nav a[href="#features"]']},
+    {'name': 'navbar_link', 'component': 'Navbar', 'action': 'click',
+     'selectors': ['nav a[href="#faq"]', 'a[href="#faq"]']},
+    {'name': 'faq_open', 'component': 'FAQ', 'action': 'click',
+     'selectors': ['#faq button[data-state="closed"]']},
+    {'name': 'faq_switch', 'component': 'FAQ', 'action': 'click',
+     'selectors': ['#faq button[data-state="closed"]']},
+    {'name': 'contact_type', 'component': 'ContactForm', 'action': 'type', 'text': 'Teste Mind',
+     'selectors': ['#contact form input']},
+]
+
+# Interações acima disso são consideradas lentas (limite "bom" do INP)
+SLOW_INTERACTION_MS = 200
+
+@dataclass
+class InteractionLatency:
+    """Latência de uma interação roteirizada"""
+    name: str
+    component: str
+    dispatched: bool
+    event: str = ""
+    target: str = ""
+    duration: float = 0  # ms
+    input_delay: float = 0
+    processing: float = 0
+    presentation: float = 0
+    long_tasks: int = 0
+    long_task_ms: float = 0
+    scripts: List[Dict] = field(default_factory=list)  # atribuição por script/chunk
+
+@dataclass
+class InteractionReport:
+    """Resultado da sessão de interações"""
+    inp: float
+    fid: float
+    interactions: List[InteractionLatency]
+    slow_interactions: List[str]
+
+def overlaps(start: float, end: float, item: Dict) -> bool:
+    return item['start'] < end and item['start'] + item['duration'] > start
+
+def compute_inp(durations: List[float]) -> float:
+    """p98 das durações (com < 50 interações equivale à maior)"""
+    if not durations:
+        return 0.0
+    ordered = sorted(durations, reverse=True)
+    return ordered[min(len(ordered) - 1, len(ordered) // 50)]
+
+def attribute_interaction(window_start: float, window_end: float, entries: List[Dict],
+                          long_tasks: List[Dict], animation_frames: List[Dict],
+                          manual_chunks: Optional[Dict[str, List[str]]] = None) -> Dict:
+    """Associa a entrada Event Timing mais longa da janela às long tasks e scripts sobrepostos"""
+    in_window = [e for e in entries if window_start <= e['start'] <= window_end]
+    if not in_window:
+        return {}
+
+    worst = max(in_window, key=lambda e: e['duration'])
+    start, end = worst['start'], worst['start'] + worst['duration']
+
+    tasks = [task for task in long_tasks if overlaps(start, end, task)]
+
+    scripts: Dict[str, Dict] = {}
+    for frame in animation_frames:
+        if not overlaps(start, end, frame):
+            continue
+        for script in frame['scripts']:
+            key = script['source_url'] or script['invoker']
+            entry = scripts.setdefault(key, {
+                'source_url': script['source_url'],
+                'chunk': resolve_chunk_name(script['source_url'], manual_chunks),
+                'invoker': script['invoker'],
+                'duration': 0
+            })
+            entry['duration'] += script['duration']
+
+    return {
+        'event': worst['name'],
+        'target': worst.get('target', ''),
+        'duration': worst['duration'],
+        'input_delay': worst['input_delay'],
+        'processing': worst['processing'],
+        'presentation': worst['presentation'],
+        'long_tasks': len(tasks),
+        'long_task_ms': sum(task['duration'] for task in tasks),
+        'scripts': sorted(scripts.values(), key=lambda s: s['duration'], reverse=True)
+    }
+
+class InteractionRunner:
+    """Executa interações confiáveis via CDP e mede a latência com o agente de métricas"""
+
+    def __init__(self, driver, targets: Optional[List[Dict]] = None):
+        self.driver = driver
+        self.targets = targets or INTERACTION_TARGETS
+        self.manual_chunks = load_manual_chunks()
+
+        # Configurações
+        self.settle_after_input = 0.4  # segundos para o próximo paint e entradas do observer
+        self.quiet_ms = 300
+        self.timeout_ms = 5000
+
+    def locate(self, selectors: List[str]) -> Optional[Dict]:
+        """Centro do primeiro elemento visível (rolado para a viewport)"""
+        return self.driver.execute_script("""
+            for (const selector of arguments[0]) {
+                let elements = [];
+                try { elements = document.querySelectorAll(selector); } catch (e) { continue; }
+                for (const element of elements) {
+                    if (!element.getClientRects().length) continue;  // display:none (ex.: menu mobile no desktop)
+                    element.scrollIntoView({block: 'center'});
+                    const rect = element.getBoundingClientRect();
+                    if (rect.width === 0 || rect.height === 0) continue;
+                    return {x: rect.left + rect.width / 2, y: rect.top + rect.height / 2, selector};
+                }
+            }
+            return null;
+        """, selectors)
+
+    def now(self) -> float:
+        return self.driver.execute_script("return performance.now();")
+
+    def dispatch_click(self, x: float, y: float):
+        """Clique confiável (isTrusted) via Input.dispatchMouseEvent"""
+        for event_type in ('mouseMoved', 'mousePressed', 'mouseReleased'):
+            params = {'type': event_type, 'x': x, 'y': y}
+            if event_type != 'mouseMoved':
+                params.update({'button': 'left', 'clickCount': 1})
+            self.driver.execute_cdp_cmd('Input.dispatchMouseEvent', params)
+
+    def dispatch_text(self, text: str):
+        """Digitação confiável via Input.dispatchKeyEvent"""
+        for char in text:
+            self.driver.execute_cdp_cmd('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': char, 'key': char})
+            self.driver.execute_cdp_cmd('Input.dispatchKeyEvent', {'type': 'keyUp', 'key': char})
+
+    def run(self) -> InteractionReport:
+        """Executa os alvos em sequência e coleta tudo numa chamada ao final"""
+        windows = []
+
+        for target in self.targets:
+            point = self.locate(target['selectors'])
+            if not point:
+                windows.append((target, None, None))
+                continue
+
+            start = self.now()
+            if target['action'] == 'type':
+                self.dispatch_click(point['x'], point['y'])
+                self.dispatch_text(target.get('text', 'teste'))
+            else:
+                self.dispatch_click(point['x'], point['y'])
+            time.sleep(self.settle_after_input)
+            windows.append((target, start, self.now()))
+
+        metrics = collect_agent_metrics(self.driver, self.quiet_ms, self.timeout_ms)
+        cwv = metrics.get('core_web_vitals', {})
+        entries = cwv.get('interactions', [])
+        long_tasks = cwv.get('long_tasks', [])
+        animation_frames = cwv.get('long_animation_frames', [])
+
+        interactions = []
+        for target, start, end in windows:
+            latency = InteractionLatency(name=target['name'], component=target['component'],
+                                         dispatched=start is not None)
+            if start is not None:
+                attribution = attribute_interaction(start, end, entries, long_tasks,
+                                                    animation_frames, self.manual_chunks)
+                for key, value in attribution.items():
+                    setattr(latency, key, value)
+            interactions.append(latency)
+
+        measured = [i.duration for i in interactions if i.duration > 0]
+        return InteractionReport(
+            inp=compute_inp(measured) if measured else cwv.get('inp', 0),
+            fid=cwv.get('fid', 0),
+            interactions=interactions,
+            slow_interactions=[i.name for i in interactions if i.duration > SLOW_INTERACTION_MS]
+        )
+
+def interaction_report_to_dict(report: InteractionReport) -> Dict:
+    return asdict(report)
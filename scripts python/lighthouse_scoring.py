@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+🏁 Lighthouse Scoring - Projeto M
+Score de performance equivalente ao Lighthouse, calculado localmente (sem Node)
+
+Funcionalidades:
+- Curvas log-normais por métrica (p10 e mediana) e pesos da categoria performance
+- Versões de scoring congeladas (lh10, lh8): scores históricos continuam comparáveis
+- Curvas mobile e desktop
+- Cálculo vetorizado com NumPy para re-pontuar o histórico em lote
+"""
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+@dataclass(frozen=True)
+class MetricCurve:
+    """Curva log-normal: o valor p10 recebe score 0.9 e a mediana 0.5"""
+    p10: float
+    median: float
+
+@dataclass(frozen=True)
+class ScoringVersion:
+    """Pesos e curvas de uma versão do Lighthouse (nunca altere uma versão publicada)"""
+    name: str
+    weights: Dict[str, float]
+    curves: Dict[str, Dict[str, MetricCurve]]  # form factor -> métrica -> curva
+
+# Métricas: fcp, si, lcp, tbt, tti (ms) e cls
+SCORING_VERSIONS = {
+    # Lighthouse 10+
+    'lh10': ScoringVersion(
+        name='lh10',
+        weights={'fcp': 0.10, 'si': 0.10, 'lcp': 0.25, 'tbt': 0.30, 'cls': 0.25},
+        curves={
+            'mobile': {
+                'fcp': MetricCurve(1800, 3000),
+                'si': MetricCurve(3387, 5800),
+                'lcp': MetricCurve(2500, 4000),
+                'tbt': MetricCurve(200, 600),
+                'cls': MetricCurve(0.1, 0.25),
+            },
+            'desktop': {
+                'fcp': MetricCurve(934, 1600),
+                'si': MetricCurve(1311, 2300),
+                'lcp': MetricCurve(1200, 2400),
+                'tbt': MetricCurve(150, 350),
+                'cls': MetricCurve(0.1, 0.25),
+            },
+        },
+    ),
+    # Lighthouse 8/9 (com TTI)
+    'lh8': ScoringVersion(
+        name='lh8',
+        weights={'fcp': 0.10, 'si': 0.10, 'lcp': 0.25, 'tti': 0.10, 'tbt': 0.30, 'cls': 0.15},
+        curves={
+            'mobile': {
+                'fcp': MetricCurve(1800, 3000),
+                'si': MetricCurve(3387, 5800),
+                'lcp': MetricCurve(2500, 4000),
+                'tti': MetricCurve(3785, 7300),
+                'tbt': MetricCurve(200, 600),
+                'cls': MetricCurve(0.1, 0.25),
+            },
+            'desktop': {
+                'fcp': MetricCurve(934, 1600),
+                'si': MetricCurve(1311, 2300),
+                'lcp': MetricCurve(1200, 2400),
+                'tti': MetricCurve(2468, 4500),
+                'tbt': MetricCurve(150, 350),
+                'cls': MetricCurve(0.1, 0.25),
+            },
+        },
+    ),
+}
+
+DEFAULT_SCORING_VERSION = 'lh10'
+
+# erfc⁻¹(1/5): posiciona o p10 em score 0.9
+INVERSE_ERFC_ONE_FIFTH = 0.9061938024368232
+
+def erf(x: np.ndarray) -> np.ndarray:
+    """Aproximação de Abramowitz-Stegun 7.1.26 (a mesma do Lighthouse)"""
+    sign = np.sign(x)
+    x = np.abs(x)
+    a1, a2, a3, a4, a5 = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429
+    t = 1 / (1 + 0.3275911 * x)
+    y = t * (a1 + t * (a2 + t * (a3 + t * (a4 + t * a5))))
+    return sign * (1 - y * np.exp(-x * x))
+
+def log_normal_score(values, curve: MetricCurve) -> np.ndarray:
+    """Score 0-1 de cada valor (NaN permanece NaN)"""
+    values = np.asarray(values, dtype=float)
+    tiny = np.finfo(float).tiny
+
+    with np.errstate(invalid='ignore'):
+        x_log_ratio = np.log(np.maximum(tiny, values / curve.median))
+        p10_log_ratio = -np.log(max(tiny, curve.p10 / curve.median))
+        standardized = x_log_ratio * INVERSE_ERFC_ONE_FIFTH / p10_log_ratio
+        score = (1 - erf(standardized)) / 2
+
+        # Mantém cada faixa no intervalo esperado (erros de ponto flutuante da aproximação)
+        score = np.where(values <= curve.p10, np.clip(score, 0.9, 1),
+                np.where(values <= curve.median, np.clip(score, 0.5, 0.8999999999999999),
+                         np.clip(score, 0, 0.49999999999999994)))
+        score = np.where(values <= 0, 1.0, score)
+
+    return np.where(np.isnan(values), np.nan, score)
+
+def get_version(version: str) -> ScoringVersion:
+    if version not in SCORING_VERSIONS:
+        raise ValueError(f"Versão de scoring desconhecida: {version} (disponíveis: {', '.join(SCORING_VERSIONS)})")
+    return SCORING_VERSIONS[version]
+
+def score_matrix(columns: Dict[str, Sequence[float]], form_factor: str = 'mobile',
+                 version: str = DEFAULT_SCORING_VERSION) -> Dict[str, np.ndarray]:
+    """Pontua N medições de uma vez; métricas ausentes (NaN) têm o peso redistribuído"""
+    scoring = get_version(version)
+    curves = scoring.curves[form_factor]
+    n = len(next(iter(columns.values()))) if columns else 0
+
+    metric_scores = {}
+    weighted = np.zeros(n)
+    weight_used = np.zeros(n)
+    for metric, weight in scoring.weights.items():
+        values = np.asarray(columns.get(metric, np.full(n, np.nan)), dtype=float)
+        scores = np.round(log_normal_score(values, curves[metric]), 2)  # scores de auditoria têm 2 casas
+        metric_scores[metric] = scores
+
+        present = ~np.isnan(scores)
+        weighted += np.where(present, scores * weight, 0)
+        weight_used += np.where(present, weight, 0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        performance = np.where(weight_used > 0, weighted / weight_used, np.nan)
+
+    return {
+        'performance': np.round(performance * 100),
+        'weight_coverage': weight_used / sum(scoring.weights.values()),
+        **metric_scores
+    }
+
+def score_metrics(metrics: Dict[str, Optional[float]], form_factor: str = 'mobile',
+                  version: str = DEFAULT_SCORING_VERSION) -> Dict:
+    """Score de uma medição (métricas None ou ausentes são ignoradas)"""
+    columns = {name: [np.nan if value is None else value] for name, value in metrics.items()}
+    result = score_matrix(columns, form_factor, version)
+    weights = get_version(version).weights
+
+    performance = result['performance'][0]
+    return {
+        'version': version,
+        'form_factor': form_factor,
+        'performance_score': 0 if np.isnan(performance) else int(performance),
+        'metric_scores': {name: (None if np.isnan(result[name][0]) else float(result[name][0]))
+                          for name in weights},
+        'missing': [name for name in weights if np.isnan(result[name][0])],
+        'weight_coverage': float(result['weight_coverage'][0])
+    }
+
+def rescore_history(paths: Sequence[Path], version: str = DEFAULT_SCORING_VERSION) -> List[Dict]:
+    """Re-pontua análises salvas (real_performance_analysis_*.json) numa versão de scoring"""
+    rows = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            cwv = data['core_web_vitals']
+            rows.append({
+                'file': str(path),
+                'timestamp': data.get('timestamp', ''),
+                'form_factor': (data.get('scoring') or {}).get('form_factor', 'desktop'),
+                'previous_score': data.get('performance_score', 0),
+                'previous_version': cwv.get('scoring_version') or 'legacy',
+                'fcp': cwv.get('fcp'), 'lcp': cwv.get('lcp'), 'cls': cwv.get('cls'),
+                'tbt': cwv.get('tbt', data.get('javascript_metrics', {}).get('blocking_time')),
+                'si': cwv.get('si') or None
+            })
+        except Exception as e:
+            print(f"⚠️ Erro ao ler {path}: {e}")
+
+    for form_factor in {row['form_factor'] for row in rows}:
+        group = [row for row in rows if row['form_factor'] == form_factor]
+        columns = {metric: [np.nan if row[metric] is None else row[metric] for row in group]
+                   for metric in ('fcp', 'lcp', 'cls', 'tbt', 'si')}
+        scores = score_matrix(columns, form_factor, version)['performance']
+        for row, score in zip(group, scores):
+            row['score'] = None if np.isnan(score) else int(score)
+            row['version'] = version
+
+    return sorted(rows, key=lambda row: row['timestamp'])
+
+def main():
+    """Re-pontua o histórico: python lighthouse_scoring.py [versão] [arquivos...]"""
+    args = sys.argv[1:]
+    version = args.pop(0) if args and args[0] in SCORING_VERSIONS else DEFAULT_SCORING_VERSION
+    paths = [Path(arg) for arg in args] or sorted(Path(".").glob("real_performance_analysis_*.json"))
+
+    if not paths:
+        print("⚠️ Nenhuma análise encontrada (real_performance_analysis_*.json)")
+        return
+
+    print(f"🏁 Re-pontuando {len(paths)} análises com {version}")
+    for row in rescore_history(paths, version):
+        print(f"   {row['timestamp'][:19]:<20} {row['form_factor']:<8} "
+              f"{row['previous_score']:>3} ({row['previous_version']}) → {row['score']}")
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,15 @@
 Orquestrador principal de todos os testes de performance
 
 Funcionalidades:
-- Execução coordenada de todos os testes
+- Execução coordenada de todos os testes (DAG com recursos: testes compatíveis em paralelo)
 - Relatórios consolidados
-- Comparação histórica
+- Reuso de resultados quando build, assets e configuração não mudaram (fingerprint por conteúdo)
+- Checkpoint por etapa e retomada de sessões interrompidas (--resume), com retries por etapa
+- Auto-profiling da própria suíte em formato Chrome trace (--self-trace, abrir no Perfetto)
+- Métricas ao vivo em OpenMetrics/Prometheus (--metrics-port, --metrics-textfile)
+- Modo A/B: dois dist/ servidos localmente, runs intercaladas e comparação pareada (--ab)
+- Rede gravada e reproduzida por proxy local (--network-record/--network-replay)
+- Comparação histórica estatística (medianas por run/bootstrap hierárquico contra baseline móvel, changepoints)
 - Alertas automáticos
 - Dashboard integration
 - CI/CD integration
@@ -21,19 +27,55 @@ import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import argparse
 
-# Importar outros módulos da suíte
+# Importar outros módulos da suíte (só os leves: cada etapa importa o seu módulo, com
+# selenium/aiohttp/psutil, quando roda - --help e execuções parciais não pagam por eles)
 try:
-    from bundle_analyzer import BundleAnalyzer
-    from memory_profiler import MemoryProfiler
-    from stress_tester import StressTester
-    from real_performance_suite import RealPerformanceSuite
+    from suite_scheduler import DagScheduler, TaskSpec, print_schedule
+    from result_cache import InputFingerprinter, ResultCache
+    from regression_detector import RegressionDetector, RunHistory, extract_run_samples, format_verdict
+    from suite_checkpoint import CheckpointStore, latest_session
+    from suite_tracer import TRACER, print_span_totals, span, traced
+    from metrics_exporter import METRICS
 except ImportError as e:
     print(f"⚠️ Erro ao importar módulos: {e}")
     print("Certifique-se de que todos os scripts estão no mesmo diretório")
 
+# Nomes aceitos pela RealPerformanceSuite, repetidos aqui para o CLI não importar o Selenium
+PERFORMANCE_CACHE_MODES = ["cold", "warm_http", "warm_code"]
+PERFORMANCE_DEVICE_PROFILES = ["desktop", "desktop_cable", "mid_tier_mobile", "low_end_mobile"]
+
+# Entradas específicas de cada etapa para o fingerprint: prefixo dos campos da TestConfiguration,
+# arquivos do projeto além dos comuns, módulos da suíte que ela executa e se é uma medição
+# (reuso só com reuse_measurements)
+STAGE_CACHE_INPUTS = {
+    "Bundle Analysis": {
+        "config_prefixes": ("bundle_",),
+        "project": ["src", "package.json"],  # lidos na detecção de dependências não utilizadas
+        "code": ["bundle_analyzer.py", "coverage_collector.py"],
+        "measurement": False
+    },
+    "Memory Profiling": {
+        "config_prefixes": ("memory_", "network_"),
+        "code": ["memory_profiler.py", "memory_scenarios.py", "memory_soak.py", "chrome_trace.py"],
+        "measurement": True
+    },
+    "Performance Suite": {
+        "config_prefixes": ("performance_", "network_"),
+        "code": ["real_performance_suite.py", "metrics_agent.py", "chrome_trace.py", "network_recorder.py",
+                 "interaction_latency.py", "visual_progress.py", "lighthouse_scoring.py",
+                 "measurement_stats.py", "route_crawler.py"],
+        "measurement": True
+    },
+    "Stress Testing": {
+        "config_prefixes": ("stress_", "network_"),
+        "code": ["stress_tester.py"],
+        "measurement": True
+    },
+}
+
 @dataclass
 class TestConfiguration:
     """Configuração dos testes"""
@@ -44,10 +86,61 @@ class TestConfiguration:
     run_performance_suite: bool = True
     
     # Configurações específicas
+    bundle_coverage: bool = True  # cobertura JS/CSS por chunk (requer servidor)
     memory_duration_minutes: int = 3
+    memory_allocation_sampling: bool = False
+    memory_sampling_interval: int = 32768  # bytes
+    memory_sampling_phases: List[str] = field(default_factory=list)  # vazio = todas
+    memory_gc_tracing: bool = True  # métricas reais de GC via tracing do V8
+    memory_soak_hours: float = 0  # > 0 ativa o modo soak (substitui memory_duration_minutes)
+    memory_scenario_matrix: bool = False  # cenários × viewports em processos paralelos
+    memory_scenarios: List[str] = field(default_factory=list)  # vazio = todas as interações
+    memory_viewports: List[str] = field(default_factory=lambda: ["desktop", "mobile"])
+    memory_cores_per_scenario: int = 2
+    memory_max_parallelism: int = 0  # 0 = automático (CPUs disponíveis)
     stress_max_users: int = 20
     stress_duration_minutes: int = 3
+    stress_engine: str = "selenium"  # selenium = um Chrome por usuário; cdp = uma aba por usuário num Chrome só
     performance_network_tests: bool = True
+    performance_cache_modes: List[str] = field(default_factory=lambda: ["cold", "warm_http", "warm_code"])
+    performance_device_profiles: List[str] = field(default_factory=lambda: ["desktop", "mid_tier_mobile"])
+    performance_crawl_routes: bool = False  # todas as rotas × viewports em browsers paralelos
+    performance_crawl_viewports: List[str] = field(default_factory=lambda: ["desktop", "mid_tier_mobile"])
+    performance_crawl_parallelism: int = 0  # 0 = automático (CPUs e memória livres)
+    
+    # Agendamento: testes compatíveis em paralelo (False = sequencial, como antes)
+    parallel_scheduling: bool = True
+    scheduler_max_concurrency: int = 0  # 0 = limitado só por CPUs/browsers
+    
+    # Reuso de resultados com entradas idênticas (dist/, public/, configs, teste e código da etapa)
+    reuse_cached_results: bool = True
+    reuse_measurements: bool = False  # também memória/performance/stress (ex.: CI de commits só de docs)
+    
+    # Detecção de regressões contra o histórico
+    regression_window: int = 10  # runs na baseline móvel
+    regression_alpha: float = 0.05
+    regression_min_effect: float = 0.05  # mudança relativa mínima da mediana
+    
+    # Novas tentativas por etapa após falha, timeout ou crash do WebDriver
+    stage_retries: Dict[str, int] = field(default_factory=lambda: {
+        "Bundle Analysis": 0,
+        "Memory Profiling": 1,
+        "Performance Suite": 1,
+        "Stress Testing": 0
+    })
+    
+    # Spans da própria suíte (etapas, Chrome, execute_script, arquivos, relatórios, esperas)
+    self_trace: bool = False
+    
+    # Export OpenMetrics durante a run: endpoint /metrics (None = desligado) e/ou arquivo .prom
+    metrics_port: Optional[int] = None
+    metrics_textfile: Optional[str] = None
+    
+    # Proxy de rede: "record" grava as respostas em network_archive, "replay" responde só delas
+    network_mode: Optional[str] = None
+    network_archive: str = "network_archive"
+    network_latency_ms: Optional[float] = None  # None = latência gravada de cada resposta
+    network_download_kbps: float = 0  # 0 = sem limite de banda
     
     # Configurações gerais
     base_url: str = "http://localhost:8080"
@@ -65,6 +158,10 @@ class TestResult:
     duration_seconds: float
     data: Optional[Dict] = None
     error_message: Optional[str] = None
+    cached: bool = False  # resultado reutilizado de uma sessão anterior com as mesmas entradas
+    fingerprint: Optional[str] = None
+    attempts: int = 1
+    resumed: bool = False  # concluído antes da interrupção, lido do checkpoint
 
 @dataclass
 class ConsolidatedReport:
@@ -87,23 +184,46 @@ class ConsolidatedReport:
     
     # Comparação histórica
     historical_comparison: Optional[Dict] = None
+    
+    # Linha do tempo do agendamento e caminho crítico da suíte
+    schedule: Optional[Dict] = None
+    
+    # Etapas reutilizadas do cache (fingerprint idêntico)
+    cached_stages: List[str] = field(default_factory=list)
+    
+    # Etapas concluídas antes de uma interrupção (sessão retomada com --resume)
+    resumed_stages: List[str] = field(default_factory=list)
 
 class MasterPerformanceSuite:
     """Suíte principal de performance testing"""
     
-    def __init__(self, config: TestConfiguration):
+    def __init__(self, config: TestConfiguration, resume_session: Optional[str] = None):
         self.config = config
-        self.session_id = f"perf_suite_{int(time.time())}"
+        self.session_id = resume_session or f"perf_suite_{int(time.time())}"
         self.test_results: List[TestResult] = []
+        self.schedule = None
         self.start_time = datetime.now()
+        if config.self_trace:
+            TRACER.enable()
         
         # Criar diretório de output
         self.output_dir = Path(config.output_dir)
         self.output_dir.mkdir(exist_ok=True)
         
+        # Cache de resultados por fingerprint das entradas
+        cache_dir = self.output_dir / ".stage_cache"
+        self.fingerprinter = InputFingerprinter(cache_dir)
+        self.result_cache = ResultCache(cache_dir)
+        
+        # Checkpoints da sessão (na retomada, resultados já concluídos)
+        self.checkpoints = CheckpointStore(self.output_dir, self.session_id)
+        self.resumed_results = self.checkpoints.load_stages() if resume_session else {}
+        
         print(f"🎯 Master Performance Suite iniciada")
         print(f"📁 Relatórios serão salvos em: {self.output_dir}")
         print(f"🆔 Session ID: {self.session_id}")
+        if resume_session:
+            print(f"🔄 Retomando sessão: {len(self.resumed_results)} etapa(s) com checkpoint")
     
     async def run_all_tests(self) -> Optional[ConsolidatedReport]:
         """Executa todos os testes configurados"""
@@ -116,22 +236,56 @@ class MasterPerformanceSuite:
             print("❌ Servidor não está rodando. Execute 'npm run dev' primeiro.")
             return None
         
-        # Executar testes na ordem otimizada
+        try:
+            proxy = self.start_network_proxy()
+        except (FileNotFoundError, OSError) as e:
+            print(f"❌ Proxy de rede não iniciado: {e}")
+            return None
+        
+        self.start_metrics_export()
+        try:
+            return await self.run_stages()
+        finally:
+            if proxy:
+                from replay_proxy import print_proxy_stats
+                proxy.stop()
+                print_proxy_stats(proxy)
+            if METRICS.enabled:
+                METRICS.disable()
+    
+    async def run_stages(self) -> ConsolidatedReport:
+        """Etapas, relatório consolidado e saídas (dashboard, alertas, trace)"""
+        # Executar testes pelo agendador (ordem canônica mantida no relatório)
         test_sequence = [
             ("Bundle Analysis", self.run_bundle_analysis),
             ("Memory Profiling", self.run_memory_profiling),
             ("Performance Suite", self.run_performance_suite),
             ("Stress Testing", self.run_stress_testing)
         ]
+        order = [test_name for test_name, _ in test_sequence]
+        self.checkpoints.save_manifest(asdict(self.config), self.start_time.isoformat())
         
+        tasks = []
         for test_name, test_func in test_sequence:
-            if self.should_run_test(test_name):
-                await self.execute_test(test_name, test_func)
-            else:
+            if not self.should_run_test(test_name):
                 self.add_skipped_test(test_name)
+            elif not self.resume_finished_stage(test_name) and not self.reuse_cached_result(test_name):
+                tasks.append(self.build_task_spec(test_name, test_func))
+        
+        try:
+            if tasks:
+                scheduler = DagScheduler(
+                    tasks,
+                    max_concurrency=self.config.scheduler_max_concurrency if self.config.parallel_scheduling else 1
+                )
+                self.schedule = await scheduler.run(lambda task: self.execute_test(task.name, task.func))
+        finally:
+            self.test_results.sort(key=lambda result: order.index(result.test_name))
         
         # Gerar relatório consolidado
         report = await self.generate_consolidated_report()
+        if METRICS.enabled:
+            METRICS.publish_report(report.overall_performance_score, report.historical_comparison)
         
         # Salvar resultados
         await self.save_results(report)
@@ -144,11 +298,44 @@ class MasterPerformanceSuite:
         if self.config.send_alerts:
             await self.send_alerts(report)
         
+        if TRACER.enabled:
+            self.export_self_trace()
+        
         # Imprimir resumo final
         self.print_final_summary(report)
         
         return report
     
+    def start_metrics_export(self):
+        """Sobe o endpoint /metrics e/ou o textfile antes das etapas (scrape da run em andamento)"""
+        if self.config.metrics_port is None and not self.config.metrics_textfile:
+            return
+        try:
+            METRICS.enable(port=self.config.metrics_port, textfile=self.config.metrics_textfile)
+            if METRICS.server:
+                print(f"📡 Métricas OpenMetrics em http://localhost:{METRICS.server.port}/metrics")
+            if METRICS.textfile:
+                print(f"📡 Métricas gravadas em: {METRICS.textfile.path}")
+        except OSError as e:
+            print(f"⚠️ Erro ao iniciar o export de métricas: {e}")
+            METRICS.disable()
+    
+    def start_network_proxy(self):
+        """Sobe o proxy de record/replay; os browsers das etapas (e workers) o usam pelo ambiente"""
+        if not self.config.network_mode:
+            return None
+        from replay_proxy import ReplayProxy
+        
+        proxy = ReplayProxy(
+            self.config.network_archive,
+            mode=self.config.network_mode,
+            latency_ms=self.config.network_latency_ms,
+            download_kbps=self.config.network_download_kbps
+        )
+        proxy_url = proxy.start()
+        print(f"📼 Proxy de rede ({self.config.network_mode}) em {proxy_url}: {self.config.network_archive}")
+        return proxy
+    
     async def check_server(self) -> bool:
         """Verifica se o servidor está rodando"""
         try:
@@ -170,14 +357,225 @@ class MasterPerformanceSuite:
         }
         return test_map.get(test_name, False)
     
+    def resume_finished_stage(self, test_name: str) -> bool:
+        """Na retomada, reaproveita a etapa que terminou com sucesso antes da interrupção"""
+        result = self.resumed_results.get(test_name)
+        if not result or result.get("status") != "success":
+            if result:
+                print(f"🔁 {test_name} será repetido (status anterior: {result.get('status')})")
+            return False
+        
+        test_result = TestResult(**result)
+        test_result.resumed = True
+        self.test_results.append(test_result)
+        print(f"💾 {test_name} recuperado do checkpoint ({test_result.duration_seconds:.1f}s)")
+        return True
+    
+    def checkpoint_result(self, test_result: TestResult):
+        try:
+            self.checkpoints.save_stage(asdict(test_result))
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar checkpoint de {test_result.test_name}: {e}")
+    
+    def is_cacheable(self, test_name: str) -> bool:
+        spec = STAGE_CACHE_INPUTS.get(test_name)
+        if not spec or not self.config.reuse_cached_results:
+            return False
+        return not spec["measurement"] or self.config.reuse_measurements
+    
+    def stage_fingerprint(self, test_name: str) -> Optional[Dict]:
+        """Fingerprint das entradas da etapa (None = não cacheável)"""
+        if not self.is_cacheable(test_name):
+            return None
+        
+        spec = STAGE_CACHE_INPUTS[test_name]
+        stage_config = {
+            key: value for key, value in asdict(self.config).items()
+            if key == "base_url" or key.startswith(spec["config_prefixes"])
+        }
+        code_dir = Path(__file__).parent
+        
+        try:
+            return self.fingerprinter.fingerprint(stage_config, [str(code_dir / name) for name in spec["code"]],
+                                                  spec.get("project", []))
+        except Exception as e:
+            print(f"⚠️ Erro ao calcular fingerprint de {test_name}: {e}")
+            return None
+    
+    def reuse_cached_result(self, test_name: str) -> bool:
+        """Reaproveita o resultado anterior da etapa se as entradas forem idênticas"""
+        fingerprint = self.stage_fingerprint(test_name)
+        if not fingerprint or not fingerprint["complete"]:
+            return False
+        
+        entry = self.result_cache.load(test_name, fingerprint["fingerprint"])
+        if not entry:
+            return False
+        
+        now = datetime.now().isoformat()
+        self.test_results.append(TestResult(
+            test_name=test_name,
+            status="success",
+            start_time=now,
+            end_time=now,
+            duration_seconds=0,
+            data=entry["data"],
+            cached=True,
+            fingerprint=fingerprint["fingerprint"]
+        ))
+        self.checkpoint_result(self.test_results[-1])
+        print(f"♻️ {test_name} reutilizado (entradas idênticas às da sessão {entry['session_id']})")
+        return True
+    
+    def store_cached_result(self, test_result: TestResult):
+        """Guarda o resultado de uma etapa cacheável (fingerprint calculado após a execução)"""
+        fingerprint = self.stage_fingerprint(test_result.test_name)
+        if not fingerprint or not fingerprint["complete"]:
+            return
+        
+        try:
+            self.result_cache.store(test_result.test_name, fingerprint, test_result.data,
+                                    self.session_id, test_result.duration_seconds)
+            test_result.fingerprint = fingerprint["fingerprint"]
+        except Exception as e:
+            print(f"⚠️ Erro ao guardar {test_result.test_name} no cache: {e}")
+    
+    def build_task_spec(self, test_name: str, test_func) -> TaskSpec:
+        """Recursos de cada teste: quem mede tempo pede máquina quieta; o stress gera carga"""
+        estimate = self.estimate_test_seconds(test_name)
+        
+        if test_name == "Bundle Analysis":
+            # I/O e CPU; a cobertura abre um Chrome, mas não mede tempos
+            return TaskSpec(test_name, test_func, cores=1, browsers=1 if self.config.bundle_coverage else 0,
+                            estimate_seconds=estimate)
+        if test_name == "Memory Profiling":
+            # A matriz de cenários tem pool próprio com CPUs fixas: ocupa a máquina inteira
+            return TaskSpec(test_name, test_func, cores=2, browsers=1, quiet=True,
+                            exclusive=self.config.memory_scenario_matrix, estimate_seconds=estimate)
+        if test_name == "Performance Suite":
+            return TaskSpec(test_name, test_func, cores=2, browsers=1, quiet=True,
+                            exclusive=self.config.performance_crawl_routes, estimate_seconds=estimate)
+        if test_name == "Stress Testing":
+            return TaskSpec(test_name, test_func, cores=2, load=True, estimate_seconds=estimate)
+        return TaskSpec(test_name, test_func, estimate_seconds=estimate)
+    
+    def estimate_test_seconds(self, test_name: str) -> float:
+        """Duração esperada (última execução bem-sucedida ou a partir da configuração)"""
+        previous = self.load_previous_durations()
+        if test_name in previous:
+            return previous[test_name]
+        
+        if test_name == "Bundle Analysis":
+            return 90 if self.config.bundle_coverage else 15
+        if test_name == "Memory Profiling":
+            if self.config.memory_soak_hours > 0 and not self.config.memory_scenario_matrix:
+                return self.config.memory_soak_hours * 3600
+            return self.config.memory_duration_minutes * 60 + 60
+        if test_name == "Performance Suite":
+            return len(self.config.performance_device_profiles) * len(self.config.performance_cache_modes) * 60
+        if test_name == "Stress Testing":
+            return (1 + self.config.stress_duration_minutes) * 60  # ramp-up de 1 minuto
+        return 60
+    
+    def load_previous_durations(self) -> Dict[str, float]:
+        """Durações dos testes no relatório consolidado mais recente"""
+        try:
+            history_files = sorted(self.output_dir.glob("consolidated_report_*.json"))
+            if not history_files:
+                return {}
+            
+            with open(history_files[-1], 'r', encoding='utf-8') as f:
+                previous_data = json.load(f)
+            
+            return {
+                result["test_name"]: result["duration_seconds"]
+                for result in previous_data.get("test_results", [])
+                if result.get("status") == "success" and not result.get("cached")
+            }
+        
+        except Exception:
+            return {}
+    
+    def get_test_timeout(self, test_name: str) -> float:
+        """Timeout de cada teste (o soak de memória dura horas)"""
+        if (test_name == "Memory Profiling" and self.config.memory_soak_hours > 0
+                and not self.config.memory_scenario_matrix):
+            return self.config.memory_soak_hours * 3600 + 600
+        if test_name == "Performance Suite":
+            # Cada perfil × modo de cache roda num Chrome novo (perfis lentos levam mais)
+            combinations = len(self.config.performance_device_profiles) * len(self.config.performance_cache_modes)
+            if self.config.performance_crawl_routes:
+                combinations += len(self.config.performance_crawl_viewports) * 8  # ~8 rotas/seções
+            return max(600, combinations * 300)
+        return 600  # 10 minutos
+    
     async def execute_test(self, test_name: str, test_func):
-        """Executa um teste individual com tratamento de erro"""
+        """Executa um teste com as novas tentativas da etapa e grava o checkpoint do resultado"""
+        retries = self.config.stage_retries.get(test_name, 0)
+        previous = self.resumed_results.get(test_name, {}).get("attempts", 0)
+        
+        for attempt in range(1, retries + 2):
+            test_result, error = await self.execute_attempt(test_name, test_func)
+            if (test_result.status == "success" or isinstance(error, asyncio.CancelledError)
+                    or attempt > retries):
+                break
+            print(f"🔁 Nova tentativa de {test_name} ({attempt + 1}/{retries + 1})")
+        
+        test_result.attempts = previous + attempt
+        self.test_results.append(test_result)
+        self.checkpoint_result(test_result)
+        if test_result.status == "success":
+            self.store_cached_result(test_result)
+        if METRICS.enabled:
+            METRICS.publish_stage(test_name, test_result.status, test_result.duration_seconds)
+        
+        if error:
+            raise error  # cancelamento ou erro crítico de WebDriver interrompem a suíte
+    
+    async def run_stage_thread(self, coro, timeout: float):
+        """Roda a etapa no seu event loop numa thread: as chamadas síncronas do Selenium de um
+        teste não bloqueiam os outros. No timeout (ou cancelamento) a etapa é cancelada no próprio
+        loop e a thread é aguardada, então CPUs e browsers reservados só voltam ao agendador
+        quando o Chrome da etapa já foi fechado"""
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(coro)
+        
+        def run():
+            try:
+                return loop.run_until_complete(task)
+            finally:
+                # Como o asyncio.run: cancela o que a etapa deixou pendente e fecha o loop
+                leftovers = asyncio.all_tasks(loop)
+                for leftover in leftovers:
+                    leftover.cancel()
+                loop.run_until_complete(asyncio.gather(*leftovers, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+        
+        worker = asyncio.ensure_future(asyncio.to_thread(run))
+        try:
+            return await asyncio.wait_for(asyncio.shield(worker), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            try:
+                loop.call_soon_threadsafe(task.cancel)  # efetivo na próxima espera da etapa
+            except RuntimeError:
+                pass  # a etapa terminou junto com o timeout
+            await asyncio.gather(worker, return_exceptions=True)
+            raise
+    
+    async def execute_attempt(self, test_name: str, test_func):
+        """Executa uma tentativa com tratamento de erro: (resultado, exceção que interrompe a suíte)"""
         print(f"\n🔍 Iniciando: {test_name}")
         start_time = datetime.now()
         
         try:
             # Executar teste com timeout
-            result_data = await asyncio.wait_for(test_func(), timeout=600)  # 10 minutos timeout
+            timeout = self.get_test_timeout(test_name)
+            with span("stage", test_name):
+                if self.config.parallel_scheduling:
+                    result_data = await self.run_stage_thread(test_func(), timeout)
+                else:
+                    result_data = await asyncio.wait_for(test_func(), timeout=timeout)
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
@@ -190,8 +588,8 @@ class MasterPerformanceSuite:
                 data=result_data
             )
             
-            self.test_results.append(test_result)
             print(f"✅ {test_name} concluído em {duration:.1f}s")
+            return test_result, None
             
         except asyncio.TimeoutError:
             end_time = datetime.now()
@@ -206,10 +604,10 @@ class MasterPerformanceSuite:
                 error_message=f"Timeout após {duration:.1f}s"
             )
             
-            self.test_results.append(test_result)
             print(f"⏰ {test_name} timeout após {duration:.1f}s")
+            return test_result, None
             
-        except asyncio.CancelledError:
+        except asyncio.CancelledError as e:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
@@ -222,9 +620,8 @@ class MasterPerformanceSuite:
                 error_message="Teste cancelado pelo usuário"
             )
             
-            self.test_results.append(test_result)
             print(f"⏹️ {test_name} cancelado após {duration:.1f}s")
-            raise  # Re-raise para interromper a suíte
+            return test_result, e  # Re-raise para interromper a suíte
             
         except Exception as e:
             end_time = datetime.now()
@@ -239,13 +636,14 @@ class MasterPerformanceSuite:
                 error_message=str(e)
             )
             
-            self.test_results.append(test_result)
             print(f"❌ {test_name} falhou: {e}")
             
-            # Se for um erro crítico, interromper a suíte
-            if "selenium" in str(e).lower() or "webdriver" in str(e).lower():
-                print("🚨 Erro crítico de WebDriver detectado. Interrompendo suíte.")
-                raise
+            # Se for um erro crítico, interromper a suíte (depois das novas tentativas);
+            # dependência não instalada (import da etapa) só falha a própria etapa
+            if not isinstance(e, ImportError) and ("selenium" in str(e).lower() or "webdriver" in str(e).lower()):
+                print("🚨 Erro crítico de WebDriver detectado.")
+                return test_result, e
+            return test_result, None
     
     def add_skipped_test(self, test_name: str):
         """Adiciona um teste como pulado"""
@@ -261,42 +659,137 @@ class MasterPerformanceSuite:
     
     async def run_bundle_analysis(self) -> Dict:
         """Executa análise do bundle"""
-        analyzer = BundleAnalyzer()
+        from bundle_analyzer import BundleAnalyzer
+        
+        analyzer = BundleAnalyzer(coverage_url=self.config.base_url if self.config.bundle_coverage else None)
         analysis = analyzer.analyze()
         
-        return {
+        result = {
             "total_size": analysis.total_size,
             "gzipped_size": analysis.total_gzipped_size,
             "chunks_count": analysis.chunks_count,
             "optimization_suggestions": analysis.optimization_suggestions,
             "performance_impact": analysis.performance_impact
         }
+        
+        if analysis.coverage:
+            result["coverage"] = analysis.coverage
+            result["unused_bytes"] = analysis.coverage["unused_bytes"]
+        
+        return result
     
     async def run_memory_profiling(self) -> Dict:
         """Executa profiling de memória"""
+        if self.config.memory_scenario_matrix:
+            if self.config.memory_soak_hours > 0:
+                print("⚠️ Soak de memória ignorado: a matriz de cenários usa memory_duration_minutes")
+            return await self.run_memory_scenario_matrix()
+        
+        from memory_profiler import MemoryProfiler
+        
         profiler = MemoryProfiler(self.config.base_url)
-        analysis = await profiler.run_memory_profiling(self.config.memory_duration_minutes)
+        profiler.allocation_sampling = self.config.memory_allocation_sampling
+        profiler.sampling_interval = self.config.memory_sampling_interval
+        profiler.allocation_phases = self.config.memory_sampling_phases or None
+        profiler.gc_tracing = self.config.memory_gc_tracing
         
-        return {
+        if self.config.memory_soak_hours > 0:
+            analysis = await profiler.run_soak_profiling(
+                self.config.memory_soak_hours, output_dir=str(self.output_dir)
+            )
+        else:
+            analysis = await profiler.run_memory_profiling(self.config.memory_duration_minutes)
+        
+        result = {
             "peak_memory": analysis.peak_memory,
             "average_memory": analysis.average_memory,
             "memory_growth_rate": analysis.memory_growth_rate,
             "detected_leaks": len(analysis.detected_leaks),
+            "gc_efficiency": analysis.gc_efficiency,
+            "gc_time_share": analysis.gc_metrics["gc_time_share"] if analysis.gc_metrics else 0,
             "recommendations": analysis.recommendations
         }
+        
+        if analysis.gc_metrics:
+            result["gc_metrics"] = analysis.gc_metrics
+        
+        if analysis.allocation_profile:
+            result["allocation_profile"] = analysis.allocation_profile
+            result["collapsed_stack_files"] = profiler.save_collapsed_stacks(str(self.output_dir))
+        
+        if analysis.soak_summary:
+            result["soak_summary"] = analysis.soak_summary
+        
+        return result
+    
+    async def run_memory_scenario_matrix(self) -> Dict:
+        """Executa a matriz de cenários de memória em paralelo"""
+        from memory_scenarios import ScenarioMatrixRunner, build_scenario_matrix
+        
+        runner = ScenarioMatrixRunner(
+            self.config.base_url,
+            output_dir=str(self.output_dir),
+            cores_per_scenario=self.config.memory_cores_per_scenario,
+            max_parallelism=self.config.memory_max_parallelism
+        )
+        scenarios = build_scenario_matrix(
+            self.config.memory_scenarios or None,
+            self.config.memory_viewports,
+            duration_minutes=self.config.memory_duration_minutes,
+            allocation_sampling=self.config.memory_allocation_sampling,
+            sampling_interval=self.config.memory_sampling_interval,
+            sampling_phases=self.config.memory_sampling_phases,
+            gc_tracing=self.config.memory_gc_tracing
+        )
+        
+        report = await runner.run_matrix(scenarios)
+        runner.print_report(report)
+        
+        # Pior cenário para o gate de pressão de GC
+        successful = [r.analysis for r in report.results if r.status == "success" and r.analysis]
+        gc_shares = [a["gc_metrics"]["gc_time_share"] for a in successful if a.get("gc_metrics")]
+        
+        return {
+            "peak_memory": report.peak_memory,
+            "average_memory": report.average_memory,
+            "memory_growth_rate": report.memory_growth_rate,
+            "detected_leaks": report.detected_leaks,
+            "gc_efficiency": min((a["gc_efficiency"] for a in successful), default=0),
+            "gc_time_share": max(gc_shares, default=0),
+            "recommendations": report.recommendations,
+            "scenario_matrix": {
+                "report_file": runner.save_report(report),
+                "parallelism": report.parallelism,
+                "wall_seconds": report.wall_seconds,
+                "serial_seconds": report.serial_seconds,
+                "speedup": report.speedup,
+                "scenarios": {
+                    r.scenario.name: (r.analysis if r.status == "success" else {"error": r.error_message})
+                    for r in report.results
+                }
+            }
+        }
     
     async def run_performance_suite(self) -> Dict:
         """Executa suíte real de performance"""
         print("⚡ Executando Real Performance Suite...")
+        from real_performance_suite import RealPerformanceSuite
         
         real_suite = RealPerformanceSuite(self.config.base_url)
+        real_suite.cache_modes = self.config.performance_cache_modes
+        real_suite.device_profiles = self.config.performance_device_profiles
         analysis = await real_suite.run_performance_analysis()
         
+        routes = await self.run_route_crawl() if self.config.performance_crawl_routes else None
+        
         return {
+            "routes": routes,
             "fcp_avg": analysis.core_web_vitals.fcp,
             "lcp_avg": analysis.core_web_vitals.lcp,
             "cls_avg": analysis.core_web_vitals.cls,
             "fid_avg": analysis.core_web_vitals.fid,
+            "inp": analysis.core_web_vitals.inp,
+            "speed_index": analysis.core_web_vitals.si,
             "ttfb_avg": analysis.core_web_vitals.ttfb,
             "performance_score": analysis.performance_score,
             "accessibility_score": analysis.accessibility_score,
@@ -309,16 +802,84 @@ class MasterPerformanceSuite:
             "heap_used_mb": analysis.javascript_metrics.heap_used / 1024 / 1024,
             "dom_nodes": analysis.javascript_metrics.dom_nodes,
             "long_tasks": analysis.javascript_metrics.long_tasks_count,
+            "js_compile_ms": analysis.javascript_metrics.compile_time,
+            "js_execution_ms": analysis.javascript_metrics.execution_time,
+            "main_thread_groups": (analysis.main_thread or {}).get("groups", {}),
+            "lcp_blocking_chunk": (analysis.main_thread or {}).get("lcp_blocking_chunk"),
+            "lcp_bottleneck": ((analysis.request_chain or {}).get("lcp_bottleneck") or {}).get("name"),
+            "render_blocking": [node["name"] for node in (analysis.request_chain or {}).get("render_blocking", [])],
+            "priority_mismatches": [
+                f"{mismatch['kind']}: {mismatch['request']['name']}"
+                for mismatch in (analysis.request_chain or {}).get("priority_mismatches", [])
+            ],
+            "har_file": (analysis.request_chain or {}).get("har_file"),
             "avg_response_time": analysis.network_metrics.avg_response_time,
             "failed_requests": analysis.network_metrics.failed_requests,
             "critical_issues": len(analysis.critical_issues),
             "warnings": len(analysis.warnings),
-            "network_tests_completed": True
+            "network_tests_completed": True,
+            "measurement_stats": analysis.measurement_stats,
+            "slow_interactions": (analysis.interactions or {}).get("slow_interactions", []),
+            "cache_modes": {
+                mode: {
+                    "runs": result["runs"],
+                    "fcp": result["core_web_vitals"]["fcp"],
+                    "lcp": result["core_web_vitals"]["lcp"],
+                    "transfer_kb": result["transfer_bytes"] / 1024,
+                    "cache_hit_ratio": result["cache_hit_ratio"]
+                }
+                for mode, result in (analysis.cache_modes or {}).items()
+            },
+            "device_profiles": {
+                name: {
+                    "performance_score": result["performance_score"],
+                    "cpu_slowdown": result["profile"]["cpu_slowdown"],
+                    "critical_issues": len(result["critical_issues"]),
+                    "warnings": len(result["warnings"])
+                }
+                for name, result in (analysis.device_profiles or {}).items()
+            }
+        }
+    
+    async def run_route_crawl(self) -> Dict:
+        """Mede todas as rotas × viewports em browsers isolados e paralelos"""
+        from route_crawler import RouteCrawler, build_route_jobs, discover_routes
+        
+        crawler = RouteCrawler(
+            self.config.base_url,
+            output_dir=str(self.output_dir),
+            max_parallelism=self.config.performance_crawl_parallelism
+        )
+        routes = discover_routes(self.config.base_url)
+        report = await crawler.crawl(build_route_jobs(routes, self.config.performance_crawl_viewports))
+        crawler.print_report(report)
+        
+        # Cada rota × viewport mediu num processo próprio: publica pelo resultado consolidado
+        if METRICS.enabled:
+            for route, viewports in report.routes.items():
+                for viewport, summary in viewports.items():
+                    METRICS.publish_route_summary(route, viewport, summary)
+        
+        return {
+            "report_file": crawler.save_report(report),
+            "parallelism": report.parallelism,
+            "wall_seconds": report.wall_seconds,
+            "failures": report.failures,
+            "by_route": {
+                route: {
+                    viewport: {key: summary[key] for key in ("performance_score", "fcp", "lcp", "cls", "tbt")}
+                    if "error" not in summary else summary
+                    for viewport, summary in viewports.items()
+                }
+                for route, viewports in report.routes.items()
+            }
         }
     
     async def run_stress_testing(self) -> Dict:
         """Executa testes de stress"""
-        tester = StressTester(self.config.base_url)
+        from stress_tester import StressTester
+        
+        tester = StressTester(self.config.base_url, engine=self.config.stress_engine)
         
         stress_config = {
             'max_users': self.config.stress_max_users,
@@ -335,7 +896,8 @@ class MasterPerformanceSuite:
             "throughput": result.throughput,
             "error_rate": result.error_rate,
             "avg_response_time": sum(result.response_times) / len(result.response_times) if result.response_times else 0,
-            "failure_points": len(result.failure_points)
+            "failure_points": len(result.failure_points),
+            "engine": result.browser_engine
         }
     
     async def generate_consolidated_report(self) -> ConsolidatedReport:
@@ -370,7 +932,10 @@ class MasterPerformanceSuite:
             warnings=warnings,
             recommendations=recommendations,
             historical_comparison=historical_comparison,
-            overall_status=overall_status
+            overall_status=overall_status,
+            schedule=asdict(self.schedule) if self.schedule else None,
+            cached_stages=[result.test_name for result in self.test_results if result.cached],
+            resumed_stages=[result.test_name for result in self.test_results if result.resumed]
         )
         
         return report
@@ -418,6 +983,12 @@ class MasterPerformanceSuite:
                 elif result.test_name == "Memory Profiling":
                     if result.data["detected_leaks"] > 0:
                         issues.append(f"🧠 {result.data['detected_leaks']} vazamentos de memória detectados")
+                    if result.data.get("gc_time_share", 0) > 0.25:  # > 25% da main thread
+                        issues.append(f"♻️ Pressão de GC crítica ({result.data['gc_time_share'] * 100:.1f}% da main thread)")
+                
+                elif result.test_name == "Performance Suite":
+                    if result.data.get("inp", 0) > 500:
+                        issues.append(f"👆 INP muito alto ({result.data['inp']:.0f}ms)")
                 
                 elif result.test_name == "Stress Testing":
                     if result.data["error_rate"] > 10:
@@ -434,14 +1005,26 @@ class MasterPerformanceSuite:
                 if result.test_name == "Bundle Analysis":
                     if result.data["total_size"] > 500 * 1024:  # > 500KB
                         warnings.append("📦 Bundle grande (>500KB) - considere otimizações")
+                    if result.data.get("unused_bytes", 0) > 200 * 1024:  # > 200KB não executados
+                        warnings.append(f"🧹 {result.data['unused_bytes'] / 1024:.0f}KB de JS/CSS não utilizados na landing page")
                 
                 elif result.test_name == "Memory Profiling":
                     if result.data["memory_growth_rate"] > 1024 * 1024:  # > 1MB/min
                         warnings.append("🧠 Taxa de crescimento de memória alta")
+                    if 0.10 < result.data.get("gc_time_share", 0) <= 0.25:  # > 10% da main thread
+                        warnings.append(f"♻️ Pressão de GC alta ({result.data['gc_time_share'] * 100:.1f}% da main thread)")
                 
                 elif result.test_name == "Performance Suite":
                     if result.data["fcp_avg"] > 2000:
                         warnings.append("⚡ First Contentful Paint alto (>2s)")
+                    for route, viewports in ((result.data.get("routes") or {}).get("by_route") or {}).items():
+                        for viewport, summary in viewports.items():
+                            if summary.get("performance_score", 100) < 50:
+                                warnings.append(f"🕸️ Rota {route} ({viewport}) com score {summary['performance_score']}")
+                    if 200 < result.data.get("inp", 0) <= 500:
+                        warnings.append(f"👆 INP alto ({result.data['inp']:.0f}ms): {', '.join(result.data.get('slow_interactions', []))}")
+                    for mismatch in result.data.get("priority_mismatches", []):
+                        warnings.append(f"🔗 Prioridade incompatível no carregamento ({mismatch})")
                 
                 elif result.test_name == "Stress Testing":
                     if result.data["error_rate"] > 5:
@@ -481,27 +1064,44 @@ class MasterPerformanceSuite:
             return "warning"
     
     async def load_historical_comparison(self) -> Optional[Dict]:
-        """Carrega dados históricos para comparação"""
+        """Compara as distribuições desta run com a baseline recente de cada métrica"""
         try:
-            history_files = list(self.output_dir.glob("consolidated_report_*.json"))
-            if not history_files:
+            # Relatório parcial desta mesma sessão (antes de um --resume) não é histórico
+            history = [run for run in RunHistory(self.output_dir).runs() if run["session_id"] != self.session_id]
+            if not history:
                 return None
             
-            # Pegar o relatório mais recente
-            latest_file = sorted(history_files)[-1]
+            overall_score = self.calculate_overall_score()
+            current_samples = extract_run_samples({
+                "overall_performance_score": overall_score,
+                "test_results": [asdict(result) for result in self.test_results]
+            })
             
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                previous_data = json.load(f)
+            detector = RegressionDetector(
+                window=self.config.regression_window,
+                alpha=self.config.regression_alpha,
+                min_effect=self.config.regression_min_effect
+            )
+            verdicts = detector.evaluate(history, current_samples)
+            
+            previous = history[-1]
+            previous_score = (previous["samples"].get("overall_score") or [0])[0]
             
             return {
-                "previous_score": previous_data.get("overall_performance_score", 0),
-                "score_change": self.calculate_overall_score() - previous_data.get("overall_performance_score", 0),
-                "previous_timestamp": previous_data.get("timestamp", "")
+                "previous_score": previous_score,
+                "score_change": overall_score - previous_score,
+                "previous_timestamp": previous["timestamp"],
+                "history_runs": len(history),
+                "regressed": [m for m, v in verdicts.items() if v["verdict"] == "regressed"],
+                "improved": [m for m, v in verdicts.items() if v["verdict"] == "improved"],
+                "metrics": verdicts
             }
         
-        except Exception:
+        except Exception as e:
+            print(f"⚠️ Erro na comparação histórica: {e}")
             return None
     
+    @traced("report_write")
     async def save_results(self, report: ConsolidatedReport):
         """Salva todos os resultados"""
         print("\n💾 Salvando resultados...")
@@ -520,6 +1120,16 @@ class MasterPerformanceSuite:
         
         print(f"📁 Resultados salvos em: {self.output_dir}")
     
+    def export_self_trace(self) -> Optional[str]:
+        """Grava os spans da suíte em trace-event JSON (ui.perfetto.dev)"""
+        try:
+            trace_file = TRACER.export(str(self.output_dir / f"suite_trace_{self.session_id}.json"))
+            print(f"🔬 Trace da suíte salvo em: {trace_file}")
+            return trace_file
+        except Exception as e:
+            print(f"⚠️ Erro ao exportar trace da suíte: {e}")
+            return None
+    
     async def generate_dashboard(self, report: ConsolidatedReport):
         """Gera dashboard HTML"""
         print("🎨 Gerando dashboard...")
@@ -545,6 +1155,10 @@ class MasterPerformanceSuite:
                 print("❌ Issues críticos:")
                 for issue in report.critical_issues:
                     print(f"   {issue}")
+        
+        regressed = (report.historical_comparison or {}).get("regressed", [])
+        if regressed:
+            print(f"🚨 ALERTA: regressão estatisticamente significativa em {', '.join(regressed)}")
     
     def print_final_summary(self, report: ConsolidatedReport):
         """Imprime resumo final"""
@@ -566,6 +1180,19 @@ class MasterPerformanceSuite:
         print(f"   ✅ Sucessos: {len(successful_tests)}")
         print(f"   ❌ Falhas: {len(failed_tests)}")
         print(f"   ⏭️ Pulados: {len(skipped_tests)}")
+        if report.cached_stages:
+            print(f"   ♻️ Reutilizados (entradas idênticas): {', '.join(report.cached_stages)}")
+        if report.resumed_stages:
+            print(f"   💾 Recuperados do checkpoint: {', '.join(report.resumed_stages)}")
+        retried = [f"{r.test_name} ({r.attempts}x)" for r in report.test_results if r.attempts > 1]
+        if retried:
+            print(f"   🔁 Com novas tentativas: {', '.join(retried)}")
+        
+        if self.schedule:
+            print_schedule(self.schedule)
+        
+        if TRACER.enabled:
+            print_span_totals(TRACER.totals(), (datetime.now() - self.start_time).total_seconds())
         
         # Issues críticos
         if report.critical_issues:
@@ -585,6 +1212,14 @@ class MasterPerformanceSuite:
             print(f"\n📈 COMPARAÇÃO HISTÓRICA:")
             print(f"   Score anterior: {report.historical_comparison['previous_score']:.1f}")
             print(f"   Mudança: {change:+.1f} pontos")
+            
+            verdicts = report.historical_comparison.get("metrics", {})
+            for metric in report.historical_comparison.get("regressed", []):
+                print(f"   🔴 {format_verdict(verdicts[metric])}")
+            for metric in report.historical_comparison.get("improved", []):
+                print(f"   🟢 {format_verdict(verdicts[metric])}")
+            print(f"   (baseline de até {self.config.regression_window} de "
+                  f"{report.historical_comparison.get('history_runs', 0)} runs; demais métricas inconclusivas)")
         
         # Top recomendações
         print(f"\n💡 TOP RECOMENDAÇÕES:")
@@ -621,46 +1256,196 @@ def create_default_config() -> TestConfiguration:
         send_alerts=True
     )
 
-def parse_arguments():
+def parse_arguments(argv: Optional[List[str]] = None):
     """Parse argumentos da linha de comando"""
     parser = argparse.ArgumentParser(description="Master Performance Suite - Projeto M")
     
     parser.add_argument("--url", default="http://localhost:8080", help="URL base para testes")
     parser.add_argument("--output", default="performance_reports", help="Diretório de output")
     parser.add_argument("--memory-duration", type=int, default=2, help="Duração do memory profiling (minutos)")
+    parser.add_argument("--memory-soak-hours", type=float, default=0,
+                        help="Modo soak: duração do memory profiling em horas (ex: 8, 24)")
+    parser.add_argument("--memory-matrix", action="store_true",
+                        help="Executa o memory profiling como matriz cenário × viewport em paralelo")
+    parser.add_argument("--memory-scenarios", nargs="*", default=[],
+                        help="Interações da matriz (padrão: todas)")
+    parser.add_argument("--memory-viewports", nargs="*", default=["desktop", "mobile"],
+                        help="Viewports da matriz: desktop laptop tablet mobile")
+    parser.add_argument("--memory-cores-per-scenario", type=int, default=2,
+                        help="CPUs reservadas (pinning) para cada cenário")
+    parser.add_argument("--memory-parallelism", type=int, default=0,
+                        help="Máximo de cenários simultâneos (0 = automático)")
+    parser.add_argument("--memory-allocation-sampling", action="store_true",
+                        help="Amostrar alocações (HeapProfiler) durante as interações do memory profiling")
+    parser.add_argument("--memory-sampling-interval", type=int, default=32768,
+                        help="Intervalo médio de amostragem de alocações (bytes)")
+    parser.add_argument("--memory-sampling-phases", nargs="*", default=[],
+                        help="Fases amostradas: scroll click_features hover_elements navigate resize (padrão: todas)")
+    parser.add_argument("--memory-no-gc-trace", action="store_true",
+                        help="Desliga o tracing de GC do V8 no memory profiling")
+    parser.add_argument("--cache-modes", nargs="+", choices=PERFORMANCE_CACHE_MODES,
+                        default=list(PERFORMANCE_CACHE_MODES),
+                        help="Modos de cache da Performance Suite (ao menos um)")
+    parser.add_argument("--device-profiles", nargs="+", choices=PERFORMANCE_DEVICE_PROFILES,
+                        default=["desktop", "mid_tier_mobile"],
+                        help="Perfis de dispositivo da Performance Suite (ao menos um)")
+    parser.add_argument("--crawl-routes", action="store_true",
+                        help="Mede todas as rotas (router + links/#seções) × viewports em paralelo")
+    parser.add_argument("--crawl-viewports", nargs="+", choices=PERFORMANCE_DEVICE_PROFILES,
+                        default=["desktop", "mid_tier_mobile"],
+                        help="Perfis de dispositivo do crawl de rotas (ao menos um)")
+    parser.add_argument("--crawl-parallelism", type=int, default=0,
+                        help="Máximo de browsers simultâneos no crawl (0 = automático)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Não reutiliza resultados de execuções anteriores com as mesmas entradas")
+    parser.add_argument("--reuse-measurements", action="store_true",
+                        help="Reutiliza também memória, performance e stress quando build/config não mudaram")
+    parser.add_argument("--regression-window", type=int, default=10,
+                        help="Runs anteriores na baseline da detecção de regressões")
+    parser.add_argument("--resume", metavar="SESSION_ID",
+                        help="Retoma uma sessão interrompida (ou 'latest'): pula etapas concluídas")
+    parser.add_argument("--retries", nargs="+", default=[], metavar="ETAPA=N",
+                        help="Novas tentativas por etapa (bundle, memory, performance, stress), ex.: memory=2")
+    parser.add_argument("--self-trace", action="store_true",
+                        help="Grava spans da própria suíte em Chrome trace (suite_trace_<sessão>.json)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORTA",
+                        help="Expõe métricas OpenMetrics/Prometheus em http://<host>:PORTA/metrics durante a run")
+    parser.add_argument("--metrics-textfile", metavar="ARQUIVO",
+                        help="Grava as métricas num arquivo .prom (textfile collector do node_exporter)")
+    parser.add_argument("--network-record", metavar="DIR",
+                        help="Grava todas as respostas de rede das etapas em DIR (proxy local)")
+    parser.add_argument("--network-replay", metavar="DIR",
+                        help="Reproduz as respostas gravadas em DIR, sem backend nem jitter do servidor")
+    parser.add_argument("--replay-latency-ms", type=float, default=None,
+                        help="Latência fixa por resposta no replay (padrão: a gravada)")
+    parser.add_argument("--replay-kbps", type=float, default=0, help="Banda no replay (0 = sem limite)")
+    parser.add_argument("--ab", nargs=2, metavar=("BASELINE_DIST", "CANDIDATE_DIST"),
+                        help="Modo A/B: compara dois builds com runs intercaladas (em vez da suíte completa)")
+    parser.add_argument("--ab-pairs", type=int, default=10, help="Pares AB por motor no modo A/B")
+    parser.add_argument("--serial", action="store_true",
+                        help="Executa os testes um após o outro (sem agendamento paralelo)")
+    parser.add_argument("--max-concurrency", type=int, default=0,
+                        help="Máximo de testes simultâneos no agendamento (0 = limitado por CPUs/browsers)")
     parser.add_argument("--stress-users", type=int, default=15, help="Número máximo de usuários no stress test")
     parser.add_argument("--stress-duration", type=int, default=2, help="Duração do stress test (minutos)")
+    parser.add_argument("--stress-engine", choices=["selenium", "cdp"], default="selenium",
+                        help="Browser dos usuários virtuais: Selenium (padrão) ou CDP assíncrono")
     
     # Flags para habilitar/desabilitar testes
     parser.add_argument("--no-bundle", action="store_true", help="Pular bundle analysis")
+    parser.add_argument("--no-coverage", action="store_true", help="Não coletar cobertura JS/CSS na bundle analysis")
     parser.add_argument("--no-memory", action="store_true", help="Pular memory profiling")
     parser.add_argument("--no-stress", action="store_true", help="Pular stress testing")
     parser.add_argument("--no-dashboard", action="store_true", help="Não gerar dashboard")
     parser.add_argument("--no-alerts", action="store_true", help="Não enviar alertas")
     
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.memory_soak_hours > 0 and args.memory_matrix:
+        parser.error("--memory-soak-hours não combina com --memory-matrix (a matriz usa --memory-duration)")
+    return args
+
+STAGE_ALIASES = {
+    "bundle": "Bundle Analysis",
+    "memory": "Memory Profiling",
+    "performance": "Performance Suite",
+    "stress": "Stress Testing"
+}
+
+def parse_stage_retries(items: List[str], defaults: Dict[str, int]) -> Dict[str, int]:
+    """Converte ['memory=2', 'stress=1'] em novas tentativas por etapa"""
+    retries = dict(defaults)
+    for item in items:
+        alias, _, count = item.partition("=")
+        if alias not in STAGE_ALIASES or not count.isdigit():
+            raise ValueError(f"--retries inválido: {item} (use {'/'.join(STAGE_ALIASES)}=N)")
+        retries[STAGE_ALIASES[alias]] = int(count)
+    return retries
 
 async def main():
     """Função principal"""
     args = parse_arguments()
     
+    # Modo A/B: os builds são servidos pela própria comparação (não usa o servidor de --url)
+    if args.ab:
+        from ab_comparison import run_ab_comparison
+        try:
+            return await run_ab_comparison(args.ab[0], args.ab[1], pairs=args.ab_pairs, output_dir=args.output)
+        except (ValueError, FileNotFoundError) as e:
+            print(f"❌ {e}")
+            return 1
+    
     # Criar configuração baseada nos argumentos
     config = TestConfiguration(
         run_bundle_analysis=not args.no_bundle,
+        bundle_coverage=not args.no_coverage,
         run_memory_profiling=not args.no_memory,
         run_stress_testing=not args.no_stress,
         run_performance_suite=True,  # Sempre habilitado agora
         memory_duration_minutes=args.memory_duration,
+        memory_soak_hours=args.memory_soak_hours,
+        memory_scenario_matrix=args.memory_matrix,
+        memory_scenarios=args.memory_scenarios,
+        memory_viewports=args.memory_viewports,
+        memory_cores_per_scenario=args.memory_cores_per_scenario,
+        memory_max_parallelism=args.memory_parallelism,
+        memory_allocation_sampling=args.memory_allocation_sampling,
+        memory_sampling_interval=args.memory_sampling_interval,
+        memory_sampling_phases=args.memory_sampling_phases,
+        memory_gc_tracing=not args.memory_no_gc_trace,
+        performance_cache_modes=args.cache_modes,
+        performance_device_profiles=args.device_profiles,
+        performance_crawl_routes=args.crawl_routes,
+        performance_crawl_viewports=args.crawl_viewports,
+        performance_crawl_parallelism=args.crawl_parallelism,
         stress_max_users=args.stress_users,
         stress_duration_minutes=args.stress_duration,
+        stress_engine=args.stress_engine,
+        parallel_scheduling=not args.serial,
+        reuse_cached_results=not args.no_cache,
+        reuse_measurements=args.reuse_measurements,
+        regression_window=args.regression_window,
+        self_trace=args.self_trace,
+        metrics_port=args.metrics_port,
+        metrics_textfile=args.metrics_textfile,
+        network_mode="record" if args.network_record else "replay" if args.network_replay else None,
+        network_archive=args.network_record or args.network_replay or "network_archive",
+        network_latency_ms=args.replay_latency_ms,
+        network_download_kbps=args.replay_kbps,
+        scheduler_max_concurrency=args.max_concurrency,
         base_url=args.url,
         output_dir=args.output,
         generate_dashboard=not args.no_dashboard,
         send_alerts=not args.no_alerts
     )
+    if args.network_record and args.network_replay:
+        print("❌ Use --network-record ou --network-replay, não os dois")
+        return 1
+    try:
+        config.stage_retries = parse_stage_retries(args.retries, config.stage_retries)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    # Retomada: mesma sessão e mesma configuração da execução interrompida
+    resume_session = None
+    if args.resume:
+        resume_session = latest_session(Path(args.output)) if args.resume == "latest" else args.resume
+        checkpoints = CheckpointStore(Path(args.output), resume_session) if resume_session else None
+        if not checkpoints or not checkpoints.exists():
+            print(f"❌ Nenhum checkpoint encontrado para a sessão: {args.resume}")
+            return 1
+        
+        saved = checkpoints.load_manifest()["configuration"]
+        saved = {key: value for key, value in saved.items() if key in TestConfiguration.__dataclass_fields__}
+        if args.retries:
+            saved["stage_retries"] = config.stage_retries
+        saved["metrics_port"] = config.metrics_port  # destino das métricas não afeta a medição
+        saved["metrics_textfile"] = config.metrics_textfile
+        config = TestConfiguration(**saved)
+        print(f"🔄 Configuração restaurada da sessão {resume_session}")
     
     # Executar suíte
-    suite = MasterPerformanceSuite(config)
+    suite = MasterPerformanceSuite(config, resume_session=resume_session)
     
     try:
         report = await suite.run_all_tests()
@@ -682,6 +1467,7 @@ async def main():
                 partial_report = await suite.generate_consolidated_report()
                 await suite.save_results(partial_report)
                 print(f"💾 Relatório parcial salvo em: {config.output_dir}")
+                print(f"🔄 Para retomar: python master_performance_suite.py --resume {suite.session_id}")
             except Exception as e:
                 print(f"⚠️ Erro ao salvar relatório parcial: {e}")
         
@@ -697,6 +1483,7 @@ async def main():
                 partial_report = await suite.generate_consolidated_report()
                 await suite.save_results(partial_report)
                 print(f"💾 Relatório parcial salvo em: {config.output_dir}")
+                print(f"🔄 Para retomar: python master_performance_suite.py --resume {suite.session_id}")
             except Exception as e:
                 print(f"⚠️ Erro ao salvar relatório parcial: {e}")
         
@@ -712,6 +1499,7 @@ async def main():
                 error_report = await suite.generate_consolidated_report()
                 await suite.save_results(error_report)
                 print(f"💾 Relatório de erro salvo em: {config.output_dir}")
+                print(f"🔄 Para retomar: python master_performance_suite.py --resume {suite.session_id}")
             except Exception as save_error:
                 print(f"⚠️ Erro ao salvar relatório de erro: {save_error}")
         
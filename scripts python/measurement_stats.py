@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+📐 Measurement Stats - Projeto M
+Motor de amostragem adaptativa com estatística robusta
+
+Funcionalidades:
+- Mediana, média aparada e intervalos de confiança por bootstrap
+- Detecção de outliers (MAD / z-score modificado)
+- Amostragem adaptativa: coleta até o IC 95% ficar abaixo do alvo ou esgotar o orçamento
+"""
+
+import random
+import statistics
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Semiamplitude alvo do IC 95% por métrica (unidades da métrica)
+DEFAULT_CI_TARGETS = {
+    'fcp': 50.0,    # ms
+    'lcp': 75.0,    # ms
+    'cls': 0.01,
+    'ttfb': 25.0,   # ms
+    'blocking_time': 25.0,  # ms
+}
+
+@dataclass
+class MetricSummary:
+    """Resumo estatístico de uma métrica"""
+    name: str
+    n: int
+    median: float
+    trimmed_mean: float
+    mean: float
+    ci_low: float
+    ci_high: float
+    half_width: float
+    target_half_width: Optional[float]
+    converged: bool
+    outliers: List[float] = field(default_factory=list)
+
+def trimmed_mean(values: Sequence[float], proportion: float = 0.1) -> float:
+    """Média descartando a fração `proportion` de cada extremo"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    cut = int(len(ordered) * proportion)
+    kept = ordered[cut:len(ordered) - cut] or ordered
+    return statistics.mean(kept)
+
+def detect_outliers(values: Sequence[float], threshold: float = 3.5) -> List[int]:
+    """Índices dos outliers pelo z-score modificado (mediana/MAD)"""
+    if len(values) < 3:
+        return []
+    center = statistics.median(values)
+    mad = statistics.median(abs(v - center) for v in values)
+    if mad == 0:
+        return []
+    return [i for i, v in enumerate(values) if 0.6745 * abs(v - center) / mad > threshold]
+
+def without_outliers(values: Sequence[float]) -> List[float]:
+    """Valores sem outliers (todos, se nada sobrar)"""
+    outlier_indices = set(detect_outliers(values))
+    return [v for i, v in enumerate(values) if i not in outlier_indices] or list(values)
+
+def robust_median(values: Sequence[float]) -> float:
+    """Mediana descartando outliers"""
+    return statistics.median(without_outliers(values)) if values else 0.0
+
+def bootstrap_ci(values: Sequence[float],
+                 estimator: Callable[[Sequence[float]], float] = statistics.median,
+                 confidence: float = 0.95, resamples: int = 2000,
+                 seed: Optional[int] = 0) -> Tuple[float, float]:
+    """Intervalo de confiança percentil por bootstrap"""
+    if not values:
+        return 0.0, 0.0
+    if len(values) == 1:
+        return values[0], values[0]
+
+    rng = random.Random(seed)
+    n = len(values)
+    estimates = sorted(estimator(rng.choices(values, k=n)) for _ in range(resamples))
+
+    alpha = (1 - confidence) / 2
+    low = estimates[int(alpha * (resamples - 1))]
+    high = estimates[int((1 - alpha) * (resamples - 1))]
+    return low, high
+
+def summarize(name: str, values: Sequence[float], target_half_width: Optional[float] = None,
+              min_samples: int = 3) -> MetricSummary:
+    """Resumo robusto (outliers excluídos das estimativas)"""
+    values = list(values)
+    outlier_indices = set(detect_outliers(values))
+    kept = without_outliers(values)
+
+    ci_low, ci_high = bootstrap_ci(kept)
+    half_width = (ci_high - ci_low) / 2
+    converged = (len(values) >= min_samples and
+                 (target_half_width is None or half_width <= target_half_width))
+
+    return MetricSummary(
+        name=name,
+        n=len(values),
+        median=statistics.median(kept) if kept else 0.0,
+        trimmed_mean=trimmed_mean(kept),
+        mean=statistics.mean(values) if values else 0.0,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        half_width=half_width,
+        target_half_width=target_half_width,
+        converged=converged,
+        outliers=[values[i] for i in sorted(outlier_indices)]
+    )
+
+class AdaptiveSampler:
+    """Decide quando parar de amostrar com base na largura do IC de cada métrica"""
+
+    def __init__(self, targets: Optional[Dict[str, float]] = None,
+                 min_runs: int = 3, max_runs: int = 12):
+        self.targets = dict(DEFAULT_CI_TARGETS if targets is None else targets)
+        self.min_runs = min_runs
+        self.max_runs = max_runs
+        self.samples: Dict[str, List[float]] = {name: [] for name in self.targets}
+        self.runs = 0
+
+    def add(self, sample: Dict[str, float]):
+        """Registra uma run (métricas ausentes são ignoradas)"""
+        self.runs += 1
+        for name in self.targets:
+            if name in sample and sample[name] is not None:
+                self.samples[name].append(float(sample[name]))
+
+    def summaries(self) -> Dict[str, MetricSummary]:
+        return {
+            name: summarize(name, values, self.targets[name], self.min_runs)
+            for name, values in self.samples.items()
+        }
+
+    def needs_more(self) -> bool:
+        """True enquanto alguma métrica não convergiu e ainda há orçamento"""
+        if self.runs < self.min_runs:
+            return True
+        if self.runs >= self.max_runs:
+            return False
+        return not all(summary.converged for summary in self.summaries().values())
+
+    def report(self) -> Dict:
+        """Resumo serializável para relatórios"""
+        summaries = self.summaries()
+        return {
+            'runs': self.runs,
+            'min_runs': self.min_runs,
+            'max_runs': self.max_runs,
+            'converged': all(s.converged for s in summaries.values()),
+            'metrics': {
+                name: {
+                    'n': s.n,
+                    'median': s.median,
+                    'trimmed_mean': s.trimmed_mean,
+                    'mean': s.mean,
+                    'ci95': [s.ci_low, s.ci_high],
+                    'half_width': s.half_width,
+                    'target_half_width': s.target_half_width,
+                    'converged': s.converged,
+                    'outliers': s.outliers,
+                    'samples': self.samples[name]  # distribuição da run (detecção de regressões)
+                }
+                for name, s in summaries.items()
+            }
+        }
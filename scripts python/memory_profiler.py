@@ -9,6 +9,9 @@ Funcionalidades:
 - Análise de DOM nodes
 - Tracking de event listeners
 - Profiling de componentes React
+- Amostragem de alocações (HeapProfiler) por fase de interação
+- Modo soak (8-24h) com armazenamento limitado e downsampling
+- Eficiência real do GC via tracing do V8 (pausas, bytes liberados, fração da main thread)
 - Relatórios detalhados de memória
 """
 
@@ -19,9 +22,17 @@ import statistics
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import subprocess
 
+from bundle_analyzer import load_manual_chunks, resolve_chunk_name
+from memory_soak import SoakRecorder
+from metrics_exporter import METRICS
+from replay_proxy import apply_replay_proxy
+from suite_tracer import instrument_driver, traced, traced_sleep
+from chrome_trace import (GC_TRACE_CATEGORIES, PHASE_MARKER_PREFIX, GCTraceAnalyzer,
+                          chrome_perf_logging_prefs, iter_trace_events)
+
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
@@ -30,9 +41,8 @@ try:
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from webdriver_manager.chrome import ChromeDriverManager
-except ImportError:
-    print("⚠️ Instale as dependências: pip install selenium webdriver-manager")
-    exit(1)
+except ImportError as e:
+    raise ImportError("⚠️ Instale as dependências: pip install selenium webdriver-manager") from e
 
 @dataclass
 class MemorySnapshot:
@@ -67,6 +77,19 @@ class MemoryLeak:
     description: str
     recommendations: List[str]
 
+@dataclass
+class AllocationProfile:
+    """Alocações amostradas (HeapProfiler.startSampling) agregadas de uma fase"""
+    phase: str
+    profiles_collected: int = 0
+    total_bytes: int = 0
+    sample_count: int = 0
+    
+    # Agregações: pilha colapsada / URL do script / chunk do bundle -> bytes
+    by_stack: Dict[str, int] = field(default_factory=dict)
+    by_script: Dict[str, int] = field(default_factory=dict)
+    by_chunk: Dict[str, int] = field(default_factory=dict)
+
 @dataclass
 class MemoryAnalysis:
     """Resultado completo da análise de memória"""
@@ -89,6 +112,15 @@ class MemoryAnalysis:
     
     # Recomendações
     recommendations: List[str]
+    
+    # Amostragem de alocações (opcional)
+    allocation_profile: Optional[Dict] = None
+    
+    # Resumo do modo soak (opcional)
+    soak_summary: Optional[Dict] = None
+    
+    # Métricas de GC do tracing do V8 (opcional)
+    gc_metrics: Optional[Dict] = None
 
 class MemoryProfiler:
     """Profiler avançado de memória"""
@@ -104,6 +136,27 @@ class MemoryProfiler:
         self.snapshot_interval = 2  # segundos
         self.leak_detection_threshold = 1024 * 1024  # 1MB
         self.monitoring_duration = 300  # 5 minutos
+        self.window_size = (1920, 1080)
+        self.interaction_names: Optional[List[str]] = None  # None = todas as interações
+        
+        # Amostragem de alocações (HeapProfiler)
+        self.allocation_sampling = False
+        self.sampling_interval = 32768  # bytes entre amostras
+        self.allocation_phases: Optional[List[str]] = None  # None = todas as fases
+        self.allocation_top_n = 20
+        self.allocation_profiles: Dict[str, AllocationProfile] = {}
+        self.manual_chunks = load_manual_chunks()
+        
+        # Modo soak: snapshots vão para o SoakRecorder e só uma janela fica em memória
+        self.soak_recorder: Optional[SoakRecorder] = None
+        self.soak_snapshot_window = 30
+        self.soak_checkpoint_interval = 300  # segundos
+        self.soak_leaks: Dict[str, MemoryLeak] = {}
+        
+        # Tracing de GC do V8 (substitui a eficiência estimada)
+        self.gc_tracing = True
+        self.gc_time_share_threshold = 0.10  # 10% da main thread em GC
+        self.gc_analyzer = GCTraceAnalyzer()
         
         # Componentes React para rastreamento
         self.react_components = [
@@ -111,6 +164,7 @@ class MemoryProfiler:
             'ProcessOptimizationSection', 'FloatingOrbs'
         ]
     
+    @traced("driver_setup")
     def setup_driver(self) -> webdriver.Chrome:
         """Configura Chrome com opções de profiling de memória"""
         options = Options()
@@ -118,7 +172,7 @@ class MemoryProfiler:
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
         
         # Habilitar profiling de memória
         options.add_argument("--enable-precise-memory-info")
@@ -144,14 +198,20 @@ class MemoryProfiler:
         
         # Logging para análise (reduzido)
         options.set_capability('goog:loggingPrefs', {
-            'performance': 'SEVERE',
+            'performance': 'ALL' if self.gc_tracing else 'SEVERE',
             'browser': 'SEVERE'
         })
         
+        # Trace events de GC chegam pelo performance log
+        if self.gc_tracing:
+            options.add_experimental_option('perfLoggingPrefs', chrome_perf_logging_prefs(GC_TRACE_CATEGORIES))
+        
+        apply_replay_proxy(options)
+        
         service = Service(ChromeDriverManager().install())
         service.creation_flags = 0x08000000  # CREATE_NO_WINDOW no Windows
         
-        return webdriver.Chrome(service=service, options=options)
+        return instrument_driver(webdriver.Chrome(service=service, options=options))
     
     def collect_memory_snapshot(self, user_action: str = "idle") -> Optional[MemorySnapshot]:
         """Coleta snapshot detalhado da memória"""
@@ -263,6 +323,26 @@ class MemoryProfiler:
             print(f"⚠️ Erro ao coletar snapshot: {e}")
             return None
     
+    def add_snapshot(self, snapshot: Optional[MemorySnapshot]):
+        """Registra um snapshot (no modo soak mantém apenas uma janela recente)"""
+        if not snapshot:
+            return
+        
+        self.snapshots.append(snapshot)
+        if METRICS.enabled:
+            METRICS.observe_heap(snapshot.heap_used, snapshot.user_action)
+        
+        if self.soak_recorder:
+            self.soak_recorder.record({
+                'heap_used': snapshot.heap_used,
+                'heap_total': snapshot.heap_total,
+                'dom_nodes': snapshot.dom_nodes,
+                'event_listeners': snapshot.event_listeners
+            }, snapshot.user_action)
+            
+            if len(self.snapshots) > self.soak_snapshot_window:
+                del self.snapshots[:-self.soak_snapshot_window]
+    
     def calculate_memory_pressure(self, used: int, limit: int) -> str:
         """Calcula o nível de pressão de memória"""
         if limit == 0:
@@ -443,6 +523,181 @@ class MemoryProfiler:
         # Análise simples baseada nos componentes conhecidos
         return ["FloatingOrbs", "Hero", "Features"]  # Placeholder
     
+    def should_sample_phase(self, phase: str) -> bool:
+        """Verifica se a fase de interação deve ter alocações amostradas"""
+        if not self.allocation_sampling:
+            return False
+        return self.allocation_phases is None or phase in self.allocation_phases
+    
+    def start_allocation_sampling(self) -> bool:
+        """Inicia a amostragem de alocações via HeapProfiler"""
+        if not self.driver:
+            return False
+        
+        try:
+            self.driver.execute_cdp_cmd('HeapProfiler.enable', {})
+            self.driver.execute_cdp_cmd('HeapProfiler.startSampling', {
+                'samplingInterval': self.sampling_interval
+            })
+            return True
+        except Exception as e:
+            print(f"⚠️ Erro ao iniciar amostragem de alocações: {e}")
+            return False
+    
+    def stop_allocation_sampling(self, phase: str):
+        """Encerra a amostragem e agrega o perfil coletado na fase"""
+        try:
+            result = self.driver.execute_cdp_cmd('HeapProfiler.stopSampling', {})
+        except Exception as e:
+            print(f"⚠️ Erro ao coletar perfil de alocações ({phase}): {e}")
+            return
+        
+        profile = self.allocation_profiles.setdefault(phase, AllocationProfile(phase=phase))
+        self.aggregate_sampling_profile(result.get('profile', {}), profile)
+    
+    def format_call_frame(self, call_frame: Dict) -> str:
+        """Formata um frame da pilha para o arquivo colapsado"""
+        function_name = call_frame.get('functionName') or '(anonymous)'
+        url = call_frame.get('url', '')
+        if not url:
+            return function_name
+        
+        script = url.split('?')[0].rsplit('/', 1)[-1]
+        # Linhas do CDP são 0-based
+        return f"{function_name} ({script}:{call_frame.get('lineNumber', 0) + 1})"
+    
+    def aggregate_sampling_profile(self, sampling_profile: Dict, profile: AllocationProfile):
+        """Agrega um SamplingHeapProfile por pilha, script e chunk"""
+        head = sampling_profile.get('head')
+        if not head:
+            return
+        
+        profile.profiles_collected += 1
+        profile.sample_count += len(sampling_profile.get('samples', []))
+        
+        # Percorrer a árvore iterativamente (pilhas de React podem ser profundas)
+        stack = [(head, [])]
+        while stack:
+            node, frames = stack.pop()
+            call_frame = node.get('callFrame', {})
+            
+            # O nó raiz "(root)" não faz parte da pilha
+            if call_frame.get('functionName') != '(root)' or frames:
+                frames = frames + [self.format_call_frame(call_frame)]
+            
+            self_size = node.get('selfSize', 0)
+            if self_size > 0 and frames:
+                collapsed = ';'.join(frames)
+                url = call_frame.get('url', '')
+                chunk = resolve_chunk_name(url, self.manual_chunks)
+                
+                profile.total_bytes += self_size
+                profile.by_stack[collapsed] = profile.by_stack.get(collapsed, 0) + self_size
+                profile.by_script[url or '(native)'] = profile.by_script.get(url or '(native)', 0) + self_size
+                profile.by_chunk[chunk] = profile.by_chunk.get(chunk, 0) + self_size
+            
+            for child in node.get('children', []):
+                stack.append((child, frames))
+    
+    def top_entries(self, values: Dict[str, int], total: int) -> List[Dict]:
+        """Retorna as N maiores entradas com percentual do total"""
+        ranked = sorted(values.items(), key=lambda item: item[1], reverse=True)[:self.allocation_top_n]
+        return [
+            {
+                "name": name,
+                "bytes": size,
+                "percent": (size / total * 100) if total > 0 else 0
+            }
+            for name, size in ranked
+        ]
+    
+    def build_allocation_report(self) -> Optional[Dict]:
+        """Monta o relatório top-N de alocações por fase e consolidado"""
+        if not self.allocation_profiles:
+            return None
+        
+        combined = AllocationProfile(phase="all")
+        phases = {}
+        
+        for phase, profile in self.allocation_profiles.items():
+            for attr in ('by_stack', 'by_script', 'by_chunk'):
+                target = getattr(combined, attr)
+                for key, size in getattr(profile, attr).items():
+                    target[key] = target.get(key, 0) + size
+            combined.total_bytes += profile.total_bytes
+            combined.sample_count += profile.sample_count
+            combined.profiles_collected += profile.profiles_collected
+            
+            phases[phase] = {
+                "profiles_collected": profile.profiles_collected,
+                "total_bytes": profile.total_bytes,
+                "sample_count": profile.sample_count,
+                "top_stacks": self.top_entries(profile.by_stack, profile.total_bytes),
+                "by_chunk": self.top_entries(profile.by_chunk, profile.total_bytes)
+            }
+        
+        return {
+            "sampling_interval": self.sampling_interval,
+            "total_bytes": combined.total_bytes,
+            "sample_count": combined.sample_count,
+            "top_stacks": self.top_entries(combined.by_stack, combined.total_bytes),
+            "top_scripts": self.top_entries(combined.by_script, combined.total_bytes),
+            "by_chunk": self.top_entries(combined.by_chunk, combined.total_bytes),
+            "phases": phases
+        }
+    
+    def save_collapsed_stacks(self, output_dir: str = ".") -> List[str]:
+        """Salva pilhas colapsadas (formato flamegraph.pl / speedscope) por fase"""
+        saved = []
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        combined: Dict[str, int] = {}
+        for phase, profile in self.allocation_profiles.items():
+            filename = output_path / f"allocations_{self.session_id}_{phase}.collapsed"
+            with open(filename, 'w', encoding='utf-8') as f:
+                for stack, size in sorted(profile.by_stack.items()):
+                    f.write(f"{stack} {size}\n")
+                    combined[f"{phase};{stack}"] = size
+            saved.append(str(filename))
+        
+        if combined:
+            filename = output_path / f"allocations_{self.session_id}.collapsed"
+            with open(filename, 'w', encoding='utf-8') as f:
+                for stack, size in sorted(combined.items()):
+                    f.write(f"{stack} {size}\n")
+            saved.append(str(filename))
+        
+        return saved
+    
+    def mark_phase(self, edge: str, phase: str):
+        """Emite marcador de fase no trace (console.timeStamp)"""
+        if not self.driver or not self.gc_tracing:
+            return
+        
+        try:
+            self.driver.execute_script(f"console.timeStamp('{PHASE_MARKER_PREFIX}{edge}:{phase}');")
+        except Exception as e:
+            print(f"⚠️ Erro ao marcar fase {phase}: {e}")
+    
+    def collect_gc_trace(self):
+        """Drena o performance log e alimenta o analisador de GC"""
+        if not self.driver or not self.gc_tracing:
+            return
+        
+        try:
+            self.gc_analyzer.feed(iter_trace_events(self.driver.get_log('performance')))
+        except Exception as e:
+            print(f"⚠️ Erro ao coletar trace de GC: {e}")
+    
+    def build_gc_metrics(self) -> Optional[Dict]:
+        """Resumo das métricas de GC (None se o tracing estiver desligado)"""
+        if not self.gc_tracing:
+            return None
+        
+        self.collect_gc_trace()
+        return self.gc_analyzer.summary()
+    
     async def simulate_user_interactions(self):
         """Simula interações do usuário para stress testing"""
         interactions = [
@@ -453,29 +708,40 @@ class MemoryProfiler:
             ("resize", self.resize_window)
         ]
         
+        if self.interaction_names is not None:
+            interactions = [i for i in interactions if i[0] in self.interaction_names]
+        
         for action_name, action_func in interactions:
             print(f"🎯 Executando: {action_name}")
             
             # Snapshot antes da ação
             before_snapshot = self.collect_memory_snapshot(f"before_{action_name}")
-            if before_snapshot:
-                self.snapshots.append(before_snapshot)
+            self.add_snapshot(before_snapshot)
+            
+            sampling = self.should_sample_phase(action_name) and self.start_allocation_sampling()
+            self.mark_phase("start", action_name)
             
             # Executar ação
             await action_func()
             
             # Aguardar estabilização
-            await asyncio.sleep(2)
+            await traced_sleep(2)
+            
+            self.mark_phase("end", action_name)
+            if sampling:
+                self.stop_allocation_sampling(action_name)
             
             # Snapshot depois da ação
             after_snapshot = self.collect_memory_snapshot(f"after_{action_name}")
-            if after_snapshot:
-                self.snapshots.append(after_snapshot)
+            self.add_snapshot(after_snapshot)
             
             # Detectar vazamentos
             leaks = self.detect_memory_leaks()
             if leaks:
                 print(f"⚠️ Vazamento detectado durante {action_name}")
+        
+        # Drenar o trace a cada ciclo (evita acumular eventos no ChromeDriver)
+        self.collect_gc_trace()
     
     async def scroll_page(self):
         """Simula scroll na página"""
@@ -484,7 +750,7 @@ class MemoryProfiler:
             
         for i in range(5):
             self.driver.execute_script(f"window.scrollTo(0, {i * 500});")
-            await asyncio.sleep(0.5)
+            await traced_sleep(0.5)
         
         # Voltar ao topo
         self.driver.execute_script("window.scrollTo(0, 0);")
@@ -505,7 +771,7 @@ class MemoryProfiler:
                 try:
                     if element.is_displayed():
                         element.click()
-                        await asyncio.sleep(0.5)
+                        await traced_sleep(0.5)
                 except:
                     continue
         except:
@@ -526,7 +792,7 @@ class MemoryProfiler:
                 try:
                     if element.is_displayed():
                         actions.move_to_element(element).perform()
-                        await asyncio.sleep(0.2)
+                        await traced_sleep(0.2)
                 except:
                     continue
         except:
@@ -542,7 +808,7 @@ class MemoryProfiler:
         for section in sections:
             try:
                 self.driver.execute_script(f"document.querySelector('{section}')?.scrollIntoView();")
-                await asyncio.sleep(1)
+                await traced_sleep(1)
             except:
                 continue
     
@@ -555,7 +821,10 @@ class MemoryProfiler:
         
         for width, height in sizes:
             self.driver.set_window_size(width, height)
-            await asyncio.sleep(1)
+            await traced_sleep(1)
+        
+        # Voltar ao viewport do cenário
+        self.driver.set_window_size(*self.window_size)
     
     def analyze_component_memory(self) -> Dict[str, Dict]:
         """Analisa uso de memória por componente"""
@@ -573,11 +842,23 @@ class MemoryProfiler:
         
         return component_analysis
     
-    def generate_recommendations(self, leaks: List[MemoryLeak]) -> List[str]:
+    def generate_recommendations(self, leaks: List[MemoryLeak],
+                                 gc_metrics: Optional[Dict] = None) -> List[str]:
         """Gera recomendações baseadas na análise"""
         recommendations = []
         
-        if any(leak.type == "heap" for leak in leaks):
+        if gc_metrics and gc_metrics['gc_time_share'] > self.gc_time_share_threshold:
+            recommendations.extend([
+                f"♻️ GC ocupa {gc_metrics['gc_time_share'] * 100:.1f}% da main thread: reduzir alocações temporárias",
+                "📦 Reutilizar objetos/arrays em handlers de scroll e animações"
+            ])
+        
+        if gc_metrics and gc_metrics['mark_compact']['max_pause_ms'] > 50:
+            recommendations.append(
+                f"⏸️ Pausa de mark-compact de {gc_metrics['mark_compact']['max_pause_ms']:.0f}ms: reduzir objetos de vida longa"
+            )
+        
+        if any(leak.type in ("heap", "heap_long_term") for leak in leaks):
             recommendations.extend([
                 "🧠 Implementar cleanup em useEffect hooks",
                 "🔄 Verificar closures desnecessários",
@@ -616,12 +897,11 @@ class MemoryProfiler:
         try:
             # Navegar para a página
             self.driver.get(self.base_url)
-            await asyncio.sleep(3)
+            await traced_sleep(3)
             
             # Snapshot inicial
             initial_snapshot = self.collect_memory_snapshot("initial")
-            if initial_snapshot:
-                self.snapshots.append(initial_snapshot)
+            self.add_snapshot(initial_snapshot)
             
             # Monitoramento contínuo
             end_time = time.time() + (duration_minutes * 60)
@@ -633,14 +913,12 @@ class MemoryProfiler:
                 # Snapshots regulares
                 for _ in range(5):  # 5 snapshots por ciclo
                     snapshot = self.collect_memory_snapshot("monitoring")
-                    if snapshot:
-                        self.snapshots.append(snapshot)
-                    await asyncio.sleep(self.snapshot_interval)
+                    self.add_snapshot(snapshot)
+                    await traced_sleep(self.snapshot_interval)
             
             # Snapshot final
             final_snapshot = self.collect_memory_snapshot("final")
-            if final_snapshot:
-                self.snapshots.append(final_snapshot)
+            self.add_snapshot(final_snapshot)
             
             # Detectar vazamentos
             detected_leaks = self.detect_memory_leaks()
@@ -659,8 +937,11 @@ class MemoryProfiler:
             # Análise por componente
             component_analysis = self.analyze_component_memory()
             
+            # Métricas reais de GC
+            gc_metrics = self.build_gc_metrics()
+            
             # Gerar recomendações
-            recommendations = self.generate_recommendations(detected_leaks)
+            recommendations = self.generate_recommendations(detected_leaks, gc_metrics)
             
             # Criar análise final
             analysis = MemoryAnalysis(
@@ -673,9 +954,11 @@ class MemoryProfiler:
                 peak_memory=peak_memory,
                 average_memory=int(average_memory),
                 memory_growth_rate=memory_growth_rate,
-                gc_efficiency=0.8,  # Placeholder
+                gc_efficiency=gc_metrics['reclaimed_fraction'] if gc_metrics else 0.0,
                 component_analysis=component_analysis,
-                recommendations=recommendations
+                recommendations=recommendations,
+                allocation_profile=self.build_allocation_report(),
+                gc_metrics=gc_metrics
             )
             
             return analysis
@@ -684,6 +967,123 @@ class MemoryProfiler:
             if self.driver:
                 self.driver.quit()
     
+    def detect_long_term_leak(self) -> Optional[MemoryLeak]:
+        """Detecta crescimento do heap na série downsampled do soak"""
+        if not self.soak_recorder:
+            return None
+
+        timeline = self.soak_recorder.timeline()
+        if len(timeline) < 10:
+            return None
+
+        start = datetime.fromisoformat(timeline[0]['start'])
+        times = [(datetime.fromisoformat(b['end']) - start).total_seconds() for b in timeline]
+        heap_means = [float(b['heap_used']['mean']) for b in timeline]
+
+        if times[-1] <= 0 or self.calculate_correlation(times, heap_means) <= 0.8:
+            return None
+
+        growth_rate = (heap_means[-1] - heap_means[0]) / times[-1]
+
+        # No soak o limiar é menor: 1MB por hora já é vazamento
+        if growth_rate <= 1024 * 1024 / 3600:
+            return None
+
+        return MemoryLeak(
+            type="heap_long_term",
+            # Escala por hora: os limiares de MB/min viram MB/h
+            severity=self.classify_leak_severity(growth_rate * 60),
+            growth_rate=growth_rate,
+            start_time=timeline[0]['start'],
+            detection_time=datetime.now().isoformat(),
+            affected_components=self.identify_affected_components(),
+            description=f"Heap crescendo {growth_rate * 3600 / 1024 / 1024:.2f} MB/h ao longo do soak",
+            recommendations=[
+                "Verificar caches e listas que crescem sem limite",
+                "Verificar subscriptions e timers criados a cada interação",
+                "Comparar heap snapshots do início e do fim do soak"
+            ]
+        )
+
+    async def run_soak_profiling(self, duration_hours: float = 8,
+                                 output_dir: str = ".") -> MemoryAnalysis:
+        """Executa profiling de longa duração com memória constante"""
+        print(f"🕰️ Iniciando Memory Soak - {duration_hours:.1f} horas")
+
+        self.soak_recorder = SoakRecorder(
+            self.session_id,
+            output_dir=output_dir,
+            checkpoint_interval=self.soak_checkpoint_interval
+        )
+        self.driver = self.setup_driver()
+
+        try:
+            self.driver.get(self.base_url)
+            await traced_sleep(3)
+
+            self.add_snapshot(self.collect_memory_snapshot("initial"))
+
+            end_time = time.time() + duration_hours * 3600
+            cycle = 0
+
+            while time.time() < end_time:
+                await self.simulate_user_interactions()
+
+                for _ in range(5):
+                    self.add_snapshot(self.collect_memory_snapshot("monitoring"))
+                    await traced_sleep(self.snapshot_interval)
+
+                # Guardar o vazamento mais recente de cada tipo (memória limitada)
+                for leak in self.detect_memory_leaks():
+                    self.soak_leaks[leak.type] = leak
+
+                cycle += 1
+                if cycle % 30 == 0:
+                    elapsed = duration_hours * 3600 - (end_time - time.time())
+                    print(f"   ⏱️ {elapsed / 3600:.1f}h - {self.soak_recorder.sample_count} amostras")
+
+            self.add_snapshot(self.collect_memory_snapshot("final"))
+
+            long_term_leak = self.detect_long_term_leak()
+            if long_term_leak:
+                self.soak_leaks[long_term_leak.type] = long_term_leak
+
+            self.soak_recorder.checkpoint()
+            summary = self.soak_recorder.summary()
+            detected_leaks = list(self.soak_leaks.values())
+            gc_metrics = self.build_gc_metrics()
+
+            timeline = self.soak_recorder.timeline()
+            memory_growth_rate = 0
+            duration_minutes = summary['duration_seconds'] / 60
+            if len(timeline) > 1 and duration_minutes > 0:
+                memory_growth_rate = (timeline[-1]['heap_used']['mean'] - timeline[0]['heap_used']['mean']) / duration_minutes
+
+            return MemoryAnalysis(
+                session_id=self.session_id,
+                start_time=self.start_time.isoformat(),
+                end_time=datetime.now().isoformat(),
+                duration_seconds=summary['duration_seconds'],
+                snapshots=list(self.snapshots),
+                detected_leaks=detected_leaks,
+                peak_memory=summary['peak']['heap_used'],
+                average_memory=int(summary['mean']['heap_used']),
+                memory_growth_rate=memory_growth_rate,
+                gc_efficiency=gc_metrics['reclaimed_fraction'] if gc_metrics else 0.0,
+                component_analysis=self.analyze_component_memory(),
+                recommendations=self.generate_recommendations(detected_leaks, gc_metrics),
+                allocation_profile=self.build_allocation_report(),
+                soak_summary=summary,
+                gc_metrics=gc_metrics
+            )
+
+        finally:
+            if self.driver:
+                self.driver.quit()
+            if self.soak_recorder:
+                self.soak_recorder.checkpoint()
+
+    @traced("report_write")
     def save_analysis(self, analysis: MemoryAnalysis):
         """Salva análise em arquivo"""
         filename = f"memory_analysis_{analysis.session_id}.json"
@@ -692,6 +1092,10 @@ class MemoryProfiler:
             json.dump(asdict(analysis), f, indent=2, ensure_ascii=False)
         
         print(f"💾 Análise salva em: {filename}")
+        
+        if self.allocation_profiles:
+            for collapsed_file in self.save_collapsed_stacks():
+                print(f"🔥 Pilhas colapsadas salvas em: {collapsed_file}")
     
     def print_memory_report(self, analysis: MemoryAnalysis):
         """Imprime relatório de memória"""
@@ -703,11 +1107,32 @@ class MemoryProfiler:
         print(f"⏱️ Duração: {analysis.duration_seconds/60:.1f} minutos")
         print(f"📊 Snapshots coletados: {len(analysis.snapshots)}")
         
+        if analysis.soak_summary:
+            soak = analysis.soak_summary
+            print(f"🕰️ Soak: {soak['sample_count']} amostras em {soak['duration_seconds'] / 3600:.1f}h "
+                  f"({soak['checkpoints_written']} checkpoints)")
+            print(f"   Amostras completas: {soak['samples_file']}")
+        
         print(f"\n💾 ESTATÍSTICAS DE MEMÓRIA:")
         print(f"   Pico: {analysis.peak_memory / 1024 / 1024:.2f} MB")
         print(f"   Média: {analysis.average_memory / 1024 / 1024:.2f} MB")
         print(f"   Taxa de crescimento: {analysis.memory_growth_rate / 1024:.2f} KB/min")
         
+        if analysis.gc_metrics and analysis.gc_metrics['available']:
+            gc = analysis.gc_metrics
+            print(f"\n♻️ GARBAGE COLLECTION ({gc['gc_count']} ciclos):")
+            print(f"   Scavenge: {gc['scavenge']['count']} ciclos, {gc['scavenge']['total_pause_ms']:.1f}ms "
+                  f"(máx {gc['scavenge']['max_pause_ms']:.1f}ms)")
+            print(f"   Mark-compact: {gc['mark_compact']['count']} ciclos, {gc['mark_compact']['total_pause_ms']:.1f}ms "
+                  f"(máx {gc['mark_compact']['max_pause_ms']:.1f}ms)")
+            print(f"   Liberado por ciclo: {gc['bytes_reclaimed_per_cycle'] / 1024:.1f} KB "
+                  f"(eficiência {analysis.gc_efficiency * 100:.1f}%)")
+            print(f"   Tempo em GC: {gc['gc_time_share'] * 100:.2f}% da main thread")
+            for phase, stats in gc['by_phase'].items():
+                print(f"   {phase}: {stats['count']} GCs, {stats['total_pause_ms']:.1f}ms")
+        elif analysis.gc_metrics is not None:
+            print(f"\n♻️ GARBAGE COLLECTION: nenhum evento de GC no trace")
+        
         if analysis.detected_leaks:
             print(f"\n⚠️ VAZAMENTOS DETECTADOS ({len(analysis.detected_leaks)}):")
             for leak in analysis.detected_leaks:
@@ -715,6 +1140,16 @@ class MemoryProfiler:
         else:
             print(f"\n✅ NENHUM VAZAMENTO DETECTADO")
         
+        if analysis.allocation_profile:
+            allocation = analysis.allocation_profile
+            print(f"\n🔬 ALOCAÇÕES AMOSTRADAS ({allocation['total_bytes'] / 1024:.1f} KB vivos):")
+            for entry in allocation['by_chunk'][:5]:
+                print(f"   {entry['name']}: {entry['bytes'] / 1024:.1f} KB ({entry['percent']:.1f}%)")
+            print(f"   Top pilhas:")
+            for entry in allocation['top_stacks'][:5]:
+                leaf = entry['name'].rsplit(';', 1)[-1]
+                print(f"   {entry['bytes'] / 1024:.1f} KB - {leaf}")
+        
         print(f"\n💡 RECOMENDAÇÕES:")
         for rec in analysis.recommendations:
             print(f"   {rec}")
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+🧪 Memory Scenario Matrix - Projeto M
+Profiling de memória de vários cenários em paralelo, cada um no seu processo
+
+Funcionalidades:
+- Matriz cenário (interação) × viewport
+- Um processo + Chrome isolado por cenário (sem estado compartilhado)
+- CPU pinning por worker para evitar interferência entre cenários
+- Relatório único com as análises de todos os cenários
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from suite_tracer import traced
+
+# Interações disponíveis no MemoryProfiler.simulate_user_interactions
+DEFAULT_INTERACTIONS = ['scroll', 'click_features', 'hover_elements', 'navigate', 'resize']
+
+DEFAULT_VIEWPORTS = {
+    'desktop': (1920, 1080),
+    'laptop': (1366, 768),
+    'tablet': (768, 1024),
+    'mobile': (375, 667),
+}
+
+@dataclass
+class MemoryScenario:
+    """Um cenário da matriz de profiling"""
+    name: str
+    interactions: List[str]
+    viewport_name: str
+    viewport: Tuple[int, int]
+    duration_minutes: float = 2
+    allocation_sampling: bool = False
+    sampling_interval: int = 32768  # bytes entre amostras de alocação
+    sampling_phases: List[str] = field(default_factory=list)  # vazio = todas
+    gc_tracing: bool = True
+
+@dataclass
+class ScenarioResult:
+    """Resultado de um cenário executado num worker"""
+    scenario: MemoryScenario
+    status: str  # success, failed
+    cpu_cores: List[int]
+    wall_seconds: float
+    analysis: Optional[Dict] = None
+    error_message: Optional[str] = None
+
+@dataclass
+class ScenarioMatrixReport:
+    """Relatório consolidado da matriz de cenários"""
+    session_id: str
+    timestamp: str
+    parallelism: int
+    cores_per_scenario: int
+    wall_seconds: float
+    serial_seconds: float  # soma das durações individuais
+    speedup: float
+    results: List[ScenarioResult] = field(default_factory=list)
+
+    # Agregados (mesmas chaves usadas pelo MasterPerformanceSuite)
+    peak_memory: int = 0
+    average_memory: int = 0
+    memory_growth_rate: float = 0
+    detected_leaks: int = 0
+    recommendations: List[str] = field(default_factory=list)
+
+def build_scenario_matrix(interactions: Optional[List[str]] = None,
+                          viewports: Optional[List[str]] = None,
+                          duration_minutes: float = 2,
+                          allocation_sampling: bool = False,
+                          sampling_interval: int = 32768,
+                          sampling_phases: Optional[List[str]] = None,
+                          gc_tracing: bool = True) -> List[MemoryScenario]:
+    """Gera a matriz cenário × viewport (uma interação por cenário)"""
+    scenarios = []
+
+    for viewport_name in viewports or ['desktop', 'mobile']:
+        viewport = DEFAULT_VIEWPORTS.get(viewport_name)
+        if viewport is None:
+            print(f"⚠️ Viewport desconhecido ignorado: {viewport_name}")
+            continue
+
+        for interaction in interactions or DEFAULT_INTERACTIONS:
+            scenarios.append(MemoryScenario(
+                name=f"{interaction}_{viewport_name}",
+                interactions=[interaction],
+                viewport_name=viewport_name,
+                viewport=viewport,
+                duration_minutes=duration_minutes,
+                allocation_sampling=allocation_sampling,
+                sampling_interval=sampling_interval,
+                sampling_phases=list(sampling_phases or []),
+                gc_tracing=gc_tracing
+            ))
+
+    return scenarios
+
+def available_cores() -> List[int]:
+    """CPUs que este processo pode usar"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+
+    try:
+        import psutil
+        return sorted(psutil.Process().cpu_affinity())
+    except Exception:
+        return list(range(os.cpu_count() or 1))
+
+def partition_cores(cores: List[int], cores_per_scenario: int) -> List[List[int]]:
+    """Divide as CPUs em conjuntos disjuntos (um por worker)"""
+    cores_per_scenario = max(1, cores_per_scenario)
+    slots = len(cores) // cores_per_scenario
+    return [cores[i * cores_per_scenario:(i + 1) * cores_per_scenario] for i in range(max(1, slots))]
+
+def pin_current_process(cores: List[int]) -> bool:
+    """Fixa o processo atual (e o Chrome que ele iniciar) nas CPUs indicadas"""
+    if not cores:
+        return False
+
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            os.sched_setaffinity(0, cores)
+        else:
+            import psutil
+            psutil.Process().cpu_affinity(cores)
+        return True
+    except Exception as e:
+        print(f"⚠️ Não foi possível fixar CPUs {cores}: {e}")
+        return False
+
+# Conjunto de CPUs do worker atual (definido no initializer do pool)
+_worker_cores: List[int] = []
+
+def _init_worker(core_queue):
+    """Initializer do pool: cada worker reserva um conjunto de CPUs exclusivo"""
+    global _worker_cores
+    _worker_cores = core_queue.get()
+    pin_current_process(_worker_cores)
+
+def run_scenario_worker(scenario: MemoryScenario, base_url: str, output_dir: str) -> ScenarioResult:
+    """Executa um cenário num processo isolado (função de topo para ser picklable)"""
+    from memory_profiler import MemoryProfiler
+
+    start = time.time()
+
+    try:
+        profiler = MemoryProfiler(base_url)
+        profiler.session_id = f"{profiler.session_id}_{scenario.name}"
+        profiler.window_size = tuple(scenario.viewport)
+        profiler.interaction_names = list(scenario.interactions)
+        profiler.allocation_sampling = scenario.allocation_sampling
+        profiler.sampling_interval = scenario.sampling_interval
+        profiler.allocation_phases = list(scenario.sampling_phases) or None
+        profiler.gc_tracing = scenario.gc_tracing
+
+        analysis = asyncio.run(profiler.run_memory_profiling(scenario.duration_minutes))
+
+        # Análise completa em disco; o processo pai recebe só o resumo
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        analysis_file = output_path / f"memory_scenario_{analysis.session_id}.json"
+        with open(analysis_file, 'w', encoding='utf-8') as f:
+            json.dump(asdict(analysis), f, indent=2, ensure_ascii=False)
+
+        if profiler.allocation_profiles:
+            profiler.save_collapsed_stacks(output_dir)
+
+        summary = {
+            "session_id": analysis.session_id,
+            "analysis_file": str(analysis_file),
+            "snapshots": len(analysis.snapshots),
+            "peak_memory": analysis.peak_memory,
+            "average_memory": analysis.average_memory,
+            "memory_growth_rate": analysis.memory_growth_rate,
+            "gc_efficiency": analysis.gc_efficiency,
+            "gc_metrics": analysis.gc_metrics,
+            "detected_leaks": [asdict(leak) for leak in analysis.detected_leaks],
+            "recommendations": analysis.recommendations,
+            "allocation_profile": analysis.allocation_profile
+        }
+
+        return ScenarioResult(
+            scenario=scenario,
+            status="success",
+            cpu_cores=list(_worker_cores),
+            wall_seconds=time.time() - start,
+            analysis=summary
+        )
+
+    except Exception as e:
+        return ScenarioResult(
+            scenario=scenario,
+            status="failed",
+            cpu_cores=list(_worker_cores),
+            wall_seconds=time.time() - start,
+            error_message=str(e)
+        )
+
+class ScenarioMatrixRunner:
+    """Executa uma matriz de cenários de memória em processos paralelos"""
+
+    def __init__(self, base_url: str = "http://localhost:8080",
+                 output_dir: str = "performance_reports",
+                 cores_per_scenario: int = 2,
+                 max_parallelism: int = 0):
+        self.base_url = base_url
+        self.output_dir = output_dir
+        self.cores_per_scenario = cores_per_scenario
+        self.max_parallelism = max_parallelism  # 0 = automático
+        self.session_id = f"memory_matrix_{int(time.time())}"
+
+    def plan_parallelism(self, scenario_count: int) -> List[List[int]]:
+        """Define quantos workers rodam juntos e as CPUs de cada um"""
+        core_sets = partition_cores(available_cores(), self.cores_per_scenario)
+
+        parallelism = min(len(core_sets), scenario_count)
+        if self.max_parallelism > 0:
+            parallelism = min(parallelism, self.max_parallelism)
+
+        return core_sets[:max(1, parallelism)]
+
+    async def run_matrix(self, scenarios: List[MemoryScenario]) -> ScenarioMatrixReport:
+        """Executa todos os cenários e consolida o relatório"""
+        core_sets = self.plan_parallelism(len(scenarios))
+        parallelism = len(core_sets)
+
+        print(f"🧪 Matriz de memória: {len(scenarios)} cenários, {parallelism} em paralelo "
+              f"({self.cores_per_scenario} CPUs por cenário)")
+
+        # 'spawn' evita herdar estado do processo pai (e funciona igual no Windows)
+        context = multiprocessing.get_context('spawn')
+        start = time.time()
+        loop = asyncio.get_running_loop()
+        results = []
+
+        with context.Manager() as manager:
+            core_queue = manager.Queue()
+            for cores in core_sets:
+                core_queue.put(cores)
+
+            with ProcessPoolExecutor(max_workers=parallelism, mp_context=context,
+                                     initializer=_init_worker, initargs=(core_queue,)) as pool:
+                futures = [
+                    loop.run_in_executor(pool, run_scenario_worker, scenario, self.base_url, self.output_dir)
+                    for scenario in scenarios
+                ]
+
+                for future in asyncio.as_completed(futures):
+                    result = await future
+                    status = "✅" if result.status == "success" else "❌"
+                    print(f"   {status} {result.scenario.name} em {result.wall_seconds:.1f}s (CPUs {result.cpu_cores})")
+                    results.append(result)
+
+        wall_seconds = time.time() - start
+        results.sort(key=lambda r: r.scenario.name)
+
+        return self.merge_results(results, parallelism, wall_seconds)
+
+    def merge_results(self, results: List[ScenarioResult], parallelism: int,
+                      wall_seconds: float) -> ScenarioMatrixReport:
+        """Mescla as análises por cenário num relatório único"""
+        serial_seconds = sum(r.wall_seconds for r in results)
+        successful = [r.analysis for r in results if r.status == "success" and r.analysis]
+
+        recommendations: List[str] = []
+        for analysis in successful:
+            for rec in analysis["recommendations"]:
+                if rec not in recommendations:
+                    recommendations.append(rec)
+
+        return ScenarioMatrixReport(
+            session_id=self.session_id,
+            timestamp=datetime.now().isoformat(),
+            parallelism=parallelism,
+            cores_per_scenario=self.cores_per_scenario,
+            wall_seconds=wall_seconds,
+            serial_seconds=serial_seconds,
+            speedup=serial_seconds / wall_seconds if wall_seconds > 0 else 0,
+            results=results,
+            # Pior caso entre os cenários para gates
+            peak_memory=max((a["peak_memory"] for a in successful), default=0),
+            average_memory=int(sum(a["average_memory"] for a in successful) / len(successful)) if successful else 0,
+            memory_growth_rate=max((a["memory_growth_rate"] for a in successful), default=0),
+            detected_leaks=sum(len(a["detected_leaks"]) for a in successful),
+            recommendations=recommendations
+        )
+
+    @traced("report_write")
+    def save_report(self, report: ScenarioMatrixReport) -> str:
+        """Salva o relatório consolidado da matriz"""
+        output_path = Path(self.output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        filename = output_path / f"memory_matrix_{report.session_id}.json"
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(asdict(report), f, indent=2, ensure_ascii=False)
+
+        print(f"💾 Matriz salva em: {filename}")
+        return str(filename)
+
+    def print_report(self, report: ScenarioMatrixReport):
+        """Imprime o resumo da matriz"""
+        print("\n" + "="*70)
+        print("🧪 RELATÓRIO DA MATRIZ DE MEMÓRIA")
+        print("="*70)
+
+        print(f"⏱️ Tempo total: {report.wall_seconds:.1f}s (serial seria {report.serial_seconds:.1f}s, "
+              f"speedup {report.speedup:.1f}x)")
+        print(f"⚙️ Paralelismo: {report.parallelism} × {report.cores_per_scenario} CPUs")
+
+        print(f"\n{'Cenário':<28} {'Pico (MB)':>10} {'Média (MB)':>11} {'Cresc. (KB/min)':>16} {'Leaks':>6}")
+        for result in report.results:
+            if result.status != "success":
+                print(f"{result.scenario.name:<28} ❌ {result.error_message}")
+                continue
+            a = result.analysis
+            print(f"{result.scenario.name:<28} {a['peak_memory'] / 1024 / 1024:>10.2f} "
+                  f"{a['average_memory'] / 1024 / 1024:>11.2f} {a['memory_growth_rate'] / 1024:>16.2f} "
+                  f"{len(a['detected_leaks']):>6}")
+
+        print("\n" + "="*70)
+
+async def main():
+    """Função principal"""
+    runner = ScenarioMatrixRunner()
+    scenarios = build_scenario_matrix(duration_minutes=1)
+
+    try:
+        report = await runner.run_matrix(scenarios)
+        runner.save_report(report)
+        runner.print_report(report)
+
+    except Exception as e:
+        print(f"❌ Erro durante matriz de memória: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+🕰️ Memory Soak Storage - Projeto M
+Armazenamento de memória limitado para execuções longas (8-24h) do Memory Profiler
+
+Funcionalidades:
+- Ring buffer de alta resolução em arrays de largura fixa
+- Downsampling progressivo (min/max/média por bucket) em camadas
+- Checkpoints periódicos em disco (binário append-only + resumo JSON atômico)
+- Uso de memória constante independente da duração
+"""
+
+import json
+import os
+import struct
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Métricas numéricas armazenadas por amostra (ordem fixa)
+SOAK_METRICS = ('heap_used', 'heap_total', 'dom_nodes', 'event_listeners')
+
+# Registro binário: timestamp (double), 4 métricas (int64), código da ação (uint16)
+SAMPLE_RECORD = struct.Struct('<d4qH')
+
+class SoakBucket:
+    """Bucket agregado (min/max/soma) de um intervalo de tempo"""
+    __slots__ = ('start', 'end', 'count', 'minimum', 'maximum', 'total')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.end = start
+        self.count = 0
+        self.minimum = [0] * len(SOAK_METRICS)
+        self.maximum = [0] * len(SOAK_METRICS)
+        self.total = [0.0] * len(SOAK_METRICS)
+
+    def add(self, timestamp: float, values):
+        """Adiciona uma amostra bruta ao bucket"""
+        if self.count == 0:
+            self.minimum = list(values)
+            self.maximum = list(values)
+        else:
+            for i, value in enumerate(values):
+                if value < self.minimum[i]:
+                    self.minimum[i] = value
+                if value > self.maximum[i]:
+                    self.maximum[i] = value
+
+        for i, value in enumerate(values):
+            self.total[i] += value
+
+        self.count += 1
+        self.end = timestamp
+
+    def merge(self, other: 'SoakBucket'):
+        """Incorpora outro bucket (usado ao descer de camada)"""
+        if other.count == 0:
+            return
+
+        if self.count == 0:
+            self.start = other.start
+            self.minimum = list(other.minimum)
+            self.maximum = list(other.maximum)
+        else:
+            self.start = min(self.start, other.start)
+            for i in range(len(SOAK_METRICS)):
+                self.minimum[i] = min(self.minimum[i], other.minimum[i])
+                self.maximum[i] = max(self.maximum[i], other.maximum[i])
+
+        for i in range(len(SOAK_METRICS)):
+            self.total[i] += other.total[i]
+
+        self.count += other.count
+        self.end = max(self.end, other.end)
+
+    def to_dict(self) -> Dict:
+        """Serializa o bucket para relatórios/checkpoints"""
+        data = {
+            'start': datetime.fromtimestamp(self.start).isoformat(),
+            'end': datetime.fromtimestamp(self.end).isoformat(),
+            'count': self.count
+        }
+        for i, metric in enumerate(SOAK_METRICS):
+            data[metric] = {
+                'min': self.minimum[i],
+                'max': self.maximum[i],
+                'mean': self.total[i] / self.count if self.count else 0
+            }
+        return data
+
+class SampleRingBuffer:
+    """Ring buffer de amostras brutas em arrays de largura fixa"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', [0.0]) * capacity
+        self.values = [array('q', [0]) * capacity for _ in SOAK_METRICS]
+        self.actions = array('H', [0]) * capacity
+        self.head = 0  # próxima posição de escrita
+        self.size = 0
+
+    def append(self, timestamp: float, values, action_code: int) -> Optional[tuple]:
+        """Adiciona uma amostra; retorna a amostra mais antiga se ela foi descartada"""
+        evicted = None
+        if self.size == self.capacity:
+            evicted = self.get(0)
+        else:
+            self.size += 1
+
+        self.timestamps[self.head] = timestamp
+        for i, value in enumerate(values):
+            self.values[i][self.head] = int(value)
+        self.actions[self.head] = action_code
+        self.head = (self.head + 1) % self.capacity
+
+        return evicted
+
+    def get(self, index: int) -> tuple:
+        """Retorna a i-ésima amostra em ordem cronológica"""
+        position = (self.head - self.size + index) % self.capacity
+        return (
+            self.timestamps[position],
+            tuple(column[position] for column in self.values),
+            self.actions[position]
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for i in range(self.size):
+            yield self.get(i)
+
+class SoakRecorder:
+    """Armazena amostras de memória com uso de memória limitado"""
+
+    def __init__(self, session_id: str, output_dir: str = ".",
+                 ring_capacity: int = 1800,
+                 tier_seconds: Optional[List[int]] = None,
+                 tier_capacity: int = 360,
+                 checkpoint_interval: int = 300):
+        self.session_id = session_id
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Alta resolução: ~1h com snapshots a cada 2s
+        self.recent = SampleRingBuffer(ring_capacity)
+
+        # Camadas de downsampling: 1 min, 10 min, 1 h (cada uma com capacidade fixa)
+        self.tier_seconds = tier_seconds or [60, 600, 3600]
+        self.tier_capacity = tier_capacity
+        self.tiers: List[deque] = [deque() for _ in self.tier_seconds]
+        self.open_bucket: Optional[SoakBucket] = None
+
+        # Tabela de ações (código uint16 <-> nome)
+        self.action_codes: Dict[str, int] = {}
+        self.action_names: List[str] = []
+
+        # Estatísticas acumuladas (O(1) em memória)
+        self.sample_count = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self.peak = [0] * len(SOAK_METRICS)
+        self.totals = [0.0] * len(SOAK_METRICS)
+
+        # Checkpoints
+        self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint: Optional[float] = None
+        self.pending = array('B')  # registros binários ainda não gravados
+        self.samples_file = self.output_dir / f"soak_{session_id}.samples.bin"
+        self.summary_file = self.output_dir / f"soak_{session_id}.json"
+        self.checkpoints_written = 0
+
+    def encode_action(self, action: str) -> int:
+        """Converte o nome da ação em código compacto"""
+        code = self.action_codes.get(action)
+        if code is None:
+            code = len(self.action_names)
+            self.action_codes[action] = code
+            self.action_names.append(action)
+        return code
+
+    def record(self, values: Dict[str, int], action: str = "monitoring",
+               timestamp: Optional[float] = None):
+        """Registra uma amostra de memória"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        metrics = tuple(int(values.get(metric, 0) or 0) for metric in SOAK_METRICS)
+        action_code = self.encode_action(action)
+
+        self.sample_count += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+            self.last_checkpoint = timestamp
+        self.last_timestamp = timestamp
+
+        for i, value in enumerate(metrics):
+            if value > self.peak[i]:
+                self.peak[i] = value
+            self.totals[i] += value
+
+        self.pending.frombytes(SAMPLE_RECORD.pack(timestamp, *metrics, action_code))
+
+        evicted = self.recent.append(timestamp, metrics, action_code)
+        if evicted:
+            self.downsample(evicted[0], evicted[1])
+
+        if timestamp - self.last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def downsample(self, timestamp: float, values):
+        """Agrega uma amostra descartada do ring buffer na primeira camada"""
+        width = self.tier_seconds[0]
+        if self.open_bucket and timestamp - self.open_bucket.start >= width:
+            self.push_bucket(0, self.open_bucket)
+            self.open_bucket = None
+
+        if self.open_bucket is None:
+            self.open_bucket = SoakBucket(timestamp - (timestamp % width))
+
+        self.open_bucket.add(timestamp, values)
+
+    def push_bucket(self, tier_index: int, bucket: SoakBucket):
+        """Insere bucket numa camada, rebaixando os mais antigos quando cheia"""
+        tier = self.tiers[tier_index]
+        if tier and tier[-1].start == bucket.start:
+            tier[-1].merge(bucket)
+            return
+        tier.append(bucket)
+
+        if len(tier) <= self.tier_capacity:
+            return
+
+        if tier_index + 1 < len(self.tiers):
+            # Agrupar buckets antigos na largura da próxima camada
+            width = self.tier_seconds[tier_index + 1]
+            oldest = tier.popleft()
+            merged = SoakBucket(oldest.start - (oldest.start % width))
+            merged.merge(oldest)
+            while tier and tier[0].start < merged.start + width and len(tier) > self.tier_capacity // 2:
+                merged.merge(tier.popleft())
+            self.push_bucket(tier_index + 1, merged)
+        else:
+            # Última camada: fundir pares adjacentes (dobra a largura efetiva)
+            compacted = deque()
+            while tier:
+                bucket = tier.popleft()
+                if tier:
+                    bucket.merge(tier.popleft())
+                compacted.append(bucket)
+            self.tiers[tier_index] = compacted
+
+    def recent_window(self, count: int) -> List[tuple]:
+        """Retorna as últimas N amostras brutas (timestamp, valores, ação)"""
+        start = max(0, len(self.recent) - count)
+        return [self.recent.get(i) for i in range(start, len(self.recent))]
+
+    def timeline(self) -> List[Dict]:
+        """Série completa do mais antigo ao mais recente (camadas + ring buffer)
+
+        As amostras do ring buffer entram agregadas na largura da primeira camada, então
+        a última hora (e o soak inteiro, enquanto nada foi descartado) aparece na série.
+        """
+        buckets = [bucket for tier in reversed(self.tiers) for bucket in tier]
+
+        # Cópia do bucket aberto: as amostras do ring buffer não podem alterá-lo
+        current = None
+        if self.open_bucket:
+            current = SoakBucket(self.open_bucket.start)
+            current.merge(self.open_bucket)
+
+        width = self.tier_seconds[0]
+        for timestamp, values, _ in self.recent:
+            start = timestamp - (timestamp % width)
+            if current and current.start != start:
+                buckets.append(current)
+                current = None
+            if current is None:
+                current = SoakBucket(start)
+            current.add(timestamp, values)
+        if current:
+            buckets.append(current)
+
+        return [bucket.to_dict() for bucket in buckets]
+
+    def summary(self) -> Dict:
+        """Resumo compacto para relatórios e checkpoints"""
+        duration = 0.0
+        if self.first_timestamp is not None and self.last_timestamp is not None:
+            duration = self.last_timestamp - self.first_timestamp
+
+        means = {
+            metric: (self.totals[i] / self.sample_count if self.sample_count else 0)
+            for i, metric in enumerate(SOAK_METRICS)
+        }
+
+        return {
+            'session_id': self.session_id,
+            'sample_count': self.sample_count,
+            'duration_seconds': duration,
+            'peak': dict(zip(SOAK_METRICS, self.peak)),
+            'mean': means,
+            'ring_buffer': {
+                'capacity': self.recent.capacity,
+                'size': len(self.recent)
+            },
+            'tiers': [
+                {'bucket_seconds': seconds, 'buckets': len(tier)}
+                for seconds, tier in zip(self.tier_seconds, self.tiers)
+            ],
+            'actions': list(self.action_names),
+            'samples_file': str(self.samples_file),
+            'checkpoints_written': self.checkpoints_written
+        }
+
+    def checkpoint(self):
+        """Grava amostras pendentes e resumo em disco"""
+        if self.pending:
+            with open(self.samples_file, 'ab') as f:
+                self.pending.tofile(f)
+            self.pending = array('B')
+
+        data = self.summary()
+        data['timeline'] = self.timeline()
+        data['recent'] = [
+            {
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                **dict(zip(SOAK_METRICS, values)),
+                'user_action': self.action_names[action_code]
+            }
+            for timestamp, values, action_code in self.recent
+        ]
+
+        # Escrita atômica: nunca deixa um checkpoint truncado
+        tmp_file = self.summary_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, self.summary_file)
+
+        self.checkpoints_written += 1
+        self.last_checkpoint = self.last_timestamp or time.time()
+
+def read_soak_samples(samples_file: str):
+    """Lê o arquivo binário de amostras de um soak (gerador, sem carregar tudo)"""
+    with open(samples_file, 'rb') as f:
+        while True:
+            chunk = f.read(SAMPLE_RECORD.size * 4096)
+            if not chunk:
+                break
+            for record in SAMPLE_RECORD.iter_unpack(chunk[:len(chunk) - len(chunk) % SAMPLE_RECORD.size]):
+                timestamp, *values, action_code = record
+                yield timestamp, dict(zip(SOAK_METRICS, values)), action_code
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+🛰️ Metrics Agent - Projeto M
+Agente de métricas injetado no início do documento (Page.addScriptToEvaluateOnNewDocument)
+
+Funcionalidades:
+- PerformanceObservers registrados antes de qualquer script da aplicação (buffered)
+- FCP, LCP, CLS (janelas de sessão), INP (Event Timing), long tasks e resource timing
+- Long Animation Frames com scripts responsáveis (atribuição de interações lentas)
+- Coleta de todas as métricas numa única chamada quando a página estabiliza
+"""
+
+from typing import Callable, Dict, Optional
+
+# Instalado antes do carregamento de cada documento; acumula entradas desde o navigation start
+METRICS_AGENT_SCRIPT = r"""
+(() => {
+    if (window.__perfAgent || window.top !== window) return;
+
+    const agent = {
+        fcp: 0,
+        lcp: 0,
+        lcpUrl: '',
+        lcpElement: '',
+        cls: 0,
+        fid: 0,
+        longTasks: [],
+        animationFrames: [],
+        interactions: {},
+        lastActivity: performance.now(),
+        sessionValue: 0,
+        sessionStart: 0,
+        sessionLast: 0
+    };
+    window.__perfAgent = agent;
+
+    const touch = () => { agent.lastActivity = performance.now(); };
+
+    const describe = (node) => {
+        if (!node || !node.tagName) return '';
+        const label = node.getAttribute('aria-label');
+        return node.tagName.toLowerCase() + (node.id ? '#' + node.id : '') + (label ? `[${label}]` : '');
+    };
+
+    const observe = (type, callback, options = {}) => {
+        try {
+            new PerformanceObserver((list) => {
+                list.getEntries().forEach(callback);
+                touch();
+            }).observe({type, buffered: true, ...options});
+        } catch (e) {}
+    };
+
+    observe('paint', (entry) => {
+        if (entry.name === 'first-contentful-paint') agent.fcp = entry.startTime;
+    });
+
+    observe('largest-contentful-paint', (entry) => {
+        agent.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+        agent.lcpUrl = entry.url || '';  // imagem/poster do elemento LCP (vazio para texto)
+        agent.lcpElement = describe(entry.element);
+    });
+
+    // CLS: maior janela de sessão (gap de 1s, máximo de 5s)
+    observe('layout-shift', (entry) => {
+        if (entry.hadRecentInput) return;
+        if (agent.sessionValue && (entry.startTime - agent.sessionLast > 1000 ||
+                                   entry.startTime - agent.sessionStart > 5000)) {
+            agent.sessionValue = 0;
+        }
+        if (!agent.sessionValue) agent.sessionStart = entry.startTime;
+        agent.sessionValue += entry.value;
+        agent.sessionLast = entry.startTime;
+        agent.cls = Math.max(agent.cls, agent.sessionValue);
+    });
+
+    observe('first-input', (entry) => {
+        agent.fid = entry.processingStart - entry.startTime;
+    });
+
+    // INP: maior duração por interação (Event Timing)
+    observe('event', (entry) => {
+        if (!entry.interactionId) return;
+        const previous = agent.interactions[entry.interactionId];
+        if (!previous || entry.duration > previous.duration) {
+            agent.interactions[entry.interactionId] = {
+                name: entry.name,
+                target: describe(entry.target),
+                start: entry.startTime,
+                duration: entry.duration,
+                input_delay: entry.processingStart - entry.startTime,
+                processing: entry.processingEnd - entry.processingStart,
+                presentation: entry.startTime + entry.duration - entry.processingEnd
+            };
+        }
+    }, {durationThreshold: 16});
+
+    observe('longtask', (entry) => {
+        agent.longTasks.push({start: entry.startTime, duration: entry.duration});
+    });
+
+    // Long Animation Frames (Chrome 123+): scripts que ocuparam cada frame lento
+    observe('long-animation-frame', (entry) => {
+        if (agent.animationFrames.length >= 200) return;
+        agent.animationFrames.push({
+            start: entry.startTime,
+            duration: entry.duration,
+            blocking_duration: entry.blockingDuration || 0,
+            scripts: (entry.scripts || []).map((script) => ({
+                source_url: script.sourceURL || '',
+                function_name: script.sourceFunctionName || '',
+                invoker: script.invoker || '',
+                duration: script.duration
+            }))
+        });
+    });
+
+    observe('resource', () => {});
+
+    agent.snapshot = () => {
+        const navigation = performance.getEntriesByType('navigation')[0];
+        const resources = performance.getEntriesByType('resource');
+        const memInfo = performance.memory || {};
+        const connection = navigator.connection || {};
+
+        const interactions = Object.values(agent.interactions).sort((a, b) => b.duration - a.duration);
+        // p98 das interações (com < 50 interações equivale à maior)
+        const inpIndex = Math.min(interactions.length - 1, Math.floor(interactions.length / 50));
+
+        const cwv = {
+            fcp: agent.fcp,
+            lcp: agent.lcp,
+            lcp_url: agent.lcpUrl,
+            lcp_element: agent.lcpElement,
+            cls: agent.cls,
+            fid: agent.fid,
+            inp: interactions.length ? interactions[inpIndex].duration : 0,
+            interactions: interactions.slice(0, 50),
+            long_tasks: agent.longTasks.slice(-200),
+            long_animation_frames: agent.animationFrames,
+            ttfb: navigation ? navigation.responseStart - navigation.requestStart : 0
+        };
+
+        const res = {
+            total_resources: resources.length,
+            total_size: 0, total_transfer_size: 0,
+            scripts_count: 0, scripts_size: 0,
+            stylesheets_count: 0, stylesheets_size: 0,
+            images_count: 0, images_size: 0,
+            fonts_count: 0, fonts_size: 0,
+            dns_lookup_time: 0, connection_time: 0, request_time: 0, response_time: 0
+        };
+
+        const net = {
+            connection_type: connection.type || 'unknown',
+            effective_type: connection.effectiveType || 'unknown',
+            downlink: connection.downlink || 0,
+            rtt: connection.rtt || 0,
+            total_requests: resources.length,
+            failed_requests: 0, cached_requests: 0,
+            avg_response_time: 0, avg_download_time: 0,
+            revalidated_requests: 0
+        };
+
+        let totalResponseTime = 0, totalDownloadTime = 0, validRequests = 0;
+        let scriptDuration = 0, scriptCount = 0;
+
+        resources.forEach((resource) => {
+            const size = resource.decodedBodySize || resource.encodedBodySize || 0;
+            res.total_size += size;
+            res.total_transfer_size += resource.transferSize || 0;
+
+            if (resource.initiatorType === 'script' || resource.name.includes('.js')) {
+                res.scripts_count++;
+                res.scripts_size += size;
+                scriptDuration += resource.responseEnd - resource.startTime;
+                scriptCount++;
+            } else if (resource.initiatorType === 'css' || resource.name.includes('.css')) {
+                res.stylesheets_count++;
+                res.stylesheets_size += size;
+            } else if (resource.initiatorType === 'img' || /\.(jpg|jpeg|png|gif|webp|svg)/.test(resource.name)) {
+                res.images_count++;
+                res.images_size += size;
+            } else if (/\.(woff|woff2|ttf|otf|eot)/.test(resource.name)) {
+                res.fonts_count++;
+                res.fonts_size += size;
+            }
+
+            if (resource.transferSize === 0 && resource.decodedBodySize === 0) net.failed_requests++;
+            if (resource.transferSize === 0 && resource.decodedBodySize > 0) net.cached_requests++;
+            // 304: só cabeçalhos trafegam (num fetch completo transferSize = corpo + cabeçalhos)
+            if (resource.transferSize > 0 && resource.transferSize < resource.encodedBodySize) {
+                net.revalidated_requests++;
+            }
+
+            if (resource.responseEnd && resource.responseStart) {
+                const responseTime = resource.responseEnd - resource.requestStart;
+                if (responseTime > 0) {
+                    totalResponseTime += responseTime;
+                    totalDownloadTime += resource.responseEnd - resource.responseStart;
+                    validRequests++;
+                }
+            }
+        });
+
+        if (validRequests > 0) {
+            net.avg_response_time = totalResponseTime / validRequests;
+            net.avg_download_time = totalDownloadTime / validRequests;
+        }
+
+        if (navigation) {
+            res.dns_lookup_time = navigation.domainLookupEnd - navigation.domainLookupStart;
+            res.connection_time = navigation.connectEnd - navigation.connectStart;
+            res.request_time = navigation.responseStart - navigation.requestStart;
+            res.response_time = navigation.responseEnd - navigation.responseStart;
+        }
+
+        const js = {
+            heap_used: memInfo.usedJSHeapSize || 0,
+            heap_total: memInfo.totalJSHeapSize || 0,
+            heap_limit: memInfo.jsHeapSizeLimit || 0,
+            dom_nodes: document.getElementsByTagName('*').length,
+            event_listeners: document.querySelectorAll('button, a, input, select, textarea, [onclick]').length,
+            long_tasks_count: agent.longTasks.length,
+            // Total Blocking Time: parcela acima de 50ms de cada long task
+            blocking_time: agent.longTasks.reduce((total, task) => total + Math.max(0, task.duration - 50), 0),
+            script_duration: scriptCount ? scriptDuration / scriptCount : 0,
+            compile_time: 0,
+            execution_time: 0
+        };
+
+        return {core_web_vitals: cwv, resources: res, javascript: js, network: net};
+    };
+})();
+"""
+
+# Aguarda a página estabilizar (load + janela sem novas entradas) e retorna tudo numa chamada
+COLLECT_METRICS_SCRIPT = r"""
+const [quietMs, timeoutMs, sliceMs, startedAt, done] = arguments;
+const started = startedAt ?? performance.now();
+const sliceStarted = performance.now();
+
+const poll = () => {
+    const agent = window.__perfAgent;
+    const now = performance.now();
+    const timedOut = now - started >= timeoutMs;
+
+    if ((agent && document.readyState === 'complete' && now - agent.lastActivity >= quietMs) || timedOut) {
+        if (!agent) {
+            done({error: 'agente de métricas não instalado'});
+            return;
+        }
+        const result = agent.snapshot();
+        result.settle = {waited_ms: now - started, timed_out: timedOut, settled_at: now};
+        done(result);
+        return;
+    }
+    // Fatia esgotada: devolve o controle (ex.: drenar o performance log) e é chamado de novo
+    if (sliceMs && now - sliceStarted >= sliceMs) {
+        done({pending: true, started});
+        return;
+    }
+    setTimeout(poll, 50);
+};
+poll();
+"""
+
+def install_metrics_agent(driver) -> str:
+    """Registra o agente para todos os documentos seguintes; retorna o identificador do script"""
+    result = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': METRICS_AGENT_SCRIPT})
+    return result.get('identifier', '')
+
+def collect_agent_metrics(driver, quiet_ms: int = 500, timeout_ms: int = 15000,
+                          on_slice: Optional[Callable[[], None]] = None, slice_ms: int = 1000) -> Dict:
+    """Coleta as métricas do agente quando a página estabiliza (bloqueante). Com on_slice, a espera
+    é dividida em fatias de slice_ms e on_slice roda entre elas (na mesma thread do driver)"""
+    started = None
+    while True:
+        result = driver.execute_async_script(COLLECT_METRICS_SCRIPT, quiet_ms, timeout_ms,
+                                             slice_ms if on_slice else 0, started)
+        if not (isinstance(result, dict) and result.get('pending')):
+            return result
+        started = result['started']
+        on_slice()
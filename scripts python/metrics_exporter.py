@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+📡 Metrics Exporter - Projeto M
+Métricas da suíte em formato OpenMetrics/Prometheus, ao vivo durante a execução
+
+Funcionalidades:
+- Registro de counters, gauges e histogramas com labels (route, profile, chunk, action...)
+- Endpoint HTTP embutido (/metrics) numa thread própria: o Prometheus raspa a run em andamento
+- Textfile exporter (.prom atômico) para o textfile collector do node_exporter/CI
+- Latência do stress por ação (histograma), throughput, taxa de erro, percentis de CWV,
+  crescimento de heap, tamanho dos chunks do bundle, duração das etapas e regressões
+- Desligado: os hooks das etapas só checam uma flag (sem dependência de prometheus_client)
+"""
+
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latência das ações do stress (segundos): de cliques rápidos a navegações lentas
+STRESS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Percentis publicados das amostras de CWV de cada modo de cache
+CWV_QUANTILES = (0.5, 0.75, 0.95)
+
+# Métricas do sampler em ms (publicadas em segundos); cls é adimensional
+CWV_TIMINGS = ("fcp", "lcp", "ttfb", "blocking_time")
+
+# Vereditos do regression_detector; inconclusivo (sem mudança detectável) publica 0
+VERDICT_VALUES = {"regressed": 1, "inconclusive": 0, "improved": -1}
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in pairs) + "}"
+
+def quantile(samples: List[float], q: float) -> float:
+    """Percentil com interpolação linear (mesmo método do numpy padrão)"""
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def route_label(url: str) -> str:
+    """Rota de uma URL como label (path + #seção, sem host)"""
+    from urllib.parse import urlparse
+
+    parsed = urlparse(url)
+    return (parsed.path or "/") + (f"#{parsed.fragment}" if parsed.fragment else "")
+
+class MetricFamily:
+    """Família de séries com os mesmos labels; .labels(...) devolve a série"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = lock
+        self.series: Dict[tuple, object] = {}
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self.series.get(key)
+        if series is None:
+            with self.lock:
+                series = self.series.setdefault(key, self.new_series())
+        return series
+
+    def new_series(self):
+        raise NotImplementedError
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+    def header(self, openmetrics: bool) -> List[str]:
+        name = self.name if openmetrics or self.kind != "counter" else f"{self.name}_total"
+        return [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+
+class CounterSeries:
+    def __init__(self, lock: threading.Lock):
+        self.lock = lock
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("counters só aumentam")
+        with self.lock:
+            self.value += amount
+
+class GaugeSeries:
+    def __init__(self, lock: threading.Lock):
+        self.lock = lock
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+class HistogramSeries:
+    def __init__(self, lock: threading.Lock, buckets: Sequence[float]):
+        self.lock = lock
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # último = +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+class Counter(MetricFamily):
+    kind = "counter"
+
+    def new_series(self):
+        return CounterSeries(self.lock)
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        return [f"{self.name}_total{format_labels(self.labelnames, key)} {format_value(series.value)}"
+                for key, series in self.series.items()]
+
+class Gauge(MetricFamily):
+    kind = "gauge"
+
+    def new_series(self):
+        return GaugeSeries(self.lock)
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        return [f"{self.name}{format_labels(self.labelnames, key)} {format_value(series.value)}"
+                for key, series in self.series.items()]
+
+class Histogram(MetricFamily):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames, lock, buckets: Sequence[float]):
+        super().__init__(name, documentation, labelnames, lock)
+        self.buckets = tuple(sorted(buckets))
+
+    def new_series(self):
+        return HistogramSeries(self.lock, self.buckets)
+
+    def samples(self, openmetrics: bool) -> List[str]:
+        lines = []
+        for key, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series.counts):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                labels = format_labels(self.labelnames, key, ("le", le))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {format_value(series.sum)}")
+        return lines
+
+class MetricsRegistry:
+    """Famílias registradas e renderização no formato de exposição"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.families: Dict[str, MetricFamily] = {}
+
+    def register(self, family: MetricFamily) -> MetricFamily:
+        with self.lock:
+            if family.name in self.families:
+                raise ValueError(f"métrica já registrada: {family.name}")
+            self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, self.lock))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, self.lock))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = STRESS_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, self.lock, buckets))
+
+    def render(self, openmetrics: bool = True) -> str:
+        """OpenMetrics 1.0 (com # EOF) ou texto 0.0.4 do Prometheus (textfile collector)"""
+        lines = []
+        with self.lock:
+            for family in self.families.values():
+                if not family.series:
+                    continue
+                lines.extend(family.header(openmetrics))
+                lines.extend(family.samples(openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+class MetricsServer:
+    """Endpoint /metrics numa thread daemon (porta 0 = porta livre escolhida pelo SO)"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "0.0.0.0", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.requested_port = port
+        self.httpd = None
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> Optional[int]:
+        return self.httpd.server_address[1] if self.httpd else None
+
+    def start(self) -> int:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "") \
+                    or "openmetrics" in self.path
+                body = registry.render(openmetrics=openmetrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # cada scrape não vira uma linha no console da suíte
+
+        self.httpd = ThreadingHTTPServer((self.host, self.requested_port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+class TextfileExporter:
+    """Grava o registro em <arquivo>.prom atomicamente (opcionalmente a cada N segundos)"""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 0):
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def write(self) -> Path:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.registry.render(openmetrics=False))
+        os.replace(temp_path, self.path)  # o collector nunca lê um arquivo pela metade
+        return self.path
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.loop, name="metrics-textfile", daemon=True)
+        self.thread.start()
+
+    def loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"⚠️ Erro ao gravar métricas em {self.path}: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+            self.thread = None
+
+class SuiteMetrics:
+    """Métricas da suíte; desligado por padrão (hooks das etapas viram no-op)"""
+
+    def __init__(self):
+        self.enabled = False
+        self.registry = MetricsRegistry()
+        self.server: Optional[MetricsServer] = None
+        self.textfile: Optional[TextfileExporter] = None
+        self.stress_started_at: Optional[float] = None
+        self.heap_baseline: Optional[int] = None
+
+        r = self.registry
+        self.stress_response = r.histogram(
+            "perf_suite_stress_response_seconds", "Latência das ações dos usuários virtuais", ["action"])
+        self.stress_requests = r.counter(
+            "perf_suite_stress_requests", "Ações dos usuários virtuais por resultado", ["action", "outcome"])
+        self.stress_active_users = r.gauge("perf_suite_stress_active_users", "Usuários virtuais ativos")
+        self.stress_throughput = r.gauge("perf_suite_stress_throughput_rps", "Ações concluídas por segundo")
+        self.stress_error_ratio = r.gauge("perf_suite_stress_error_ratio", "Fração de ações com erro")
+        self.web_vital = r.gauge(
+            "perf_suite_web_vital_seconds", "Percentis dos tempos de Core Web Vitals",
+            ["metric", "route", "profile", "mode", "quantile"])
+        self.cls = r.gauge(
+            "perf_suite_cls", "Percentis do Cumulative Layout Shift", ["route", "profile", "mode", "quantile"])
+        self.route_score = r.gauge(
+            "perf_suite_route_performance_score", "Score de performance por rota", ["route", "profile"])
+        self.heap_used = r.gauge("perf_suite_heap_used_bytes", "Heap JS usado no último snapshot", ["phase"])
+        self.heap_growth = r.gauge(
+            "perf_suite_heap_growth_bytes", "Crescimento do heap desde o primeiro snapshot da etapa")
+        self.bundle_chunk = r.gauge(
+            "perf_suite_bundle_chunk_bytes", "Tamanho dos chunks do bundle", ["chunk", "type", "encoding"])
+        self.bundle_total = r.gauge("perf_suite_bundle_total_bytes", "Tamanho total do bundle", ["encoding"])
+        self.stage_duration = r.gauge("perf_suite_stage_duration_seconds", "Duração da etapa", ["stage"])
+        self.stage_success = r.gauge("perf_suite_stage_success", "1 se a etapa terminou com sucesso", ["stage"])
+        self.overall_score = r.gauge("perf_suite_overall_score", "Score geral de performance da run")
+        self.regression = r.gauge(
+            "perf_suite_regression_verdict", "Veredito contra o histórico: 1 regressão, -1 melhora, 0 inconclusivo",
+            ["metric"])
+        self.relative_change = r.gauge(
+            "perf_suite_relative_change", "Mudança relativa da mediana contra a baseline histórica", ["metric"])
+
+    def enable(self, port: Optional[int] = None, textfile: Optional[str] = None,
+               host: str = "0.0.0.0", textfile_interval: float = 15):
+        """Liga os hooks e sobe o endpoint e/ou o textfile periódico"""
+        for family in self.registry.families.values():
+            family.clear()
+        self.stress_started_at = None
+        self.heap_baseline = None
+        self.enabled = True
+        if port is not None:
+            self.server = MetricsServer(self.registry, host, port)
+            self.server.start()
+        if textfile:
+            self.textfile = TextfileExporter(self.registry, textfile, textfile_interval)
+            self.textfile.start()
+
+    def flush(self):
+        """Grava o textfile agora (fim de etapa e fim da run)"""
+        if self.textfile:
+            try:
+                self.textfile.write()
+            except OSError as e:
+                print(f"⚠️ Erro ao gravar métricas em {self.textfile.path}: {e}")
+
+    def disable(self):
+        self.flush()
+        if self.textfile:
+            self.textfile.stop()
+            self.textfile = None
+        if self.server:
+            self.server.stop()
+            self.server = None
+        self.enabled = False
+
+    # Hooks das etapas (chamados com o exporter ligado)
+
+    def stress_user_started(self):
+        if self.stress_started_at is None:
+            self.stress_started_at = time.time()
+        self.stress_active_users.labels().inc()
+
+    def stress_user_finished(self):
+        self.stress_active_users.labels().dec()
+
+    def observe_stress_action(self, action: str, seconds: Optional[float], success: bool):
+        if success:
+            self.stress_response.labels(action=action).observe(seconds)
+        self.stress_requests.labels(action=action, outcome="success" if success else "error").inc()
+
+        total = sum(series.value for series in self.stress_requests.series.values())
+        failed = sum(series.value for key, series in self.stress_requests.series.items() if key[1] == "error")
+        elapsed = time.time() - (self.stress_started_at or time.time())
+        self.stress_error_ratio.labels().set(failed / total)
+        if elapsed > 0:
+            self.stress_throughput.labels().set((total - failed) / elapsed)
+
+    def publish_cwv_samples(self, route: str, profile: str, mode: str, metrics: Dict[str, Dict]):
+        """Percentis das amostras do AdaptiveSampler (report()['metrics'])"""
+        for name, summary in metrics.items():
+            samples = summary.get("samples") or []
+            if not samples or (name not in CWV_TIMINGS and name != "cls"):
+                continue
+            for q in CWV_QUANTILES:
+                value = quantile(samples, q)
+                if name == "cls":
+                    self.cls.labels(route=route, profile=profile, mode=mode, quantile=q).set(value)
+                else:
+                    self.web_vital.labels(metric=name, route=route, profile=profile, mode=mode,
+                                          quantile=q).set(value / 1000)
+
+    def publish_route_summary(self, route: str, profile: str, summary: Dict):
+        """Medianas de uma rota do crawl (cada rota × viewport roda num processo próprio)"""
+        if "performance_score" in summary:
+            self.route_score.labels(route=route, profile=profile).set(summary["performance_score"])
+        for name in ("fcp", "lcp"):
+            if summary.get(name) is not None:
+                self.web_vital.labels(metric=name, route=route, profile=profile, mode="crawl",
+                                      quantile=0.5).set(summary[name] / 1000)
+        if summary.get("tbt") is not None:
+            self.web_vital.labels(metric="blocking_time", route=route, profile=profile, mode="crawl",
+                                  quantile=0.5).set(summary["tbt"] / 1000)
+        if summary.get("cls") is not None:
+            self.cls.labels(route=route, profile=profile, mode="crawl", quantile=0.5).set(summary["cls"])
+
+    def observe_heap(self, heap_used: int, phase: str):
+        if self.heap_baseline is None:
+            self.heap_baseline = heap_used
+        self.heap_used.labels(phase=phase).set(heap_used)
+        self.heap_growth.labels().set(heap_used - self.heap_baseline)
+
+    def publish_bundle(self, files):
+        """Tamanho por chunk, sem o hash do nome (BundleFile: name, type, size, gzipped_size)"""
+        from bundle_analyzer import HASHED_ASSET_PATTERN
+
+        sizes: Dict[tuple, int] = {}
+        for bundle_file in files:
+            match = HASHED_ASSET_PATTERN.match(bundle_file.name)
+            chunk = match.group('name') if match else bundle_file.name
+            for encoding, size in (("raw", bundle_file.size), ("gzip", bundle_file.gzipped_size)):
+                key = (chunk, bundle_file.type, encoding)
+                sizes[key] = sizes.get(key, 0) + size
+        for (chunk, file_type, encoding), size in sizes.items():
+            self.bundle_chunk.labels(chunk=chunk, type=file_type, encoding=encoding).set(size)
+        for encoding in ("raw", "gzip"):
+            self.bundle_total.labels(encoding=encoding).set(
+                sum(size for key, size in sizes.items() if key[2] == encoding))
+
+    def publish_stage(self, stage: str, status: str, duration_seconds: float):
+        self.stage_duration.labels(stage=stage).set(duration_seconds)
+        self.stage_success.labels(stage=stage).set(1 if status == "success" else 0)
+        self.flush()
+
+    def publish_report(self, overall_score: float, historical: Optional[Dict]):
+        """Score da run e vereditos da detecção de regressões contra o histórico"""
+        self.overall_score.labels().set(overall_score)
+        for metric, verdict in ((historical or {}).get("metrics") or {}).items():
+            if verdict.get("verdict") in VERDICT_VALUES:
+                self.regression.labels(metric=metric).set(VERDICT_VALUES[verdict["verdict"]])
+            effect = verdict.get("effect") or {}
+            if effect.get("relative_change") is not None:
+                self.relative_change.labels(metric=metric).set(effect["relative_change"])
+        self.flush()
+
+METRICS = SuiteMetrics()
+
+def parse_openmetrics(text: str) -> Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float]:
+    """Parser mínimo do formato de exposição: {(amostra, labels ordenados): valor} (scrape de teste)"""
+    import re
+
+    pattern = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+    label_pattern = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = pattern.match(line)
+        if not match:
+            raise ValueError(f"linha inválida: {line}")
+        name, raw_labels, value = match.groups()
+        labels = tuple(sorted(
+            (key, raw.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\"))
+            for key, raw in label_pattern.findall(raw_labels or "")
+        ))
+        samples[(name, labels)] = float(value)
+    return samples
+
+def scrape(url: str, openmetrics: bool = True, timeout: float = 5) -> Tuple[str, str]:
+    """Raspa o endpoint como o Prometheus faria: (content-type, corpo)"""
+    from urllib.request import Request, urlopen
+
+    accept = "application/openmetrics-text; version=1.0.0" if openmetrics else "text/plain; version=0.0.4"
+    with urlopen(Request(url, headers={"Accept": accept}), timeout=timeout) as response:
+        return response.headers.get("Content-Type", ""), response.read().decode("utf-8")
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+🌐 Network Recorder - Projeto M
+Gravação de eventos Network.* do CDP, export HAR e cadeia crítica de requests
+
+Funcionalidades:
+- Leitura em streaming do performance log (só mensagens Network.* são decodificadas)
+- Índice compacto por requestId (prioridade, iniciador, timing, bytes, cache, redirects)
+- Export HAR 1.2 (abre no DevTools, WebPageTest e afins)
+- Cadeia crítica até o LCP: caminho de dependências mais longo e o request que mais a atrasa
+- Recursos render-blocking e prioridades incompatíveis (LCP em baixa prioridade,
+  fontes descobertas tarde, mídia disputando banda antes do LCP)
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from chrome_trace import iter_log_messages
+
+# Marcador para decodificar só as mensagens de rede do performance log
+NETWORK_MESSAGE_MARKER = '"Network.'
+
+PRIORITY_ORDER = {'VeryLow': 0, 'Low': 1, 'Medium': 2, 'High': 3, 'VeryHigh': 4}
+
+# Mesmo critério do critical-request-chains do Lighthouse
+CRITICAL_PRIORITIES = {'VeryHigh', 'High', 'Medium'}
+NON_CRITICAL_TYPES = {'Image', 'XHR', 'Fetch', 'EventSource', 'Media', 'Ping', 'Preflight'}
+
+# renderBlockingBehavior do Chrome que de fato bloqueia a primeira renderização
+RENDER_BLOCKING_BEHAVIORS = {'Blocking', 'InBodyParserBlocking'}
+
+# Transferências não críticas acima disso antes do LCP disputam banda com ele
+CONTENTION_MIN_BYTES = 100 * 1024
+
+# Recursos que bloqueiam a renderização segundo o DOM (fallback quando o CDP não informa)
+RENDER_BLOCKING_SCRIPT = """
+    const urls = [];
+    document.querySelectorAll('link[rel~="stylesheet"][href]').forEach((link) => {
+        if (!link.disabled && (!link.media || link.media === 'all' || matchMedia(link.media).matches)) {
+            urls.push(link.href);
+        }
+    });
+    document.querySelectorAll('head script[src]').forEach((script) => {
+        if (!script.async && !script.defer && script.type !== 'module') urls.push(script.src);
+    });
+    return urls;
+"""
+
+class RequestRecord:
+    """Um request no índice (slots: milhares de requests por sessão sem custo de dict)"""
+    __slots__ = ('request_id', 'url', 'method', 'resource_type', 'priority', 'initial_priority',
+                 'initiator_type', 'initiator_url', 'is_link_preload', 'render_blocking',
+                 'start', 'wall_time', 'status', 'status_text', 'mime_type', 'protocol',
+                 'remote_ip', 'from_cache', 'timing', 'response_time', 'end', 'encoded_bytes',
+                 'data_bytes', 'failed', 'redirect_url', 'request_headers', 'response_headers')
+
+    def __init__(self, request_id: str, url: str, method: str = 'GET'):
+        self.request_id = request_id
+        self.url = url
+        self.method = method
+        self.resource_type = 'Other'
+        self.priority = ''
+        self.initial_priority = ''
+        self.initiator_type = ''
+        self.initiator_url = ''
+        self.is_link_preload = False
+        self.render_blocking = ''  # renderBlockingBehavior do Chrome ('' = desconhecido)
+        self.start = 0.0  # s (relógio monotônico do CDP)
+        self.wall_time = 0.0  # s (época)
+        self.status = 0
+        self.status_text = ''
+        self.mime_type = ''
+        self.protocol = ''
+        self.remote_ip = ''
+        self.from_cache = ''  # disk, memory, service_worker, prefetch
+        self.timing: Optional[Dict] = None
+        self.response_time = 0.0
+        self.end = 0.0
+        self.encoded_bytes = 0
+        self.data_bytes = 0
+        self.failed = ''
+        self.redirect_url = ''
+        self.request_headers: Optional[Dict] = None
+        self.response_headers: Optional[Dict] = None
+
+    @property
+    def name(self) -> str:
+        path = urlparse(self.url).path
+        return path.rsplit('/', 1)[-1] or path or self.url
+
+def initiator_source(initiator: Dict) -> str:
+    """URL que originou o request (documento/CSS do parser ou script da pilha)"""
+    if initiator.get('url'):
+        return initiator['url']
+
+    stack = initiator.get('stack')
+    while stack:
+        for frame in stack.get('callFrames', []):
+            if frame.get('url'):
+                return frame['url']
+        stack = stack.get('parent')
+    return ''
+
+class NetworkRecorder:
+    """Indexa eventos Network.* de um carregamento por requestId"""
+
+    def __init__(self, keep_headers: bool = True):
+        self.keep_headers = keep_headers  # necessários só para o HAR
+        self.requests: Dict[str, RequestRecord] = {}
+        self.order: List[str] = []
+        self.redirects = 0
+        self.events = 0
+
+    def feed_log(self, entries: Iterable[Dict]):
+        """Consome entradas do performance log sem decodificar mensagens que não são de rede"""
+        self.feed(iter_log_messages(
+            entry for entry in entries if NETWORK_MESSAGE_MARKER in entry.get('message', '')
+        ))
+
+    def feed(self, messages: Iterable[Tuple[str, Dict]]):
+        """Processa pares (method, params) do CDP"""
+        for method, params in messages:
+            handler = self.HANDLERS.get(method)
+            if handler:
+                self.events += 1
+                handler(self, params)
+
+    def add(self, record: RequestRecord):
+        self.requests[record.request_id] = record
+        self.order.append(record.request_id)
+
+    def on_request_will_be_sent(self, params: Dict):
+        request_id = params['requestId']
+        request = params.get('request', {})
+
+        # Redirect: o mesmo requestId é reutilizado; o salto anterior vira um registro próprio
+        previous = self.requests.get(request_id)
+        if previous and params.get('redirectResponse'):
+            self.redirects += 1
+            self.apply_response(previous, params['redirectResponse'], params.get('timestamp', 0))
+            previous.end = params.get('timestamp', 0)
+            previous.redirect_url = request.get('url', '')
+            previous.request_id = f"{request_id}:redirect{self.redirects}"
+            self.requests[previous.request_id] = previous
+            self.order[self.order.index(request_id)] = previous.request_id
+
+        record = RequestRecord(request_id, request.get('url', ''), request.get('method', 'GET'))
+        record.resource_type = params.get('type', 'Other')
+        record.priority = record.initial_priority = request.get('initialPriority', '')
+        record.is_link_preload = bool(request.get('isLinkPreload'))
+        record.render_blocking = params.get('renderBlockingBehavior', '') or request.get('renderBlockingBehavior', '')
+        record.start = params.get('timestamp', 0)
+        record.wall_time = params.get('wallTime', 0)
+
+        initiator = params.get('initiator', {})
+        record.initiator_type = initiator.get('type', '')
+        record.initiator_url = initiator_source(initiator)
+        if previous and params.get('redirectResponse'):
+            record.initiator_type = 'redirect'
+            record.initiator_url = previous.url
+
+        if self.keep_headers:
+            record.request_headers = request.get('headers', {})
+        self.add(record)
+
+    def apply_response(self, record: RequestRecord, response: Dict, timestamp: float):
+        record.status = response.get('status', 0)
+        record.status_text = response.get('statusText', '')
+        record.mime_type = response.get('mimeType', '')
+        record.protocol = response.get('protocol', '')
+        record.remote_ip = response.get('remoteIPAddress', '')
+        record.timing = response.get('timing')
+        record.response_time = timestamp
+        if response.get('fromServiceWorker'):
+            record.from_cache = 'service_worker'
+        elif response.get('fromPrefetchCache'):
+            record.from_cache = 'prefetch'
+        elif response.get('fromDiskCache'):
+            record.from_cache = record.from_cache or 'disk'
+        if self.keep_headers:
+            record.response_headers = response.get('headers', {})
+
+    def on_response_received(self, params: Dict):
+        record = self.requests.get(params['requestId'])
+        if record:
+            record.resource_type = params.get('type', record.resource_type)
+            self.apply_response(record, params.get('response', {}), params.get('timestamp', 0))
+
+    def on_data_received(self, params: Dict):
+        record = self.requests.get(params['requestId'])
+        if record:
+            record.data_bytes += params.get('dataLength', 0)
+
+    def on_loading_finished(self, params: Dict):
+        record = self.requests.get(params['requestId'])
+        if record:
+            record.end = params.get('timestamp', 0)
+            record.encoded_bytes = params.get('encodedDataLength', 0)
+
+    def on_loading_failed(self, params: Dict):
+        record = self.requests.get(params['requestId'])
+        if record:
+            record.end = params.get('timestamp', 0)
+            record.failed = 'canceled' if params.get('canceled') else params.get('errorText', 'failed')
+
+    def on_served_from_cache(self, params: Dict):
+        record = self.requests.get(params['requestId'])
+        if record:
+            record.from_cache = 'memory'
+
+    def on_priority_changed(self, params: Dict):
+        record = self.requests.get(params['requestId'])
+        if record:
+            record.priority = params.get('newPriority', record.priority)
+
+    HANDLERS: Dict[str, Callable] = {
+        'Network.requestWillBeSent': on_request_will_be_sent,
+        'Network.responseReceived': on_response_received,
+        'Network.dataReceived': on_data_received,
+        'Network.loadingFinished': on_loading_finished,
+        'Network.loadingFailed': on_loading_failed,
+        'Network.requestServedFromCache': on_served_from_cache,
+        'Network.resourceChangedPriority': on_priority_changed,
+    }
+
+    def records(self) -> List[RequestRecord]:
+        return [self.requests[request_id] for request_id in self.order]
+
+    def document(self) -> Optional[RequestRecord]:
+        """Request do documento principal (origem do tempo: navigation start)"""
+        return next((r for r in self.records() if r.resource_type == 'Document'), None)
+
+    def summary(self) -> Dict:
+        """Contagens e bytes transferidos (mesmas chaves do analyze_network_requests antigo)"""
+        records = [r for r in self.records() if not r.redirect_url]
+        cache_hits = sum(1 for r in records if r.from_cache)
+        return {
+            'requests_count': len(records),
+            'total_transfer_size': sum(r.encoded_bytes for r in records),
+            'cache_hits': cache_hits,
+            'cache_misses': len(records) - cache_hits,
+            'failed_requests': sum(1 for r in records if r.failed),
+            'redirects': self.redirects
+        }
+
+    # --- Cadeia crítica -------------------------------------------------------------------
+
+    def parents(self) -> Dict[str, Optional[RequestRecord]]:
+        """Request iniciador de cada request (primeiro request da URL iniciadora, iniciado antes)"""
+        by_url: Dict[str, RequestRecord] = {}
+        for record in self.records():
+            by_url.setdefault(record.url, record)
+
+        parents = {}
+        for record in self.records():
+            parent = by_url.get(record.initiator_url)
+            parents[record.request_id] = parent if parent is not record and parent and parent.start <= record.start else None
+        return parents
+
+    def is_critical(self, record: RequestRecord) -> bool:
+        """Request que pode atrasar a primeira renderização (critério do Lighthouse)"""
+        if record.is_link_preload or record.resource_type in NON_CRITICAL_TYPES:
+            return False
+        if record.mime_type.startswith('image/'):
+            return False
+        return record.priority in CRITICAL_PRIORITIES
+
+    def is_render_blocking(self, record: RequestRecord, dom_blocking: Optional[set] = None) -> bool:
+        if record.render_blocking:
+            return record.render_blocking in RENDER_BLOCKING_BEHAVIORS
+        if dom_blocking is not None:
+            return record.url in dom_blocking
+        # Heurística: CSS do parser em prioridade máxima
+        return record.resource_type == 'Stylesheet' and record.initiator_type == 'parser' and record.priority == 'VeryHigh'
+
+    def analyze(self, lcp_ms: float = 0, lcp_url: str = '', fcp_ms: float = 0,
+                render_blocking_urls: Optional[Iterable[str]] = None,
+                resolve_chunk: Optional[Callable[[str], str]] = None) -> Dict:
+        """Cadeia crítica até o LCP, recursos render-blocking e prioridades incompatíveis"""
+        document = self.document()
+        if not document:
+            return {'available': False}
+
+        origin = document.start
+        lcp_ts = origin + lcp_ms / 1000 if lcp_ms else float('inf')
+        fcp_ts = origin + fcp_ms / 1000 if fcp_ms else float('inf')
+        dom_blocking = set(render_blocking_urls) if render_blocking_urls is not None else None
+        parents = self.parents()
+        records = [r for r in self.records() if not r.redirect_url]
+
+        def describe(record: RequestRecord, parent: Optional[RequestRecord] = None) -> Dict:
+            end = record.end or record.response_time or record.start
+            # Tempo que o request acrescenta à cadeia depois que o pai terminou (inclui descoberta)
+            parent_end = (parent.end or parent.start) if parent else origin
+            return {
+                'url': record.url,
+                'name': record.name,
+                'chunk': resolve_chunk(record.url) if resolve_chunk and record.resource_type == 'Script' else None,
+                'type': record.resource_type,
+                'priority': record.priority,
+                'initiator': record.initiator_type,
+                'start_ms': (record.start - origin) * 1000,
+                'end_ms': (end - origin) * 1000,
+                'duration_ms': (end - record.start) * 1000,
+                'added_ms': max(0.0, (end - max(parent_end, origin)) * 1000),
+                'transfer_bytes': record.encoded_bytes,
+                'from_cache': record.from_cache
+            }
+
+        def path_to(record: RequestRecord) -> List[RequestRecord]:
+            path, seen = [], set()
+            while record and record.request_id not in seen:
+                seen.add(record.request_id)
+                path.append(record)
+                record = parents.get(record.request_id)
+            return path[::-1]
+
+        def chain(path: List[RequestRecord]) -> List[Dict]:
+            return [describe(record, path[index - 1] if index else None) for index, record in enumerate(path)]
+
+        # Cadeias críticas: caminho mais longo (fim da folha - início da raiz) concluído até o LCP
+        critical = [r for r in records if (self.is_critical(r) or r is document) and (r.end or r.start) <= lcp_ts]
+        longest: List[RequestRecord] = []
+        longest_ms = 0.0
+        for record in critical:
+            path = path_to(record)
+            if not all(self.is_critical(r) or r is document for r in path):
+                continue
+            length = ((record.end or record.start) - path[0].start) * 1000
+            if length > longest_ms:
+                longest, longest_ms = path, length
+
+        # Cadeia do LCP: até o recurso do elemento LCP (imagem/poster) ou a cadeia crítica mais longa
+        lcp_resource = next((r for r in records if lcp_url and r.url == lcp_url), None)
+        lcp_path = path_to(lcp_resource) if lcp_resource else longest
+        lcp_chain = chain(lcp_path)
+        bottleneck = max(lcp_chain, key=lambda node: node['added_ms'], default=None)
+
+        render_blocking = [
+            describe(r) for r in records
+            if r is not document and r.start <= fcp_ts and self.is_render_blocking(r, dom_blocking)
+        ]
+
+        return {
+            'available': True,
+            'requests': len(records),
+            'transfer_bytes': sum(r.encoded_bytes for r in records),
+            'lcp_ms': lcp_ms,
+            'lcp_url': lcp_url,
+            'lcp_resource': describe(lcp_resource, parents.get(lcp_resource.request_id)) if lcp_resource else None,
+            'longest_chain': chain(longest),
+            'longest_chain_ms': longest_ms,
+            'lcp_chain': lcp_chain,
+            'lcp_bottleneck': bottleneck,
+            'render_blocking': render_blocking,
+            'render_blocking_ms': max((node['end_ms'] for node in render_blocking), default=0),
+            'priority_mismatches': self.priority_mismatches(records, lcp_resource, lcp_ts, parents, describe)
+        }
+
+    def priority_mismatches(self, records: List[RequestRecord], lcp_resource: Optional[RequestRecord],
+                            lcp_ts: float, parents: Dict, describe: Callable) -> List[Dict]:
+        mismatches = []
+
+        if lcp_resource and PRIORITY_ORDER.get(lcp_resource.initial_priority, 0) < PRIORITY_ORDER['High']:
+            mismatches.append({
+                'kind': 'lcp_low_priority',
+                'request': describe(lcp_resource),
+                'suggestion': 'fetchpriority="high" (ou <link rel="preload">) no recurso do LCP'
+            })
+
+        for record in records:
+            if record is lcp_resource or record.start > lcp_ts:
+                continue
+            parent = parents.get(record.request_id)
+
+            # Fonte só descoberta depois que o CSS chegou: um round-trip a mais antes do texto
+            if (record.resource_type == 'Font' and not record.is_link_preload
+                    and parent is not None and parent.resource_type == 'Stylesheet'):
+                mismatches.append({
+                    'kind': 'late_discovered_font',
+                    'request': describe(record, parent),
+                    'suggestion': '<link rel="preload" as="font" crossorigin> (e woff2 em vez de ttf/otf)'
+                })
+
+            # Mídia/imagem grande baixada antes do LCP sem ser o LCP: disputa banda
+            elif (record.resource_type in ('Media', 'Image') and record.encoded_bytes >= CONTENTION_MIN_BYTES
+                    and record.end and record.start < lcp_ts):
+                mismatches.append({
+                    'kind': 'bandwidth_contention',
+                    'request': describe(record, parent),
+                    'suggestion': 'adiar para depois do LCP (preload="none"/loading="lazy" ou fetchpriority="low")'
+                })
+
+        return mismatches
+
+    # --- HAR ---------------------------------------------------------------------------
+
+    def to_har(self, page_title: str = '', page_timings: Optional[Dict] = None) -> Dict:
+        """Exporta o carregamento em HAR 1.2"""
+        document = self.document()
+        page_id = 'page_1'
+        started = document.wall_time if document else 0
+
+        return {
+            'log': {
+                'version': '1.2',
+                'creator': {'name': 'Projeto M Performance Suite', 'version': '1.0'},
+                'pages': [{
+                    'startedDateTime': iso_time(started),
+                    'id': page_id,
+                    'title': page_title or (document.url if document else ''),
+                    'pageTimings': {
+                        'onContentLoad': (page_timings or {}).get('onContentLoad', -1),
+                        'onLoad': (page_timings or {}).get('onLoad', -1)
+                    }
+                }],
+                'entries': [har_entry(record, page_id) for record in self.records()]
+            }
+        }
+
+    def save_har(self, path: str, page_title: str = '', page_timings: Optional[Dict] = None) -> str:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_har(page_title, page_timings), f, ensure_ascii=False)
+        return path
+
+def iso_time(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, tz=timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+def har_headers(headers: Optional[Dict]) -> List[Dict]:
+    return [{'name': name, 'value': str(value)} for name, value in (headers or {}).items()]
+
+def har_timings(record: RequestRecord) -> Dict:
+    """Fases do ResourceTiming do CDP (ms relativos a requestTime) no formato HAR"""
+    timing = record.timing
+    end = record.end or record.response_time or record.start
+    total = (end - record.start) * 1000
+
+    if not timing:
+        return {'blocked': -1, 'dns': -1, 'connect': -1, 'ssl': -1, 'send': 0, 'wait': max(0.0, total), 'receive': 0}
+
+    def span(start_key: str, end_key: str) -> float:
+        start, stop = timing.get(start_key, -1), timing.get(end_key, -1)
+        return stop - start if start >= 0 and stop >= 0 else -1
+
+    # Fila antes do requestTime + espera até a primeira fase de rede
+    queued = (timing['requestTime'] - record.start) * 1000
+    first_phase = next((timing[key] for key in ('dnsStart', 'connectStart', 'sendStart') if timing.get(key, -1) >= 0), 0)
+    receive_headers_end = timing.get('receiveHeadersEnd', 0)
+    received = (end - timing['requestTime']) * 1000 - receive_headers_end
+
+    return {
+        'blocked': max(0.0, queued + first_phase),
+        'dns': span('dnsStart', 'dnsEnd'),
+        'connect': span('connectStart', 'connectEnd'),
+        'ssl': span('sslStart', 'sslEnd'),  # já incluído em connect (HAR 1.2)
+        'send': max(0.0, span('sendStart', 'sendEnd')),
+        'wait': max(0.0, receive_headers_end - max(0, timing.get('sendEnd', 0))),
+        'receive': max(0.0, received)
+    }
+
+def har_entry(record: RequestRecord, page_id: str) -> Dict:
+    timings = har_timings(record)
+    http_version = record.protocol.upper() if record.protocol else 'HTTP/1.1'
+
+    return {
+        'pageref': page_id,
+        'startedDateTime': iso_time(record.wall_time),
+        'time': sum(value for key, value in timings.items() if key != 'ssl' and value > 0),
+        'request': {
+            'method': record.method,
+            'url': record.url,
+            'httpVersion': http_version,
+            'cookies': [],
+            'headers': har_headers(record.request_headers),
+            'queryString': [{'name': name, 'value': value} for name, value in parse_qsl(urlparse(record.url).query)],
+            'headersSize': -1,
+            'bodySize': 0 if record.method in ('GET', 'HEAD') else -1
+        },
+        'response': {
+            'status': record.status,
+            'statusText': record.status_text or record.failed,
+            'httpVersion': http_version,
+            'cookies': [],
+            'headers': har_headers(record.response_headers),
+            'content': {'size': record.data_bytes, 'mimeType': record.mime_type or 'x-unknown'},
+            'redirectURL': record.redirect_url,
+            'headersSize': -1,
+            'bodySize': record.encoded_bytes if record.end else -1
+        },
+        'cache': {},
+        'timings': timings,
+        'serverIPAddress': record.remote_ip.strip('[]'),
+        # Campos próprios (prefixo "_", permitido pelo HAR) usados pelo DevTools
+        '_priority': record.priority,
+        '_resourceType': record.resource_type.lower(),
+        '_initiator': {'type': record.initiator_type, 'url': record.initiator_url},
+        '_fromCache': record.from_cache,
+        '_renderBlocking': record.render_blocking
+    }
+
+def collect_render_blocking_urls(driver) -> Optional[List[str]]:
+    """URLs de CSS e scripts síncronos do <head> (render-blocking segundo o DOM)"""
+    try:
+        return driver.execute_script(RENDER_BLOCKING_SCRIPT)
+    except Exception:
+        return None
+
+def main():
+    """Analisa um HAR salvo: python network_recorder.py arquivo.har"""
+    if len(sys.argv) < 2:
+        print("Uso: python network_recorder.py arquivo.har")
+        return
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        entries = json.load(f)['log']['entries']
+
+    print(f"🌐 {len(entries)} requests")
+    for entry in sorted(entries, key=lambda e: e['time'], reverse=True)[:15]:
+        print(f"   {entry['time']:>7.0f}ms {entry.get('_priority', ''):<9} "
+              f"{entry.get('_resourceType', ''):<11} {entry['request']['url'][:80]}")
+
+if __name__ == "__main__":
+    main()
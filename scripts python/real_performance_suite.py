@@ -4,7 +4,16 @@
 Coleta métricas reais de performance do navegador
 
 Funcionalidades:
-- Core Web Vitals (FCP, LCP, CLS, FID)
+- Core Web Vitals (FCP, LCP, CLS, FID, INP)
+- Interações roteirizadas via CDP (INP real com atribuição a long tasks/scripts)
+- Breakdown da main thread por carregamento (trace devtools.timeline) por script e chunk
+- Score de performance equivalente ao Lighthouse (curvas log-normais versionadas, sem Node)
+- Speed Index e completude visual via screencast (filmstrip em disco)
+- Gravação de rede via CDP: HAR 1.2, cadeia crítica até o LCP, render-blocking e prioridades
+- Agente de métricas no início do documento (observers buffered, coleta única)
+- Amostragem adaptativa com medianas, médias aparadas e IC 95% por bootstrap
+- Modos de cache: cold, HTTP cache quente e code cache quente (bytes transferidos e cache hits)
+- Perfis de dispositivo com throttling de CPU e rede (matriz perfil × modo de cache)
 - Performance Timeline API
 - Resource Loading Times
 - Network Performance
@@ -15,10 +24,11 @@ Funcionalidades:
 import asyncio
 import json
 import time
-import statistics
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 try:
@@ -29,9 +39,47 @@ try:
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     from webdriver_manager.chrome import ChromeDriverManager
-except ImportError:
-    print("⚠️ Instale as dependências: pip install selenium webdriver-manager")
-    exit(1)
+except ImportError as e:
+    raise ImportError("⚠️ Instale as dependências: pip install selenium webdriver-manager") from e
+
+from metrics_agent import install_metrics_agent, collect_agent_metrics
+from interaction_latency import InteractionRunner, interaction_report_to_dict
+from chrome_trace import (TIMELINE_TRACE_CATEGORIES, MainThreadBreakdown,
+                          chrome_perf_logging_prefs, iter_trace_events)
+from bundle_analyzer import load_manual_chunks, resolve_chunk_name
+from network_recorder import NetworkRecorder, collect_render_blocking_urls
+from lighthouse_scoring import DEFAULT_SCORING_VERSION, score_metrics
+from measurement_stats import DEFAULT_CI_TARGETS, AdaptiveSampler, robust_median, trimmed_mean
+from metrics_exporter import METRICS, route_label
+from replay_proxy import apply_replay_proxy
+from suite_tracer import instrument_driver, traced
+
+@dataclass
+class DeviceProfile:
+    """Perfil de dispositivo: viewport, throttling de CPU e de rede"""
+    name: str
+    width: int
+    height: int
+    device_scale_factor: float
+    mobile: bool
+    cpu_slowdown: float  # Emulation.setCPUThrottlingRate (1 = sem throttling)
+    latency_ms: float = 0  # 0 e throughput 0 = rede sem throttling
+    download_kbps: float = 0
+    upload_kbps: float = 0
+
+# Modos de cache medidos: cold (sem cache), warm_http (cache HTTP), warm_code (cache HTTP + code cache do V8)
+CACHE_MODES = ('cold', 'warm_http', 'warm_code')
+
+# Rede com os valores de throttling do DevTools usados pelo Lighthouse (latência já multiplicada)
+DEVICE_PROFILES = {
+    'desktop': DeviceProfile('desktop', 1920, 1080, 1, False, cpu_slowdown=1),
+    'desktop_cable': DeviceProfile('desktop_cable', 1366, 768, 1, False, cpu_slowdown=1,
+                                   latency_ms=28, download_kbps=5000, upload_kbps=1000),
+    'mid_tier_mobile': DeviceProfile('mid_tier_mobile', 412, 823, 1.75, True, cpu_slowdown=4,
+                                     latency_ms=562.5, download_kbps=1474.56, upload_kbps=675),  # slow 4G
+    'low_end_mobile': DeviceProfile('low_end_mobile', 360, 640, 2, True, cpu_slowdown=6,
+                                    latency_ms=2000, download_kbps=400, upload_kbps=400),  # 3G lento
+}
 
 @dataclass
 class CoreWebVitals:
@@ -47,6 +95,11 @@ class CoreWebVitals:
     lcp_score: int
     cls_score: int
     overall_score: int
+    
+    inp: float = 0  # Interaction to Next Paint (ms), 0 sem interações
+    tbt: float = 0  # Total Blocking Time (ms)
+    si: float = 0  # Speed Index (ms), 0 quando não medido
+    scoring_version: str = ""  # versão das curvas usadas nos scores (lighthouse_scoring)
 
 @dataclass
 class ResourceMetrics:
@@ -107,6 +160,35 @@ class NetworkMetrics:
     # Timing médio
     avg_response_time: float
     avg_download_time: float
+    
+    # Revalidações (304): poucos bytes transferidos, corpo vindo do cache
+    revalidated_requests: int = 0
+
+@dataclass
+class CacheModeResult:
+    """Métricas de um modo de cache (cold, warm_http, warm_code)"""
+    mode: str
+    runs: int
+    core_web_vitals: CoreWebVitals
+    resource_metrics: ResourceMetrics
+    javascript_metrics: JavaScriptMetrics
+    network_metrics: NetworkMetrics
+    transfer_bytes: int
+    cache_hit_ratio: float  # requests servidos do cache / total
+    measurement_stats: Dict
+    interactions: Optional[Dict] = None  # sessão de interações (só no modo principal)
+    visual_progress: Optional[Dict] = None  # screencast: Speed Index e filmstrip (só no modo principal)
+    main_thread: Optional[Dict] = None  # breakdown da main thread (mediana das runs)
+    request_chain: Optional[Dict] = None  # cadeia crítica da última run (só no modo principal)
+
+@dataclass
+class DeviceProfileResult:
+    """Resultados de um perfil de dispositivo (todos os modos de cache)"""
+    profile: DeviceProfile
+    performance_score: int
+    cache_modes: Dict[str, CacheModeResult]
+    critical_issues: List[str]
+    warnings: List[str]
 
 @dataclass
 class PerformanceAnalysis:
@@ -134,6 +216,30 @@ class PerformanceAnalysis:
     
     # Comparação
     baseline_comparison: Optional[Dict] = None
+    
+    # Amostragem: runs, IC 95% e outliers por métrica
+    measurement_stats: Optional[Dict] = None
+    
+    # Resultados por modo de cache
+    cache_modes: Optional[Dict[str, Dict]] = None
+    
+    # Matriz de perfis de dispositivo (CPU/rede)
+    device_profiles: Optional[Dict[str, Dict]] = None
+    
+    # Latência por interação roteirizada (perfil/modo principais)
+    interactions: Optional[Dict] = None
+    
+    # Breakdown da main thread por grupo e chunk (perfil/modo principais)
+    main_thread: Optional[Dict] = None
+    
+    # Progresso visual do carregamento (perfil/modo principais)
+    visual_progress: Optional[Dict] = None
+    
+    # Cadeia crítica de requests, render-blocking e prioridades (perfil/modo principais)
+    request_chain: Optional[Dict] = None
+    
+    # Scoring local (versão, form factor, score por métrica)
+    scoring: Optional[Dict] = None
 
 class RealPerformanceSuite:
     """Suite real de análise de performance"""
@@ -141,13 +247,57 @@ class RealPerformanceSuite:
     def __init__(self, base_url: str = "http://localhost:8080"):
         self.base_url = base_url
         self.driver: Optional[webdriver.Chrome] = None
+        self.last_agent_metrics: Dict = {}  # snapshot bruto do agente da última coleta
         self.session_id = f"perf_real_{int(time.time())}"
         
         # Configurações
         self.warmup_runs = 2
-        self.measurement_runs = 3
-        self.wait_time = 2
         
+        # Scoring equivalente ao Lighthouse; o form factor segue o perfil de dispositivo
+        self.scoring_version = DEFAULT_SCORING_VERSION
+        self.form_factor = 'desktop'
+        
+        # Amostragem adaptativa: mínimo de runs, orçamento máximo e IC alvo por métrica
+        self.min_runs = 3
+        self.max_runs = 12
+        self.ci_targets = dict(DEFAULT_CI_TARGETS)
+        
+        # Modos de cache medidos (cada um num perfil novo) e o que alimenta os scores
+        self.cache_modes = list(CACHE_MODES)
+        self.primary_cache_mode = 'warm_code'
+        
+        # Perfis de dispositivo medidos; os scores principais vêm do primeiro
+        self.device_profiles = ['desktop', 'mid_tier_mobile']
+        
+        # Sessão de interações (FID/INP reais) após a amostragem do modo principal
+        self.measure_interactions = True
+        
+        # Trace devtools.timeline de cada run medida (compile/execution e breakdown por chunk)
+        self.main_thread_tracing = True
+        self.manual_chunks = load_manual_chunks()
+        
+        # Captura por screencast (Speed Index, completude visual, filmstrip) no modo principal
+        self.measure_visual_progress = True
+        self.filmstrip_dir = Path("filmstrips")
+        
+        # Eventos Network.* de cada run medida; a última run do modo principal vira HAR
+        self.record_network = True
+        self.har_dir = Path("har")
+        
+        # Estabilização: load completo + janela sem novas entradas de performance
+        self.settle_quiet_ms = 500
+        self.settle_timeout_ms = 15000
+        
+    def perf_logging_prefs(self) -> Optional[Dict]:
+        """Trace events da main thread, frames do screencast e eventos de rede chegam pelo
+        performance log; cada um segue a sua própria flag (None = nenhum ligado)"""
+        if not (self.main_thread_tracing or self.measure_visual_progress or self.record_network):
+            return None
+        return chrome_perf_logging_prefs(
+            TIMELINE_TRACE_CATEGORIES if self.main_thread_tracing else None,
+            enable_page=self.measure_visual_progress, enable_network=self.record_network)
+    
+    @traced("driver_setup")
     def setup_driver(self) -> webdriver.Chrome:
         """Configura Chrome para coleta de performance"""
         options = Options()
@@ -175,423 +325,91 @@ class RealPerformanceSuite:
             'browser': 'SEVERE'
         })
         
+        perf_logging_prefs = self.perf_logging_prefs()
+        if perf_logging_prefs:
+            options.add_experimental_option('perfLoggingPrefs', perf_logging_prefs)
+        
+        # Proxy de record/replay ativo (respostas e latências determinísticas)
+        apply_replay_proxy(options)
+        
         service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
-    
-    async def collect_core_web_vitals(self) -> CoreWebVitals:
-        """Coleta Core Web Vitals reais"""
+        driver = instrument_driver(webdriver.Chrome(service=service, options=options))
         
-        # Script para coletar Core Web Vitals
-        cwv_script = """
-        return new Promise((resolve) => {
-            const metrics = {};
-            
-            // Observer para Core Web Vitals
-            if ('PerformanceObserver' in window) {
-                // FCP - First Contentful Paint
-                const fcpObserver = new PerformanceObserver((list) => {
-                    const entries = list.getEntries();
-                    if (entries.length > 0) {
-                        metrics.fcp = entries[0].startTime;
-                    }
-                });
-                
-                try {
-                    fcpObserver.observe({entryTypes: ['paint']});
-                } catch(e) {}
-                
-                // LCP - Largest Contentful Paint
-                const lcpObserver = new PerformanceObserver((list) => {
-                    const entries = list.getEntries();
-                    if (entries.length > 0) {
-                        metrics.lcp = entries[entries.length - 1].startTime;
-                    }
-                });
-                
-                try {
-                    lcpObserver.observe({entryTypes: ['largest-contentful-paint']});
-                } catch(e) {}
-                
-                // CLS - Cumulative Layout Shift
-                let clsValue = 0;
-                const clsObserver = new PerformanceObserver((list) => {
-                    for (const entry of list.getEntries()) {
-                        if (!entry.hadRecentInput) {
-                            clsValue += entry.value;
-                        }
-                    }
-                    metrics.cls = clsValue;
-                });
-                
-                try {
-                    clsObserver.observe({entryTypes: ['layout-shift']});
-                } catch(e) {}
-                
-                // FID - First Input Delay
-                const fidObserver = new PerformanceObserver((list) => {
-                    for (const entry of list.getEntries()) {
-                        metrics.fid = entry.processingStart - entry.startTime;
-                        break;
-                    }
-                });
-                
-                try {
-                    fidObserver.observe({entryTypes: ['first-input']});
-                } catch(e) {}
-            }
-            
-            // Navigation Timing para TTFB
-            const navigation = performance.getEntriesByType('navigation')[0];
-            if (navigation) {
-                metrics.ttfb = navigation.responseStart - navigation.requestStart;
-            }
-            
-            // Aguardar um tempo para coletar métricas
-            setTimeout(() => {
-                // Fallbacks usando Performance API
-                if (!metrics.fcp) {
-                    const paintEntries = performance.getEntriesByType('paint');
-                    const fcpEntry = paintEntries.find(entry => entry.name === 'first-contentful-paint');
-                    metrics.fcp = fcpEntry ? fcpEntry.startTime : 0;
-                }
-                
-                if (!metrics.lcp) {
-                    const lcpEntries = performance.getEntriesByType('largest-contentful-paint');
-                    metrics.lcp = lcpEntries.length > 0 ? lcpEntries[lcpEntries.length - 1].startTime : 0;
-                }
-                
-                if (metrics.cls === undefined) {
-                    metrics.cls = 0; // Fallback
-                }
-                
-                if (!metrics.fid) {
-                    metrics.fid = 0; // FID só é medido com interação real
-                }
-                
-                if (!metrics.ttfb && navigation) {
-                    metrics.ttfb = navigation.responseStart - navigation.fetchStart;
-                }
-                
-                resolve(metrics);
-            }, 3000);
-        });
-        """
+        # Observers registrados antes de qualquer script da aplicação
+        driver.set_script_timeout(self.settle_timeout_ms / 1000 + 5)
+        install_metrics_agent(driver)
         
+        return driver
+    
+    async def collect_run_metrics(self, on_slice: Optional[Callable[[], None]] = None
+                                  ) -> Tuple[CoreWebVitals, ResourceMetrics, JavaScriptMetrics, NetworkMetrics]:
+        """Coleta todas as métricas do agente quando a página estabiliza; on_slice roda entre as
+        fatias da espera (ex.: drenar o performance log durante o carregamento)"""
         try:
             if not self.driver:
                 raise Exception("Driver não inicializado")
             
             metrics = await asyncio.get_event_loop().run_in_executor(
-                None, self.driver.execute_async_script, cwv_script
+                None, collect_agent_metrics, self.driver, self.settle_quiet_ms, self.settle_timeout_ms, on_slice
             )
             
-            # Calcular scores baseados nas métricas
-            fcp_score = self.calculate_fcp_score(metrics.get('fcp', 0))
-            lcp_score = self.calculate_lcp_score(metrics.get('lcp', 0))
-            cls_score = self.calculate_cls_score(metrics.get('cls', 0))
+            if metrics.get('error'):
+                raise Exception(metrics['error'])
             
-            overall_score = int((fcp_score + lcp_score + cls_score) / 3)
+            self.last_agent_metrics = metrics
             
-            return CoreWebVitals(
-                fcp=metrics.get('fcp', 0),
-                lcp=metrics.get('lcp', 0),
-                cls=metrics.get('cls', 0),
-                fid=metrics.get('fid', 0),
-                ttfb=metrics.get('ttfb', 0),
-                fcp_score=fcp_score,
-                lcp_score=lcp_score,
-                cls_score=cls_score,
-                overall_score=overall_score
+            if metrics['settle']['timed_out']:
+                print(f"⚠️ Página não estabilizou em {self.settle_timeout_ms}ms - métricas parciais")
+            
+            return (
+                self.build_core_web_vitals(metrics['core_web_vitals'], metrics['javascript']['blocking_time']),
+                ResourceMetrics(**metrics['resources']),
+                JavaScriptMetrics(**metrics['javascript']),
+                NetworkMetrics(**metrics['network'])
             )
             
         except Exception as e:
-            print(f"⚠️ Erro ao coletar Core Web Vitals: {e}")
+            print(f"⚠️ Erro ao coletar métricas: {e}")
             # Retornar valores padrão em caso de erro
-            return CoreWebVitals(
-                fcp=0, lcp=0, cls=0, fid=0, ttfb=0,
-                fcp_score=0, lcp_score=0, cls_score=0, overall_score=0
+            return (
+                CoreWebVitals(0, 0, 0, 0, 0, 0, 0, 0, 0),
+                ResourceMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0),
+                JavaScriptMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0),
+                NetworkMetrics('unknown', 'unknown', 0, 0, 0, 0, 0, 0, 0)
             )
     
-    def calculate_fcp_score(self, fcp: float) -> int:
-        """Calcula score do FCP (0-100)"""
-        if fcp <= 1800:  # Bom
-            return 100
-        elif fcp <= 3000:  # Precisa melhorar
-            return int(100 - ((fcp - 1800) / 1200) * 50)
-        else:  # Ruim
-            return max(0, int(50 - ((fcp - 3000) / 1000) * 50))
-    
-    def calculate_lcp_score(self, lcp: float) -> int:
-        """Calcula score do LCP (0-100)"""
-        if lcp <= 2500:  # Bom
-            return 100
-        elif lcp <= 4000:  # Precisa melhorar
-            return int(100 - ((lcp - 2500) / 1500) * 50)
-        else:  # Ruim
-            return max(0, int(50 - ((lcp - 4000) / 1000) * 50))
-    
-    def calculate_cls_score(self, cls: float) -> int:
-        """Calcula score do CLS (0-100)"""
-        if cls <= 0.1:  # Bom
-            return 100
-        elif cls <= 0.25:  # Precisa melhorar
-            return int(100 - ((cls - 0.1) / 0.15) * 50)
-        else:  # Ruim
-            return max(0, int(50 - ((cls - 0.25) / 0.1) * 50))
-    
-    async def collect_resource_metrics(self) -> ResourceMetrics:
-        """Coleta métricas de recursos"""
-        
-        resource_script = """
-        const resources = performance.getEntriesByType('resource');
-        const navigation = performance.getEntriesByType('navigation')[0];
-        
-        const metrics = {
-            total_resources: resources.length,
-            total_size: 0,
-            total_transfer_size: 0,
-            scripts_count: 0,
-            scripts_size: 0,
-            stylesheets_count: 0,
-            stylesheets_size: 0,
-            images_count: 0,
-            images_size: 0,
-            fonts_count: 0,
-            fonts_size: 0,
-            dns_lookup_time: 0,
-            connection_time: 0,
-            request_time: 0,
-            response_time: 0
-        };
-        
-        // Analisar recursos
-        resources.forEach(resource => {
-            const size = resource.decodedBodySize || resource.encodedBodySize || 0;
-            const transferSize = resource.transferSize || 0;
-            
-            metrics.total_size += size;
-            metrics.total_transfer_size += transferSize;
-            
-            // Categorizar por tipo
-            if (resource.initiatorType === 'script' || resource.name.includes('.js')) {
-                metrics.scripts_count++;
-                metrics.scripts_size += size;
-            } else if (resource.initiatorType === 'css' || resource.name.includes('.css')) {
-                metrics.stylesheets_count++;
-                metrics.stylesheets_size += size;
-            } else if (resource.initiatorType === 'img' || /\\.(jpg|jpeg|png|gif|webp|svg)/.test(resource.name)) {
-                metrics.images_count++;
-                metrics.images_size += size;
-            } else if (/\\.(woff|woff2|ttf|otf|eot)/.test(resource.name)) {
-                metrics.fonts_count++;
-                metrics.fonts_size += size;
-            }
-        });
-        
-        // Timing de navegação
-        if (navigation) {
-            metrics.dns_lookup_time = navigation.domainLookupEnd - navigation.domainLookupStart;
-            metrics.connection_time = navigation.connectEnd - navigation.connectStart;
-            metrics.request_time = navigation.responseStart - navigation.requestStart;
-            metrics.response_time = navigation.responseEnd - navigation.responseStart;
-        }
-        
-        return metrics;
-        """
-        
-        try:
-            if not self.driver:
-                raise Exception("Driver não inicializado")
-            
-            metrics = self.driver.execute_script(resource_script)
-            
-            return ResourceMetrics(
-                total_resources=metrics['total_resources'],
-                total_size=metrics['total_size'],
-                total_transfer_size=metrics['total_transfer_size'],
-                scripts_count=metrics['scripts_count'],
-                scripts_size=metrics['scripts_size'],
-                stylesheets_count=metrics['stylesheets_count'],
-                stylesheets_size=metrics['stylesheets_size'],
-                images_count=metrics['images_count'],
-                images_size=metrics['images_size'],
-                fonts_count=metrics['fonts_count'],
-                fonts_size=metrics['fonts_size'],
-                dns_lookup_time=metrics['dns_lookup_time'],
-                connection_time=metrics['connection_time'],
-                request_time=metrics['request_time'],
-                response_time=metrics['response_time']
-            )
-            
-        except Exception as e:
-            print(f"⚠️ Erro ao coletar métricas de recursos: {e}")
-            return ResourceMetrics(
-                total_resources=0, total_size=0, total_transfer_size=0,
-                scripts_count=0, scripts_size=0, stylesheets_count=0, stylesheets_size=0,
-                images_count=0, images_size=0, fonts_count=0, fonts_size=0,
-                dns_lookup_time=0, connection_time=0, request_time=0, response_time=0
-            )
+    def build_core_web_vitals(self, metrics: Dict, tbt: float = 0) -> CoreWebVitals:
+        """Monta os Core Web Vitals com scores a partir das métricas do agente"""
+        return self.score_core_web_vitals(CoreWebVitals(
+            fcp=metrics.get('fcp', 0),
+            lcp=metrics.get('lcp', 0),
+            cls=metrics.get('cls', 0),
+            fid=metrics.get('fid', 0),
+            ttfb=metrics.get('ttfb', 0),
+            fcp_score=0, lcp_score=0, cls_score=0, overall_score=0,
+            inp=metrics.get('inp', 0),
+            tbt=tbt,
+            si=metrics.get('si', 0)
+        ))
     
-    async def collect_javascript_metrics(self) -> JavaScriptMetrics:
-        """Coleta métricas de JavaScript"""
-        
-        js_script = """
-        // Forçar garbage collection se disponível
-        if (window.gc) {
-            window.gc();
-        }
-        
-        const memInfo = performance.memory || {};
-        const metrics = {
-            heap_used: memInfo.usedJSHeapSize || 0,
-            heap_total: memInfo.totalJSHeapSize || 0,
-            heap_limit: memInfo.jsHeapSizeLimit || 0,
-            dom_nodes: document.querySelectorAll('*').length,
-            event_listeners: 0,
-            long_tasks_count: 0,
-            blocking_time: 0,
-            script_duration: 0,
-            compile_time: 0,
-            execution_time: 0
-        };
-        
-        // Contar event listeners (estimativa)
-        try {
-            const interactiveElements = document.querySelectorAll('button, a, input, select, textarea, [onclick]');
-            metrics.event_listeners = interactiveElements.length;
-        } catch(e) {}
-        
-        // Long Tasks (se disponível)
-        try {
-            const longTasks = performance.getEntriesByType('longtask');
-            metrics.long_tasks_count = longTasks.length;
-            metrics.blocking_time = longTasks.reduce((total, task) => total + task.duration, 0);
-        } catch(e) {}
-        
-        // Script timing
-        try {
-            const scriptEntries = performance.getEntriesByType('resource').filter(r => 
-                r.initiatorType === 'script' || r.name.includes('.js')
-            );
-            
-            if (scriptEntries.length > 0) {
-                metrics.script_duration = scriptEntries.reduce((total, script) => 
-                    total + (script.responseEnd - script.startTime), 0
-                ) / scriptEntries.length;
-            }
-        } catch(e) {}
-        
-        return metrics;
-        """
-        
-        try:
-            if not self.driver:
-                raise Exception("Driver não inicializado")
-            
-            metrics = self.driver.execute_script(js_script)
-            
-            return JavaScriptMetrics(
-                heap_used=metrics['heap_used'],
-                heap_total=metrics['heap_total'],
-                heap_limit=metrics['heap_limit'],
-                script_duration=metrics['script_duration'],
-                compile_time=metrics['compile_time'],
-                execution_time=metrics['execution_time'],
-                dom_nodes=metrics['dom_nodes'],
-                event_listeners=metrics['event_listeners'],
-                long_tasks_count=metrics['long_tasks_count'],
-                blocking_time=metrics['blocking_time']
-            )
-            
-        except Exception as e:
-            print(f"⚠️ Erro ao coletar métricas de JavaScript: {e}")
-            return JavaScriptMetrics(
-                heap_used=0, heap_total=0, heap_limit=0,
-                script_duration=0, compile_time=0, execution_time=0,
-                dom_nodes=0, event_listeners=0, long_tasks_count=0, blocking_time=0
-            )
+    def score_metrics(self, cwv: CoreWebVitals) -> Dict:
+        """Score de performance local (Lighthouse) para o form factor atual"""
+        return score_metrics({
+            'fcp': cwv.fcp, 'lcp': cwv.lcp, 'cls': cwv.cls, 'tbt': cwv.tbt,
+            'si': cwv.si or None  # sem Speed Index o peso é redistribuído
+        }, self.form_factor, self.scoring_version)
     
-    async def collect_network_metrics(self) -> NetworkMetrics:
-        """Coleta métricas de rede"""
-        
-        network_script = """
-        const connection = navigator.connection || navigator.mozConnection || navigator.webkitConnection;
-        const resources = performance.getEntriesByType('resource');
-        
-        const metrics = {
-            connection_type: connection ? connection.type || 'unknown' : 'unknown',
-            effective_type: connection ? connection.effectiveType || 'unknown' : 'unknown',
-            downlink: connection ? connection.downlink || 0 : 0,
-            rtt: connection ? connection.rtt || 0 : 0,
-            total_requests: resources.length,
-            failed_requests: 0,
-            cached_requests: 0,
-            avg_response_time: 0,
-            avg_download_time: 0
-        };
-        
-        // Analisar requests
-        let totalResponseTime = 0;
-        let totalDownloadTime = 0;
-        let validRequests = 0;
-        
-        resources.forEach(resource => {
-            // Detectar requests com falha (transferSize 0 pode indicar falha)
-            if (resource.transferSize === 0 && resource.decodedBodySize === 0) {
-                metrics.failed_requests++;
-            }
-            
-            // Detectar requests em cache
-            if (resource.transferSize === 0 && resource.decodedBodySize > 0) {
-                metrics.cached_requests++;
-            }
-            
-            // Calcular tempos médios
-            if (resource.responseEnd && resource.responseStart) {
-                const responseTime = resource.responseEnd - resource.requestStart;
-                const downloadTime = resource.responseEnd - resource.responseStart;
-                
-                if (responseTime > 0) {
-                    totalResponseTime += responseTime;
-                    totalDownloadTime += downloadTime;
-                    validRequests++;
-                }
-            }
-        });
-        
-        if (validRequests > 0) {
-            metrics.avg_response_time = totalResponseTime / validRequests;
-            metrics.avg_download_time = totalDownloadTime / validRequests;
-        }
-        
-        return metrics;
-        """
-        
-        try:
-            if not self.driver:
-                raise Exception("Driver não inicializado")
-            
-            metrics = self.driver.execute_script(network_script)
-            
-            return NetworkMetrics(
-                connection_type=metrics['connection_type'],
-                effective_type=metrics['effective_type'],
-                downlink=metrics['downlink'],
-                rtt=metrics['rtt'],
-                total_requests=metrics['total_requests'],
-                failed_requests=metrics['failed_requests'],
-                cached_requests=metrics['cached_requests'],
-                avg_response_time=metrics['avg_response_time'],
-                avg_download_time=metrics['avg_download_time']
-            )
-            
-        except Exception as e:
-            print(f"⚠️ Erro ao coletar métricas de rede: {e}")
-            return NetworkMetrics(
-                connection_type='unknown', effective_type='unknown',
-                downlink=0, rtt=0, total_requests=0, failed_requests=0,
-                cached_requests=0, avg_response_time=0, avg_download_time=0
-            )
+    def score_core_web_vitals(self, cwv: CoreWebVitals) -> CoreWebVitals:
+        """Preenche os scores (0-100) com as curvas log-normais da versão configurada"""
+        scoring = self.score_metrics(cwv)
+        metric_scores = scoring['metric_scores']
+        
+        cwv.fcp_score = int(round(metric_scores['fcp'] * 100))
+        cwv.lcp_score = int(round(metric_scores['lcp'] * 100))
+        cwv.cls_score = int(round(metric_scores['cls'] * 100))
+        cwv.overall_score = scoring['performance_score']
+        cwv.scoring_version = scoring['version']
+        return cwv
     
     def analyze_performance(self, cwv: CoreWebVitals, resources: ResourceMetrics, 
                           js: JavaScriptMetrics, network: NetworkMetrics) -> Tuple[List[str], List[str], List[str]]:
@@ -617,6 +435,11 @@ class RealPerformanceSuite:
         elif cwv.cls > 0.1:
             warnings.append(f"📐 Cumulative Layout Shift alto ({cwv.cls:.3f})")
         
+        if cwv.inp > 500:
+            critical_issues.append(f"👆 Interaction to Next Paint muito alto ({cwv.inp:.0f}ms)")
+        elif cwv.inp > 200:
+            warnings.append(f"👆 Interaction to Next Paint alto ({cwv.inp:.0f}ms)")
+        
         # Análise de recursos
         if resources.total_size > 3 * 1024 * 1024:  # > 3MB
             critical_issues.append(f"📦 Tamanho total de recursos muito alto ({resources.total_size / 1024 / 1024:.1f}MB)")
@@ -639,6 +462,10 @@ class RealPerformanceSuite:
         if js.blocking_time > 300:
             warnings.append(f"🚫 Tempo de bloqueio alto ({js.blocking_time:.0f}ms)")
         
+        if js.compile_time + js.execution_time > 2000:
+            warnings.append(f"📜 JavaScript ocupa a main thread por {js.compile_time + js.execution_time:.0f}ms "
+                            f"(compilação {js.compile_time:.0f}ms)")
+        
         # Análise de rede
         if network.failed_requests > 0:
             critical_issues.append(f"🌐 {network.failed_requests} requests falharam")
@@ -656,6 +483,9 @@ class RealPerformanceSuite:
         if cwv.cls > 0.1:
             recommendations.append("📐 Reduzir Layout Shift: definir dimensões de imagens/vídeos")
         
+        if cwv.inp > 200:
+            recommendations.append("👆 Reduzir INP: quebrar handlers longos e adiar trabalho após o paint")
+        
         if resources.total_size > 1024 * 1024:
             recommendations.append("📦 Reduzir tamanho de recursos: comprimir assets, lazy loading")
         
@@ -675,153 +505,451 @@ class RealPerformanceSuite:
         
         return critical_issues, warnings, recommendations
     
-    async def run_performance_analysis(self) -> PerformanceAnalysis:
-        """Executa análise completa de performance"""
-        print(f"⚡ Iniciando análise real de performance...")
+    def navigate(self):
+        """Carrega base_url; URLs com #seção passam por about:blank (senão seria só um scroll)"""
+        if urlparse(self.base_url).fragment:
+            self.driver.get('about:blank')
+        self.driver.get(self.base_url)
+    
+    def clear_browser_state(self):
+        """Limpa HTTP cache, service workers e Cache Storage da origem"""
+        url = urlparse(self.base_url)
+        self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+            'origin': f"{url.scheme}://{url.netloc}",
+            'storageTypes': 'service_workers,cache_storage'
+        })
+    
+    async def prepare_cache_mode(self, mode: str, first_run: bool):
+        """Deixa o navegador no estado de cache do modo antes de cada run"""
+        if mode == 'cold':
+            # Cache desabilitado: todo request vai à rede e o code cache não é consumido
+            self.clear_browser_state()
+        
+        elif mode == 'warm_http':
+            # Uma visita prévia: HTTP cache quente, code cache ainda não consumido
+            self.clear_browser_state()
+            self.navigate()
+            await self.collect_run_metrics()
+        
+        elif mode == 'warm_code' and first_run:
+            # V8 gera o code cache na 2ª visita e o consome a partir da 3ª
+            for i in range(max(2, self.warmup_runs)):
+                self.navigate()
+                await self.collect_run_metrics()
+    
+    def apply_device_profile(self, profile: DeviceProfile):
+        """Aplica viewport, throttling de CPU e de rede via CDP (requer Network.enable)"""
+        self.driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', {
+            'width': profile.width,
+            'height': profile.height,
+            'deviceScaleFactor': profile.device_scale_factor,
+            'mobile': profile.mobile
+        })
+        self.driver.execute_cdp_cmd('Emulation.setCPUThrottlingRate', {'rate': profile.cpu_slowdown})
+        self.driver.execute_cdp_cmd('Network.emulateNetworkConditions', {
+            'offline': False,
+            'latency': profile.latency_ms,
+            # bytes/s; -1 desabilita o throttling
+            'downloadThroughput': profile.download_kbps * 1024 / 8 if profile.download_kbps else -1,
+            'uploadThroughput': profile.upload_kbps * 1024 / 8 if profile.upload_kbps else -1
+        })
+    
+    async def measure_cache_mode(self, mode: str, profile: Optional[DeviceProfile] = None) -> CacheModeResult:
+        """Mede um modo de cache num perfil novo do Chrome"""
+        print(f"🗄️ Modo de cache: {mode}" + (f" ({profile.name})" if profile else ""))
         
         self.driver = self.setup_driver()
+        self.form_factor = 'mobile' if profile and profile.mobile else 'desktop'
         
         try:
-            # Warmup runs
-            print("🔥 Executando warmup...")
-            for i in range(self.warmup_runs):
-                self.driver.get(self.base_url)
-                await asyncio.sleep(self.wait_time)
-            
-            # Measurement runs
-            print("📊 Coletando métricas...")
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': mode == 'cold'})
+            if profile:
+                self.apply_device_profile(profile)
             
             cwv_measurements = []
             resource_measurements = []
             js_measurements = []
             network_measurements = []
+            main_thread_runs = []
+            recorder = None
             
-            for i in range(self.measurement_runs):
-                print(f"   Run {i + 1}/{self.measurement_runs}")
+            sampler = AdaptiveSampler(self.ci_targets, self.min_runs, self.max_runs)
+            
+            while sampler.needs_more():
+                print(f"   Run {sampler.runs + 1} (máx. {self.max_runs})")
+                await self.prepare_cache_mode(mode, first_run=sampler.runs == 0)
+                
+                # Descartar o log do aquecimento: só o carregamento medido entra no breakdown/HAR
+                if self.main_thread_tracing or self.record_network:
+                    self.driver.get_log('performance')
+                
+                # O log é drenado em fatias durante a estabilização e uma última vez no fim: cada
+                # leitura alimenta o trace da main thread e o gravador de rede e é descartada
+                trace = MainThreadBreakdown() if self.main_thread_tracing else None
+                run_recorder = NetworkRecorder() if self.record_network else None
+                drain = partial(self.drain_performance_log, trace, run_recorder) if trace or run_recorder else None
                 
-                # Navegar para a página
-                self.driver.get(self.base_url)
-                await asyncio.sleep(self.wait_time)
+                # Navegar e coletar quando a página estabilizar
+                self.navigate()
+                cwv, resources, js, network = await self.collect_run_metrics(on_slice=drain)
+                if drain:
+                    drain()
+                recorder = self.record_network_events(run_recorder) or recorder
                 
-                # Coletar métricas
-                cwv = await self.collect_core_web_vitals()
-                resources = await self.collect_resource_metrics()
-                js = await self.collect_javascript_metrics()
-                network = await self.collect_network_metrics()
+                breakdown = self.collect_main_thread_breakdown(trace)
+                if breakdown:
+                    main_thread_runs.append(breakdown)
+                    js.compile_time = breakdown['groups']['parse_compile']
+                    js.execution_time = breakdown['groups']['script_evaluation']
+                    js.script_duration = js.compile_time + js.execution_time
                 
                 cwv_measurements.append(cwv)
                 resource_measurements.append(resources)
                 js_measurements.append(js)
                 network_measurements.append(network)
                 
-                await asyncio.sleep(1)
+                sampler.add({
+                    'fcp': cwv.fcp, 'lcp': cwv.lcp, 'cls': cwv.cls, 'ttfb': cwv.ttfb,
+                    'blocking_time': js.blocking_time
+                })
+            
+            measurement_stats = sampler.report()
+            if not measurement_stats['converged']:
+                print(f"⚠️ IC alvo não atingido em {self.max_runs} runs - página ruidosa ({mode})")
+            if METRICS.enabled:
+                METRICS.publish_cwv_samples(route_label(self.base_url), profile.name if profile else "desktop",
+                                            mode, measurement_stats['metrics'])
             
-            # Calcular médias
-            avg_cwv = self.calculate_average_cwv(cwv_measurements)
             avg_resources = self.calculate_average_resources(resource_measurements)
-            avg_js = self.calculate_average_js(js_measurements)
             avg_network = self.calculate_average_network(network_measurements)
+            avg_cwv = self.calculate_average_cwv(cwv_measurements)
             
-            # Análise
-            critical_issues, warnings, recommendations = self.analyze_performance(
-                avg_cwv, avg_resources, avg_js, avg_network
-            )
+            request_chain = None
+            if recorder and mode == self.primary_cache_mode:
+                request_chain = self.analyze_request_chain(recorder, profile)
+            
+            # Speed Index num carregamento extra com screencast (a captura altera os demais tempos)
+            visual = None
+            if self.measure_visual_progress and mode == self.primary_cache_mode:
+                visual = self.capture_visual_progress(profile)
+                if visual:
+                    avg_cwv.si = visual['speed_index']
+                    self.score_core_web_vitals(avg_cwv)
             
-            # Calcular scores
-            performance_score = avg_cwv.overall_score
-            accessibility_score = 85  # Placeholder - requer análise específica
-            best_practices_score = 80  # Placeholder - requer análise específica
-            seo_score = 75  # Placeholder - requer análise específica
+            # Carregamentos sem input sempre dão FID/INP 0: medir numa sessão com interações
+            interactions = None
+            if self.measure_interactions and mode == self.primary_cache_mode:
+                interactions = await self.measure_interaction_session()
+                if interactions:
+                    avg_cwv.fid = interactions['fid']
+                    avg_cwv.inp = interactions['inp']
             
-            analysis = PerformanceAnalysis(
-                session_id=self.session_id,
-                timestamp=datetime.now().isoformat(),
-                url=self.base_url,
+            return CacheModeResult(
+                mode=mode,
+                runs=sampler.runs,
                 core_web_vitals=avg_cwv,
                 resource_metrics=avg_resources,
-                javascript_metrics=avg_js,
+                javascript_metrics=self.calculate_average_js(js_measurements),
                 network_metrics=avg_network,
-                performance_score=performance_score,
-                accessibility_score=accessibility_score,
-                best_practices_score=best_practices_score,
-                seo_score=seo_score,
-                critical_issues=critical_issues,
-                warnings=warnings,
-                recommendations=recommendations
+                transfer_bytes=avg_resources.total_transfer_size,
+                cache_hit_ratio=(avg_network.cached_requests / avg_network.total_requests
+                                 if avg_network.total_requests else 0),
+                measurement_stats=measurement_stats,
+                interactions=interactions,
+                visual_progress=visual,
+                main_thread=self.aggregate_main_thread(main_thread_runs),
+                request_chain=request_chain
             )
             
-            return analysis
-            
         finally:
             if self.driver:
                 self.driver.quit()
+                self.driver = None
+    
+    def drain_performance_log(self, trace: Optional[MainThreadBreakdown], recorder: Optional[NetworkRecorder]):
+        """Lê o que o performance log acumulou desde a última leitura e repassa aos consumidores"""
+        entries = self.driver.get_log('performance')
+        if trace:
+            trace.feed(iter_trace_events(entries))
+        if recorder:
+            recorder.feed_log(entries)
+    
+    def collect_main_thread_breakdown(self, trace: Optional[MainThreadBreakdown]) -> Optional[Dict]:
+        """Breakdown do trace do carregamento, alimentado em lotes durante a run"""
+        if not trace:
+            return None
+        
+        try:
+            summary = trace.summary(lambda url: resolve_chunk_name(url, self.manual_chunks))
+            return summary if summary['available'] else None
+        
+        except Exception as e:
+            print(f"⚠️ Erro ao processar trace da main thread: {e}")
+            return None
+    
+    def record_network_events(self, recorder: Optional[NetworkRecorder]) -> Optional[Dict]:
+        """Eventos Network.* da run (já indexados) com o contexto do LCP para a cadeia crítica"""
+        if not recorder:
+            return None
+        
+        try:
+            if not recorder.document():
+                return None
+            
+            cwv = self.last_agent_metrics.get('core_web_vitals', {})
+            return {
+                'recorder': recorder,
+                'lcp': cwv.get('lcp', 0),
+                'lcp_url': cwv.get('lcp_url', ''),
+                'lcp_element': cwv.get('lcp_element', ''),
+                'fcp': cwv.get('fcp', 0),
+                'render_blocking_urls': collect_render_blocking_urls(self.driver)
+            }
+        
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar eventos de rede: {e}")
+            return None
+    
+    def analyze_request_chain(self, recording: Dict, profile: Optional[DeviceProfile] = None) -> Optional[Dict]:
+        """Cadeia crítica até o LCP da última run e export HAR"""
+        try:
+            recorder: NetworkRecorder = recording['recorder']
+            analysis = recorder.analyze(
+                lcp_ms=recording['lcp'], lcp_url=recording['lcp_url'], fcp_ms=recording['fcp'],
+                render_blocking_urls=recording['render_blocking_urls'],
+                resolve_chunk=lambda url: resolve_chunk_name(url, self.manual_chunks)
+            )
+            analysis['lcp_element'] = recording['lcp_element']
+            
+            self.har_dir.mkdir(parents=True, exist_ok=True)
+            har_file = self.har_dir / f"{self.session_id}_{profile.name if profile else 'default'}.har"
+            analysis['har_file'] = recorder.save_har(str(har_file), page_title=self.base_url)
+            
+            bottleneck = analysis.get('lcp_bottleneck')
+            if bottleneck:
+                print(f"   🔗 Cadeia do LCP: {len(analysis['lcp_chain'])} requests, "
+                      f"gargalo {bottleneck['name']} (+{bottleneck['added_ms']:.0f}ms)")
+            return analysis
+        
+        except Exception as e:
+            print(f"⚠️ Erro na análise da cadeia crítica: {e}")
+            return None
+    
+    def aggregate_main_thread(self, runs: List[Dict]) -> Optional[Dict]:
+        """Consolida os breakdowns das runs (mediana por grupo e por chunk)"""
+        if not runs:
+            return None
+        
+        chunks = sorted({chunk for run in runs for chunk in run['by_chunk']})
+        by_chunk = {
+            chunk: {
+                key: robust_median([run['by_chunk'].get(chunk, {}).get(key, 0) for run in runs])
+                for key in ('parse_compile', 'script_evaluation', 'total_ms', 'before_lcp_ms')
+            }
+            for chunk in chunks
+        }
+        blocking = max(by_chunk.items(), key=lambda item: item[1]['before_lcp_ms'], default=None)
+        
+        return {
+            'runs': len(runs),
+            'total_ms': robust_median([run['total_ms'] for run in runs]),
+            'groups': {
+                group: robust_median([run['groups'][group] for run in runs])
+                for group in runs[0]['groups']
+            },
+            'by_chunk': by_chunk,
+            'lcp_blocking_chunk': blocking[0] if blocking and blocking[1]['before_lcp_ms'] > 0 else None,
+            'top_scripts': runs[-1]['by_url'][:10]
+        }
+    
+    def capture_visual_progress(self, profile: Optional[DeviceProfile] = None) -> Optional[Dict]:
+        """Captura o screencast de um carregamento e calcula o progresso visual"""
+        try:
+            from visual_progress import ScreencastCapture
+            
+            output_dir = self.filmstrip_dir / f"{self.session_id}_{profile.name if profile else 'default'}"
+            result = ScreencastCapture(self.driver, output_dir).capture(self.base_url)
+            if not result:
+                print("⚠️ Screencast sem frames suficientes - Speed Index indisponível")
+                return None
+            
+            print(f"   🎞️ Speed Index {result.speed_index:.0f}ms, visualmente completo em "
+                  f"{result.visually_complete['100']:.0f}ms ({result.frames} frames)")
+            return asdict(result)
+        
+        except Exception as e:
+            print(f"⚠️ Erro na captura visual: {e}")
+            return None
+    
+    async def measure_interaction_session(self) -> Optional[Dict]:
+        """Carrega a página e executa as interações roteirizadas (input confiável via CDP)"""
+        try:
+            self.navigate()
+            await self.collect_run_metrics()
+            
+            report = InteractionRunner(self.driver).run()
+            dispatched = sum(1 for i in report.interactions if i.dispatched)
+            print(f"   👆 {dispatched}/{len(report.interactions)} interações, INP {report.inp:.0f}ms")
+            return interaction_report_to_dict(report)
+        
+        except Exception as e:
+            print(f"⚠️ Erro na sessão de interações: {e}")
+            return None
+    
+    async def measure_device_profile(self, profile: DeviceProfile) -> DeviceProfileResult:
+        """Mede todos os modos de cache num perfil de dispositivo"""
+        print(f"📱 Perfil: {profile.name} (CPU {profile.cpu_slowdown:g}x, "
+              f"{profile.download_kbps or 'sem limite'} Kbps, {profile.latency_ms:g}ms)")
+        
+        mode_results: Dict[str, CacheModeResult] = {}
+        for mode in self.cache_modes:
+            mode_results[mode] = await self.measure_cache_mode(mode, profile)
+        
+        primary = mode_results.get(self.primary_cache_mode) or next(iter(mode_results.values()))
+        critical_issues, warnings, _ = self.analyze_performance(
+            primary.core_web_vitals, primary.resource_metrics,
+            primary.javascript_metrics, primary.network_metrics
+        )
+        
+        return DeviceProfileResult(
+            profile=profile,
+            performance_score=primary.core_web_vitals.overall_score,
+            cache_modes=mode_results,
+            critical_issues=critical_issues,
+            warnings=warnings
+        )
+    
+    async def run_performance_analysis(self) -> PerformanceAnalysis:
+        """Executa análise completa de performance"""
+        print(f"⚡ Iniciando análise real de performance...")
+        
+        unknown_modes = [mode for mode in self.cache_modes if mode not in CACHE_MODES]
+        if not self.cache_modes or unknown_modes:
+            raise ValueError(f"Modos de cache inválidos: {unknown_modes or 'nenhum'} (use {', '.join(CACHE_MODES)})")
+        unknown_profiles = [name for name in self.device_profiles if name not in DEVICE_PROFILES]
+        if not self.device_profiles or unknown_profiles:
+            raise ValueError(f"Perfis de dispositivo inválidos: {unknown_profiles or 'nenhum'} "
+                             f"(use {', '.join(DEVICE_PROFILES)})")
+        
+        profile_results: Dict[str, DeviceProfileResult] = {}
+        for name in self.device_profiles:
+            profile_results[name] = await self.measure_device_profile(DEVICE_PROFILES[name])
+        
+        main_profile = next(iter(profile_results.values()))
+        mode_results = main_profile.cache_modes
+        primary = mode_results.get(self.primary_cache_mode) or next(iter(mode_results.values()))
+        
+        # Análise
+        critical_issues, warnings, recommendations = self.analyze_performance(
+            primary.core_web_vitals, primary.resource_metrics,
+            primary.javascript_metrics, primary.network_metrics
+        )
+        
+        # Regressões que só aparecem em dispositivos mais lentos
+        for name, result in list(profile_results.items())[1:]:
+            critical_issues.extend(f"[{name}] {issue}" for issue in result.critical_issues)
+            warnings.extend(f"[{name}] {warning}" for warning in result.warnings)
+        
+        # Calcular scores (form factor do perfil principal)
+        self.form_factor = 'mobile' if main_profile.profile.mobile else 'desktop'
+        scoring = self.score_metrics(primary.core_web_vitals)
+        performance_score = scoring['performance_score']
+        accessibility_score = 85  # Placeholder - requer análise específica
+        best_practices_score = 80  # Placeholder - requer análise específica
+        seo_score = 75  # Placeholder - requer análise específica
+        
+        return PerformanceAnalysis(
+            session_id=self.session_id,
+            timestamp=datetime.now().isoformat(),
+            url=self.base_url,
+            core_web_vitals=primary.core_web_vitals,
+            resource_metrics=primary.resource_metrics,
+            javascript_metrics=primary.javascript_metrics,
+            network_metrics=primary.network_metrics,
+            performance_score=performance_score,
+            accessibility_score=accessibility_score,
+            best_practices_score=best_practices_score,
+            seo_score=seo_score,
+            critical_issues=critical_issues,
+            warnings=warnings,
+            recommendations=recommendations,
+            measurement_stats=primary.measurement_stats,
+            cache_modes={mode: asdict(result) for mode, result in mode_results.items()},
+            device_profiles={name: asdict(result) for name, result in profile_results.items()},
+            interactions=primary.interactions,
+            main_thread=primary.main_thread,
+            visual_progress=primary.visual_progress,
+            request_chain=primary.request_chain,
+            scoring=scoring
+        )
     
     def calculate_average_cwv(self, measurements: List[CoreWebVitals]) -> CoreWebVitals:
-        """Calcula média dos Core Web Vitals"""
+        """Consolida os Core Web Vitals (mediana sem outliers)"""
         if not measurements:
             return CoreWebVitals(0, 0, 0, 0, 0, 0, 0, 0, 0)
         
-        fcp_avg = statistics.mean([m.fcp for m in measurements])
-        lcp_avg = statistics.mean([m.lcp for m in measurements])
-        cls_avg = statistics.mean([m.cls for m in measurements])
-        fid_avg = statistics.mean([m.fid for m in measurements])
-        ttfb_avg = statistics.mean([m.ttfb for m in measurements])
+        fcp_avg = robust_median([m.fcp for m in measurements])
+        lcp_avg = robust_median([m.lcp for m in measurements])
+        cls_avg = robust_median([m.cls for m in measurements])
+        fid_avg = robust_median([m.fid for m in measurements])
+        ttfb_avg = robust_median([m.ttfb for m in measurements])
+        inp_avg = robust_median([m.inp for m in measurements])
         
-        # Recalcular scores
-        fcp_score = self.calculate_fcp_score(fcp_avg)
-        lcp_score = self.calculate_lcp_score(lcp_avg)
-        cls_score = self.calculate_cls_score(cls_avg)
-        overall_score = int((fcp_score + lcp_score + cls_score) / 3)
+        tbt_avg = robust_median([m.tbt for m in measurements])
+        si_avg = robust_median([m.si for m in measurements])
         
-        return CoreWebVitals(
+        # Recalcular scores sobre as medianas
+        return self.score_core_web_vitals(CoreWebVitals(
             fcp=fcp_avg, lcp=lcp_avg, cls=cls_avg, fid=fid_avg, ttfb=ttfb_avg,
-            fcp_score=fcp_score, lcp_score=lcp_score, cls_score=cls_score,
-            overall_score=overall_score
-        )
+            fcp_score=0, lcp_score=0, cls_score=0, overall_score=0,
+            inp=inp_avg, tbt=tbt_avg, si=si_avg
+        ))
     
     def calculate_average_resources(self, measurements: List[ResourceMetrics]) -> ResourceMetrics:
-        """Calcula média das métricas de recursos"""
+        """Consolida métricas de recursos (média aparada)"""
         if not measurements:
             return ResourceMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
         
         return ResourceMetrics(
-            total_resources=int(statistics.mean([m.total_resources for m in measurements])),
-            total_size=int(statistics.mean([m.total_size for m in measurements])),
-            total_transfer_size=int(statistics.mean([m.total_transfer_size for m in measurements])),
-            scripts_count=int(statistics.mean([m.scripts_count for m in measurements])),
-            scripts_size=int(statistics.mean([m.scripts_size for m in measurements])),
-            stylesheets_count=int(statistics.mean([m.stylesheets_count for m in measurements])),
-            stylesheets_size=int(statistics.mean([m.stylesheets_size for m in measurements])),
-            images_count=int(statistics.mean([m.images_count for m in measurements])),
-            images_size=int(statistics.mean([m.images_size for m in measurements])),
-            fonts_count=int(statistics.mean([m.fonts_count for m in measurements])),
-            fonts_size=int(statistics.mean([m.fonts_size for m in measurements])),
-            dns_lookup_time=statistics.mean([m.dns_lookup_time for m in measurements]),
-            connection_time=statistics.mean([m.connection_time for m in measurements]),
-            request_time=statistics.mean([m.request_time for m in measurements]),
-            response_time=statistics.mean([m.response_time for m in measurements])
+            total_resources=int(trimmed_mean([m.total_resources for m in measurements])),
+            total_size=int(trimmed_mean([m.total_size for m in measurements])),
+            total_transfer_size=int(trimmed_mean([m.total_transfer_size for m in measurements])),
+            scripts_count=int(trimmed_mean([m.scripts_count for m in measurements])),
+            scripts_size=int(trimmed_mean([m.scripts_size for m in measurements])),
+            stylesheets_count=int(trimmed_mean([m.stylesheets_count for m in measurements])),
+            stylesheets_size=int(trimmed_mean([m.stylesheets_size for m in measurements])),
+            images_count=int(trimmed_mean([m.images_count for m in measurements])),
+            images_size=int(trimmed_mean([m.images_size for m in measurements])),
+            fonts_count=int(trimmed_mean([m.fonts_count for m in measurements])),
+            fonts_size=int(trimmed_mean([m.fonts_size for m in measurements])),
+            dns_lookup_time=trimmed_mean([m.dns_lookup_time for m in measurements]),
+            connection_time=trimmed_mean([m.connection_time for m in measurements]),
+            request_time=trimmed_mean([m.request_time for m in measurements]),
+            response_time=trimmed_mean([m.response_time for m in measurements])
         )
     
     def calculate_average_js(self, measurements: List[JavaScriptMetrics]) -> JavaScriptMetrics:
-        """Calcula média das métricas de JavaScript"""
+        """Consolida métricas de JavaScript (média aparada)"""
         if not measurements:
             return JavaScriptMetrics(0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
         
         return JavaScriptMetrics(
-            heap_used=int(statistics.mean([m.heap_used for m in measurements])),
-            heap_total=int(statistics.mean([m.heap_total for m in measurements])),
-            heap_limit=int(statistics.mean([m.heap_limit for m in measurements])),
-            script_duration=statistics.mean([m.script_duration for m in measurements]),
-            compile_time=statistics.mean([m.compile_time for m in measurements]),
-            execution_time=statistics.mean([m.execution_time for m in measurements]),
-            dom_nodes=int(statistics.mean([m.dom_nodes for m in measurements])),
-            event_listeners=int(statistics.mean([m.event_listeners for m in measurements])),
-            long_tasks_count=int(statistics.mean([m.long_tasks_count for m in measurements])),
-            blocking_time=statistics.mean([m.blocking_time for m in measurements])
+            heap_used=int(trimmed_mean([m.heap_used for m in measurements])),
+            heap_total=int(trimmed_mean([m.heap_total for m in measurements])),
+            heap_limit=int(trimmed_mean([m.heap_limit for m in measurements])),
+            script_duration=trimmed_mean([m.script_duration for m in measurements]),
+            compile_time=trimmed_mean([m.compile_time for m in measurements]),
+            execution_time=trimmed_mean([m.execution_time for m in measurements]),
+            dom_nodes=int(trimmed_mean([m.dom_nodes for m in measurements])),
+            event_listeners=int(trimmed_mean([m.event_listeners for m in measurements])),
+            long_tasks_count=int(trimmed_mean([m.long_tasks_count for m in measurements])),
+            blocking_time=trimmed_mean([m.blocking_time for m in measurements])
         )
     
     def calculate_average_network(self, measurements: List[NetworkMetrics]) -> NetworkMetrics:
-        """Calcula média das métricas de rede"""
+        """Consolida métricas de rede (média aparada)"""
         if not measurements:
             return NetworkMetrics('unknown', 'unknown', 0, 0, 0, 0, 0, 0, 0)
         
@@ -832,15 +960,17 @@ class RealPerformanceSuite:
         return NetworkMetrics(
             connection_type=connection_type,
             effective_type=effective_type,
-            downlink=statistics.mean([m.downlink for m in measurements]),
-            rtt=statistics.mean([m.rtt for m in measurements]),
-            total_requests=int(statistics.mean([m.total_requests for m in measurements])),
-            failed_requests=int(statistics.mean([m.failed_requests for m in measurements])),
-            cached_requests=int(statistics.mean([m.cached_requests for m in measurements])),
-            avg_response_time=statistics.mean([m.avg_response_time for m in measurements]),
-            avg_download_time=statistics.mean([m.avg_download_time for m in measurements])
+            downlink=trimmed_mean([m.downlink for m in measurements]),
+            rtt=trimmed_mean([m.rtt for m in measurements]),
+            total_requests=int(trimmed_mean([m.total_requests for m in measurements])),
+            failed_requests=int(trimmed_mean([m.failed_requests for m in measurements])),
+            cached_requests=int(trimmed_mean([m.cached_requests for m in measurements])),
+            avg_response_time=trimmed_mean([m.avg_response_time for m in measurements]),
+            avg_download_time=trimmed_mean([m.avg_download_time for m in measurements]),
+            revalidated_requests=int(trimmed_mean([m.revalidated_requests for m in measurements]))
         )
     
+    @traced("report_write")
     def save_analysis(self, analysis: PerformanceAnalysis):
         """Salva análise em arquivo"""
         filename = f"real_performance_analysis_{analysis.session_id}.json"
@@ -860,6 +990,16 @@ class RealPerformanceSuite:
         print(f"📅 Timestamp: {analysis.timestamp}")
         print(f"🆔 Session: {analysis.session_id}")
         
+        # Amostragem
+        if analysis.measurement_stats:
+            stats = analysis.measurement_stats
+            status = "convergiu" if stats['converged'] else "não convergiu"
+            print(f"\n📐 AMOSTRAGEM: {stats['runs']} runs ({status})")
+            for name, metric in stats['metrics'].items():
+                outliers = f", {len(metric['outliers'])} outliers" if metric['outliers'] else ""
+                print(f"   {name}: mediana {metric['median']:.3f} ± {metric['half_width']:.3f} "
+                      f"(IC95% {metric['ci95'][0]:.3f}-{metric['ci95'][1]:.3f}, n={metric['n']}{outliers})")
+        
         # Core Web Vitals
         cwv = analysis.core_web_vitals
         print(f"\n📊 CORE WEB VITALS:")
@@ -867,8 +1007,70 @@ class RealPerformanceSuite:
         print(f"   LCP: {cwv.lcp:.0f}ms (Score: {cwv.lcp_score}/100)")
         print(f"   CLS: {cwv.cls:.3f} (Score: {cwv.cls_score}/100)")
         print(f"   FID: {cwv.fid:.0f}ms")
+        print(f"   INP: {cwv.inp:.0f}ms")
         print(f"   TTFB: {cwv.ttfb:.0f}ms")
+        print(f"   TBT: {cwv.tbt:.0f}ms")
+        if cwv.si:
+            print(f"   Speed Index: {cwv.si:.0f}ms")
         print(f"   Overall: {cwv.overall_score}/100")
+        if analysis.scoring:
+            scoring = analysis.scoring
+            missing = f", sem {', '.join(scoring['missing'])}" if scoring['missing'] else ""
+            print(f"   Scoring: {scoring['version']} ({scoring['form_factor']}{missing})")
+
+        if analysis.visual_progress:
+            visual = analysis.visual_progress
+            complete = visual['visually_complete']
+            print(f"\n🎞️ PROGRESSO VISUAL:")
+            print(f"   Primeira mudança: {visual['first_visual_change']:.0f}ms")
+            print(f"   Visualmente completo: 85% {complete['85']:.0f}ms / 95% {complete['95']:.0f}ms / "
+                  f"100% {complete['100']:.0f}ms")
+            print(f"   Última mudança: {visual['last_visual_change']:.0f}ms ({visual['distinct_frames']} frames distintos)")
+            if visual['filmstrip']:
+                print(f"   Filmstrip: {Path(visual['filmstrip'][0]['file']).parent}")
+
+        if analysis.main_thread:
+            main_thread = analysis.main_thread
+            print(f"\n🧵 MAIN THREAD ({main_thread['total_ms']:.0f}ms, mediana de {main_thread['runs']} runs):")
+            for group, ms in main_thread['groups'].items():
+                print(f"   {group:<18} {ms:>7.0f}ms")
+            for chunk, data in sorted(main_thread['by_chunk'].items(),
+                                      key=lambda item: item[1]['total_ms'], reverse=True)[:5]:
+                print(f"   📦 {chunk:<15} compile {data['parse_compile']:.0f}ms / eval {data['script_evaluation']:.0f}ms "
+                      f"(antes do LCP: {data['before_lcp_ms']:.0f}ms)")
+            if main_thread['lcp_blocking_chunk']:
+                print(f"   ⏳ Chunk que mais atrasa o LCP: {main_thread['lcp_blocking_chunk']}")
+
+        if analysis.request_chain and analysis.request_chain.get('available'):
+            chain = analysis.request_chain
+            target = chain['lcp_element'] or chain['lcp_url'] or 'cadeia crítica mais longa'
+            print(f"\n🔗 CADEIA DO LCP ({target}):")
+            for node in chain['lcp_chain']:
+                label = node['chunk'] or node['name']
+                print(f"   {node['start_ms']:>6.0f}→{node['end_ms']:>6.0f}ms {node['priority']:<9} "
+                      f"{node['type']:<10} {label} (+{node['added_ms']:.0f}ms)")
+            if chain['lcp_bottleneck']:
+                print(f"   ⏳ Gargalo: {chain['lcp_bottleneck']['name']}")
+            if chain['render_blocking']:
+                names = ', '.join(node['name'] for node in chain['render_blocking'])
+                print(f"   🚧 Render-blocking até {chain['render_blocking_ms']:.0f}ms: {names}")
+            for mismatch in chain['priority_mismatches']:
+                print(f"   ⚠️ {mismatch['kind']}: {mismatch['request']['name']} "
+                      f"({mismatch['request']['priority']}) → {mismatch['suggestion']}")
+            print(f"   HAR: {chain['har_file']}")
+
+        if analysis.interactions:
+            print(f"\n👆 INTERAÇÕES (INP {analysis.interactions['inp']:.0f}ms):")
+            for interaction in analysis.interactions['interactions']:
+                if not interaction['dispatched']:
+                    print(f"   {interaction['name']:<18} elemento não encontrado")
+                    continue
+                print(f"   {interaction['name']:<18} {interaction['duration']:>5.0f}ms "
+                      f"(delay {interaction['input_delay']:.0f} / processing {interaction['processing']:.0f} / "
+                      f"presentation {interaction['presentation']:.0f})")
+                if interaction['scripts']:
+                    top = interaction['scripts'][0]
+                    print(f"      ↳ {top['chunk']}: {top['duration']:.0f}ms ({top['invoker'] or top['source_url']})")
         
         # Recursos
         res = analysis.resource_metrics
@@ -893,6 +1095,32 @@ class RealPerformanceSuite:
         print(f"   Requests: {net.total_requests} (falhas: {net.failed_requests})")
         print(f"   Tempo médio: {net.avg_response_time:.0f}ms")
         
+        # Modos de cache
+        if analysis.cache_modes:
+            print(f"\n🗄️ MODOS DE CACHE:")
+            print(f"   {'Modo':<10} {'Runs':>5} {'FCP':>8} {'LCP':>8} {'Transferido':>12} {'Cache hits':>11}")
+            for mode, result in analysis.cache_modes.items():
+                mode_cwv = result['core_web_vitals']
+                print(f"   {mode:<10} {result['runs']:>5} {mode_cwv['fcp']:>6.0f}ms {mode_cwv['lcp']:>6.0f}ms "
+                      f"{result['transfer_bytes'] / 1024:>10.0f}KB {result['cache_hit_ratio'] * 100:>10.0f}%")
+            
+            if 'cold' in analysis.cache_modes and 'warm_http' in analysis.cache_modes:
+                cold = analysis.cache_modes['cold']
+                warm = analysis.cache_modes['warm_http']
+                saved = cold['transfer_bytes'] - warm['transfer_bytes']
+                print(f"   Economia do cache de longo prazo: {saved / 1024:.0f}KB, "
+                      f"LCP {cold['core_web_vitals']['lcp'] - warm['core_web_vitals']['lcp']:.0f}ms mais rápido")
+        
+        # Perfis de dispositivo
+        if analysis.device_profiles and len(analysis.device_profiles) > 1:
+            print(f"\n📱 PERFIS DE DISPOSITIVO ({self.primary_cache_mode}):")
+            print(f"   {'Perfil':<16} {'CPU':>5} {'FCP':>8} {'LCP':>8} {'TBT':>8} {'Score':>6}")
+            for name, result in analysis.device_profiles.items():
+                mode = result['cache_modes'].get(self.primary_cache_mode) or next(iter(result['cache_modes'].values()))
+                print(f"   {name:<16} {result['profile']['cpu_slowdown']:>4g}x "
+                      f"{mode['core_web_vitals']['fcp']:>6.0f}ms {mode['core_web_vitals']['lcp']:>6.0f}ms "
+                      f"{mode['javascript_metrics']['blocking_time']:>6.0f}ms {result['performance_score']:>6}")
+        
         # Scores
         print(f"\n🎯 SCORES:")
         print(f"   Performance: {analysis.performance_score}/100")
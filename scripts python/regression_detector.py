@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+📉 Regression Detector - Projeto M
+Detecção estatística de regressões sobre o histórico de execuções da suíte
+
+Funcionalidades:
+- Distribuições por run (amostras do AdaptiveSampler), não só médias
+- A run é a unidade de comparação: mediana da run atual vs intervalo de predição das medianas
+  das runs da baseline móvel (t de Student, n-1 g.l.), sem tratar amostras de runs diferentes
+  como uma população só
+- Tamanho de efeito: delta de Cliff entre runs e mudança da mediana com IC 95% por bootstrap
+  hierárquico (runs, depois amostras de cada run)
+- Detecção de changepoints (segmentação binária) para a baseline não misturar patamares
+- Veredito por métrica: improved / regressed / inconclusive
+- Índice compacto do histórico: centenas de relatórios sem reler os JSON inalterados
+"""
+
+import json
+import math
+import random
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Métricas acompanhadas: (nome, teste, campo em TestResult.data, menor é melhor)
+# Teste None = campo do próprio relatório consolidado
+SCALAR_METRICS = [
+    ("overall_score", None, "overall_performance_score", False),
+    ("bundle_size", "Bundle Analysis", "total_size", True),
+    ("peak_memory", "Memory Profiling", "peak_memory", True),
+    ("memory_growth_rate", "Memory Profiling", "memory_growth_rate", True),
+    ("gc_time_share", "Memory Profiling", "gc_time_share", True),
+    ("performance_score", "Performance Suite", "performance_score", False),
+    ("speed_index", "Performance Suite", "speed_index", True),
+    ("inp", "Performance Suite", "inp", True),
+    ("total_size_mb", "Performance Suite", "total_size_mb", True),
+    ("stress_throughput", "Stress Testing", "throughput", False),
+    ("stress_error_rate", "Stress Testing", "error_rate", True),
+    ("stress_response_time", "Stress Testing", "avg_response_time", True),
+]
+
+# Métricas com várias amostras por run (measurement_stats da Performance Suite)
+SAMPLED_METRICS = {"fcp": True, "lcp": True, "cls": True, "ttfb": True, "blocking_time": True}
+
+LOWER_IS_BETTER = {name: lower for name, _, _, lower in SCALAR_METRICS}
+LOWER_IS_BETTER.update(SAMPLED_METRICS)
+
+INDEX_FILE = ".regression_index.json"
+
+def extract_run_samples(report: Dict) -> Dict[str, List[float]]:
+    """Amostras por métrica de um relatório consolidado (resultados reutilizados do cache ficam de fora)"""
+    results = {
+        result["test_name"]: result.get("data") or {}
+        for result in report.get("test_results", [])
+        if result.get("status") == "success" and not result.get("cached")
+    }
+
+    samples: Dict[str, List[float]] = {}
+    for name, test_name, key, _ in SCALAR_METRICS:
+        source = report if test_name is None else results.get(test_name)
+        value = source.get(key) if source else None
+        if isinstance(value, (int, float)):
+            samples[name] = [float(value)]
+
+    metrics = ((results.get("Performance Suite") or {}).get("measurement_stats") or {}).get("metrics", {})
+    for name in SAMPLED_METRICS:
+        stats = metrics.get(name)
+        if stats:
+            values = stats.get("samples") or [stats["median"]]  # relatórios antigos só têm a mediana
+            samples[name] = [float(v) for v in values]
+    return samples
+
+class RunHistory:
+    """Runs anteriores (consolidated_report_*.json) com índice compacto das amostras"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.index_file = self.output_dir / INDEX_FILE
+
+    def load_index(self) -> Dict:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def runs(self) -> List[Dict]:
+        """Runs em ordem cronológica: session_id, timestamp e amostras por métrica"""
+        index = self.load_index()
+        current = {}
+        dirty = False
+
+        for path in self.output_dir.glob("consolidated_report_*.json"):
+            mtime = path.stat().st_mtime_ns
+            entry = index.get(path.name)
+            if not entry or entry["mtime_ns"] != mtime:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        report = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Erro ao ler {path.name}: {e}")
+                    continue
+                entry = {
+                    "mtime_ns": mtime,
+                    "session_id": report.get("session_id", path.stem),
+                    "timestamp": report.get("timestamp", ""),
+                    "samples": extract_run_samples(report)
+                }
+                dirty = True
+            current[path.name] = entry
+
+        if dirty or len(current) != len(index):
+            try:
+                with open(self.index_file, 'w', encoding='utf-8') as f:
+                    json.dump(current, f)
+            except OSError as e:
+                print(f"⚠️ Erro ao salvar índice do histórico: {e}")
+
+        return sorted(current.values(), key=lambda run: (run["timestamp"], run["session_id"]))
+
+def student_t_sf_two_sided(t: float, df: int) -> float:
+    """P(|T| ≥ |t|) da t de Student com df inteiro (forma fechada, Abramowitz & Stegun 26.7.3-4)"""
+    theta = math.atan(abs(t) / math.sqrt(df))
+    sin_theta, cos2 = math.sin(theta), math.cos(theta) ** 2
+    if df % 2:
+        term, total = math.cos(theta), 0.0
+        if df > 1:
+            total = term
+            for k in range(3, df - 1, 2):
+                term *= cos2 * (k - 1) / k
+                total += term
+        inside = 2 / math.pi * (theta + sin_theta * total)
+    else:
+        term = total = 1.0
+        for k in range(2, df - 1, 2):
+            term *= cos2 * (k - 1) / k
+            total += term
+        inside = sin_theta * total
+    return min(1.0, max(0.0, 1 - inside))
+
+def prediction_t_test(value: float, baseline: Sequence[float]) -> Tuple[Optional[float], float]:
+    """t de um valor novo contra o intervalo de predição da baseline (n-1 graus de liberdade,
+    escala s·√(1+1/n)) e p-valor bicaudal. Sem dispersão na baseline o t não é finito: volta None
+    (p=1 se o valor repete a baseline, p=0 se não)"""
+    n = len(baseline)
+    if n < 2:
+        return None, 1.0
+    mean = statistics.fmean(baseline)
+    scale = statistics.stdev(baseline) * math.sqrt(1 + 1 / n)
+    if scale == 0:
+        return (0.0, 1.0) if value == mean else (None, 0.0)
+    t = (value - mean) / scale
+    return t, student_t_sf_two_sided(t, n - 1)
+
+def hierarchical_bootstrap_shift(current: Sequence[float], baseline_runs: Sequence[Sequence[float]],
+                                 resamples: int = 1000, seed: Optional[int] = 0) -> Tuple[float, float]:
+    """IC 95% da diferença de medianas (current - baseline) reamostrando runs e, dentro de
+    cada run sorteada, as suas amostras: a variação entre runs entra no intervalo"""
+    rng = random.Random(seed)
+    shifts = []
+    for _ in range(resamples):
+        runs = rng.choices(baseline_runs, k=len(baseline_runs))
+        baseline_median = statistics.median(statistics.median(rng.choices(run, k=len(run))) for run in runs)
+        shifts.append(statistics.median(rng.choices(current, k=len(current))) - baseline_median)
+    shifts.sort()
+    return shifts[int(0.025 * (resamples - 1))], shifts[int(0.975 * (resamples - 1))]
+
+def detect_changepoints(series: Sequence[float], min_size: int = 3, penalty_factor: float = 3.0) -> List[int]:
+    """Índices onde começa um novo patamar (segmentação binária, custo = soma dos quadrados)"""
+    n = len(series)
+    if n < 2 * min_size:
+        return []
+
+    # Variância do ruído pelas diferenças consecutivas (robusta a degraus)
+    diffs = [b - a for a, b in zip(series, series[1:])]
+    sigma = statistics.median(abs(d) for d in diffs) / 0.6745 / math.sqrt(2)
+    variance = sigma ** 2 or sum(d * d for d in diffs) / (2 * len(diffs))
+    if variance == 0:
+        return []
+    penalty = penalty_factor * variance * math.log(n)
+
+    prefix = [0.0]
+    prefix_sq = [0.0]
+    for value in series:
+        prefix.append(prefix[-1] + value)
+        prefix_sq.append(prefix_sq[-1] + value * value)
+
+    def cost(start: int, end: int) -> float:
+        total = prefix[end] - prefix[start]
+        return prefix_sq[end] - prefix_sq[start] - total * total / (end - start)
+
+    changepoints = []
+    segments = [(0, n)]
+    while segments:
+        start, end = segments.pop()
+        if end - start < 2 * min_size:
+            continue
+        whole = cost(start, end)
+        best_gain, best_split = max(
+            (whole - cost(start, split) - cost(split, end), split)
+            for split in range(start + min_size, end - min_size + 1)
+        )
+        if best_gain > penalty:
+            changepoints.append(best_split)
+            segments.extend([(start, best_split), (best_split, end)])
+    return sorted(changepoints)
+
+class RegressionDetector:
+    """Compara a run atual com a baseline recente de cada métrica"""
+
+    def __init__(self, window: int = 10, alpha: float = 0.05, min_effect: float = 0.05,
+                 min_baseline: int = 5, resamples: int = 1000, seed: Optional[int] = 0):
+        self.window = window  # runs na baseline móvel
+        self.alpha = alpha
+        self.min_effect = min_effect  # mudança relativa mínima da mediana para ser relevante
+        self.min_baseline = min_baseline
+        self.resamples = resamples
+        self.seed = seed
+
+    def compare(self, metric: str, history: List[Dict], current: List[float]) -> Dict:
+        """Veredito de uma métrica: history = runs anteriores (ordem cronológica) com amostras"""
+        runs = [run for run in history if run["samples"].get(metric)]
+        medians = [statistics.median(run["samples"][metric]) for run in runs]
+        changepoints = detect_changepoints(medians)
+
+        # Baseline = runs desde o último changepoint, limitadas à janela
+        segment_start = changepoints[-1] if changepoints else 0
+        baseline_runs = runs[max(segment_start, len(runs) - self.window):]
+        baseline_medians = [statistics.median(run["samples"][metric]) for run in baseline_runs]
+
+        verdict = {
+            "metric": metric,
+            "verdict": "inconclusive",
+            "lower_is_better": LOWER_IS_BETTER.get(metric, True),
+            "baseline_runs": len(baseline_runs),
+            "baseline_median": statistics.median(baseline_medians) if baseline_medians else None,
+            "current_median": statistics.median(current) if current else None,
+            "changepoints": [
+                {
+                    "session_id": runs[index]["session_id"],
+                    "before": statistics.median(medians[max(0, index - self.window):index]),
+                    "after": statistics.median(medians[index:index + self.window])
+                }
+                for index in changepoints
+            ]
+        }
+
+        if not current:
+            verdict["reason"] = "métrica ausente na run atual"
+            return verdict
+        if len(baseline_runs) < self.min_baseline:
+            verdict["reason"] = (f"baseline com {len(baseline_runs)} run(s) "
+                                 f"(mínimo {self.min_baseline}{', após changepoint' if changepoints else ''})")
+            return verdict
+
+        # A run é a unidade: a dispersão entre as medianas das runs inclui o drift normal de run
+        # para run, que some quando as amostras de todas as runs viram uma população só. Intervalo
+        # de predição (t com n-1 g.l.) em vez de z: com 5-10 runs o z rejeitava ~15% sob H0
+        value = verdict["current_median"]
+        t, p_value = prediction_t_test(value, baseline_medians)
+        verdict["method"] = "run_medians_prediction_t"
+        verdict["t"] = t
+
+        shift = value - verdict["baseline_median"]
+        ci_low, ci_high = hierarchical_bootstrap_shift(current, [run["samples"][metric] for run in baseline_runs],
+                                                       self.resamples, self.seed)
+        relative = shift / abs(verdict["baseline_median"]) if verdict["baseline_median"] else None
+
+        verdict["p_value"] = p_value
+        verdict["effect"] = {
+            "cliffs_delta": (sum(m < value for m in baseline_medians)
+                             - sum(m > value for m in baseline_medians)) / len(baseline_medians),
+            "median_change": shift,
+            "relative_change": relative,
+            "ci95": [ci_low, ci_high]
+        }
+
+        significant = p_value < self.alpha and (ci_low > 0 or ci_high < 0)
+        relevant = shift != 0 and (relative is None or abs(relative) >= self.min_effect)
+        if significant and relevant:
+            worse = shift > 0 if verdict["lower_is_better"] else shift < 0
+            verdict["verdict"] = "regressed" if worse else "improved"
+        elif not significant:
+            verdict["reason"] = f"p={p_value:.3f}: diferença dentro do ruído"
+        else:
+            verdict["reason"] = f"mudança abaixo de {self.min_effect * 100:.0f}%"
+        return verdict
+
+    def evaluate(self, history: List[Dict], current_samples: Dict[str, List[float]]) -> Dict[str, Dict]:
+        """Vereditos de todas as métricas presentes na run atual ou no histórico"""
+        metrics = set(current_samples)
+        for run in history[-self.window:]:
+            metrics.update(run["samples"])
+        return {
+            metric: self.compare(metric, history, current_samples.get(metric, []))
+            for metric in sorted(metrics)
+        }
+
+def format_verdict(verdict: Dict) -> str:
+    """Linha resumida de um veredito"""
+    effect = verdict.get("effect")
+    if not effect:
+        return f"{verdict['metric']}: {verdict['verdict']} ({verdict.get('reason', '')})"
+
+    relative = effect["relative_change"]
+    change = f"{relative * 100:+.1f}%" if relative is not None else f"{effect['median_change']:+.3g}"
+    return (f"{verdict['metric']}: {verdict['verdict']} {change} "
+            f"(mediana {verdict['baseline_median']:.4g} → {verdict['current_median']:.4g}, "
+            f"p={verdict['p_value']:.3g}, δ de Cliff {effect['cliffs_delta']:+.2f})")
+
+def print_verdicts(verdicts: Dict[str, Dict]):
+    """Regressões primeiro, depois melhorias; inconclusivos só contados"""
+    emoji = {"regressed": "🔴", "improved": "🟢"}
+    print("\n📉 REGRESSÕES (baseline móvel por run, t de predição + bootstrap hierárquico):")
+    for kind in ("regressed", "improved"):
+        for verdict in verdicts.values():
+            if verdict["verdict"] == kind:
+                print(f"   {emoji[kind]} {format_verdict(verdict)}")
+
+    inconclusive = [v for v in verdicts.values() if v["verdict"] == "inconclusive"]
+    if inconclusive:
+        print(f"   ⚪ {len(inconclusive)} métrica(s) inconclusiva(s)")
+    for verdict in verdicts.values():
+        for changepoint in verdict["changepoints"][-1:]:
+            print(f"   📍 {verdict['metric']}: novo patamar desde {changepoint['session_id']} "
+                  f"({changepoint['before']:.4g} → {changepoint['after']:.4g})")
+
+def main():
+    """Avalia a run mais recente contra o histórico: python regression_detector.py [diretório]"""
+    output_dir = Path(sys.argv[1] if len(sys.argv) > 1 else "performance_reports")
+    runs = RunHistory(output_dir).runs()
+    if len(runs) < 2:
+        print(f"⚠️ Histórico insuficiente em {output_dir} ({len(runs)} run(s))")
+        return
+
+    print(f"📂 {len(runs)} runs em {output_dir}; avaliando {runs[-1]['session_id']}")
+    print_verdicts(RegressionDetector().evaluate(runs[:-1], runs[-1]["samples"]))
+
+if __name__ == "__main__":
+    main()
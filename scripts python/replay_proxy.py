@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+📼 Replay Proxy - Projeto M
+Proxy local de gravação/reprodução de rede para medições sem ruído de backend
+
+Funcionalidades:
+- Modo record: repassa as requisições (dev server, assets, Supabase...) e grava as respostas
+- Modo replay: responde só do arquivo gravado, sem tocar na rede nem no servidor
+- Latência determinística por resposta (a gravada ou uma fixa) e limite de banda com ritmo fixo
+- HTTPS via CONNECT com certificado local (openssl); o Chrome roda com --ignore-certificate-errors
+- Proxy exportado por variável de ambiente: RealPerformanceSuite, MemoryProfiler, StressTester
+  e workers em processos separados usam o mesmo proxy
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+PROXY_ENV = "PERF_SUITE_REPLAY_PROXY"
+INDEX_FILE = "index.json"
+
+# Não são repassados nem gravados (valem só para uma conexão)
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "proxy-authorization",
+                      "proxy-authenticate", "te", "trailer", "transfer-encoding", "upgrade", "content-length"}
+
+# Parâmetros que mudam a cada carregamento sem mudar a resposta (cache busters, HMR do Vite)
+VOLATILE_QUERY_PARAMS = {"_", "t", "ts", "timestamp", "cb", "nocache"}
+
+CHUNK_SIZE = 16 * 1024
+
+def request_key(method: str, url: str, body: bytes = b"") -> str:
+    """Chave estável da requisição: método + URL normalizada (+ hash do corpo)"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k not in VOLATILE_QUERY_PARAMS)
+    normalized = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+    key = f"{method.upper()} {normalized}"
+    if body:
+        key += f" {hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+class ReplayArchive:
+    """Respostas gravadas: index.json + corpos deduplicados por sha256 em bodies/"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.entries: Dict[str, Dict] = {}
+        self.bodies: Dict[str, bytes] = {}
+        self.lock = threading.Lock()
+
+    def load(self) -> "ReplayArchive":
+        index = self.directory / INDEX_FILE
+        if not index.exists():
+            raise FileNotFoundError(f"arquivo de replay não encontrado: {index}")
+        with open(index, 'r', encoding='utf-8') as f:
+            self.entries = json.load(f)["entries"]
+        return self
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        digest = entry["body"]
+        if digest not in self.bodies:
+            self.bodies[digest] = (self.directory / "bodies" / digest).read_bytes()
+        return entry, self.bodies[digest]
+
+    def put(self, key: str, entry: Dict, body: bytes):
+        """Grava só a primeira resposta de cada chave (todas as runs veem a mesma)"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = dict(entry, body=digest)
+            self.bodies[digest] = body
+
+    def save(self):
+        bodies_dir = self.directory / "bodies"
+        bodies_dir.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            for digest, body in self.bodies.items():
+                path = bodies_dir / digest
+                if not path.exists():
+                    path.write_bytes(body)
+            temp_path = self.directory / f"{INDEX_FILE}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'saved_at': datetime.now().isoformat(), 'entries': self.entries},
+                          f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.directory / INDEX_FILE)
+
+def ensure_certificate(directory: Path) -> Optional[Tuple[str, str]]:
+    """Certificado autoassinado do proxy (reaproveitado); None sem openssl"""
+    cert, key = directory / "proxy-cert.pem", directory / "proxy-key.pem"
+    if cert.exists() and key.exists():
+        return str(cert), str(key)
+    if not shutil.which("openssl"):
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    completed = subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+         "-subj", "/CN=perf-suite-replay-proxy", "-keyout", str(key), "-out", str(cert)],
+        capture_output=True, timeout=60
+    )
+    return (str(cert), str(key)) if completed.returncode == 0 else None
+
+class ReplayProxy:
+    """Proxy HTTP/HTTPS local em modo record ou replay"""
+
+    def __init__(self, archive_dir: str, mode: str = "replay", host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: Optional[float] = None, download_kbps: float = 0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"modo inválido: {mode} (use record/replay)")
+        self.archive = ReplayArchive(archive_dir)
+        self.mode = mode
+        self.host = host
+        self.requested_port = port
+        self.latency_ms = latency_ms  # None = latência gravada de cada resposta
+        self.download_kbps = download_kbps  # 0 = sem limite de banda
+        self.httpd = None
+        self.tls_context = None
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'recorded': 0, 'upstream_errors': 0,
+                      'tunneled': 0, 'bytes': 0}
+        self.missed: List[str] = []
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> Optional[str]:
+        return f"http://{self.host}:{self.httpd.server_address[1]}" if self.httpd else None
+
+    def start(self) -> str:
+        from http.server import ThreadingHTTPServer
+
+        if self.mode == "replay":
+            self.archive.load()
+        self.tls_context = self.build_tls_context()
+        if self.tls_context is None:
+            print("⚠️ openssl não encontrado: HTTPS passa direto pelo proxy (sem gravação/replay)")
+
+        self.httpd = ThreadingHTTPServer((self.host, self.requested_port), make_handler(self))
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name="replay-proxy", daemon=True).start()
+        os.environ[PROXY_ENV] = self.url
+        return self.url
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        if os.environ.get(PROXY_ENV):
+            del os.environ[PROXY_ENV]
+        if self.mode == "record":
+            self.archive.save()
+
+    def build_tls_context(self):
+        import ssl
+
+        paths = ensure_certificate(Path(tempfile.gettempdir()) / "perf_suite_replay_proxy")
+        if not paths:
+            return None
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*paths)
+        context.set_alpn_protocols(["http/1.1"])
+        return context
+
+    def count(self, name: str, amount: int = 1):
+        with self.stats_lock:
+            self.stats[name] += amount
+
+    def respond(self, method: str, url: str, headers: List[Tuple[str, str]], body: bytes) -> Tuple[Dict, bytes]:
+        """Resposta gravada (replay) ou do upstream, gravando (record)"""
+        key = request_key(method, url, body)
+        self.count('requests')
+
+        if self.mode == "replay":
+            found = self.archive.get(key)
+            if found:
+                self.count('hits')
+                return found
+            self.count('misses')
+            with self.stats_lock:
+                if len(self.missed) < 50:
+                    self.missed.append(key)
+            return {'status': 404, 'reason': 'Not Recorded', 'headers': [['X-Replay-Miss', '1']],
+                    'upstream_ms': 0}, b""
+
+        try:
+            entry, response_body = self.fetch_upstream(method, url, headers, body)
+        except Exception as e:
+            self.count('upstream_errors')
+            return {'status': 502, 'reason': 'Bad Gateway', 'headers': [], 'upstream_ms': 0}, str(e).encode()
+        self.archive.put(key, dict(entry, method=method, url=url), response_body)
+        self.count('recorded')
+        return entry, response_body
+
+    def fetch_upstream(self, method: str, url: str, headers: List[Tuple[str, str]], body: bytes):
+        import http.client
+        import ssl
+
+        parts = urlsplit(url)
+        if parts.scheme == "https":
+            connection = http.client.HTTPSConnection(parts.hostname, parts.port or 443, timeout=30,
+                                                     context=ssl.create_default_context())
+        else:
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        start = time.perf_counter()
+        try:
+            connection.request(method, path, body=body or None, headers=dict(headers))
+            response = connection.getresponse()
+            response_body = response.read()
+        finally:
+            connection.close()
+
+        return {
+            'status': response.status,
+            'reason': response.reason,
+            'headers': [[name, value] for name, value in response.getheaders()
+                        if name.lower() not in HOP_BY_HOP_HEADERS],
+            'upstream_ms': (time.perf_counter() - start) * 1000
+        }, response_body
+
+    def delay_seconds(self, entry: Dict) -> float:
+        if self.mode != "replay":
+            return 0
+        latency = self.latency_ms if self.latency_ms is not None else entry.get('upstream_ms', 0)
+        return latency / 1000
+
+def make_handler(proxy: ReplayProxy):
+    from http.server import BaseHTTPRequestHandler
+
+    class ProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        tunnel_origin = None  # https://host[:porta] depois do CONNECT
+
+        def do_CONNECT(self):
+            host, _, port = self.path.partition(":")
+            if proxy.tls_context is None:
+                return self.blind_tunnel(host, int(port or 443))
+
+            self.send_response(200, "Connection Established")
+            self.end_headers()
+            self.wfile.flush()
+            tls = proxy.tls_context.wrap_socket(self.connection, server_side=True)
+            self.connection = tls
+            self.rfile = tls.makefile("rb", self.rbufsize)
+            self.wfile = tls.makefile("wb")
+            self.tunnel_origin = f"https://{host}" + ("" if port in ("", "443") else f":{port}")
+            self.close_connection = False  # handle() continua lendo requisições de dentro do túnel
+
+        def blind_tunnel(self, host: str, port: int):
+            import select
+            import socket
+
+            proxy.count('tunneled')
+            try:
+                upstream = socket.create_connection((host, port), timeout=30)
+            except OSError:
+                self.send_error(502)
+                return
+            self.send_response(200, "Connection Established")
+            self.end_headers()
+            self.wfile.flush()
+            sockets = [self.connection, upstream]
+            try:
+                while True:
+                    readable, _, _ = select.select(sockets, [], [], 30)
+                    if not readable:
+                        break
+                    for sock in readable:
+                        data = sock.recv(CHUNK_SIZE)
+                        if not data:
+                            return
+                        (upstream if sock is self.connection else self.connection).sendall(data)
+            finally:
+                upstream.close()
+                self.close_connection = True
+
+        def handle_request(self):
+            if self.headers.get("Upgrade"):
+                self.send_error(502, "WebSocket não suportado pelo proxy de replay")
+                return
+            if self.path.startswith(("http://", "https://")):
+                url = self.path
+            else:
+                url = (self.tunnel_origin or f"http://{self.headers.get('Host')}") + self.path
+
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            headers = [(name, value) for name, value in self.headers.items()
+                       if name.lower() not in HOP_BY_HOP_HEADERS]
+
+            entry, response_body = proxy.respond(self.command, url, headers, body)
+            self.send_entry(entry, response_body)
+
+        def send_entry(self, entry: Dict, body: bytes):
+            delay = proxy.delay_seconds(entry)
+            if delay > 0:
+                time.sleep(delay)
+
+            self.send_response(entry['status'], entry.get('reason'))
+            for name, value in entry['headers']:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command == "HEAD" or not body:
+                self.wfile.flush()
+                return
+
+            # Ritmo fixo por conexão: cada bloco sai quando a banda teria entregue o seu último byte
+            rate = proxy.download_kbps * 1024 / 8 if proxy.mode == "replay" and proxy.download_kbps else 0
+            start = time.perf_counter()
+            for offset in range(0, len(body), CHUNK_SIZE):
+                chunk = body[offset:offset + CHUNK_SIZE]
+                if rate:
+                    wait = start + (offset + len(chunk)) / rate - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                self.wfile.write(chunk)
+                self.wfile.flush()
+            proxy.count('bytes', len(body))
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = handle_request
+
+        def finish(self):
+            super().finish()
+            if self.tunnel_origin:
+                self.connection.close()  # o socket TLS assumiu o descritor da conexão original
+
+        def log_message(self, format, *args):
+            pass
+
+    return ProxyHandler
+
+def apply_replay_proxy(options):
+    """Aponta o Chrome para o proxy ativo (inclusive localhost, que o Chrome não proxia por padrão)"""
+    proxy_url = os.environ.get(PROXY_ENV)
+    if not proxy_url:
+        return options
+    options.add_argument(f"--proxy-server={proxy_url}")
+    options.add_argument("--proxy-bypass-list=<-loopback>")
+    options.add_argument("--ignore-certificate-errors")
+    return options
+
+def print_proxy_stats(proxy: ReplayProxy):
+    stats = proxy.stats
+    print(f"\n📼 PROXY DE REDE ({proxy.mode}): {stats['requests']} requisições, {stats['bytes'] / 1024:.0f} KB")
+    if proxy.mode == "record":
+        print(f"   Gravadas: {len(proxy.archive.entries)} respostas em {proxy.archive.directory}")
+        if stats['upstream_errors']:
+            print(f"   ⚠️ Erros do upstream: {stats['upstream_errors']}")
+    else:
+        print(f"   Hits: {stats['hits']}  Misses: {stats['misses']}")
+        for key in proxy.missed[:10]:
+            print(f"   ⚠️ Não gravada: {key}")
+    if stats['tunneled']:
+        print(f"   ⚠️ Túneis HTTPS sem replay: {stats['tunneled']}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Proxy de gravação/reprodução de rede da suíte")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("archive", help="Diretório do arquivo gravado")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency-ms", type=float, default=None,
+                        help="Latência fixa por resposta no replay (padrão: a gravada)")
+    parser.add_argument("--download-kbps", type=float, default=0, help="Banda no replay (0 = sem limite)")
+    args = parser.parse_args()
+
+    proxy = ReplayProxy(args.archive, args.mode, port=args.port,
+                        latency_ms=args.latency_ms, download_kbps=args.download_kbps)
+    try:
+        url = proxy.start()
+    except (FileNotFoundError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"📼 Proxy em {url} (Chrome: --proxy-server={url} --proxy-bypass-list=<-loopback>)")
+    print("   Ctrl+C para encerrar")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+        print_proxy_stats(proxy)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+♻️ Result Cache - Projeto M
+Reuso de resultados de etapas da suíte quando as entradas não mudaram
+
+Funcionalidades:
+- Fingerprint por conteúdo do build (dist/), de public/, da configuração do projeto
+  (vite.config.ts, nginx.conf), das entradas próprias da etapa (ex.: src/ na análise de bundle),
+  da configuração do teste e do código da própria etapa
+- Cache de hashes por arquivo (tamanho + mtime): arquivos inalterados não são relidos
+- Resultados guardados por etapa; reuso só com fingerprint idêntico
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Entradas do projeto comuns a todas as etapas (relativas ao diretório de execução)
+PROJECT_INPUTS = ["dist", "public", "vite.config.ts", "nginx.conf"]
+
+HASH_CHUNK_SIZE = 1 << 20
+
+class FileHashCache:
+    """Hash de conteúdo por arquivo, reaproveitado enquanto tamanho e mtime não mudam"""
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = cache_file
+        self.entries: Dict[str, List] = {}
+        self.dirty = False
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.resolve())
+        cached = self.entries.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                sha.update(block)
+
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, sha.hexdigest()]
+        self.dirty = True
+        return sha.hexdigest()
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        self.dirty = False
+
+def iter_input_files(path: Path) -> Iterable[Path]:
+    """Arquivos de uma entrada (arquivo único ou árvore, em ordem estável, sem ocultos)"""
+    if path.is_file():
+        yield path
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for name in sorted(files):
+            if not name.startswith('.'):
+                yield Path(root) / name
+
+class InputFingerprinter:
+    """Fingerprint das entradas de uma etapa"""
+
+    def __init__(self, cache_dir: Path, project_inputs: Optional[List[str]] = None):
+        self.project_inputs = project_inputs if project_inputs is not None else list(PROJECT_INPUTS)
+        self.file_hashes = FileHashCache(cache_dir / "file_hashes.json")
+
+    def hash_inputs(self, paths: Iterable[str]) -> Dict[str, str]:
+        """Hash por entrada (ausente = "missing")"""
+        hashes = {}
+        for name in paths:
+            path = Path(name)
+            if not path.exists():
+                hashes[name] = "missing"
+                continue
+
+            sha = hashlib.sha256()
+            for file_path in iter_input_files(path):
+                relative = file_path.relative_to(path).as_posix() if path.is_dir() else file_path.name
+                sha.update(relative.encode('utf-8') + b'\0' + self.file_hashes.digest(file_path).encode() + b'\n')
+            hashes[name] = sha.hexdigest()
+        return hashes
+
+    def fingerprint(self, stage_config: Dict, code_files: Iterable[str] = (),
+                    stage_inputs: Iterable[str] = ()) -> Dict:
+        """Fingerprint combinado: projeto (+ entradas da etapa) + configuração do teste + código da etapa"""
+        inputs = self.hash_inputs(list(self.project_inputs) + list(stage_inputs))
+        code = self.hash_inputs(code_files)
+        config = hashlib.sha256(json.dumps(stage_config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        self.file_hashes.save()
+
+        combined = hashlib.sha256(json.dumps(
+            {'inputs': inputs, 'code': code, 'config': config}, sort_keys=True
+        ).encode('utf-8')).hexdigest()
+
+        return {
+            'fingerprint': combined,
+            # Sem build não há o que reaproveitar (a etapa pode gerar o dist/)
+            'complete': all(digest != 'missing' for name, digest in inputs.items() if Path(name).name == 'dist'),
+            'inputs': inputs,
+            'code': code,
+            'config': config
+        }
+
+class ResultCache:
+    """Último resultado de cada etapa, indexado pelo fingerprint das entradas"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def path_for(self, stage: str) -> Path:
+        return self.cache_dir / f"{stage.lower().replace(' ', '_')}.json"
+
+    def load(self, stage: str, fingerprint: str) -> Optional[Dict]:
+        """Entrada guardada se o fingerprint for idêntico"""
+        try:
+            with open(self.path_for(stage), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('fingerprint') == fingerprint else None
+
+    def store(self, stage: str, fingerprint: Dict, data: Dict, session_id: str, duration_seconds: float):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'stage': stage,
+            'fingerprint': fingerprint['fingerprint'],
+            'inputs': fingerprint['inputs'],
+            'stored_at': datetime.now().isoformat(),
+            'session_id': session_id,
+            'duration_seconds': duration_seconds,
+            'data': data
+        }
+        # Escrita atômica: uma execução interrompida não deixa entrada corrompida
+        path = self.path_for(stage)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, path)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+🕸️ Route Crawler - Projeto M
+Medição de performance de todas as rotas × viewports, em paralelo
+
+Funcionalidades:
+- Descoberta de rotas pelo React Router (src/App.tsx) e por links da página (inclusive #seções)
+- Matriz rota × viewport (perfis de dispositivo da RealPerformanceSuite)
+- Pool de workers com Chrome isolado e CPUs exclusivas (pinning), um por combinação
+- Paralelismo limitado por CPUs e memória livres para não distorcer os tempos medidos
+- Relatório com os resultados indexados por rota
+"""
+
+import asyncio
+import json
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from memory_scenarios import available_cores, partition_cores, pin_current_process
+from suite_tracer import traced
+
+# Memória reservada por Chrome medido (browser + renderer + GPU)
+MEMORY_PER_BROWSER = 1536 * 1024 * 1024
+
+ROUTE_PATTERN = re.compile(r'<Route\s+[^>]*path=["\']([^"\']+)["\']')
+
+@dataclass
+class RouteJob:
+    """Uma combinação rota × viewport"""
+    route: str  # caminho + #seção (ex.: "/", "/terms", "/#faq")
+    viewport: str  # nome do perfil de dispositivo
+
+    @property
+    def name(self) -> str:
+        return f"{self.route}@{self.viewport}"
+
+@dataclass
+class RouteResult:
+    """Resultado de uma combinação executada num worker"""
+    job: RouteJob
+    status: str  # success, failed
+    cpu_cores: List[int]
+    wall_seconds: float
+    summary: Optional[Dict] = None
+    error_message: Optional[str] = None
+
+@dataclass
+class CrawlReport:
+    """Relatório do crawl: resultados por rota e viewport"""
+    session_id: str
+    timestamp: str
+    base_url: str
+    parallelism: int
+    cores_per_job: int
+    wall_seconds: float
+    serial_seconds: float
+    routes: Dict[str, Dict[str, Dict]] = field(default_factory=dict)  # rota -> viewport -> resumo
+    failures: List[str] = field(default_factory=list)
+
+def discover_router_routes(app_path: str = "src/App.tsx") -> List[str]:
+    """Rotas estáticas declaradas no React Router (ignora "*" e parâmetros)"""
+    try:
+        with open(app_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError:
+        return []
+
+    routes = []
+    for path in ROUTE_PATTERN.findall(content):
+        if '*' in path or ':' in path or path in routes:
+            continue
+        routes.append(path)
+    return routes
+
+def discover_page_links(base_url: str) -> List[str]:
+    """Links internos renderizados na página inicial (caminhos e #seções)"""
+    from real_performance_suite import RealPerformanceSuite
+
+    suite = RealPerformanceSuite(base_url)
+    suite.main_thread_tracing = False
+    driver = suite.setup_driver()
+
+    try:
+        driver.get(base_url)
+        hrefs = driver.execute_script("""
+            return Array.from(document.querySelectorAll('a[href]')).map((a) => a.href);
+        """)
+    finally:
+        driver.quit()
+
+    origin = urlparse(base_url).netloc
+    routes = []
+    for href in hrefs:
+        url = urlparse(href)
+        if url.netloc != origin:
+            continue
+        route = (url.path or '/') + (f"#{url.fragment}" if url.fragment else '')
+        if route not in routes:
+            routes.append(route)
+    return routes
+
+def discover_routes(base_url: str, app_path: str = "src/App.tsx", include_links: bool = True) -> List[str]:
+    """Rotas do router + links da página (sem duplicatas, "/" primeiro)"""
+    routes = discover_router_routes(app_path) or ['/']
+
+    if include_links:
+        try:
+            for route in discover_page_links(base_url):
+                if route not in routes:
+                    routes.append(route)
+        except Exception as e:
+            print(f"⚠️ Erro ao descobrir links da página: {e}")
+
+    return sorted(routes, key=lambda route: (route != '/', route))
+
+def build_route_jobs(routes: List[str], viewports: List[str]) -> List[RouteJob]:
+    return [RouteJob(route, viewport) for route in routes for viewport in viewports]
+
+# Conjunto de CPUs do worker atual (definido no initializer do pool)
+_worker_cores: List[int] = []
+
+def _init_worker(core_queue):
+    """Initializer do pool: cada worker reserva um conjunto de CPUs exclusivo"""
+    global _worker_cores
+    _worker_cores = core_queue.get()
+    pin_current_process(_worker_cores)
+
+def run_route_worker(job: RouteJob, base_url: str, output_dir: str, suite_options: Dict) -> RouteResult:
+    """Mede uma rota num viewport com um Chrome isolado (função de topo para ser picklable)"""
+    from real_performance_suite import RealPerformanceSuite
+
+    start = time.time()
+
+    try:
+        suite = RealPerformanceSuite(urljoin(base_url, job.route))
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', job.route).strip('_') or 'root'
+        suite.session_id = f"{suite.session_id}_{slug}_{job.viewport}"
+        suite.device_profiles = [job.viewport]
+        # As interações roteirizadas só existem na página inicial
+        suite.measure_interactions = job.route == '/'
+        for name, value in suite_options.items():
+            setattr(suite, name, value)
+
+        analysis = asyncio.run(suite.run_performance_analysis())
+
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        analysis_file = output_path / f"route_{analysis.session_id}.json"
+        with open(analysis_file, 'w', encoding='utf-8') as f:
+            json.dump(asdict(analysis), f, indent=2, ensure_ascii=False)
+
+        cwv = analysis.core_web_vitals
+        summary = {
+            "url": analysis.url,
+            "analysis_file": str(analysis_file),
+            "performance_score": analysis.performance_score,
+            "fcp": cwv.fcp,
+            "lcp": cwv.lcp,
+            "cls": cwv.cls,
+            "tbt": cwv.tbt,
+            "si": cwv.si,
+            "inp": cwv.inp,
+            "transfer_kb": analysis.resource_metrics.total_transfer_size / 1024,
+            "critical_issues": analysis.critical_issues,
+            "warnings": analysis.warnings
+        }
+
+        return RouteResult(job=job, status="success", cpu_cores=list(_worker_cores),
+                           wall_seconds=time.time() - start, summary=summary)
+
+    except Exception as e:
+        return RouteResult(job=job, status="failed", cpu_cores=list(_worker_cores),
+                           wall_seconds=time.time() - start, error_message=str(e))
+
+class RouteCrawler:
+    """Executa a matriz rota × viewport num pool de browsers isolados"""
+
+    def __init__(self, base_url: str = "http://localhost:8080",
+                 output_dir: str = "performance_reports",
+                 cores_per_job: int = 2,
+                 max_parallelism: int = 0,
+                 suite_options: Optional[Dict] = None):
+        self.base_url = base_url
+        self.output_dir = output_dir
+        self.cores_per_job = cores_per_job
+        self.max_parallelism = max_parallelism  # 0 = automático
+        # Atributos aplicados a cada RealPerformanceSuite (ex.: cache_modes)
+        self.suite_options = suite_options if suite_options is not None else {'cache_modes': ['warm_code']}
+        self.session_id = f"route_crawl_{int(time.time())}"
+
+    def memory_slots(self) -> int:
+        """Quantos Chromes cabem na memória livre"""
+        try:
+            import psutil
+            return max(1, psutil.virtual_memory().available // MEMORY_PER_BROWSER)
+        except Exception:
+            return 1 << 16  # sem psutil: só o limite de CPUs
+
+    def plan_parallelism(self, job_count: int) -> List[List[int]]:
+        """CPUs de cada worker: conjuntos disjuntos, limitados pela memória e pelo teto configurado"""
+        core_sets = partition_cores(available_cores(), self.cores_per_job)
+
+        parallelism = min(len(core_sets), self.memory_slots(), job_count)
+        if self.max_parallelism > 0:
+            parallelism = min(parallelism, self.max_parallelism)
+
+        return core_sets[:max(1, parallelism)]
+
+    async def crawl(self, jobs: List[RouteJob]) -> CrawlReport:
+        """Executa todas as combinações e indexa os resultados por rota"""
+        core_sets = self.plan_parallelism(len(jobs))
+        parallelism = len(core_sets)
+
+        print(f"🕸️ Crawl: {len(jobs)} combinações rota × viewport, {parallelism} em paralelo "
+              f"({self.cores_per_job} CPUs por browser)")
+
+        # 'spawn' evita herdar estado do processo pai (e funciona igual no Windows)
+        context = multiprocessing.get_context('spawn')
+        start = time.time()
+        loop = asyncio.get_running_loop()
+        results: List[RouteResult] = []
+
+        with context.Manager() as manager:
+            core_queue = manager.Queue()
+            for cores in core_sets:
+                core_queue.put(cores)
+
+            with ProcessPoolExecutor(max_workers=parallelism, mp_context=context,
+                                     initializer=_init_worker, initargs=(core_queue,)) as pool:
+                futures = [
+                    loop.run_in_executor(pool, run_route_worker, job, self.base_url,
+                                         self.output_dir, self.suite_options)
+                    for job in jobs
+                ]
+
+                for future in asyncio.as_completed(futures):
+                    result = await future
+                    status = "✅" if result.status == "success" else "❌"
+                    print(f"   {status} {result.job.name} em {result.wall_seconds:.1f}s (CPUs {result.cpu_cores})")
+                    results.append(result)
+
+        return self.build_report(results, parallelism, time.time() - start)
+
+    def build_report(self, results: List[RouteResult], parallelism: int, wall_seconds: float) -> CrawlReport:
+        routes: Dict[str, Dict[str, Dict]] = {}
+        failures = []
+
+        for result in sorted(results, key=lambda r: (r.job.route != '/', r.job.route, r.job.viewport)):
+            if result.status == "success":
+                routes.setdefault(result.job.route, {})[result.job.viewport] = result.summary
+            else:
+                routes.setdefault(result.job.route, {})[result.job.viewport] = {"error": result.error_message}
+                failures.append(f"{result.job.name}: {result.error_message}")
+
+        return CrawlReport(
+            session_id=self.session_id,
+            timestamp=datetime.now().isoformat(),
+            base_url=self.base_url,
+            parallelism=parallelism,
+            cores_per_job=self.cores_per_job,
+            wall_seconds=wall_seconds,
+            serial_seconds=sum(r.wall_seconds for r in results),
+            routes=routes,
+            failures=failures
+        )
+
+    @traced("report_write")
+    def save_report(self, report: CrawlReport) -> str:
+        """Salva o relatório do crawl"""
+        output_path = Path(self.output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        filename = output_path / f"{report.session_id}.json"
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(asdict(report), f, indent=2, ensure_ascii=False)
+
+        print(f"💾 Crawl salvo em: {filename}")
+        return str(filename)
+
+    def print_report(self, report: CrawlReport):
+        """Imprime a tabela rota × viewport"""
+        print("\n" + "="*70)
+        print("🕸️ RELATÓRIO POR ROTA")
+        print("="*70)
+
+        print(f"⏱️ Tempo total: {report.wall_seconds:.1f}s (serial seria {report.serial_seconds:.1f}s)")
+        print(f"⚙️ Paralelismo: {report.parallelism} × {report.cores_per_job} CPUs")
+
+        print(f"\n{'Rota':<24} {'Viewport':<16} {'Score':>5} {'FCP':>7} {'LCP':>7} {'TBT':>6} {'CLS':>6}")
+        for route, viewports in report.routes.items():
+            for viewport, summary in viewports.items():
+                if 'error' in summary:
+                    print(f"{route:<24} {viewport:<16} ❌ {summary['error']}")
+                    continue
+                print(f"{route:<24} {viewport:<16} {summary['performance_score']:>5} "
+                      f"{summary['fcp']:>5.0f}ms {summary['lcp']:>5.0f}ms {summary['tbt']:>4.0f}ms "
+                      f"{summary['cls']:>6.3f}")
+
+        print("\n" + "="*70)
+
+async def main():
+    """Função principal"""
+    crawler = RouteCrawler()
+    routes = discover_routes(crawler.base_url)
+    jobs = build_route_jobs(routes, ['desktop', 'mid_tier_mobile'])
+
+    try:
+        report = await crawler.crawl(jobs)
+        crawler.save_report(report)
+        crawler.print_report(report)
+
+    except Exception as e:
+        print(f"❌ Erro durante o crawl: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,6 +10,7 @@ Funcionalidades:
 - Monitoramento de recursos do sistema
 - Detecção de pontos de falha
 - Relatórios detalhados de stress
+- Motor CDP assíncrono: todos os usuários como abas de um único Chrome, sem bloquear o event loop
 """
 
 import asyncio
@@ -27,6 +28,11 @@ import threading
 import queue
 import random
 
+from cdp_client import Browser, CDPPage
+from metrics_exporter import METRICS
+from replay_proxy import apply_replay_proxy
+from suite_tracer import instrument_driver, traced
+
 try:
     from selenium import webdriver
     from selenium.webdriver.chrome.options import Options
@@ -36,9 +42,8 @@ try:
     from selenium.webdriver.support import expected_conditions as EC
     from webdriver_manager.chrome import ChromeDriverManager
     from selenium.webdriver.common.action_chains import ActionChains
-except ImportError:
-    print("⚠️ Instale as dependências: pip install selenium webdriver-manager aiohttp psutil")
-    exit(1)
+except ImportError as e:
+    raise ImportError("⚠️ Instale as dependências: pip install selenium webdriver-manager aiohttp psutil") from e
 
 @dataclass
 class UserSession:
@@ -98,12 +103,22 @@ class StressTestResult:
     
     # Recomendações
     recommendations: List[str]
+    
+    # Motor dos usuários virtuais (selenium = um Chrome por usuário; cdp = uma aba por usuário)
+    browser_engine: str = "selenium"
 
 class StressTester:
     """Testador de stress avançado"""
     
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(self, base_url: str = "http://localhost:8080", engine: str = "selenium"):
+        if engine not in ("cdp", "selenium"):
+            raise ValueError(f"Motor de browser desconhecido: {engine} (use cdp ou selenium)")
         self.base_url = base_url
+        self.engine = engine
+        self.browser: Optional[Browser] = None  # Chrome compartilhado no motor CDP
+        self.engine_used = engine  # cdp cai para selenium sem Chrome
+        self.selenium_pool: Optional[ThreadPoolExecutor] = None  # um thread por usuário no Selenium
+        self.stopping = False  # fim do teste: usuários saem do loop mesmo se o cancelamento se perder
         self.test_id = f"stress_test_{int(time.time())}"
         self.user_sessions: List[UserSession] = []
         self.system_metrics: List[SystemMetrics] = []
@@ -127,6 +142,16 @@ class StressTester:
             ('resize_window', self.action_resize_window),
             ('navigate_sections', self.action_navigate_sections)
         ]
+        
+        # As mesmas ações sobre uma aba CDP (comandos aguardáveis, sem chromedriver)
+        self.cdp_user_actions = [
+            ('load_page', self.cdp_action_load_page),
+            ('scroll_page', self.cdp_action_scroll_page),
+            ('click_elements', self.cdp_action_click_elements),
+            ('hover_elements', self.cdp_action_hover_elements),
+            ('resize_window', self.cdp_action_resize_window),
+            ('navigate_sections', self.cdp_action_navigate_sections)
+        ]
     
     def collect_system_metrics(self) -> Optional[SystemMetrics]:
         """Coleta métricas do sistema"""
@@ -159,6 +184,7 @@ class StressTester:
             print(f"⚠️ Erro ao coletar métricas do sistema: {e}")
             return None
     
+    @traced("driver_setup")
     def setup_driver(self) -> webdriver.Chrome:
         """Configura Chrome para teste de stress"""
         options = Options()
@@ -175,8 +201,23 @@ class StressTester:
         options.add_argument("--disable-images")
         options.add_argument("--disable-javascript")  # Para alguns testes
         
+        apply_replay_proxy(options)
+        
         service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
+        return instrument_driver(webdriver.Chrome(service=service, options=options))
+    
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        """Executa uma chamada bloqueante do WebDriver fora do event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.selenium_pool, func, *args)
+    
+    async def launch_cdp_browser(self) -> Optional[Browser]:
+        """Lança o Chrome compartilhado do motor CDP (None = cair para o Selenium)"""
+        try:
+            return await Browser.launch(args=["--disable-web-security", "--window-size=1366,768"])
+        except (FileNotFoundError, RuntimeError, OSError, asyncio.TimeoutError) as e:
+            print(f"⚠️ Motor CDP indisponível ({e}) - usando Selenium")
+            return None
     
     async def simulate_user(self, user_id: int, config: Dict) -> UserSession:
         """Simula um usuário individual"""
@@ -193,18 +234,26 @@ class StressTester:
         )
         
         driver = None
+        actions = self.user_actions
         response_times = []
         
+        if METRICS.enabled:
+            METRICS.stress_user_started()
+        
         try:
-            driver = self.setup_driver()
+            if self.browser is not None:
+                driver = await self.browser.new_page()
+                actions = self.cdp_user_actions
+            else:
+                driver = await self.run_blocking(self.setup_driver)
             
             # Duração da sessão do usuário
             session_duration = config['test_duration_minutes'] * 60
             session_end_time = time.time() + session_duration
             
-            while time.time() < session_end_time:
+            while time.time() < session_end_time and not self.stopping:
                 # Escolher ação aleatória
-                action_name, action_func = random.choice(self.user_actions)
+                action_name, action_func = random.choice(actions)
                 
                 try:
                     start_time = time.time()
@@ -217,10 +266,14 @@ class StressTester:
                     session.total_requests += 1
                     session.successful_requests += 1
                     session.actions_performed.append(action_name)
+                    if METRICS.enabled:
+                        METRICS.observe_stress_action(action_name, response_time, success=True)
                     
                 except Exception as e:
                     session.failed_requests += 1
                     session.errors.append(f"{action_name}: {str(e)}")
+                    if METRICS.enabled:
+                        METRICS.observe_stress_action(action_name, None, success=False)
                 
                 # Think time (pausa entre ações)
                 think_time = random.uniform(*config['think_time_range'])
@@ -237,66 +290,82 @@ class StressTester:
             session.errors.append(f"Session error: {str(e)}")
         
         finally:
-            if driver:
+            if METRICS.enabled:
+                METRICS.stress_user_finished()
+            if isinstance(driver, CDPPage):
+                await driver.close()
+            elif driver:
                 try:
-                    driver.quit()
-                except:
+                    await self.run_blocking(driver.quit)
+                except Exception:
                     pass
         
         return session
     
-    # Ações que os usuários virtuais podem realizar
+    # Ações que os usuários virtuais podem realizar (comandos do WebDriver em threads do pool,
+    # pausas no event loop: um usuário esperando o chromedriver não trava os demais)
     async def action_load_page(self, driver: webdriver.Chrome, user_id: int):
         """Carrega a página principal"""
-        driver.get(self.base_url)
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        def load():
+            driver.get(self.base_url)
+            WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
+        
+        await self.run_blocking(load)
     
     async def action_scroll_page(self, driver: webdriver.Chrome, user_id: int):
         """Faz scroll na página"""
         # Scroll para baixo
         for i in range(random.randint(3, 8)):
             scroll_position = random.randint(300, 800)
-            driver.execute_script(f"window.scrollBy(0, {scroll_position});")
+            await self.run_blocking(driver.execute_script, f"window.scrollBy(0, {scroll_position});")
             await asyncio.sleep(0.5)
         
         # Voltar ao topo
-        driver.execute_script("window.scrollTo(0, 0);")
+        await self.run_blocking(driver.execute_script, "window.scrollTo(0, 0);")
     
     async def action_click_elements(self, driver: webdriver.Chrome, user_id: int):
         """Clica em elementos interativos"""
-        try:
+        def click() -> bool:
             clickable_elements = driver.find_elements(By.CSS_SELECTOR, "button, a, [role='button']")
-            
-            if clickable_elements:
-                element = random.choice(clickable_elements)
-                if element.is_displayed() and element.is_enabled():
-                    driver.execute_script("arguments[0].click();", element)
-                    await asyncio.sleep(1)
-        except:
+            if not clickable_elements:
+                return False
+            element = random.choice(clickable_elements)
+            if not (element.is_displayed() and element.is_enabled()):
+                return False
+            driver.execute_script("arguments[0].click();", element)
+            return True
+        
+        try:
+            if await self.run_blocking(click):
+                await asyncio.sleep(1)
+        except Exception:
             pass
     
     async def action_hover_elements(self, driver: webdriver.Chrome, user_id: int):
         """Faz hover sobre elementos"""
+        def hover(actions: ActionChains, element) -> bool:
+            if not element.is_displayed():
+                return False
+            actions.move_to_element(element).perform()
+            return True
+        
         try:
             actions = ActionChains(driver)
-            elements = driver.find_elements(By.CSS_SELECTOR, "div, span, img")
+            elements = await self.run_blocking(driver.find_elements, By.CSS_SELECTOR, "div, span, img")
             
             for _ in range(random.randint(3, 6)):
-                if elements:
-                    element = random.choice(elements)
-                    if element.is_displayed():
-                        actions.move_to_element(element).perform()
-                        await asyncio.sleep(0.3)
-        except:
+                if elements and await self.run_blocking(hover, actions, random.choice(elements)):
+                    await asyncio.sleep(0.3)
+        except Exception:
             pass
     
     async def action_resize_window(self, driver: webdriver.Chrome, user_id: int):
         """Redimensiona a janela"""
         sizes = [(1920, 1080), (1366, 768), (768, 1024), (375, 667)]
         width, height = random.choice(sizes)
-        driver.set_window_size(width, height)
+        await self.run_blocking(driver.set_window_size, width, height)
         await asyncio.sleep(1)
     
     async def action_navigate_sections(self, driver: webdriver.Chrome, user_id: int):
@@ -305,9 +374,83 @@ class StressTester:
         section = random.choice(sections)
         
         try:
-            driver.execute_script(f"document.querySelector('{section}')?.scrollIntoView();")
+            await self.run_blocking(driver.execute_script,
+                                    f"document.querySelector('{section}')?.scrollIntoView();")
             await asyncio.sleep(2)
-        except:
+        except Exception:
+            pass
+    
+    # Ações equivalentes no motor CDP
+    async def cdp_action_load_page(self, page: CDPPage, user_id: int):
+        """Carrega a página principal (aguarda o evento load)"""
+        await page.navigate(self.base_url, timeout=30)
+        if not await page.evaluate("document.body !== null"):
+            raise RuntimeError("body ausente após o load")
+    
+    async def cdp_action_scroll_page(self, page: CDPPage, user_id: int):
+        """Faz scroll na página"""
+        for i in range(random.randint(3, 8)):
+            scroll_position = random.randint(300, 800)
+            await page.evaluate(f"window.scrollBy(0, {scroll_position})")
+            await asyncio.sleep(0.5)
+        
+        await page.evaluate("window.scrollTo(0, 0)")
+    
+    async def cdp_action_click_elements(self, page: CDPPage, user_id: int):
+        """Clica em elementos interativos"""
+        selector = "button, a, [role='button']"
+        try:
+            count = await page.evaluate(f"document.querySelectorAll(\"{selector}\").length")
+            
+            if count:
+                clicked = await page.evaluate(f"""(() => {{
+                    const element = document.querySelectorAll("{selector}")[{random.randrange(count)}];
+                    if (!element || !element.getClientRects().length || element.disabled) return false;
+                    element.click();
+                    return true;
+                }})()""")
+                if clicked:
+                    await asyncio.sleep(1)
+        except Exception:
+            pass
+    
+    async def cdp_action_hover_elements(self, page: CDPPage, user_id: int):
+        """Faz hover sobre elementos (eventos de mouse reais via Input)"""
+        try:
+            count = await page.evaluate("document.querySelectorAll('div, span, img').length")
+            
+            for _ in range(random.randint(3, 6)):
+                if count:
+                    point = await page.evaluate(f"""(() => {{
+                        const element = document.querySelectorAll('div, span, img')[{random.randrange(count)}];
+                        if (!element) return null;
+                        element.scrollIntoView({{block: 'center'}});
+                        const rect = element.getBoundingClientRect();
+                        if (!rect.width || !rect.height) return null;
+                        return {{x: rect.left + rect.width / 2, y: rect.top + rect.height / 2}};
+                    }})()""")
+                    if point:
+                        await page.send("Input.dispatchMouseEvent", type="mouseMoved", x=point['x'], y=point['y'])
+                        await asyncio.sleep(0.3)
+        except Exception:
+            pass
+    
+    async def cdp_action_resize_window(self, page: CDPPage, user_id: int):
+        """Redimensiona a viewport"""
+        sizes = [(1920, 1080), (1366, 768), (768, 1024), (375, 667)]
+        width, height = random.choice(sizes)
+        await page.set_viewport(width, height, mobile=width < 768)
+        await asyncio.sleep(1)
+    
+    async def cdp_action_navigate_sections(self, page: CDPPage, user_id: int):
+        """Navega entre seções"""
+        sections = ["#hero", "#features", "#contact", "#faq"]
+        section = random.choice(sections)
+        
+        try:
+            await page.evaluate(f"document.querySelector('{section}')?.scrollIntoView()")
+            await asyncio.sleep(2)
+        except Exception:
             pass
     
     async def monitor_system_resources(self, duration_minutes: int):
@@ -331,6 +474,20 @@ class StressTester:
         print(f"💪 Iniciando Stress Test - {config['max_users']} usuários")
         print(f"📈 Ramp-up: {config['ramp_up_minutes']} min, Duração: {config['test_duration_minutes']} min")
         
+        # Motor CDP: um Chrome para todos os usuários (cada um em sua aba)
+        self.stopping = False
+        owns_browser = False
+        if self.engine == "cdp" and self.browser is None:
+            self.browser = await self.launch_cdp_browser()
+            owns_browser = self.browser is not None
+        self.engine_used = "cdp" if self.browser is not None else "selenium"
+        
+        # Selenium: cada usuário bloqueia um thread por comando; o pool padrão (CPUs + 4) faria
+        # os usuários esperarem uns pelos outros e inflaria os tempos de resposta
+        if self.engine_used == "selenium":
+            self.selenium_pool = ThreadPoolExecutor(max_workers=max(1, config['max_users']),
+                                                    thread_name_prefix="stress-user")
+        
         start_time = datetime.now()
         
         # Iniciar monitoramento de recursos
@@ -381,10 +538,22 @@ class StressTester:
             
         except Exception as e:
             print(f"❌ Erro durante teste de stress: {e}")
-            # Cancelar tarefas pendentes
+        
+        finally:
+            # Também no timeout/cancelamento da master: cancelar tarefas pendentes e fechar
+            # o Chrome compartilhado (processo e perfil temporário). No Python 3.11 o wait_for
+            # pode engolir o cancelamento se a resposta CDP chegar junto; a flag encerra o loop
+            self.stopping = True
             for task in user_tasks:
                 task.cancel()
             monitor_task.cancel()
+            await asyncio.gather(*user_tasks, return_exceptions=True)  # abas e drivers fechados
+            if owns_browser:
+                await self.browser.close()
+                self.browser = None
+            if self.selenium_pool:
+                self.selenium_pool.shutdown(wait=False)
+                self.selenium_pool = None
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -430,7 +599,8 @@ class StressTester:
             error_rate=error_rate,
             failure_points=failure_points,
             performance_degradation=performance_degradation,
-            recommendations=recommendations
+            recommendations=recommendations,
+            browser_engine=self.engine_used
         )
     
     def detect_failure_points(self) -> List[Dict]:
@@ -556,6 +726,7 @@ class StressTester:
         
         return recommendations
     
+    @traced("report_write")
     def save_results(self, result: StressTestResult):
         """Salva resultados do teste"""
         filename = f"stress_test_results_{result.test_id}.json"
@@ -575,6 +746,7 @@ class StressTester:
         print(f"⏱️ Duração: {result.duration_seconds/60:.1f} minutos")
         print(f"👥 Usuários simultâneos: {result.max_concurrent_users}")
         print(f"📈 Ramp-up: {result.ramp_up_time} minutos")
+        print(f"🌐 Motor: {result.browser_engine}")
         
         print(f"\n📊 MÉTRICAS GERAIS:")
         print(f"   Throughput: {result.throughput:.2f} req/s")
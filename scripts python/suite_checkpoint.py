@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+💾 Suite Checkpoint - Projeto M
+Checkpoints por etapa da Master Performance Suite para retomar execuções interrompidas
+
+Funcionalidades:
+- Resultado de cada etapa gravado atomicamente assim que ela termina
+- Manifesto da sessão com a configuração usada (retomada mede nas mesmas condições)
+- Retomada: etapas concluídas são reaproveitadas, falhas e ausentes rodam de novo
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+CHECKPOINT_DIR = "checkpoints"
+MANIFEST_FILE = "manifest.json"
+
+def write_json_atomic(path: Path, data: Dict):
+    """Grava via arquivo temporário + os.replace (uma interrupção nunca deixa JSON truncado)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def read_json(path: Path) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+class CheckpointStore:
+    """Checkpoints de uma sessão em <output_dir>/checkpoints/<session_id>/"""
+
+    def __init__(self, output_dir: Path, session_id: str):
+        self.session_id = session_id
+        self.directory = Path(output_dir) / CHECKPOINT_DIR / session_id
+
+    def exists(self) -> bool:
+        return (self.directory / MANIFEST_FILE).exists()
+
+    def stage_path(self, test_name: str) -> Path:
+        return self.directory / f"{test_name.lower().replace(' ', '_')}.json"
+
+    def save_manifest(self, configuration: Dict, started_at: str):
+        """Cria o manifesto na primeira execução (a retomada mantém o original)"""
+        if self.exists():
+            return
+        write_json_atomic(self.directory / MANIFEST_FILE, {
+            'session_id': self.session_id,
+            'started_at': started_at,
+            'configuration': configuration
+        })
+
+    def load_manifest(self) -> Optional[Dict]:
+        return read_json(self.directory / MANIFEST_FILE)
+
+    def save_stage(self, result: Dict):
+        """Checkpoint de uma etapa concluída (sucesso, falha ou cancelamento)"""
+        write_json_atomic(self.stage_path(result['test_name']), {
+            'checkpointed_at': datetime.now().isoformat(),
+            'result': result
+        })
+
+    def load_stages(self) -> Dict[str, Dict]:
+        """Último resultado gravado de cada etapa (checkpoints ilegíveis são ignorados)"""
+        stages = {}
+        for path in sorted(self.directory.glob("*.json")):
+            if path.name == MANIFEST_FILE:
+                continue
+            entry = read_json(path)
+            if entry and 'result' in entry:
+                stages[entry['result']['test_name']] = entry['result']
+        return stages
+
+def latest_session(output_dir: Path) -> Optional[str]:
+    """Sessão com checkpoint mais recente (para --resume latest)"""
+    manifests = list((Path(output_dir) / CHECKPOINT_DIR).glob(f"*/{MANIFEST_FILE}"))
+    if not manifests:
+        return None
+    return max(manifests, key=lambda path: max(p.stat().st_mtime for p in path.parent.iterdir())).parent.name
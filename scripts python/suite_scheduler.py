@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+🗓️ Suite Scheduler - Projeto M
+Agendamento em DAG dos testes da Master Performance Suite, ciente de recursos
+
+Funcionalidades:
+- Cada teste declara dependências, CPUs, slots de browser e exclusividade
+- Testes sensíveis à medição ("máquina quieta") nunca se sobrepõem a carga nem a outros browsers
+- Empacota testes compatíveis em paralelo (prioridade pelo caminho restante mais longo)
+- Linha do tempo real, motivo de cada espera e caminho crítico da própria suíte
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# Memória reservada por Chrome (browser + renderer + GPU)
+MEMORY_PER_BROWSER = 1536 * 1024 * 1024
+
+# Intervalo máximo entre o fim de um teste e o início do seguinte para considerá-los encadeados (s)
+CHAIN_TOLERANCE_SECONDS = 1.0
+
+@dataclass
+class TaskSpec:
+    """Um teste da suíte e os recursos que ele ocupa enquanto roda"""
+    name: str
+    func: Callable[[], Awaitable]
+    depends_on: List[str] = field(default_factory=list)
+    cores: int = 1
+    browsers: int = 0
+    quiet: bool = False  # sensível à medição: não roda junto com carga nem com outro browser
+    load: bool = False  # gera carga na máquina/servidor (ex.: stress)
+    exclusive: bool = False  # usa a máquina inteira (pools próprios de processos)
+    estimate_seconds: float = 60
+
+@dataclass
+class TaskTiming:
+    """Execução de um teste na linha do tempo da suíte (s desde o início)"""
+    name: str
+    start: float
+    end: float
+    cores: int
+    browsers: int
+    waited_for: str = ""  # dependência ou recurso que atrasou o início
+
+@dataclass
+class ScheduleReport:
+    """Resultado do agendamento"""
+    max_concurrency: int
+    cores: int
+    browsers: int
+    wall_seconds: float
+    serial_seconds: float  # soma das durações (tempo da execução sequencial)
+    speedup: float
+    timeline: List[TaskTiming]
+    critical_path: List[str]
+    critical_path_seconds: float
+
+def browser_slots() -> int:
+    """Quantos Chromes cabem na memória livre"""
+    try:
+        import psutil
+        return max(1, psutil.virtual_memory().available // MEMORY_PER_BROWSER)
+    except Exception:
+        return 4
+
+def critical_path(timeline: List[TaskTiming]) -> List[TaskTiming]:
+    """Cadeia de testes em que cada um só começou quando o anterior terminou, até o último fim"""
+    if not timeline:
+        return []
+
+    path = [max(timeline, key=lambda t: t.end)]
+    while True:
+        current = path[-1]
+        previous = [t for t in timeline
+                    if t not in path and t.end <= current.start
+                    and current.start - t.end <= CHAIN_TOLERANCE_SECONDS]
+        if not previous:
+            break
+        path.append(max(previous, key=lambda t: t.end))
+    return path[::-1]
+
+class DagScheduler:
+    """Executa um DAG de testes respeitando dependências e o orçamento de recursos"""
+
+    def __init__(self, tasks: List[TaskSpec], cores: Optional[int] = None,
+                 browsers: Optional[int] = None, max_concurrency: int = 0):
+        from memory_scenarios import available_cores  # multiprocessing só quando agenda
+
+        self.tasks = {task.name: task for task in tasks}
+        self.order = [task.name for task in tasks]
+        self.cores = cores or len(available_cores())
+        self.browsers = browsers or browser_slots()
+        self.max_concurrency = max_concurrency  # 0 = só os recursos limitam; 1 = sequencial
+
+        for task in tasks:
+            missing = [dep for dep in task.depends_on if dep not in self.tasks]
+            if missing:
+                raise ValueError(f"{task.name} depende de testes inexistentes: {', '.join(missing)}")
+        self.ranks = self.compute_ranks()
+
+    def compute_ranks(self) -> Dict[str, float]:
+        """Duração estimada do caminho mais longo a partir de cada teste (detecta ciclos)"""
+        successors: Dict[str, List[str]] = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dep in task.depends_on:
+                successors[dep].append(task.name)
+
+        ranks: Dict[str, float] = {}
+        visiting = set()
+
+        def rank(name: str) -> float:
+            if name in ranks:
+                return ranks[name]
+            if name in visiting:
+                raise ValueError(f"Ciclo de dependências envolvendo {name}")
+            visiting.add(name)
+            ranks[name] = self.tasks[name].estimate_seconds + max((rank(s) for s in successors[name]), default=0)
+            visiting.discard(name)
+            return ranks[name]
+
+        for name in self.tasks:
+            rank(name)
+        return ranks
+
+    def demand(self, task: TaskSpec) -> tuple:
+        """CPUs e browsers efetivos (exclusivos reservam tudo; nunca acima do orçamento)"""
+        if task.exclusive:
+            return self.cores, self.browsers
+        return min(task.cores, self.cores), min(task.browsers, self.browsers)
+
+    def blocked_by(self, task: TaskSpec, running: List[TaskSpec]) -> str:
+        """Motivo pelo qual o teste não pode começar agora ('' = pode)"""
+        if not running:
+            return ""
+        if self.max_concurrency and len(running) >= self.max_concurrency:
+            return f"limite de {self.max_concurrency} teste(s) simultâneo(s)"
+        if task.exclusive:
+            return f"exclusivo (aguarda {', '.join(t.name for t in running)})"
+
+        for other in running:
+            if other.exclusive:
+                return f"{other.name} exclusivo"
+            if task.quiet and other.load:
+                return f"máquina quieta (carga de {other.name})"
+            if task.load and other.quiet:
+                return f"máquina quieta para {other.name}"
+            # Dois Chromes medindo (ou um medindo e outro trabalhando) disputam CPU, GPU e rede
+            if task.quiet and self.demand(other)[1]:
+                return f"máquina quieta (browser de {other.name})"
+            if other.quiet and self.demand(task)[1]:
+                return f"máquina quieta para {other.name}"
+
+        cores, browsers = self.demand(task)
+        used_cores = sum(self.demand(t)[0] for t in running)
+        used_browsers = sum(self.demand(t)[1] for t in running)
+        if used_cores + cores > self.cores:
+            return f"CPUs ({used_cores}/{self.cores} em uso)"
+        if used_browsers + browsers > self.browsers:
+            return f"browsers ({used_browsers}/{self.browsers} em uso)"
+        return ""
+
+    async def run(self, execute: Callable[[TaskSpec], Awaitable]) -> ScheduleReport:
+        """Executa todos os testes; execute(task) roda um teste e trata os próprios erros"""
+        pending = dict(self.tasks)
+        done = set()
+        running: Dict[asyncio.Task, TaskSpec] = {}
+        started: Dict[str, float] = {}
+        waits: Dict[str, str] = {}
+        timeline: List[TaskTiming] = []
+        origin = time.monotonic()
+
+        try:
+            while pending or running:
+                ready = [task for task in pending.values() if all(dep in done for dep in task.depends_on)]
+                # Caminho restante mais longo primeiro; quem gera carga por último (não atrasa medições)
+                ready.sort(key=lambda t: (t.load, -self.ranks[t.name], self.order.index(t.name)))
+
+                for task in ready:
+                    reason = self.blocked_by(task, list(running.values()))
+                    if reason:
+                        waits[task.name] = reason
+                        continue
+
+                    pending.pop(task.name)
+                    started[task.name] = time.monotonic() - origin
+                    running[asyncio.ensure_future(execute(task))] = task
+
+                    if task.name not in waits and task.depends_on:
+                        last_dep = max((t for t in timeline if t.name in task.depends_on), key=lambda t: t.end)
+                        waits[task.name] = f"dependência {last_dep.name}"
+
+                if not running:
+                    raise RuntimeError(f"Nenhum teste pode iniciar: {', '.join(pending)}")
+
+                finished, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    done.add(task.name)
+                    cores, browsers = self.demand(task)
+                    timeline.append(TaskTiming(
+                        name=task.name,
+                        start=started[task.name],
+                        end=time.monotonic() - origin,
+                        cores=cores,
+                        browsers=browsers,
+                        waited_for=waits.get(task.name, "")
+                    ))
+                    future.result()  # erros que o execute propaga interrompem a suíte
+        finally:
+            for future in running:
+                future.cancel()
+
+        timeline.sort(key=lambda t: (t.start, self.order.index(t.name)))
+        wall = max((t.end for t in timeline), default=0)
+        serial = sum(t.end - t.start for t in timeline)
+        path = critical_path(timeline)
+
+        return ScheduleReport(
+            max_concurrency=self.max_concurrency,
+            cores=self.cores,
+            browsers=self.browsers,
+            wall_seconds=wall,
+            serial_seconds=serial,
+            speedup=serial / wall if wall > 0 else 1.0,
+            timeline=timeline,
+            critical_path=[t.name for t in path],
+            critical_path_seconds=sum(t.end - t.start for t in path)
+        )
+
+def print_schedule(report: ScheduleReport):
+    """Linha do tempo em texto (uma barra por teste)"""
+    print(f"\n🗓️ AGENDAMENTO ({report.cores} CPUs, {report.browsers} browsers):")
+    print(f"   Tempo total: {report.wall_seconds:.1f}s (sequencial seria {report.serial_seconds:.1f}s, "
+          f"{report.speedup:.2f}x)")
+
+    width = 40
+    scale = width / report.wall_seconds if report.wall_seconds > 0 else 0
+    for timing in report.timeline:
+        offset = int(timing.start * scale)
+        length = max(1, int((timing.end - timing.start) * scale))
+        bar = " " * offset + "█" * length
+        wait = f" ⏳ {timing.waited_for}" if timing.waited_for else ""
+        print(f"   {timing.name:<18} |{bar:<{width}}| {timing.end - timing.start:>6.1f}s{wait}")
+
+    print(f"   Caminho crítico: {' → '.join(report.critical_path)} ({report.critical_path_seconds:.1f}s)")
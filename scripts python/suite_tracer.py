@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+🔬 Suite Tracer - Projeto M
+Auto-profiling da própria suíte: spans exportados em formato Chrome trace (Perfetto)
+
+Funcionalidades:
+- Spans leves (etapas, setup do WebDriver, round trips de execute_script/CDP, análise de
+  arquivos, escrita de relatórios, esperas fixas) num ring buffer de tamanho fixo
+- Uma trilha por thread/task asyncio (etapas paralelas não se sobrepõem na mesma trilha)
+- Export em trace-event JSON (abrir em ui.perfetto.dev ou chrome://tracing)
+- Totais por tipo de span para o resumo final
+- Desligado: decorators só checam uma flag e o driver não é embrulhado (overhead desprezível)
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+DEFAULT_CAPACITY = 200_000  # spans no ring buffer (~40 MB no pior caso)
+
+# Métodos do WebDriver medidos como round trip (um span por chamada)
+DRIVER_ROUND_TRIPS = {
+    'execute_script': 'execute_script',
+    'execute_async_script': 'execute_script',
+    'execute_cdp_cmd': 'cdp',
+    'get': 'navigation',
+    'get_log': 'get_log',
+}
+
+class SuiteTracer:
+    """Coletor de spans; desligado por padrão"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.enabled = False
+        self.spans = deque(maxlen=capacity)
+        self.recorded = 0
+        self.tracks: Dict[tuple, tuple] = {}  # (thread, task) -> (tid, nome da trilha)
+        self.lock = threading.Lock()
+        self.origin_ns = time.perf_counter_ns()
+
+    def enable(self, capacity: Optional[int] = None):
+        if capacity:
+            self.spans = deque(maxlen=capacity)
+        self.spans.clear()
+        self.recorded = 0
+        self.tracks.clear()
+        self.origin_ns = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def track(self) -> int:
+        """Trilha da thread/task atual"""
+        thread = threading.current_thread()
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+
+        key = (thread.ident, id(task) if task else None)
+        track = self.tracks.get(key)
+        if track is None:
+            with self.lock:
+                name = f"{thread.name} / {task.get_name()}" if task else thread.name
+                track = self.tracks.setdefault(key, (len(self.tracks) + 1, name))
+        return track[0]
+
+    def record(self, category: str, name: str, start_ns: int, end_ns: int, args: Optional[Dict] = None):
+        self.spans.append((category, name, start_ns, end_ns - start_ns, self.track(), args))
+        self.recorded += 1
+
+    @contextmanager
+    def span(self, category: str, name: str, **args):
+        """Span em torno de um bloco (com o tracer desligado não mede nada)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(category, name, start, time.perf_counter_ns(), args or None)
+
+    def totals(self) -> Dict[str, Dict]:
+        """Por tipo de span: quantidade, tempo total e máximo (spans aninhados contam inteiros)"""
+        totals: Dict[str, Dict] = {}
+        for category, _, _, duration, _, _ in self.spans:
+            entry = totals.setdefault(category, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += duration / 1e6
+            entry['max_ms'] = max(entry['max_ms'], duration / 1e6)
+        return dict(sorted(totals.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def trace_events(self) -> List[Dict]:
+        """Spans como eventos 'X' (complete) + metadados de processo e trilhas"""
+        pid = os.getpid()
+        events = [{'ph': 'M', 'name': 'process_name', 'pid': pid, 'tid': 0,
+                   'args': {'name': 'Master Performance Suite'}}]
+        for tid, name in list(self.tracks.values()):
+            events.append({'ph': 'M', 'name': 'thread_name', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+
+        for category, name, start, duration, tid, args in list(self.spans):
+            event = {
+                'ph': 'X', 'cat': category, 'name': name, 'pid': pid, 'tid': tid,
+                'ts': (start - self.origin_ns) / 1000, 'dur': duration / 1000
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+        return events
+
+    def export(self, path: str) -> str:
+        """Grava o trace-event JSON (abrir em ui.perfetto.dev)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'traceEvents': self.trace_events(),
+                'displayTimeUnit': 'ms',
+                'otherData': {'recorded_spans': self.recorded, 'dropped_spans': self.recorded - len(self.spans)}
+            }, f, default=str)
+        return path
+
+TRACER = SuiteTracer()
+
+def span(category: str, name: str, **args):
+    return TRACER.span(category, name, **args)
+
+def traced(category: str, name: Optional[str] = None):
+    """Decorator de span para funções síncronas e corrotinas"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not TRACER.enabled:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    TRACER.record(category, label, start, time.perf_counter_ns())
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TRACER.record(category, label, start, time.perf_counter_ns())
+        return wrapper
+    return decorator
+
+def instrument_driver(driver):
+    """Embrulha os round trips do WebDriver em spans (só com o tracer ligado)"""
+    if not TRACER.enabled:
+        return driver
+
+    for method_name, category in DRIVER_ROUND_TRIPS.items():
+        method = getattr(driver, method_name, None)
+        if method is None:
+            continue
+
+        def round_trip(*args, _method=method, _category=category, _name=method_name, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                # Primeiro argumento curto como rótulo (comando CDP, URL ou tipo de log)
+                label = args[0] if args and _category != 'execute_script' else _name
+                TRACER.record(_category, str(label)[:80], start, time.perf_counter_ns())
+
+        setattr(driver, method_name, round_trip)
+    return driver
+
+async def traced_sleep(seconds: float):
+    """asyncio.sleep fixo, visível no trace como espera"""
+    with TRACER.span('sleep', f"sleep {seconds:g}s"):
+        await asyncio.sleep(seconds)
+
+def traced_sleep_sync(seconds: float):
+    """time.sleep fixo, visível no trace como espera"""
+    with TRACER.span('sleep', f"sleep {seconds:g}s"):
+        time.sleep(seconds)
+
+def print_span_totals(totals: Dict[str, Dict], wall_seconds: float):
+    """Totais por tipo de span (fração do tempo total da suíte)"""
+    print(f"\n🔬 AUTO-PROFILING DA SUÍTE ({wall_seconds:.1f}s):")
+    for category, entry in totals.items():
+        share = entry['total_ms'] / 1000 / wall_seconds * 100 if wall_seconds > 0 else 0
+        print(f"   {category:<16} {entry['count']:>6}x {entry['total_ms'] / 1000:>8.1f}s "
+              f"({share:>5.1f}%) máx {entry['max_ms']:.0f}ms")
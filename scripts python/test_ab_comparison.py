@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do A/B Comparison
+Verifica os servidores estáticos, a ordem intercalada ABAB e a comparação pareada
+"""
+
+import asyncio
+import json
+import random
+from urllib.request import urlopen
+
+import pytest
+
+from ab_comparison import (ABComparison, ABEngine, StaticBuildServer, build_engines,
+                           paired_comparison, wilcoxon_signed_rank)
+
+class DriftingEngine(ABEngine):
+    """Motor falso: drift forte e comum aos dois lados + candidato 8% mais lento no LCP"""
+
+    name = "fake"
+
+    def __init__(self):
+        self.urls = {}
+        self.calls = []
+        self.closed = False
+
+    async def setup(self, side, url):
+        self.urls[side] = url
+
+    async def run(self, side):
+        self.calls.append(side)
+        load = 1 + len(self.calls) * 0.05 + random.uniform(-0.3, 0.3)  # máquina cada vez mais carregada
+        html = urlopen(self.urls[side]).read().decode()
+        lcp = 1000 * load * (1.08 if "candidato" in html else 1.0)
+        return {"lcp": lcp, "cls": 0.01}
+
+    def close(self):
+        self.closed = True
+
+def make_dist(path, label):
+    path.mkdir()
+    (path / "index.html").write_text(f"<html><body>{label}</body></html>")
+    (path / "assets").mkdir()
+    (path / "assets" / "index-abcdef12.js").write_text("console.log(1)")
+    return path
+
+def test_static_server_serves_dist_with_spa_fallback(tmp_path):
+    server = StaticBuildServer(str(make_dist(tmp_path / "dist", "baseline")))
+    url = server.start()
+    try:
+        assert urlopen(url + "assets/index-abcdef12.js").read() == b"console.log(1)"
+        assert b"baseline" in urlopen(url + "contato").read()  # rota do router -> index.html
+    finally:
+        server.stop()
+
+    with pytest.raises(FileNotFoundError):
+        StaticBuildServer(str(tmp_path)).start()
+
+def test_wilcoxon_signed_rank():
+    assert wilcoxon_signed_rank([1, 2, 3, 4, 5, 6]) == pytest.approx(2 / 64)  # todos positivos: 2 × 1/2^6
+    assert wilcoxon_signed_rank([1, -2, 3, -4, 5, -6, 7, -8]) > 0.5
+    assert wilcoxon_signed_rank([0, 0, 0]) == 1.0
+    assert wilcoxon_signed_rank([1, 1, 2, 2, 3] * 8) < 0.001  # empates: aproximação normal
+
+def test_pairing_detects_small_shift_hidden_by_drift():
+    rng = random.Random(1)
+    baseline, candidate = [], []
+    for i in range(12):
+        load = 1 + i * 0.2 + rng.uniform(-0.3, 0.3)  # variação entre pares muito maior que o efeito
+        baseline.append(1000 * load * rng.uniform(0.99, 1.01))
+        candidate.append(1080 * load * rng.uniform(0.99, 1.01))
+
+    result = paired_comparison(baseline, candidate)
+    assert result["verdict"] == "regressed"
+    assert 0.05 < result["relative_change"] < 0.2
+    assert result["relative_ci95"][0] > 0
+    assert result["candidate_higher_pairs"] == 12
+
+    assert paired_comparison(baseline, baseline)["verdict"] == "no_change"
+    assert paired_comparison(candidate, baseline)["verdict"] == "improved"
+    assert paired_comparison([1.0, float("nan")], [1.0, 2.0])["verdict"] == "insufficient_data"
+
+def test_interleaved_run_and_report(tmp_path):
+    engine = DriftingEngine()
+    comparison = ABComparison(str(make_dist(tmp_path / "a", "baseline")), str(make_dist(tmp_path / "b", "candidato")),
+                              [engine], pairs=10, warmup_pairs=1, output_dir=str(tmp_path / "out"))
+    report = asyncio.run(comparison.run())
+
+    assert report.order == "AB" * 11
+    assert engine.calls == list("AB" * 11) and engine.closed
+    assert len(report.samples["fake.lcp"]["baseline"]) == 10  # aquecimento descartado
+    assert report.comparisons["fake.lcp"]["verdict"] == "regressed"
+    assert report.comparisons["fake.cls"]["verdict"] == "no_change"
+    assert report.regressed == ["fake.lcp"]
+
+    saved = json.loads(open(comparison.save_report(report)).read())
+    assert saved["comparisons"]["fake.lcp"]["verdict"] == "regressed"
+
+def test_build_engines_rejects_unknown():
+    assert [engine.name for engine in build_engines(["measurement", "memory"])] == ["measurement", "memory"]
+    with pytest.raises(ValueError):
+        build_engines(["gpu"])
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    print("🧪 Testando A/B Comparison...")
+    for test in (test_static_server_serves_dist_with_spa_fallback, test_interleaved_run_and_report):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_wilcoxon_signed_rank()
+    test_pairing_detects_small_shift_hidden_by_drift()
+    test_build_engines_rejects_unknown()
+    print("✅ Todos os testes passaram!")
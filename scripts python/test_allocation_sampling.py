@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste da Amostragem de Alocações
+Verifica a agregação do SamplingHeapProfile por pilha/script/chunk e o mapeamento
+de URLs de scripts para chunks do bundle
+"""
+
+from bundle_analyzer import DEFAULT_MANUAL_CHUNKS, resolve_chunk_name
+from memory_profiler import AllocationProfile, MemoryProfiler
+
+def frame(function_name, url="", line=0):
+    return {"functionName": function_name, "url": url, "lineNumber": line}
+
+def test_resolve_chunk_name():
+    assert resolve_chunk_name("http://localhost:8080/assets/vendor-a1b2c3d4.js") == "vendor"
+    assert resolve_chunk_name("/assets/index-9F8e7D6c_x.css") == "index"
+    assert resolve_chunk_name("http://localhost:5173/node_modules/.vite/deps/react-dom_client.js?v=1") == "vendor"
+    assert resolve_chunk_name("http://localhost:5173/node_modules/.vite/deps/@radix-ui_react-dialog.js") == "ui"
+    assert resolve_chunk_name("http://localhost:5173/node_modules/.vite/deps/clsx.js") == "vendor"
+    assert resolve_chunk_name("http://localhost:5173/src/components/Hero.tsx") == "index"
+    assert resolve_chunk_name("http://localhost:8080/sw.js") == "(other)"
+    assert resolve_chunk_name("") == "(native)"
+
+    # manualChunks lidos do vite.config.ts substituem o padrão
+    chunks = dict(DEFAULT_MANUAL_CHUNKS, charts=["recharts"])
+    assert resolve_chunk_name("/node_modules/.vite/deps/recharts.js", chunks) == "charts"
+
+def test_aggregate_sampling_profile():
+    hero = "http://localhost:8080/src/components/Hero.tsx"
+    react = "http://localhost:8080/assets/vendor-a1b2c3d4.js"
+    sampling_profile = {
+        "head": {"callFrame": frame("(root)"), "selfSize": 0, "children": [
+            {"callFrame": frame("render", react, 9), "selfSize": 1000, "children": [
+                {"callFrame": frame("Hero", hero, 41), "selfSize": 300, "children": []},
+                {"callFrame": frame("", hero, 0), "selfSize": 200, "children": []},
+            ]},
+            {"callFrame": frame("(garbage collector)"), "selfSize": 50, "children": []},
+        ]},
+        "samples": [{"size": 1000}, {"size": 300}, {"size": 200}, {"size": 50}],
+    }
+
+    profiler = MemoryProfiler()
+    profile = AllocationProfile(phase="scroll")
+    profiler.aggregate_sampling_profile(sampling_profile, profile)
+    profiler.aggregate_sampling_profile(sampling_profile, profile)  # perfis da mesma fase somam
+    profiler.aggregate_sampling_profile({}, profile)  # perfil vazio é ignorado
+
+    assert profile.profiles_collected == 2
+    assert profile.sample_count == 8
+    assert profile.total_bytes == 3100
+    assert profile.by_stack == {
+        "render (vendor-a1b2c3d4.js:10)": 2000,
+        "render (vendor-a1b2c3d4.js:10);Hero (Hero.tsx:42)": 600,
+        "render (vendor-a1b2c3d4.js:10);(anonymous) (Hero.tsx:1)": 400,
+        "(garbage collector)": 100,
+    }
+    assert profile.by_script == {react: 2000, hero: 1000, "(native)": 100}
+    assert profile.by_chunk == {"vendor": 2000, "index": 1000, "(native)": 100}
+
+    profiler.allocation_profiles["scroll"] = profile
+    report = profiler.build_allocation_report()
+    assert report["top_stacks"][0] == {"name": "render (vendor-a1b2c3d4.js:10)", "bytes": 2000,
+                                       "percent": 2000 / 3100 * 100}
+    assert report["phases"]["scroll"]["profiles_collected"] == 2
+
+if __name__ == "__main__":
+    print("🧪 Testando Amostragem de Alocações...")
+    test_resolve_chunk_name()
+    test_aggregate_sampling_profile()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do CDP Client
+Verifica multiplexação de abas, evaluate, eventos por sessão e o motor CDP do stress tester
+contra um endpoint DevTools falso (não precisa de Chrome)
+"""
+
+import asyncio
+import itertools
+import json
+import time
+
+import pytest
+from aiohttp import web
+
+from cdp_client import Browser, CDPError, ChromeArgs, find_chrome
+
+LOAD_DELAY = 0.2
+
+class FakeDevTools:
+    """Endpoint /devtools/browser que responde aos comandos usados pelo cliente"""
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.commands = []
+        self.runner = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/devtools/browser/fake", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        return f"ws://127.0.0.1:{port}/devtools/browser/fake"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for message in ws:
+            data = json.loads(message.data)
+            self.commands.append(data["method"])
+            await self.reply(ws, data)
+        return ws
+
+    async def reply(self, ws, data):
+        method, params, session = data["method"], data["params"], data.get("sessionId")
+        result = {}
+        if method == "Target.createTarget":
+            result = {"targetId": f"T{next(self.ids)}"}
+        elif method == "Target.attachToTarget":
+            result = {"sessionId": "S" + params["targetId"][1:]}
+        elif method == "Page.navigate":
+            result = {"frameId": "F", "loaderId": "L"}
+
+            async def fire_load():
+                await asyncio.sleep(LOAD_DELAY)
+                await ws.send_json({"method": "Page.loadEventFired", "params": {"timestamp": 1}, "sessionId": session})
+            asyncio.ensure_future(fire_load())
+        elif method == "Runtime.evaluate":
+            expression = params["expression"]
+            if "throw" in expression:
+                result = {"result": {"type": "object"},
+                          "exceptionDetails": {"text": "Uncaught", "exception": {"description": "Error: boom"}}}
+            elif expression == "document.body !== null":
+                result = {"result": {"type": "boolean", "value": True}}
+            else:
+                result = {"result": {"type": "string", "value": f"{session}:{expression}"}}
+        elif method == "Runtime.enable":
+            await ws.send_json({"method": "Runtime.consoleAPICalled",
+                                "params": {"type": "log", "args": [{"value": session}]}, "sessionId": session})
+        elif method.startswith("Bogus."):
+            await ws.send_json({"id": data["id"], "error": {"code": -32601, "message": f"'{method}' wasn't found"}})
+            return
+        await ws.send_json({"id": data["id"], "result": result, **({"sessionId": session} if session else {})})
+
+async def with_fake_browser(body):
+    fake = FakeDevTools()
+    browser = await Browser.connect(await fake.start())
+    try:
+        return await body(browser, fake)
+    finally:
+        await browser.close()
+        await fake.stop()
+
+def test_pages_are_multiplexed_on_one_connection():
+    async def body(browser, fake):
+        pages = await asyncio.gather(*(browser.new_page() for _ in range(5)))
+        assert len({page.session_id for page in pages}) == 5
+
+        start = time.perf_counter()
+        await asyncio.gather(*(page.navigate("http://localhost:8080/") for page in pages))
+        elapsed = time.perf_counter() - start
+        assert elapsed < LOAD_DELAY * 3  # em série seriam 5 × LOAD_DELAY
+        assert fake.commands.count("Page.enable") == 5
+
+        values = await asyncio.gather(*(page.evaluate("1 + 1") for page in pages))
+        assert values == [f"{page.session_id}:1 + 1" for page in pages]  # cada resposta volta à sua aba
+
+    asyncio.run(with_fake_browser(body))
+
+def test_events_are_routed_per_session():
+    async def body(browser, fake):
+        first, second = await browser.new_page(), await browser.new_page()
+        seen = []
+        unsubscribe = first.on("Runtime.consoleAPICalled", seen.append)
+        waiter = asyncio.ensure_future(second.wait_for("Runtime.consoleAPICalled"))
+        await second.enable("Runtime")
+        assert (await waiter)["args"][0]["value"] == second.session_id
+        assert seen == []  # evento da outra aba não vaza
+
+        await first.enable("Runtime")
+        assert seen[0]["args"][0]["value"] == first.session_id
+        unsubscribe()
+        assert not browser.connection.listeners[(first.session_id, "Runtime.consoleAPICalled")]
+
+    asyncio.run(with_fake_browser(body))
+
+def test_errors_raise_cdp_error():
+    async def body(browser, fake):
+        page = await browser.new_page()
+        with pytest.raises(CDPError, match="boom"):
+            await page.evaluate("throw new Error('boom')")
+        with pytest.raises(CDPError, match="Bogus.method"):
+            await page.send("Bogus.method")
+        with pytest.raises(asyncio.TimeoutError):
+            await page.wait_for("Page.frameNavigated", timeout=0.05)
+
+    asyncio.run(with_fake_browser(body))
+
+def test_launch_arguments(monkeypatch, tmp_path):
+    monkeypatch.setenv("PERF_SUITE_REPLAY_PROXY", "http://127.0.0.1:8899")
+    from replay_proxy import apply_replay_proxy
+    assert "--proxy-server=http://127.0.0.1:8899" in apply_replay_proxy(ChromeArgs(["--headless=new"]))
+
+    chrome = tmp_path / "chrome"
+    chrome.write_text("#!/bin/sh\n")
+    monkeypatch.setenv("CHROME_PATH", str(chrome))
+    assert find_chrome() == str(chrome)
+
+def test_stress_users_share_one_browser():
+    from stress_tester import StressTester
+
+    async def body(browser, fake):
+        tester = StressTester("http://localhost:8080", engine="cdp")
+        tester.browser = browser
+        config = {'max_users': 3, 'ramp_up_minutes': 0, 'test_duration_minutes': 0.01,
+                  'think_time_range': (0, 0.01), 'request_timeout': 30}
+        sessions = await asyncio.gather(*(tester.simulate_user(i, config) for i in range(config['max_users'])))
+
+        assert all(session.successful_requests > 0 and not session.errors for session in sessions)
+        assert fake.commands.count("Target.createTarget") == 3
+        assert fake.commands.count("Target.closeTarget") == 3
+
+    asyncio.run(with_fake_browser(body))
+
+    with pytest.raises(ValueError):
+        StressTester(engine="playwright")
+
+def test_stress_timeout_closes_shared_browser():
+    from stress_tester import StressTester
+
+    async def body():
+        fake = FakeDevTools()
+        ws_url = await fake.start()
+        tester = StressTester("http://localhost:8080", engine="cdp")
+        launched = []
+
+        async def launch():
+            launched.append(await Browser.connect(ws_url))
+            return launched[-1]
+        tester.launch_cdp_browser = launch
+        tester.collect_system_metrics = lambda: None
+
+        config = {'max_users': 2, 'ramp_up_minutes': 0, 'test_duration_minutes': 10,
+                  'think_time_range': (0, 0.01), 'request_timeout': 30}
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(tester.run_stress_test(config), timeout=0.5)  # timeout da master
+        finally:
+            await fake.stop()
+
+        assert launched[0].connection.closed
+        assert tester.browser is None
+        assert fake.commands.count("Target.closeTarget") == 2  # abas dos usuários fechadas
+        assert "Browser.close" in fake.commands
+
+    asyncio.run(body())
+    assert StressTester().engine == "selenium"  # o padrão não muda o significado do histórico
+
+def test_selenium_stress_actions_do_not_block_the_event_loop():
+    from stress_tester import StressTester
+
+    class SlowDriver:
+        def get(self, url):
+            time.sleep(LOAD_DELAY)  # chamada bloqueante do WebDriver
+
+        def find_element(self, by, value):
+            return object()
+
+    async def body():
+        tester = StressTester("http://localhost:8080")
+        ticks = []
+
+        async def heartbeat():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        await asyncio.gather(*(tester.action_load_page(SlowDriver(), user_id) for user_id in range(5)))
+        elapsed = time.perf_counter() - start
+        beat.cancel()
+        return elapsed, len(ticks)
+
+    elapsed, ticks = asyncio.run(body())
+    assert elapsed < LOAD_DELAY * 3  # em série seriam 5 × LOAD_DELAY
+    assert ticks >= 5  # o event loop seguiu rodando durante os carregamentos
+
+def test_benchmark_loads_selenium_pages_concurrently(monkeypatch):
+    import cdp_benchmark
+
+    class SlowDriver:
+        def get(self, url):
+            time.sleep(LOAD_DELAY)  # chamada bloqueante do WebDriver
+
+        def execute_script(self, script):
+            return 2
+
+        def quit(self):
+            pass
+
+    monkeypatch.setattr(cdp_benchmark, "selenium_driver", SlowDriver)
+    result = asyncio.run(cdp_benchmark.benchmark_selenium("http://localhost:8080", commands=3, pages=5))
+    assert result["concurrent_load_seconds"] < LOAD_DELAY * 3  # em série seriam 5 × LOAD_DELAY
+
+if __name__ == "__main__":
+    print("🧪 Testando CDP Client...")
+    test_pages_are_multiplexed_on_one_connection()
+    test_events_are_routed_per_session()
+    test_errors_raise_cdp_error()
+    test_stress_users_share_one_browser()
+    test_stress_timeout_closes_shared_browser()
+    test_selenium_stress_actions_do_not_block_the_event_loop()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Chrome Trace Utils
+Verifica a análise de GC com trace events sintéticos (sem Chrome)
+"""
+
+import json
+import os
+import tempfile
+
+from chrome_trace import GCTraceAnalyzer, MainThreadBreakdown, iter_trace_events, iter_trace_file
+
+MAIN = {'pid': 1, 'tid': 10}
+OTHER = {'pid': 1, 'tid': 20}
+
+def make_log(events):
+    """Simula entradas do performance log do ChromeDriver"""
+    message = {'message': {'method': 'Tracing.dataCollected', 'params': {'value': events}}}
+    return [{'message': json.dumps(message)}, {'message': 'inválido'}]
+
+def marker(ts, text):
+    return {**MAIN, 'ph': 'I', 'name': 'TimeStamp', 'ts': ts, 'args': {'data': {'message': text}}}
+
+def gc(name, ts, dur, before, after, thread=MAIN):
+    return {**thread, 'ph': 'X', 'name': name, 'ts': ts, 'dur': dur,
+            'args': {'usedHeapSizeBefore': before, 'usedHeapSizeAfter': after}}
+
+def synthetic_trace():
+    return [
+        {**MAIN, 'ph': 'M', 'name': 'thread_name', 'args': {'name': 'CrRendererMain'}},
+        {**MAIN, 'ph': 'X', 'name': 'ThreadControllerImpl::RunTask', 'ts': 0, 'dur': 100000},
+        marker(1000, 'perfsuite:start:scroll'),
+        gc('MinorGC', 2000, 1000, 4000, 1000),
+        gc('V8.GCScavenger', 2000, 900, 0, 0),  # subfase: não pode contar em dobro
+        marker(5000, 'perfsuite:end:scroll'),
+        gc('MajorGC', 8000, 9000, 8000, 6000),
+        gc('MinorGC', 9000, 5000, 1000, 0, thread=OTHER),  # worker: ignorado
+    ]
+
+def test_iter_trace_events():
+    events = list(iter_trace_events(make_log(synthetic_trace())))
+    assert len(events) == len(synthetic_trace())
+
+def test_gc_summary():
+    analyzer = GCTraceAnalyzer()
+    analyzer.feed(iter_trace_events(make_log(synthetic_trace())))
+    summary = analyzer.summary()
+
+    assert summary['available']
+    assert summary['gc_count'] == 2
+    assert summary['scavenge']['count'] == 1
+    assert summary['mark_compact']['max_pause_ms'] == 9.0
+    assert summary['total_pause_ms'] == 10.0
+    assert summary['bytes_reclaimed'] == 5000
+    assert summary['bytes_reclaimed_per_cycle'] == 2500
+    assert abs(summary['reclaimed_fraction'] - (0.75 + 0.25) / 2) < 1e-9
+    assert abs(summary['gc_time_share'] - 0.1) < 1e-9
+
+def test_gc_phase_attribution():
+    analyzer = GCTraceAnalyzer()
+    trace = synthetic_trace()
+    # Marcadores e GCs podem chegar em lotes diferentes
+    analyzer.feed(trace[:4])
+    analyzer.feed(trace[4:])
+    by_phase = analyzer.summary()['by_phase']
+
+    assert by_phase['scroll']['count'] == 1
+    assert by_phase['idle']['count'] == 1
+
+def test_gc_metadata_after_events():
+    # Metadados no fim do trace: o GC do worker que chegou antes não pode entrar na conta
+    trace = synthetic_trace()
+    second_renderer = {'pid': 2, 'tid': 10}
+    late = trace[1:] + [
+        gc('MinorGC', 20000, 3000, 2000, 1000, thread=second_renderer),
+        {**second_renderer, 'ph': 'M', 'name': 'thread_name', 'args': {'name': 'CrRendererMain'}},
+        trace[0],
+    ]
+    analyzer = GCTraceAnalyzer()
+    analyzer.feed(late[:5])
+    analyzer.feed(late[5:])
+    summary = analyzer.summary()
+
+    assert analyzer.main_threads == {(1, 10), (2, 10)}
+    assert summary['gc_count'] == 3  # dois renderers; o worker fica de fora
+    assert summary['total_pause_ms'] == 13.0
+    assert summary['bytes_reclaimed'] == 6000
+
+    # Sem metadados: só a thread mais ocupada
+    no_metadata = GCTraceAnalyzer()
+    no_metadata.feed(trace[1:])
+    assert no_metadata.summary()['total_pause_ms'] == 10.0
+
+def slice_event(name, ts, dur, url=None, thread=MAIN):
+    args = {'data': {'url': url}} if url else {}
+    return {**thread, 'ph': 'X', 'name': name, 'ts': ts, 'dur': dur, 'args': args}
+
+def load_trace():
+    ui = 'http://localhost:8080/assets/ui-B3kx9aQz.js'
+    index = 'http://localhost:8080/assets/index-Dq81LmZp.js'
+    return [
+        slice_event('RunTask', 0, 100000),
+        slice_event('v8.compile', 1000, 5000, ui),
+        slice_event('EvaluateScript', 10000, 40000, ui),
+        slice_event('FunctionCall', 20000, 10000),  # herda a URL do EvaluateScript
+        slice_event('MinorGC', 25000, 2000),
+        slice_event('RecalculateStyles', 60000, 3000),
+        slice_event('Layout', 64000, 4000),
+        slice_event('Paint', 70000, 1000),
+        {**MAIN, 'ph': 'I', 'name': 'largestContentfulPaint::Candidate', 'ts': 72000,
+         'args': {'data': {'isMainFrame': True}}},
+        slice_event('EvaluateScript', 80000, 10000, index),
+        slice_event('EvaluateScript', 0, 50000, ui, thread=OTHER),  # outra thread: ignorada
+        {**MAIN, 'ph': 'M', 'name': 'thread_name', 'args': {'name': 'CrRendererMain'}},
+    ]
+
+def test_main_thread_breakdown():
+    breakdown = MainThreadBreakdown()
+    trace = load_trace()
+    breakdown.feed(trace[:4])
+    breakdown.feed(trace[4:])
+    summary = breakdown.summary(lambda url: url.rsplit('/', 1)[-1].split('-')[0])
+
+    groups = summary['groups']
+    assert groups['parse_compile'] == 5.0
+    assert groups['script_evaluation'] == 48.0  # 40 - 2 de GC + 10 do index
+    assert groups['gc'] == 2.0
+    assert groups['style'] == 3.0 and groups['layout'] == 4.0 and groups['paint'] == 1.0
+    assert summary['total_ms'] == 100.0
+
+    assert summary['by_chunk']['ui']['before_lcp_ms'] == 43.0
+    assert summary['by_chunk']['index']['before_lcp_ms'] == 0
+    assert summary['lcp_blocking_chunk'] == 'ui'
+
+def test_main_thread_breakdown_out_of_order_batches():
+    # Trace sem ordem global: os filhos chegam num lote antes do pai
+    trace = load_trace()
+    in_order = MainThreadBreakdown()
+    in_order.feed(trace)
+    shuffled = MainThreadBreakdown()
+    shuffled.feed([trace[3], trace[4], trace[8], trace[11]])  # FunctionCall, MinorGC, LCP, metadados
+    shuffled.feed([event for i, event in enumerate(trace) if i not in (3, 4, 8, 11)][::-1])
+
+    expected = in_order.summary()
+    summary = shuffled.summary()
+    assert summary['groups'] == expected['groups']
+    assert summary['groups']['script_evaluation'] == 48.0
+    assert summary['by_url'] == expected['by_url']
+
+def test_main_thread_breakdown_drops_unrelated_events():
+    # Eventos de outros processos e sem grupo não ficam retidos até o summary
+    browser = {'pid': 2, 'tid': 1}
+    started = {**browser, 'ph': 'I', 'name': 'TracingStartedInBrowser', 'ts': 0,
+               'args': {'data': {'frames': [{'frame': 'A', 'processId': 1},
+                                            {'frame': 'B', 'parent': 'A', 'processId': 3}]}}}
+    noise = [slice_event('EvaluateScript', 0, 90000, thread=browser),
+             slice_event('Layout', 5000, 1000, thread={'pid': 3, 'tid': 1}),  # iframe em outro processo
+             slice_event('ProfileChunk', 30000, 10),
+             slice_event('ResourceSendRequest', 40000, 10)]
+
+    expected = MainThreadBreakdown()
+    expected.feed(load_trace())
+    breakdown = MainThreadBreakdown()
+    breakdown.feed([slice_event('EvaluateScript', 0, 5000, thread=browser)])  # antes do início: descartado no summary
+    breakdown.feed([started] + noise + load_trace())
+
+    assert breakdown.renderer_pids == {1}
+    retained = [name for events in breakdown.pending.values() for _, _, name, _ in events]
+    assert 'ProfileChunk' not in retained and 'ResourceSendRequest' not in retained
+    assert sum(len(events) for key, events in breakdown.pending.items() if key[0] == 1) == 10
+    assert breakdown.summary()['groups'] == expected.summary()['groups']
+
+def test_iter_trace_file():
+    events = load_trace()
+    for payload in (events, {'metadata': {'x': [1]}, 'traceEvents': events}):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(payload, f)
+        try:
+            assert list(iter_trace_file(f.name, chunk_size=64)) == events
+        finally:
+            os.unlink(f.name)
+
+if __name__ == "__main__":
+    print("🧪 Testando análise de GC...")
+    test_iter_trace_events()
+    test_gc_summary()
+    test_gc_phase_attribution()
+    test_gc_metadata_after_events()
+    print("✅ Análise de GC OK")
+    print("🧪 Testando breakdown da main thread...")
+    test_main_thread_breakdown()
+    test_main_thread_breakdown_out_of_order_batches()
+    test_main_thread_breakdown_drops_unrelated_events()
+    test_iter_trace_file()
+    print("✅ Breakdown da main thread OK")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Coverage Collector
+Verifica a conversão da cobertura em blocos do V8 para bytes usados (sem Chrome)
+"""
+
+from coverage_collector import CoverageCollector, disjoint_used_ranges, merge_ranges, ranges_bytes
+
+USED_CSS = ".hero{color:red}.unused{color:blue}"
+UNUSED_CSS = ".modal{display:none}"
+NEVER_REPORTED_CSS = ".print{display:none}"
+
+class FakeCoverageDriver:
+    """Responde aos comandos CDP de cobertura CSS com dois stylesheets reportados"""
+
+    def __init__(self):
+        self.texts = {'s1': USED_CSS, 's2': UNUSED_CSS}
+
+    def execute_cdp_cmd(self, method, params):
+        if method == 'CSS.takeCoverageDelta':
+            return {'coverage': [
+                {'styleSheetId': 's1', 'startOffset': 0, 'endOffset': 16, 'used': True},
+                {'styleSheetId': 's1', 'startOffset': 16, 'endOffset': 34, 'used': False},
+                {'styleSheetId': 's2', 'startOffset': 0, 'endOffset': 20, 'used': False},
+            ]}
+        if method == 'CSS.getStyleSheetText':
+            return {'text': self.texts[params['styleSheetId']]}
+        raise AssertionError(method)
+
+    def execute_script(self, script):
+        return ["http://localhost:8080/assets/index-a1b2c3d4.css", "http://localhost:8080/assets/print-e5f6a7b8.css"]
+
+def test_nested_ranges():
+    # Script de 100 chars executado, com um bloco interno [20, 40) nunca executado
+    functions = [
+        {'ranges': [{'startOffset': 0, 'endOffset': 100, 'count': 1}]},
+        {'ranges': [{'startOffset': 10, 'endOffset': 50, 'count': 1},
+                    {'startOffset': 20, 'endOffset': 40, 'count': 0}]},
+    ]
+    assert disjoint_used_ranges(functions) == [(0, 20), (40, 100)]
+
+def test_unexecuted_function():
+    functions = [
+        {'ranges': [{'startOffset': 0, 'endOffset': 30, 'count': 1}]},
+        {'ranges': [{'startOffset': 30, 'endOffset': 60, 'count': 0}]},
+    ]
+    assert disjoint_used_ranges(functions) == [(0, 30)]
+
+def test_merge_and_bytes():
+    merged = merge_ranges([(40, 60), (0, 10), (5, 20)])
+    assert merged == [(0, 20), (40, 60)]
+    assert ranges_bytes("é" * 10 + "a" * 50, [(0, 10)]) == 20
+
+def test_unused_stylesheets_are_reported(tmp_path):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-a1b2c3d4.css").write_text(USED_CSS)
+    (assets / "print-e5f6a7b8.css").write_text(NEVER_REPORTED_CSS)
+
+    collector = CoverageCollector(dist_path=str(tmp_path))
+    collector.driver = FakeCoverageDriver()
+    collector.take_css_coverage('load')
+    collector.add_unreported_stylesheets()
+
+    chunks = {chunk.files[0]: chunk for chunk in collector.aggregate_chunks() if chunk.type == 'css'}
+    assert chunks['index-a1b2c3d4.css'].used_bytes == 16
+    assert chunks['index-a1b2c3d4.css'].unused_bytes == len(USED_CSS) - 16
+    assert chunks['(inline)'].unused_bytes == len(UNUSED_CSS)  # só regras não usadas
+    assert chunks['print-e5f6a7b8.css'].unused_percent == 100  # nunca apareceu na cobertura
+
+if __name__ == "__main__":
+    print("🧪 Testando cobertura...")
+    test_nested_ranges()
+    test_unexecuted_function()
+    test_merge_and_bytes()
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_unused_stylesheets_are_reported(Path(tmp))
+    print("✅ Cobertura OK")
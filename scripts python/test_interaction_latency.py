@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Interaction Latency
+Verifica INP e atribuição de interações com entradas sintéticas (sem Chrome)
+"""
+
+from interaction_latency import attribute_interaction, compute_inp
+
+CHUNKS = {'vendor': ['react', 'react-dom'], 'ui': ['@radix-ui/react-accordion']}
+
+def entry(start, duration, name='pointerup'):
+    return {'name': name, 'target': 'button', 'start': start, 'duration': duration,
+            'input_delay': 10, 'processing': duration - 30, 'presentation': 20}
+
+def frame(start, duration, scripts):
+    return {'start': start, 'duration': duration, 'blocking_duration': 0, 'scripts': scripts}
+
+def script(url, duration, invoker='BUTTON.onclick'):
+    return {'source_url': url, 'function_name': '', 'invoker': invoker, 'duration': duration}
+
+def test_compute_inp():
+    assert compute_inp([]) == 0.0
+    assert compute_inp([40, 250, 90]) == 250
+    # Uma interação descartada a cada 50 (p98)
+    assert compute_inp(list(range(1, 101))) == 98
+
+def test_attribution():
+    entries = [entry(1000, 80), entry(1010, 240, 'click'), entry(5000, 500)]
+    long_tasks = [{'start': 1020, 'duration': 120}, {'start': 4000, 'duration': 90}]
+    frames = [
+        frame(1005, 230, [script('http://localhost:8080/assets/ui-B3kx9aQz.js', 100),
+                          script('http://localhost:8080/assets/ui-B3kx9aQz.js', 40),
+                          script('http://localhost:8080/assets/index-Dq81LmZp.js', 60)]),
+        frame(3000, 60, [script('http://localhost:8080/assets/vendor-C0ffee42.js', 50)]),
+    ]
+
+    result = attribute_interaction(900, 2000, entries, long_tasks, frames, CHUNKS)
+
+    assert result['event'] == 'click'
+    assert result['duration'] == 240
+    assert result['long_tasks'] == 1
+    assert result['long_task_ms'] == 120
+    assert [s['chunk'] for s in result['scripts']] == ['ui', 'index']
+    assert result['scripts'][0]['duration'] == 140
+
+def test_attribution_without_entries():
+    assert attribute_interaction(0, 100, [entry(500, 50)], [], []) == {}
+
+if __name__ == "__main__":
+    print("🧪 Testando latência de interação...")
+    test_compute_inp()
+    test_attribution()
+    test_attribution_without_entries()
+    print("✅ Latência de interação OK")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Lighthouse Scoring
+Verifica as curvas log-normais, os pesos e o re-scoring em lote
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from lighthouse_scoring import (SCORING_VERSIONS, MetricCurve, log_normal_score,
+                                rescore_history, score_matrix, score_metrics)
+
+def test_control_points():
+    curve = MetricCurve(1800, 3000)
+    scores = log_normal_score([0, 1800, 3000, 20000, np.nan], curve)
+    assert scores[0] == 1.0
+    assert abs(scores[1] - 0.9) < 1e-9
+    assert abs(scores[2] - 0.5) < 1e-9
+    assert scores[3] < 0.01
+    assert np.isnan(scores[4])
+
+def test_monotonic():
+    values = np.linspace(100, 10000, 200)
+    scores = log_normal_score(values, MetricCurve(2500, 4000))
+    assert np.all(np.diff(scores) <= 0)
+
+def test_weights_sum_to_one():
+    for version in SCORING_VERSIONS.values():
+        assert abs(sum(version.weights.values()) - 1) < 1e-9
+        for curves in version.curves.values():
+            assert set(curves) == set(version.weights)
+
+def test_perfect_and_missing_metrics():
+    perfect = score_metrics({'fcp': 500, 'si': 800, 'lcp': 700, 'tbt': 0, 'cls': 0}, 'mobile')
+    assert perfect['performance_score'] == 100
+    assert perfect['missing'] == []
+
+    partial = score_metrics({'fcp': 500, 'lcp': 700, 'tbt': 0, 'cls': 0}, 'mobile')
+    assert partial['missing'] == ['si']
+    assert abs(partial['weight_coverage'] - 0.9) < 1e-9
+
+def test_vectorized_matches_single():
+    rows = [{'fcp': 1500, 'lcp': 3000, 'cls': 0.05, 'tbt': 250},
+            {'fcp': 3500, 'lcp': 6000, 'cls': 0.3, 'tbt': 900}]
+    columns = {metric: [row[metric] for row in rows] for metric in rows[0]}
+    bulk = score_matrix(columns, 'mobile')['performance']
+    for row, score in zip(rows, bulk):
+        assert score_metrics(row, 'mobile')['performance_score'] == int(score)
+
+def test_rescore_history():
+    analysis = {'timestamp': '2026-01-01T00:00:00', 'performance_score': 88,
+                'core_web_vitals': {'fcp': 900, 'lcp': 1100, 'cls': 0.01, 'tbt': 50}}
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(analysis, f)
+    try:
+        rows = rescore_history([f.name], 'lh10')
+        assert rows[0]['previous_version'] == 'legacy'
+        assert rows[0]['score'] == score_metrics(
+            {'fcp': 900, 'lcp': 1100, 'cls': 0.01, 'tbt': 50}, 'desktop')['performance_score']
+    finally:
+        os.unlink(f.name)
+
+if __name__ == "__main__":
+    print("🧪 Testando scoring local...")
+    test_control_points()
+    test_monotonic()
+    test_weights_sum_to_one()
+    test_perfect_and_missing_metrics()
+    test_vectorized_matches_single()
+    test_rescore_history()
+    print("✅ Scoring local OK")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Measurement Stats
+Verifica estatística robusta e a parada da amostragem adaptativa
+"""
+
+from measurement_stats import AdaptiveSampler, bootstrap_ci, detect_outliers, robust_median, trimmed_mean
+
+def test_outlier_does_not_move_median():
+    values = [1000, 1010, 990, 1005, 995, 5000]
+    assert detect_outliers(values) == [5]
+    assert robust_median(values) == 1000
+    assert trimmed_mean([1, 2, 3, 4, 100], proportion=0.2) == 3
+
+def test_bootstrap_ci_contains_median():
+    low, high = bootstrap_ci([10, 11, 12, 13, 14, 15, 16])
+    assert low <= 13 <= high
+
+def test_stable_metric_stops_at_min_runs():
+    sampler = AdaptiveSampler({'fcp': 50.0}, min_runs=3, max_runs=10)
+    while sampler.needs_more():
+        sampler.add({'fcp': 800 + sampler.runs})
+    assert sampler.runs == 3
+    assert sampler.report()['converged']
+
+def test_noisy_metric_uses_budget():
+    sampler = AdaptiveSampler({'fcp': 5.0}, min_runs=3, max_runs=8)
+    noisy = [500, 900, 650, 1200, 700, 1100, 600, 1000]
+    while sampler.needs_more():
+        sampler.add({'fcp': noisy[sampler.runs]})
+    assert sampler.runs == 8
+    assert not sampler.report()['converged']
+
+if __name__ == "__main__":
+    print("🧪 Testando estatística de medição...")
+    test_outlier_does_not_move_median()
+    test_bootstrap_ci_contains_median()
+    test_stable_metric_stops_at_min_runs()
+    test_noisy_metric_uses_budget()
+    print("✅ Estatística de medição OK")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste da Matriz de Cenários de Memória
+Verifica a divisão de CPUs entre workers, a matriz cenário × viewport e a mescla
+das análises por cenário (sem abrir browser)
+"""
+
+from memory_scenarios import (MemoryScenario, ScenarioMatrixRunner, ScenarioResult, build_scenario_matrix,
+                              partition_cores)
+
+def test_partition_cores():
+    assert partition_cores([0, 1, 2, 3, 4, 5, 6], 2) == [[0, 1], [2, 3], [4, 5]]  # sobra fica de fora
+    assert partition_cores([0, 1, 2, 3], 1) == [[0], [1], [2], [3]]
+    assert partition_cores([0, 1, 2, 3], 0) == [[0], [1], [2], [3]]  # mínimo de 1 CPU por worker
+    assert partition_cores([0], 4) == [[0]]  # menos CPUs que o pedido: um worker com o que houver
+
+    core_sets = partition_cores(list(range(16)), 3)
+    flattened = [core for cores in core_sets for core in cores]
+    assert len(flattened) == len(set(flattened))  # conjuntos disjuntos
+
+def test_build_scenario_matrix():
+    scenarios = build_scenario_matrix(["scroll", "resize"], ["mobile", "watch"], duration_minutes=1)
+    assert [s.name for s in scenarios] == ["scroll_mobile", "resize_mobile"]  # viewport desconhecido ignorado
+    assert scenarios[0].viewport == (375, 667) and scenarios[0].interactions == ["scroll"]
+    assert scenarios[0].sampling_interval == 32768 and scenarios[0].sampling_phases == []
+
+    sampled = build_scenario_matrix(["navigate"], ["desktop"], allocation_sampling=True,
+                                    sampling_interval=4096, sampling_phases=["navigate"])
+    assert (sampled[0].sampling_interval, sampled[0].sampling_phases) == (4096, ["navigate"])
+
+def analysis(peak, average, growth, leaks, recommendations):
+    return {"peak_memory": peak, "average_memory": average, "memory_growth_rate": growth,
+            "detected_leaks": [{"type": "heap"}] * leaks, "recommendations": recommendations}
+
+def test_merge_results():
+    scenarios = build_scenario_matrix(["scroll", "navigate", "resize"], ["desktop"])
+    results = [
+        ScenarioResult(scenarios[0], "success", [0, 1], 30.0, analysis(80, 60, 100.0, 1, ["a", "b"])),
+        ScenarioResult(scenarios[1], "success", [2, 3], 50.0, analysis(120, 40, 20.0, 2, ["b", "c"])),
+        ScenarioResult(scenarios[2], "failed", [0, 1], 20.0, error_message="Chrome caiu"),
+    ]
+
+    report = ScenarioMatrixRunner(cores_per_scenario=2).merge_results(results, parallelism=2, wall_seconds=50.0)
+    assert report.serial_seconds == 100.0
+    assert report.speedup == 2.0
+    assert report.cores_per_scenario == 2
+    assert report.peak_memory == 120  # pior caso entre os cenários
+    assert report.average_memory == 50
+    assert report.memory_growth_rate == 100.0
+    assert report.detected_leaks == 3
+    assert report.recommendations == ["a", "b", "c"]  # sem duplicatas, na ordem em que aparecem
+    assert len(report.results) == 3
+
+    empty = ScenarioMatrixRunner().merge_results([ScenarioResult(
+        MemoryScenario("scroll_desktop", ["scroll"], "desktop", (1920, 1080)), "failed", [], 0.0
+    )], parallelism=1, wall_seconds=0)
+    assert (empty.peak_memory, empty.average_memory, empty.speedup) == (0, 0, 0)
+
+if __name__ == "__main__":
+    print("🧪 Testando Matriz de Cenários de Memória...")
+    test_partition_cores()
+    test_build_scenario_matrix()
+    test_merge_results()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Memory Soak
+Verifica o downsampling em camadas, a série completa (camadas + ring buffer) e o limiar
+de vazamento de longo prazo sem abrir browser
+"""
+
+from memory_profiler import MemoryProfiler
+from memory_soak import SoakRecorder
+
+START = 1_700_000_040.0  # múltiplo de 60: buckets de 1 min alinhados ao início
+
+def record_series(recorder: SoakRecorder, samples: int, heap_at, interval: float = 2):
+    for i in range(samples):
+        recorder.record({"heap_used": heap_at(i * interval), "dom_nodes": 100}, timestamp=START + i * interval)
+
+def test_downsampling_keeps_every_sample(tmp_path):
+    recorder = SoakRecorder("downsampling", str(tmp_path), ring_capacity=10, tier_capacity=4,
+                            checkpoint_interval=10 ** 9)
+    record_series(recorder, 3600, lambda t: int(t))  # 2h, heap = segundos decorridos
+
+    assert all(len(tier) <= recorder.tier_capacity for tier in recorder.tiers)
+    assert len(recorder.recent) == 10
+
+    timeline = recorder.timeline()
+    assert sum(bucket["count"] for bucket in timeline) == recorder.sample_count
+    assert [bucket["start"] for bucket in timeline] == sorted(bucket["start"] for bucket in timeline)
+    assert timeline[0]["heap_used"]["min"] == 0
+    assert timeline[-1]["heap_used"]["max"] == 7198
+    assert timeline == recorder.timeline()  # montar a série não altera o bucket aberto
+
+def test_timeline_includes_ring_buffer(tmp_path):
+    recorder = SoakRecorder("short", str(tmp_path), checkpoint_interval=10 ** 9)
+    record_series(recorder, 100, lambda t: 1000)  # 200s: nada saiu do ring buffer ainda
+
+    timeline = recorder.timeline()
+    assert [bucket["count"] for bucket in timeline] == [30, 30, 30, 10]
+    assert timeline[0]["heap_used"]["mean"] == 1000
+
+def test_long_term_leak_threshold(tmp_path):
+    def detect(mb_per_hour):
+        profiler = MemoryProfiler()
+        profiler.soak_recorder = SoakRecorder(f"leak_{mb_per_hour}", str(tmp_path), checkpoint_interval=10 ** 9)
+        record_series(profiler.soak_recorder, 1800, lambda t: 50_000_000 + int(mb_per_hour * 1024 * 1024 * t / 3600))
+        return profiler.detect_long_term_leak()
+
+    leak = detect(2)
+    assert leak is not None and leak.type == "heap_long_term"
+    assert 1.8 < leak.growth_rate * 3600 / 1024 / 1024 < 2.1
+    assert detect(0.5) is None  # abaixo de 1MB/h
+    assert detect(0) is None
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    print("🧪 Testando Memory Soak...")
+    for test in (test_downsampling_keeps_every_sample, test_timeline_includes_ring_buffer,
+                 test_long_term_leak_threshold):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Todos os testes passaram!")
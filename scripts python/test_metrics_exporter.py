@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Metrics Exporter
+Verifica o formato OpenMetrics/Prometheus, o endpoint /metrics (scrape local) e o textfile
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from metrics_exporter import (METRICS, OPENMETRICS_CONTENT_TYPE, MetricsRegistry, MetricsServer,
+                              TextfileExporter, parse_openmetrics, route_label, scrape)
+
+def labels(**kw):
+    return tuple(sorted((key, str(value)) for key, value in kw.items()))
+
+def test_render_histogram_counter_and_escaping():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_seconds", "Latência", ["action"], buckets=(0.1, 1.0))
+    requests = registry.counter("demo_requests", "Requisições", ["route"])
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.labels(action="load_page").observe(value)
+    requests.labels(route='/a"b\\c').inc(2)
+
+    text = registry.render()
+    assert text.endswith("# EOF\n")
+    assert "# TYPE demo_requests counter" in text
+    samples = parse_openmetrics(text)
+    assert samples[("demo_seconds_bucket", labels(action="load_page", le="0.1"))] == 1
+    assert samples[("demo_seconds_bucket", labels(action="load_page", le="1.0"))] == 3
+    assert samples[("demo_seconds_bucket", labels(action="load_page", le="+Inf"))] == 4
+    assert samples[("demo_seconds_count", labels(action="load_page"))] == 4
+    assert samples[("demo_seconds_sum", labels(action="load_page"))] == pytest.approx(4.25)
+    assert samples[("demo_requests_total", labels(route='/a"b\\c'))] == 2
+
+    # Texto 0.0.4 (textfile collector): família do counter com _total e sem # EOF
+    legacy = registry.render(openmetrics=False)
+    assert "# TYPE demo_requests_total counter" in legacy
+    assert "# EOF" not in legacy
+
+    with pytest.raises(ValueError):
+        requests.labels(route="/").inc(-1)
+    with pytest.raises(ValueError):
+        registry.gauge("demo_seconds", "duplicada")
+
+def test_live_scrape_during_run(tmp_path):
+    textfile = tmp_path / "perf_suite.prom"
+    METRICS.enable(port=0, host="127.0.0.1", textfile=str(textfile), textfile_interval=0)
+    try:
+        url = f"http://127.0.0.1:{METRICS.server.port}/metrics"
+
+        METRICS.stress_user_started()
+        METRICS.observe_stress_action("load_page", 0.3, success=True)
+        METRICS.observe_stress_action("load_page", 1.2, success=True)
+        METRICS.observe_stress_action("click_elements", None, success=False)
+        METRICS.publish_cwv_samples(route_label("http://localhost:8080/#features"), "mid_tier_mobile", "cold", {
+            "lcp": {"samples": [1000.0, 1200.0, 1400.0, 2000.0, 3000.0]},
+            "cls": {"samples": [0.01, 0.02, 0.05]},
+        })
+        METRICS.observe_heap(10_000_000, "initial")
+        METRICS.observe_heap(14_000_000, "after_scroll")
+        METRICS.publish_bundle([
+            SimpleNamespace(name="vendor-a1b2c3d4.js", type="js", size=300_000, gzipped_size=90_000),
+            SimpleNamespace(name="index-9f8e7d6c.css", type="css", size=20_000, gzipped_size=5_000),
+        ])
+
+        # Scrape no meio da run: o Prometheus vê os valores ao vivo
+        content_type, body = scrape(url)
+        assert content_type == OPENMETRICS_CONTENT_TYPE
+        samples = parse_openmetrics(body)
+        assert samples[("perf_suite_stress_response_seconds_bucket", labels(action="load_page", le="0.5"))] == 1
+        assert samples[("perf_suite_stress_response_seconds_count", labels(action="load_page"))] == 2
+        assert samples[("perf_suite_stress_requests_total",
+                        labels(action="click_elements", outcome="error"))] == 1
+        assert samples[("perf_suite_stress_error_ratio", ())] == pytest.approx(1 / 3)
+        assert samples[("perf_suite_stress_active_users", ())] == 1
+        assert samples[("perf_suite_web_vital_seconds", labels(
+            metric="lcp", route="/#features", profile="mid_tier_mobile", mode="cold", quantile=0.5))] == 1.4
+        assert ("perf_suite_cls", labels(route="/#features", profile="mid_tier_mobile", mode="cold",
+                                         quantile=0.95)) in samples
+        assert samples[("perf_suite_heap_growth_bytes", ())] == 4_000_000
+        assert samples[("perf_suite_bundle_chunk_bytes", labels(chunk="vendor", type="js", encoding="gzip"))] == 90_000
+        assert samples[("perf_suite_bundle_total_bytes", labels(encoding="raw"))] == 320_000
+
+        # Fim de etapa grava o textfile; valores novos aparecem no scrape seguinte
+        METRICS.publish_stage("Stress Testing", "success", 42.0)
+        METRICS.publish_report(81.5, {"metrics": {
+            "lcp": {"verdict": "regressed", "effect": {"relative_change": 0.18}},
+            "cls": {"verdict": "regressed"}
+        }})
+        _, body = scrape(url, openmetrics=False)
+        samples = parse_openmetrics(body)
+        assert samples[("perf_suite_stage_success", labels(stage="Stress Testing"))] == 1
+        assert samples[("perf_suite_regression_verdict", labels(metric="lcp"))] == 1
+
+        # Regressão que some na run seguinte volta a 0 em vez de ficar presa em 1
+        METRICS.publish_report(81.5, {"metrics": {"cls": {"verdict": "inconclusive"}}})
+        samples = parse_openmetrics(scrape(url)[1])
+        assert samples[("perf_suite_regression_verdict", labels(metric="cls"))] == 0
+    finally:
+        METRICS.disable()
+
+    assert not METRICS.enabled
+    written = parse_openmetrics(textfile.read_text())
+    assert written[("perf_suite_overall_score", ())] == 81.5
+    assert written[("perf_suite_relative_change", labels(metric="lcp"))] == 0.18
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_server_and_textfile_standalone(tmp_path):
+    registry = MetricsRegistry()
+    registry.gauge("demo_up", "Servidor no ar").labels().set(1)
+
+    server = MetricsServer(registry, "127.0.0.1", 0)
+    port = server.start()
+    try:
+        _, body = scrape(f"http://127.0.0.1:{port}/metrics")
+        assert parse_openmetrics(body) == {("demo_up", ()): 1}
+    finally:
+        server.stop()
+
+    path = TextfileExporter(registry, str(tmp_path / "nested" / "demo.prom")).write()
+    assert path.read_text() == "# HELP demo_up Servidor no ar\n# TYPE demo_up gauge\ndemo_up 1\n"
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    print("🧪 Testando Metrics Exporter...")
+    test_render_histogram_counter_and_escaping()
+    for test in (test_live_scrape_during_run, test_server_and_textfile_standalone):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Network Recorder
+Verifica índice de requests, cadeia crítica, prioridades e export HAR com eventos CDP sintéticos
+"""
+
+import json
+
+from bundle_analyzer import resolve_chunk_name
+from network_recorder import NetworkRecorder
+
+BASE = "http://localhost:8080"
+T0 = 1000.0  # relógio monotônico do CDP (s)
+WALL = 1_700_000_000.0
+
+def request(request_id, url, resource_type, priority, start, initiator=None, **extra):
+    params = {
+        'requestId': request_id,
+        'request': {'url': url, 'method': 'GET', 'initialPriority': priority, 'headers': {'Accept': '*/*'}},
+        'type': resource_type,
+        'timestamp': T0 + start,
+        'wallTime': WALL + start,
+        'initiator': initiator or {'type': 'other'}
+    }
+    params.update(extra)
+    return ('Network.requestWillBeSent', params)
+
+def response(request_id, resource_type, mime_type, at, status=200):
+    return ('Network.responseReceived', {
+        'requestId': request_id, 'type': resource_type, 'timestamp': T0 + at,
+        'response': {'status': status, 'statusText': 'OK', 'mimeType': mime_type, 'protocol': 'http/1.1',
+                     'headers': {'Content-Type': mime_type},
+                     'timing': {'requestTime': T0 + at - 0.05, 'dnsStart': -1, 'dnsEnd': -1,
+                                'connectStart': -1, 'connectEnd': -1, 'sslStart': -1, 'sslEnd': -1,
+                                'sendStart': 1, 'sendEnd': 2, 'receiveHeadersEnd': 40}}
+    })
+
+def finished(request_id, at, size):
+    return ('Network.loadingFinished', {'requestId': request_id, 'timestamp': T0 + at, 'encodedDataLength': size})
+
+def parser(url):
+    return {'type': 'parser', 'url': url}
+
+def page_load_events():
+    css = f"{BASE}/assets/index-abcdefgh.css"
+    vendor = f"{BASE}/assets/vendor-abcdefgh.js"
+    return [
+        request('doc', f"{BASE}/", 'Document', 'VeryHigh', 0.0),
+        response('doc', 'Document', 'text/html', 0.10),
+        finished('doc', 0.12, 2_000),
+
+        request('css', css, 'Stylesheet', 'VeryHigh', 0.13, parser(f"{BASE}/")),
+        response('css', 'Stylesheet', 'text/css', 0.25),
+        finished('css', 0.30, 20_000),
+
+        request('vendor', vendor, 'Script', 'High', 0.13, parser(f"{BASE}/")),
+        response('vendor', 'Script', 'application/javascript', 0.40),
+        finished('vendor', 0.60, 150_000),
+
+        # Fonte só é descoberta depois que o CSS chega
+        request('font', f"{BASE}/brockmann-medium.otf", 'Font', 'High', 0.32, parser(css)),
+        response('font', 'Font', 'font/otf', 0.45),
+        finished('font', 0.50, 60_000),
+
+        # Vídeo do Hero em baixa prioridade disputando banda antes do LCP
+        request('video', f"{BASE}/webm/Header-background-dark.webm", 'Media', 'Low', 0.35, parser(f"{BASE}/")),
+        response('video', 'Media', 'video/webm', 0.50),
+        ('Network.dataReceived', {'requestId': 'video', 'dataLength': 800_000}),
+        finished('video', 1.20, 800_000),
+
+        # Imagem do LCP inserida pelo vendor (React), em prioridade baixa
+        request('hero', f"{BASE}/hero.webp", 'Image', 'Low',  0.70,
+                {'type': 'script', 'stack': {'callFrames': [{'url': vendor, 'lineNumber': 1}]}}),
+        ('Network.resourceChangedPriority', {'requestId': 'hero', 'newPriority': 'High'}),
+        response('hero', 'Image', 'image/webp', 0.90),
+        finished('hero', 1.00, 90_000),
+
+        # Mensagem que não é de rede é ignorada
+        ('Page.loadEventFired', {'timestamp': T0 + 1.1}),
+    ]
+
+def recorded():
+    recorder = NetworkRecorder()
+    recorder.feed(page_load_events())
+    return recorder
+
+def test_index_and_summary():
+    recorder = recorded()
+    assert len(recorder.requests) == 6
+    assert recorder.requests['hero'].priority == 'High'
+    assert recorder.requests['hero'].initial_priority == 'Low'
+    assert recorder.requests['hero'].initiator_url.endswith('vendor-abcdefgh.js')
+    summary = recorder.summary()
+    assert summary['requests_count'] == 6
+    assert summary['total_transfer_size'] == 2_000 + 20_000 + 150_000 + 60_000 + 800_000 + 90_000
+
+def test_feed_log_only_decodes_network_messages():
+    entries = [{'message': json.dumps({'message': {'method': method, 'params': params}})}
+               for method, params in page_load_events()]
+    entries.append({'message': 'não é JSON'})
+    recorder = NetworkRecorder()
+    recorder.feed_log(entries)
+    assert len(recorder.requests) == 6
+    assert recorder.events == len(page_load_events()) - 1
+
+def test_lcp_chain_and_bottleneck():
+    analysis = recorded().analyze(lcp_ms=1050, lcp_url=f"{BASE}/hero.webp", fcp_ms=400,
+                                  resolve_chunk=resolve_chunk_name)
+    names = [node['name'] for node in analysis['lcp_chain']]
+    assert names == ['/', 'vendor-abcdefgh.js', 'hero.webp']
+    assert analysis['lcp_chain'][1]['chunk'] == 'vendor'
+    assert analysis['lcp_bottleneck']['name'] == 'vendor-abcdefgh.js'  # 0.12 → 0.60s
+
+    # Cadeia crítica mais longa: documento → vendor (600ms); a imagem não é crítica
+    assert [node['name'] for node in analysis['longest_chain']] == ['/', 'vendor-abcdefgh.js']
+    assert round(analysis['longest_chain_ms']) == 600
+
+    # LCP de texto (sem URL): cadeia crítica mais longa concluída antes do LCP
+    text = recorded().analyze(lcp_ms=550)
+    assert [node['name'] for node in text['lcp_chain']] == ['/', 'index-abcdefgh.css', 'brockmann-medium.otf']
+
+def test_render_blocking_and_priority_mismatches():
+    recorder = recorded()
+    analysis = recorder.analyze(lcp_ms=1050, lcp_url=f"{BASE}/hero.webp", fcp_ms=400)
+    assert [node['name'] for node in analysis['render_blocking']] == ['index-abcdefgh.css']
+
+    # URLs do DOM têm precedência sobre a heurística
+    dom = recorder.analyze(lcp_ms=1050, fcp_ms=400, render_blocking_urls=[f"{BASE}/assets/vendor-abcdefgh.js"])
+    assert [node['name'] for node in dom['render_blocking']] == ['vendor-abcdefgh.js']
+
+    kinds = {(m['kind'], m['request']['name']) for m in analysis['priority_mismatches']}
+    assert ('lcp_low_priority', 'hero.webp') in kinds
+    assert ('late_discovered_font', 'brockmann-medium.otf') in kinds
+    assert ('bandwidth_contention', 'Header-background-dark.webm') in kinds
+
+def test_redirect_becomes_own_entry():
+    recorder = NetworkRecorder()
+    recorder.feed([
+        request('doc', f"{BASE}/old", 'Document', 'VeryHigh', 0.0),
+        request('doc', f"{BASE}/", 'Document', 'VeryHigh', 0.05,
+                redirectResponse={'status': 301, 'statusText': 'Moved', 'mimeType': 'text/html', 'headers': {}}),
+        finished('doc', 0.2, 1_000),
+    ])
+    records = recorder.records()
+    assert [r.url for r in records] == [f"{BASE}/old", f"{BASE}/"]
+    assert records[0].status == 301 and records[0].redirect_url == f"{BASE}/"
+    assert records[1].initiator_type == 'redirect'
+    assert recorder.summary()['requests_count'] == 1
+
+def test_har_export():
+    har = recorded().to_har(page_title='Projeto M')
+    log = har['log']
+    assert log['version'] == '1.2'
+    assert log['pages'][0]['startedDateTime'].endswith('Z')
+    assert len(log['entries']) == 6
+
+    entry = next(e for e in log['entries'] if e['request']['url'].endswith('index-abcdefgh.css'))
+    assert entry['pageref'] == log['pages'][0]['id']
+    assert entry['response']['status'] == 200
+    assert entry['response']['bodySize'] == 20_000
+    assert entry['timings']['dns'] == -1
+    assert entry['timings']['wait'] == 38
+    assert entry['time'] > 0
+    assert entry['_priority'] == 'VeryHigh'
+    json.dumps(har)  # serializável
+
+def test_network_events_without_main_thread_tracing():
+    from real_performance_suite import RealPerformanceSuite
+
+    suite = RealPerformanceSuite()
+    suite.main_thread_tracing = suite.measure_visual_progress = False
+    assert suite.perf_logging_prefs() == {'enableNetwork': True, 'enablePage': False}
+
+    suite.record_network = False
+    assert suite.perf_logging_prefs() is None
+
+if __name__ == "__main__":
+    print("🧪 Testando Network Recorder...")
+    test_index_and_summary()
+    test_feed_log_only_decodes_network_messages()
+    test_lcp_chain_and_bottleneck()
+    test_render_blocking_and_priority_mismatches()
+    test_redirect_becomes_own_entry()
+    test_har_export()
+    test_network_events_without_main_thread_tracing()
+    print("✅ Todos os testes passaram!")
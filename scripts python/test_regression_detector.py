@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Regression Detector
+Verifica o t de predição (taxa de falsos positivos), changepoints, vereditos e o índice do histórico
+"""
+
+import json
+import random
+import time
+
+from regression_detector import (RegressionDetector, RunHistory, detect_changepoints, extract_run_samples,
+                                 prediction_t_test)
+
+def make_history(level_by_run, metric="lcp", noise=20, samples=5, seed=1):
+    rng = random.Random(seed)
+    return [
+        {"session_id": f"run_{i}", "timestamp": f"2026-01-01T00:{i:02d}",
+         "samples": {metric: [rng.gauss(level, noise) for _ in range(samples)]}}
+        for i, level in enumerate(level_by_run)
+    ]
+
+def test_prediction_t_test_and_degenerate_baseline():
+    t, p = prediction_t_test(13, [10, 11, 12, 9, 8])  # média 10, s ≈ 1,58, escala ≈ 1,73
+    assert abs(t - 1.732) < 0.01
+    assert 0.15 < p < 0.17  # t(4 g.l.)
+
+    # Baseline sem dispersão: nada de inf (json.dump escreveria Infinity)
+    assert prediction_t_test(5, [5, 5, 5]) == (0.0, 1.0)
+    assert prediction_t_test(6, [5, 5, 5]) == (None, 0.0)
+    history = make_history([0] * 6, metric="stress_error_rate", noise=0, samples=1)
+    verdict = RegressionDetector().compare("stress_error_rate", history, [0.5])
+    assert verdict["t"] is None
+    json.dumps(verdict, allow_nan=False)
+
+def test_false_positive_rate_under_null():
+    # Runs de um valor só, todas da mesma distribuição: a taxa de alarmes deve ficar em ~alpha
+    rng = random.Random(7)
+    baselines = [[rng.gauss(1000, 20) for _ in range(10)] for _ in range(4000)]
+    rejections = sum(prediction_t_test(rng.gauss(1000, 20), baseline)[1] < 0.05 for baseline in baselines)
+    assert 0.035 < rejections / len(baselines) < 0.065
+
+    detector = RegressionDetector(min_effect=0, resamples=200)
+    flagged = 0
+    for seed in range(300):
+        history = make_history([1000] * 30, samples=1, seed=seed)
+        verdict = detector.compare("lcp", history[:-1], history[-1]["samples"]["lcp"])
+        flagged += verdict["verdict"] != "inconclusive"
+    assert flagged / 300 <= 0.08
+
+def test_detects_regression_and_improvement():
+    detector = RegressionDetector()
+    history = make_history([1000] * 12)
+    rng = random.Random(2)
+
+    slower = detector.compare("lcp", history, [rng.gauss(1200, 20) for _ in range(5)])
+    assert slower["verdict"] == "regressed"
+    assert slower["method"] == "run_medians_prediction_t"
+    assert slower["effect"]["cliffs_delta"] > 0.9
+    assert slower["effect"]["ci95"][0] > 0
+
+    faster = detector.compare("lcp", history, [rng.gauss(850, 20) for _ in range(5)])
+    assert faster["verdict"] == "improved"
+
+def test_noise_is_inconclusive():
+    detector = RegressionDetector()
+    history = make_history([1000] * 12, noise=80)
+    verdict = detector.compare("lcp", history, [1010, 960, 1050, 990, 1020])
+    assert verdict["verdict"] == "inconclusive"
+
+def test_between_run_drift_is_not_a_regression():
+    # Cada run tem seu próprio nível (máquina, cache, rede) e pouco ruído dentro da run: juntar
+    # as amostras de todas as runs faria o nível da run atual parecer significativo
+    rng = random.Random(3)
+    detector = RegressionDetector()
+    levels = [rng.gauss(1000, 40) for _ in range(10)]
+    history = make_history(levels, noise=5, samples=10)
+    current = [rng.gauss(1060, 5) for _ in range(10)]  # 1,5 σ entre runs acima da média
+
+    verdict = detector.compare("lcp", history, current)
+    assert verdict["verdict"] != "regressed"
+    assert verdict["effect"]["ci95"][0] < verdict["effect"]["median_change"] < verdict["effect"]["ci95"][1]
+
+def test_higher_is_better_and_single_value_runs():
+    detector = RegressionDetector()
+    history = make_history([90] * 10, metric="performance_score", noise=1, samples=1)
+    assert detector.compare("performance_score", history, [70])["verdict"] == "regressed"
+    assert detector.compare("performance_score", history, [90.5])["verdict"] == "inconclusive"
+
+def test_changepoint_resets_baseline():
+    series = [1000] * 15 + [1300] * 8
+    assert detect_changepoints(series) == [15]
+    assert detect_changepoints([1000, 1010, 995, 1005, 990, 1000, 1008, 997]) == []
+
+    # O novo patamar já é a baseline: a run atual no patamar novo não é regressão
+    detector = RegressionDetector()
+    history = make_history([1000] * 15 + [1300] * 8)
+    verdict = detector.compare("lcp", history, [1290, 1310, 1305, 1295, 1300])
+    assert verdict["verdict"] == "inconclusive"
+    assert verdict["changepoints"][0]["session_id"] == "run_15"
+    assert verdict["baseline_runs"] == 8
+
+def test_extract_skips_cached_results_and_reads_samples():
+    report = {
+        "overall_performance_score": 80,
+        "test_results": [
+            {"test_name": "Bundle Analysis", "status": "success", "cached": True, "data": {"total_size": 1}},
+            {"test_name": "Performance Suite", "status": "success", "data": {
+                "performance_score": 75,
+                "measurement_stats": {"metrics": {"fcp": {"median": 900, "samples": [880, 900, 920]},
+                                                  "lcp": {"median": 1500}}}
+            }}
+        ]
+    }
+    samples = extract_run_samples(report)
+    assert "bundle_size" not in samples
+    assert samples["fcp"] == [880, 900, 920]
+    assert samples["lcp"] == [1500]
+    assert samples["overall_score"] == [80]
+
+def test_history_index_and_speed(tmp_path):
+    for i in range(300):
+        report = {"session_id": f"perf_suite_{i}", "timestamp": f"2026-01-01T{i // 60:02d}:{i % 60:02d}",
+                  "overall_performance_score": 80 + (i % 3), "test_results": []}
+        (tmp_path / f"consolidated_report_perf_suite_{i}.json").write_text(json.dumps(report))
+
+    runs = RunHistory(tmp_path).runs()
+    assert len(runs) == 300
+    assert runs[0]["session_id"] == "perf_suite_0"
+    assert (tmp_path / ".regression_index.json").exists()
+
+    start = time.perf_counter()
+    runs = RunHistory(tmp_path).runs()
+    RegressionDetector().evaluate(runs[:-1], runs[-1]["samples"])
+    assert time.perf_counter() - start < 2
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    print("🧪 Testando Regression Detector...")
+    test_prediction_t_test_and_degenerate_baseline()
+    test_false_positive_rate_under_null()
+    test_detects_regression_and_improvement()
+    test_noise_is_inconclusive()
+    test_between_run_drift_is_not_a_regression()
+    test_higher_is_better_and_single_value_runs()
+    test_changepoint_resets_baseline()
+    test_extract_skips_cached_results_and_reads_samples()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_history_index_and_speed(Path(tmp))
+    print("✅ Todos os testes passaram!")
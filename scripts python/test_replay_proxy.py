@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Replay Proxy
+Verifica gravação, replay sem upstream, latência/banda determinísticas e a config do Chrome
+"""
+
+import random
+import shutil
+import ssl
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import ProxyHandler, Request, build_opener
+
+import pytest
+
+from replay_proxy import PROXY_ENV, ReplayProxy, apply_replay_proxy, request_key
+
+PAYLOAD = bytes(range(256)) * 128  # 32 KB
+
+class JitteryBackend(BaseHTTPRequestHandler):
+    """Backend com latência aleatória (o ruído que o replay elimina)"""
+
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def do_GET(self):
+        JitteryBackend.calls += 1
+        time.sleep(random.uniform(0, 0.08))
+        body = PAYLOAD if self.path.startswith("/bundle.js") else f"calls={JitteryBackend.calls}".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/javascript")
+        self.send_header("Set-Cookie", "a=1")
+        self.send_header("Set-Cookie", "b=2")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        reply = b'{"ok": true, "echo": ' + body + b'}'
+        self.send_response(201)
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_backend():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JitteryBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def fetch(proxy_url, url, data=None):
+    opener = build_opener(ProxyHandler({"http": proxy_url}))
+    start = time.perf_counter()
+    with opener.open(Request(url, data=data), timeout=10) as response:
+        body = response.read()
+        return response.status, response.headers, body, time.perf_counter() - start
+
+def test_request_key_ignores_cache_busters():
+    assert request_key("get", "http://Host/a?b=2&a=1&_=123") == request_key("GET", "http://host/a?a=1&b=2&_=999")
+    assert request_key("POST", "http://host/rest", b"x") != request_key("POST", "http://host/rest", b"y")
+
+def test_record_then_replay_without_backend(tmp_path):
+    backend, base = start_backend()
+    recorder = ReplayProxy(str(tmp_path / "archive"), mode="record")
+    proxy_url = recorder.start()
+    try:
+        assert fetch(proxy_url, f"{base}/api?t=1")[2] == b"calls=1"
+        fetch(proxy_url, f"{base}/api?t=2")  # cache buster diferente: a primeira resposta continua gravada
+        status, _, body, _ = fetch(proxy_url, f"{base}/rest/v1/contacts", data=b'{"name": "Ana"}')
+        assert status == 201
+    finally:
+        recorder.stop()
+        backend.shutdown()
+        backend.server_close()
+    assert PROXY_ENV not in __import__("os").environ
+
+    replayer = ReplayProxy(str(tmp_path / "archive"), mode="replay", latency_ms=0)
+    proxy_url = replayer.start()
+    try:
+        status, headers, body, _ = fetch(proxy_url, f"{base}/api?t=3")
+        assert (status, body) == (200, b"calls=1")
+        assert headers.get_all("Set-Cookie") == ["a=1", "b=2"]
+        assert fetch(proxy_url, f"{base}/rest/v1/contacts", data=b'{"name": "Ana"}')[2] == \
+            b'{"ok": true, "echo": {"name": "Ana"}}'
+        with pytest.raises(HTTPError) as miss:
+            fetch(proxy_url, f"{base}/nunca-gravada")
+        assert miss.value.code == 404
+    finally:
+        replayer.stop()
+    assert replayer.stats["hits"] == 2 and replayer.stats["misses"] == 1
+
+def test_replay_timing_is_deterministic(tmp_path):
+    backend, base = start_backend()
+    recorder = ReplayProxy(str(tmp_path / "archive"), mode="record")
+    proxy_url = recorder.start()
+    try:
+        upstream_times = [fetch(proxy_url, f"{base}/bundle.js?_={i}")[3] for i in range(8)]
+    finally:
+        recorder.stop()
+        backend.shutdown()
+        backend.server_close()
+
+    # 32 KB a 2048 kbps (256 KB/s) = 125 ms + 20 ms de latência
+    replayer = ReplayProxy(str(tmp_path / "archive"), mode="replay", latency_ms=20, download_kbps=2048)
+    proxy_url = replayer.start()
+    try:
+        replay_times = []
+        for _ in range(8):
+            _, _, body, elapsed = fetch(proxy_url, f"{base}/bundle.js")
+            assert body == PAYLOAD
+            replay_times.append(elapsed)
+    finally:
+        replayer.stop()
+
+    assert min(replay_times) >= 0.145
+    assert statistics.pstdev(replay_times) < statistics.pstdev(upstream_times)
+    assert max(replay_times) - min(replay_times) < 0.05
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl indisponível")
+def test_https_connect_is_intercepted(tmp_path):
+    proxy = ReplayProxy(str(tmp_path / "archive"), mode="replay")
+    proxy.archive.directory.mkdir(parents=True)
+    proxy.archive.put(request_key("GET", "https://supabase.example/rest/v1/health"),
+                      {"status": 200, "reason": "OK", "headers": [["Content-Type", "text/plain"]],
+                       "upstream_ms": 0}, b"gravado")
+    proxy.archive.save()
+    proxy_url = proxy.start()
+    try:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE  # como o Chrome com --ignore-certificate-errors
+        from urllib.request import HTTPSHandler
+        opener = build_opener(ProxyHandler({"https": proxy_url}), HTTPSHandler(context=context))
+        with opener.open("https://supabase.example/rest/v1/health", timeout=10) as response:
+            assert response.read() == b"gravado"
+    finally:
+        proxy.stop()
+
+def test_chrome_options_follow_active_proxy(tmp_path, monkeypatch):
+    class Options:
+        def __init__(self):
+            self.arguments = []
+
+        def add_argument(self, argument):
+            self.arguments.append(argument)
+
+    monkeypatch.delenv(PROXY_ENV, raising=False)
+    assert apply_replay_proxy(Options()).arguments == []
+
+    monkeypatch.setenv(PROXY_ENV, "http://127.0.0.1:8899")
+    arguments = apply_replay_proxy(Options()).arguments
+    assert "--proxy-server=http://127.0.0.1:8899" in arguments
+    assert "--proxy-bypass-list=<-loopback>" in arguments  # dev server em localhost também passa pelo proxy
+
+    with pytest.raises(ValueError):
+        ReplayProxy(str(tmp_path), mode="live")
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    print("🧪 Testando Replay Proxy...")
+    test_request_key_ignores_cache_busters()
+    tests = [test_record_then_replay_without_backend, test_replay_timing_is_deterministic]
+    if shutil.which("openssl"):
+        tests.append(test_https_connect_is_intercepted)
+    for test in tests:
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Todos os testes passaram!")
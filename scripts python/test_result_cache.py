@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Result Cache
+Verifica fingerprint por conteúdo, cache de hashes por arquivo e reuso de etapas
+"""
+
+import os
+from pathlib import Path
+
+from result_cache import InputFingerprinter, ResultCache
+
+def make_project(root: Path):
+    (root / "dist" / "assets").mkdir(parents=True)
+    (root / "dist" / "index.html").write_text("<html></html>")
+    (root / "dist" / "assets" / "index-abcdefgh.js").write_text("console.log(1)")
+    (root / "public").mkdir()
+    (root / "public" / "logo.svg").write_text("<svg/>")
+    (root / "vite.config.ts").write_text("export default {}")
+
+def fingerprint(root: Path, config=None):
+    fingerprinter = InputFingerprinter(root / ".cache", [str(root / name) for name in
+                                                          ("dist", "public", "vite.config.ts", "nginx.conf")])
+    return fingerprinter.fingerprint(config or {"bundle_coverage": True})
+
+def test_fingerprint_is_stable_and_content_based(tmp_path):
+    make_project(tmp_path)
+    first = fingerprint(tmp_path)
+    assert first == fingerprint(tmp_path)
+    assert first["inputs"][str(tmp_path / "nginx.conf")] == "missing"
+
+    # Só o mtime muda: mesmo conteúdo, mesmo fingerprint
+    js = tmp_path / "dist" / "assets" / "index-abcdefgh.js"
+    os.utime(js, (1, 1))
+    assert fingerprint(tmp_path)["fingerprint"] == first["fingerprint"]
+
+    js.write_text("console.log(2)")
+    assert fingerprint(tmp_path)["fingerprint"] != first["fingerprint"]
+
+def test_config_and_renames_change_fingerprint(tmp_path):
+    make_project(tmp_path)
+    first = fingerprint(tmp_path)["fingerprint"]
+    assert fingerprint(tmp_path, {"bundle_coverage": False})["fingerprint"] != first
+
+    (tmp_path / "public" / "logo.svg").rename(tmp_path / "public" / "logo2.svg")
+    assert fingerprint(tmp_path)["fingerprint"] != first
+
+def test_stage_inputs_change_fingerprint(tmp_path):
+    make_project(tmp_path)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.tsx").write_text("import React from 'react'")
+    fingerprinter = InputFingerprinter(tmp_path / ".cache", [str(tmp_path / "dist")])
+    stage_inputs = [str(tmp_path / "src"), str(tmp_path / "package.json")]
+
+    first = fingerprinter.fingerprint({}, stage_inputs=stage_inputs)
+    assert first["inputs"][str(tmp_path / "package.json")] == "missing"
+    assert first["complete"]
+
+    # Mudança só no código-fonte: dist/ igual, mas a análise de bundle não pode ser reaproveitada
+    (tmp_path / "src" / "main.tsx").write_text("import React from 'react'\nimport 'lottie-react'")
+    assert fingerprinter.fingerprint({}, stage_inputs=stage_inputs)["fingerprint"] != first["fingerprint"]
+
+def test_bundle_stage_fingerprints_sources(tmp_path, monkeypatch):
+    import master_performance_suite as master
+
+    make_project(tmp_path)
+    monkeypatch.chdir(tmp_path)  # entradas do projeto são relativas ao diretório de execução
+    suite = master.MasterPerformanceSuite(master.TestConfiguration(output_dir=str(tmp_path / "reports")))
+    inputs = suite.stage_fingerprint("Bundle Analysis")["inputs"]
+    assert {"src", "package.json"} <= set(inputs)
+
+def test_missing_build_is_incomplete(tmp_path):
+    (tmp_path / "public").mkdir()
+    fingerprinter = InputFingerprinter(tmp_path / ".cache", [str(tmp_path / "dist"), str(tmp_path / "public")])
+    assert not fingerprinter.fingerprint({})["complete"]
+
+    make_project(tmp_path / "built")
+    assert fingerprint(tmp_path / "built")["complete"]
+
+def test_file_hash_cache_skips_unchanged_files(tmp_path):
+    make_project(tmp_path)
+    fingerprint(tmp_path)
+
+    fingerprinter = InputFingerprinter(tmp_path / ".cache", [str(tmp_path / "dist")])
+    assert fingerprinter.file_hashes.entries  # carregado do disco
+    fingerprinter.fingerprint({})
+    assert not fingerprinter.file_hashes.dirty  # nada foi re-hasheado
+
+def test_result_cache_round_trip(tmp_path):
+    make_project(tmp_path)
+    cache = ResultCache(tmp_path / ".cache")
+    current = fingerprint(tmp_path)
+
+    assert cache.load("Bundle Analysis", current["fingerprint"]) is None
+    cache.store("Bundle Analysis", current, {"total_size": 123}, "perf_suite_1", 4.2)
+
+    entry = cache.load("Bundle Analysis", current["fingerprint"])
+    assert entry["data"] == {"total_size": 123}
+    assert entry["session_id"] == "perf_suite_1"
+    assert cache.load("Bundle Analysis", "outro") is None
+    assert not list((tmp_path / ".cache").glob("*.tmp"))
+
+if __name__ == "__main__":
+    import tempfile
+    print("🧪 Testando Result Cache...")
+    for test in (test_fingerprint_is_stable_and_content_based, test_config_and_renames_change_fingerprint,
+                 test_stage_inputs_change_fingerprint, test_missing_build_is_incomplete,
+                 test_file_hash_cache_skips_unchanged_files, test_result_cache_round_trip):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Todos os testes passaram!")
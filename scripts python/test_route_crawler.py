@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Route Crawler
+Verifica descoberta de rotas, matriz e relatório por rota (sem Chrome)
+"""
+
+import os
+import tempfile
+
+from route_crawler import (RouteCrawler, RouteJob, RouteResult, build_route_jobs,
+                           discover_router_routes)
+
+APP = """
+<Routes>
+  <Route path="/" element={<Index />} />
+  <Route path="/terms" element={<TermsOfService />} />
+  <Route path="/posts/:id" element={<Post />} />
+  <Route path="*" element={<NotFound />} />
+</Routes>
+"""
+
+def test_discover_router_routes():
+    with tempfile.NamedTemporaryFile('w', suffix='.tsx', delete=False) as f:
+        f.write(APP)
+    try:
+        assert discover_router_routes(f.name) == ['/', '/terms']
+    finally:
+        os.unlink(f.name)
+    assert discover_router_routes('nao_existe.tsx') == []
+
+def test_build_route_jobs():
+    jobs = build_route_jobs(['/', '/#faq'], ['desktop', 'mid_tier_mobile'])
+    assert [job.name for job in jobs] == ['/@desktop', '/@mid_tier_mobile',
+                                          '/#faq@desktop', '/#faq@mid_tier_mobile']
+
+def test_plan_parallelism_respects_cap():
+    crawler = RouteCrawler(cores_per_job=1, max_parallelism=1)
+    core_sets = crawler.plan_parallelism(10)
+    assert len(core_sets) == 1
+
+def test_report_keyed_by_route():
+    crawler = RouteCrawler()
+    results = [
+        RouteResult(RouteJob('/terms', 'desktop'), 'success', [0], 10, summary={'performance_score': 90}),
+        RouteResult(RouteJob('/', 'desktop'), 'success', [1], 12, summary={'performance_score': 80}),
+        RouteResult(RouteJob('/', 'mid_tier_mobile'), 'failed', [0], 3, error_message='timeout'),
+    ]
+    report = crawler.build_report(results, parallelism=2, wall_seconds=15)
+
+    assert list(report.routes) == ['/', '/terms']
+    assert report.routes['/']['desktop']['performance_score'] == 80
+    assert report.routes['/']['mid_tier_mobile'] == {'error': 'timeout'}
+    assert report.serial_seconds == 25
+    assert report.failures == ['/@mid_tier_mobile: timeout']
+
+if __name__ == "__main__":
+    print("🧪 Testando crawl de rotas...")
+    test_discover_router_routes()
+    test_build_route_jobs()
+    test_plan_parallelism_respects_cap()
+    test_report_keyed_by_route()
+    print("✅ Crawl de rotas OK")
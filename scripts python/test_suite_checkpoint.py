@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Suite Checkpoint
+Verifica gravação atômica, retomada de etapas concluídas e novas tentativas por etapa
+"""
+
+import asyncio
+from dataclasses import asdict
+
+import pytest
+
+import master_performance_suite as master
+from suite_checkpoint import CheckpointStore, latest_session
+
+def make_suite(tmp_path, resume_session=None, **overrides):
+    config = master.TestConfiguration(output_dir=str(tmp_path), parallel_scheduling=False,
+                                      reuse_cached_results=False, **overrides)
+    return master.MasterPerformanceSuite(config, resume_session=resume_session)
+
+def test_store_round_trip_and_latest(tmp_path):
+    store = CheckpointStore(tmp_path, "perf_suite_1")
+    assert not store.exists()
+    store.save_manifest({"base_url": "http://localhost:8080"}, "2026-01-01T00:00:00")
+    store.save_stage({"test_name": "Memory Profiling", "status": "success", "data": {"peak_memory": 20}})
+    (store.directory / "stress_testing.json").write_text("{truncado")  # checkpoint corrompido
+
+    stages = store.load_stages()
+    assert list(stages) == ["Memory Profiling"]
+    assert store.load_manifest()["configuration"]["base_url"] == "http://localhost:8080"
+    assert not list(store.directory.glob("*.tmp"))
+    assert latest_session(tmp_path) == "perf_suite_1"
+
+    # O manifesto original sobrevive à retomada
+    store.save_manifest({"base_url": "outra"}, "2026-01-02T00:00:00")
+    assert store.load_manifest()["started_at"] == "2026-01-01T00:00:00"
+
+def test_retries_and_checkpoint_per_stage(tmp_path):
+    suite = make_suite(tmp_path, stage_retries={"Memory Profiling": 2})
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise RuntimeError("chrome not reachable")
+        return {"peak_memory": 20}
+
+    asyncio.run(suite.execute_test("Memory Profiling", flaky))
+    result = suite.test_results[-1]
+    assert result.status == "success"
+    assert result.attempts == 2
+
+    saved = suite.checkpoints.load_stages()["Memory Profiling"]
+    assert saved["data"] == {"peak_memory": 20}
+    assert saved["attempts"] == 2
+
+def test_resume_skips_finished_and_retries_failed(tmp_path):
+    first = make_suite(tmp_path)
+    first.checkpoints.save_manifest(asdict(first.config), first.start_time.isoformat())
+
+    async def ok():
+        return {"peak_memory": 20}
+
+    async def broken():
+        raise RuntimeError("falhou")
+
+    asyncio.run(first.execute_test("Memory Profiling", ok))
+    asyncio.run(first.execute_test("Stress Testing", broken))
+
+    resumed = make_suite(tmp_path, resume_session=first.session_id)
+    assert resumed.session_id == first.session_id
+    assert resumed.resume_finished_stage("Memory Profiling")
+    assert not resumed.resume_finished_stage("Stress Testing")
+    assert not resumed.resume_finished_stage("Performance Suite")
+
+    result = resumed.test_results[0]
+    assert result.resumed and result.data == {"peak_memory": 20}
+
+    asyncio.run(resumed.execute_test("Stress Testing", broken))
+    assert resumed.test_results[-1].attempts == 2  # tentativa anterior + a da retomada
+
+def test_parse_stage_retries():
+    retries = master.parse_stage_retries(["memory=3", "stress=1"], {"Memory Profiling": 1, "Bundle Analysis": 0})
+    assert retries == {"Memory Profiling": 3, "Stress Testing": 1, "Bundle Analysis": 0}
+    with pytest.raises(ValueError):
+        master.parse_stage_retries(["gpu=1"], {})
+
+def test_cache_modes_are_validated_by_the_cli():
+    assert master.parse_arguments([]).cache_modes == ["cold", "warm_http", "warm_code"]
+    assert master.parse_arguments(["--cache-modes", "warm_code"]).cache_modes == ["warm_code"]
+    for argv in (["--cache-modes"], ["--cache-modes", "hot"]):
+        with pytest.raises(SystemExit):
+            master.parse_arguments(argv)
+
+    from real_performance_suite import CACHE_MODES, RealPerformanceSuite
+    assert master.PERFORMANCE_CACHE_MODES == list(CACHE_MODES)
+    suite = RealPerformanceSuite()
+    suite.cache_modes = []
+    with pytest.raises(ValueError):
+        asyncio.run(suite.run_performance_analysis())
+
+def test_memory_soak_and_matrix_are_rejected_together():
+    assert master.parse_arguments(["--memory-matrix"]).memory_matrix
+    assert master.parse_arguments(["--memory-soak-hours", "8"]).memory_soak_hours == 8
+    with pytest.raises(SystemExit):
+        master.parse_arguments(["--memory-matrix", "--memory-soak-hours", "8"])
+
+def test_device_profiles_are_validated_by_the_cli():
+    args = master.parse_arguments(["--device-profiles", "low_end_mobile", "--crawl-viewports", "desktop"])
+    assert args.device_profiles == ["low_end_mobile"] and args.crawl_viewports == ["desktop"]
+    for argv in (["--device-profiles"], ["--device-profiles", "iphone"], ["--crawl-viewports"],
+                 ["--crawl-viewports", "iphone"]):
+        with pytest.raises(SystemExit):
+            master.parse_arguments(argv)
+
+    from real_performance_suite import DEVICE_PROFILES, RealPerformanceSuite
+    assert master.PERFORMANCE_DEVICE_PROFILES == list(DEVICE_PROFILES)
+    for profiles in ([], ["desktop", "iphone"]):
+        suite = RealPerformanceSuite()
+        suite.device_profiles = profiles
+        with pytest.raises(ValueError):
+            asyncio.run(suite.run_performance_analysis())
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    print("🧪 Testando Suite Checkpoint...")
+    for test in (test_store_round_trip_and_latest, test_retries_and_checkpoint_per_stage,
+                 test_resume_skips_finished_and_retries_failed):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_parse_stage_retries()
+    test_cache_modes_are_validated_by_the_cli()
+    test_memory_soak_and_matrix_are_rejected_together()
+    test_device_profiles_are_validated_by_the_cli()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Suite Scheduler
+Verifica empacotamento por recursos, máquina quieta, dependências e caminho crítico
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import master_performance_suite as master
+from suite_scheduler import DagScheduler, TaskSpec, TaskTiming, critical_path
+
+def sleeper(seconds):
+    async def run():
+        await asyncio.sleep(seconds)
+    return run
+
+async def execute(task):
+    await task.func()
+
+def overlapped(a: TaskTiming, b: TaskTiming) -> bool:
+    return a.start < b.end - 0.01 and b.start < a.end - 0.01
+
+def run_schedule(tasks, **kwargs):
+    return asyncio.run(DagScheduler(tasks, **kwargs).run(execute))
+
+def test_packs_compatible_tasks_and_keeps_load_apart():
+    tasks = [
+        TaskSpec("bundle", sleeper(0.05), cores=1),
+        TaskSpec("memory", sleeper(0.1), cores=2, browsers=1, quiet=True),
+        TaskSpec("performance", sleeper(0.1), cores=2, browsers=1, quiet=True),
+        TaskSpec("stress", sleeper(0.1), cores=2, load=True),
+    ]
+    report = run_schedule(tasks, cores=8, browsers=4)
+    timing = {t.name: t for t in report.timeline}
+
+    assert overlapped(timing["bundle"], timing["memory"])
+    assert not overlapped(timing["stress"], timing["memory"])
+    assert not overlapped(timing["stress"], timing["performance"])
+    assert timing["stress"].waited_for.startswith("máquina quieta")
+    assert report.wall_seconds < report.serial_seconds
+    assert report.critical_path[-1] == "stress"
+
+def test_quiet_measurements_never_share_the_machine():
+    tasks = [
+        TaskSpec("memory", sleeper(0.05), cores=2, browsers=1, quiet=True),
+        TaskSpec("performance", sleeper(0.05), cores=2, browsers=1, quiet=True),
+        TaskSpec("coverage", sleeper(0.05), cores=1, browsers=1),
+    ]
+    report = run_schedule(tasks, cores=16, browsers=8)
+    timing = {t.name: t for t in report.timeline}
+
+    assert not overlapped(timing["memory"], timing["performance"])
+    assert not overlapped(timing["coverage"], timing["memory"])
+    assert not overlapped(timing["coverage"], timing["performance"])
+    assert timing["performance"].waited_for.startswith("máquina quieta")
+
+def test_resource_budget_limits_parallelism():
+    tasks = [TaskSpec(f"t{i}", sleeper(0.05), cores=2) for i in range(3)]
+    report = run_schedule(tasks, cores=4, browsers=1)
+    timing = {t.name: t for t in report.timeline}
+    assert not overlapped(timing["t2"], timing["t0"]) or not overlapped(timing["t2"], timing["t1"])
+    assert "CPUs" in timing["t2"].waited_for
+
+def test_serial_mode_and_dependencies():
+    tasks = [
+        TaskSpec("a", sleeper(0.02)),
+        TaskSpec("b", sleeper(0.02), depends_on=["a"]),
+        TaskSpec("c", sleeper(0.02)),
+    ]
+    report = run_schedule(tasks, cores=8, browsers=4, max_concurrency=1)
+    timeline = report.timeline
+    for first, second in zip(timeline, timeline[1:]):
+        assert first.end <= second.start + 0.01
+
+    timing = {t.name: t for t in timeline}
+    assert timing["b"].start >= timing["a"].end
+
+def test_exclusive_task_runs_alone():
+    tasks = [
+        TaskSpec("matrix", sleeper(0.05), exclusive=True),
+        TaskSpec("bundle", sleeper(0.05), cores=1),
+    ]
+    report = run_schedule(tasks, cores=8, browsers=4)
+    a, b = report.timeline
+    assert not overlapped(a, b)
+
+def test_invalid_graphs():
+    with pytest.raises(ValueError):
+        DagScheduler([TaskSpec("a", sleeper(0), depends_on=["x"])], cores=1, browsers=1)
+    with pytest.raises(ValueError):
+        DagScheduler([TaskSpec("a", sleeper(0), depends_on=["b"]),
+                      TaskSpec("b", sleeper(0), depends_on=["a"])], cores=1, browsers=1)
+
+def test_critical_path_follows_gating_chain():
+    timeline = [
+        TaskTiming("bundle", 0, 10, 1, 0),
+        TaskTiming("performance", 0, 100, 2, 1),
+        TaskTiming("stress", 100.2, 160, 2, 0),
+    ]
+    assert [t.name for t in critical_path(timeline)] == ["performance", "stress"]
+
+def test_stage_timeout_waits_for_its_thread(tmp_path):
+    config = master.TestConfiguration(output_dir=str(tmp_path), parallel_scheduling=True, reuse_cached_results=False)
+    suite = master.MasterPerformanceSuite(config)
+    suite.get_test_timeout = lambda name: 0.2
+    state = {"running": False}
+
+    async def blocking_stage():
+        state["running"] = True
+        try:
+            while True:
+                time.sleep(0.05)  # chamada síncrona do Selenium
+                await asyncio.sleep(0)
+        finally:
+            state["running"] = False  # driver.quit() da etapa
+
+    result, error = asyncio.run(suite.execute_attempt("Stress Testing", blocking_stage))
+    assert result.status == "failed" and result.error_message.startswith("Timeout")
+    assert error is None
+    assert not state["running"]  # recursos só voltam ao agendador depois da limpeza
+
+if __name__ == "__main__":
+    print("🧪 Testando Suite Scheduler...")
+    test_packs_compatible_tasks_and_keeps_load_apart()
+    test_quiet_measurements_never_share_the_machine()
+    test_resource_budget_limits_parallelism()
+    test_serial_mode_and_dependencies()
+    test_exclusive_task_runs_alone()
+    test_invalid_graphs()
+    test_critical_path_follows_gating_chain()
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stage_timeout_waits_for_its_thread(Path(tmp))
+    print("✅ Todos os testes passaram!")
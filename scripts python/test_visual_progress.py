@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do Visual Progress
+Verifica progresso por histograma, Speed Index e decodificação de frames (sem Chrome)
+"""
+
+import base64
+import io
+
+import numpy as np
+from PIL import Image
+
+from visual_progress import decode_frame, speed_index, visual_progress
+
+def jpeg_frame(color, size=(400, 200)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='JPEG', quality=95)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+def test_decode_frame_ignores_white():
+    white = decode_frame(jpeg_frame((255, 255, 255)), 100, keep_thumbnail=False)
+    assert white['histogram'].sum() == 0
+    assert white['thumbnail'] is None
+
+    dark = decode_frame(jpeg_frame((10, 20, 30)), 100, keep_thumbnail=True)
+    assert dark['histogram'].shape == (3, 256)
+    assert dark['histogram'][0].sum() == 100 * 50  # reduzido para 100px de largura
+    assert dark['thumbnail'][:2] == b'\xff\xd8'
+
+def test_visual_progress_and_speed_index():
+    blank = np.zeros((3, 256), dtype=np.int64)
+    final = np.zeros((3, 256), dtype=np.int64)
+    final[:, 10] = 100
+    half = final // 2
+
+    progress = visual_progress(np.stack([blank, half, final]))
+    assert progress.tolist() == [0, 50, 100]
+
+    # 0-1000ms em 0%, 1000-2000ms em 50%
+    assert speed_index(np.array([0.0, 1000.0, 2000.0]), progress) == 1000 + 500
+
+def test_static_page_is_complete():
+    frame = np.ones((3, 256), dtype=np.int64)
+    assert visual_progress(np.stack([frame, frame])).tolist() == [100, 100]
+
+def test_screencast_page_events_without_main_thread_tracing():
+    from real_performance_suite import RealPerformanceSuite
+
+    suite = RealPerformanceSuite()
+    suite.main_thread_tracing, suite.measure_visual_progress = False, True
+    prefs = suite.perf_logging_prefs()
+    assert prefs["enablePage"] and "traceCategories" not in prefs
+
+    suite.main_thread_tracing, suite.measure_visual_progress = True, False
+    prefs = suite.perf_logging_prefs()
+    assert not prefs["enablePage"] and prefs["traceCategories"]
+
+if __name__ == "__main__":
+    print("🧪 Testando progresso visual...")
+    test_decode_frame_ignores_white()
+    test_visual_progress_and_speed_index()
+    test_static_page_is_complete()
+    test_screencast_page_events_without_main_thread_tracing()
+    print("✅ Progresso visual OK")
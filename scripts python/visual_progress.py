@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+🎞️ Visual Progress - Projeto M
+Speed Index e completude visual a partir de um screencast do carregamento
+
+Funcionalidades:
+- Captura com Page.startScreencast durante a navegação (frames via performance log + ack)
+- Decodificação e redução dos frames num pool de processos, à medida que chegam
+- Progresso visual por histograma de cores (mesmo método do speedline/Lighthouse) em NumPy
+- Speed Index, primeira mudança visual, tempos de 85%/95%/100% e filmstrip em disco
+"""
+
+import base64
+import io
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from chrome_trace import iter_log_messages
+
+# Pixels quase brancos são ignorados no histograma (como no speedline)
+WHITE_THRESHOLD = 249
+
+# Limiares de completude visual reportados (%)
+VISUAL_COMPLETE_THRESHOLDS = (85, 95, 100)
+
+@dataclass
+class FilmstripFrame:
+    """Frame do filmstrip (um por intervalo)"""
+    time_ms: float
+    progress: float
+    file: str = ""
+
+@dataclass
+class VisualProgressResult:
+    """Resultado da captura visual de um carregamento"""
+    speed_index: float  # ms
+    first_visual_change: float
+    visually_complete: Dict[str, float]  # limiar (%) -> ms
+    last_visual_change: float
+    frames: int
+    distinct_frames: int
+    filmstrip: List[FilmstripFrame] = field(default_factory=list)
+
+def decode_frame(data: str, analysis_width: int, keep_thumbnail: bool) -> Dict:
+    """Decodifica e reduz um frame; retorna histograma RGB (3×256) e miniatura opcional"""
+    image = Image.open(io.BytesIO(base64.b64decode(data))).convert('RGB')
+    if image.width > analysis_width:
+        image = image.resize((analysis_width, max(1, image.height * analysis_width // image.width)))
+
+    pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 3)
+    pixels = pixels[~np.all(pixels >= WHITE_THRESHOLD, axis=1)]
+    histogram = np.stack([np.bincount(pixels[:, channel], minlength=256) for channel in range(3)])
+
+    thumbnail = None
+    if keep_thumbnail:
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=70)
+        thumbnail = buffer.getvalue()
+
+    return {'histogram': histogram, 'thumbnail': thumbnail}
+
+def visual_progress(histograms: np.ndarray) -> np.ndarray:
+    """Progresso (0-100) de cada frame entre o primeiro e o último (histogramas n×3×256)"""
+    initial = histograms[0]
+    target = histograms[-1]
+
+    current_diff = np.abs(histograms - initial)
+    target_diff = np.abs(target - initial)
+
+    match = np.minimum(current_diff, target_diff).sum(axis=(1, 2))
+    total = target_diff.sum()
+    if total == 0:
+        return np.full(len(histograms), 100.0)
+    return np.floor(match / total * 100)
+
+def speed_index(times_ms: np.ndarray, progress: np.ndarray) -> float:
+    """Área acima da curva de progresso visual desde o início da navegação"""
+    if len(times_ms) == 0:
+        return 0.0
+    intervals = np.diff(np.concatenate(([0.0], times_ms)))
+    previous_progress = np.concatenate(([0.0], progress[:-1])) / 100
+    return float(np.sum(intervals * (1 - previous_progress)))
+
+class ScreencastCapture:
+    """Captura o screencast de uma navegação e calcula o progresso visual em streaming"""
+
+    def __init__(self, driver, output_dir: Optional[Path] = None):
+        self.driver = driver
+        self.output_dir = output_dir
+
+        # Configurações
+        self.screencast_max_width = 800
+        self.analysis_width = 200
+        self.jpeg_quality = 60
+        self.workers = 2
+        self.max_pending = 8  # frames em decodificação (backpressure)
+        self.poll_interval = 0.05  # segundos
+        self.quiet_ms = 1500  # sem frames novos após o load
+        self.timeout = 30  # segundos
+        self.filmstrip_interval_ms = 100
+
+    def poll_frames(self) -> List[Dict]:
+        """Lê frames do performance log e confirma cada um (senão o Chrome para de enviar)"""
+        frames = []
+        for method, params in iter_log_messages(self.driver.get_log('performance')):
+            if method == 'Page.screencastFrame':
+                self.driver.execute_cdp_cmd('Page.screencastFrameAck', {'sessionId': params['sessionId']})
+                frames.append(params)
+        return frames
+
+    def capture(self, url: str) -> Optional[VisualProgressResult]:
+        """Navega com o screencast ativo e processa os frames à medida que chegam"""
+        self.driver.execute_cdp_cmd('Page.enable', {})
+        self.driver.get('about:blank')
+        self.driver.get_log('performance')  # descarta eventos anteriores
+
+        self.driver.execute_cdp_cmd('Page.startScreencast', {
+            'format': 'jpeg',
+            'quality': self.jpeg_quality,
+            'maxWidth': self.screencast_max_width,
+            'maxHeight': self.screencast_max_width,
+            'everyNthFrame': 1
+        })
+
+        timestamps: List[float] = []  # s (época), na ordem de chegada
+        histograms: List[np.ndarray] = []
+        thumbnails: Dict[int, tuple] = {}  # bucket -> (timestamp, miniatura)
+        pending = deque()
+
+        def drain(block: bool):
+            while pending and (block or pending[0][1].done()):
+                timestamp, future = pending.popleft()
+                result = future.result()
+                timestamps.append(timestamp)
+                histograms.append(result['histogram'])
+                if result['thumbnail'] is not None:
+                    # Último frame de cada intervalo; a chave é relativa ao primeiro frame
+                    bucket = int((timestamp - timestamps[0]) * 1000 // self.filmstrip_interval_ms)
+                    thumbnails[bucket] = (timestamp, result['thumbnail'])
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            self.driver.execute_cdp_cmd('Page.navigate', {'url': url})
+            started = time.time()
+            last_frame = started
+
+            try:
+                while time.time() - started < self.timeout:
+                    for frame in self.poll_frames():
+                        future = pool.submit(decode_frame, frame['data'], self.analysis_width,
+                                             self.output_dir is not None)
+                        pending.append((frame['metadata']['timestamp'], future))
+                        last_frame = time.time()
+                        if len(pending) >= self.max_pending:
+                            drain(block=True)
+                    drain(block=False)
+
+                    loaded = self.driver.execute_script("return document.readyState") == 'complete'
+                    if loaded and (time.time() - last_frame) * 1000 >= self.quiet_ms:
+                        break
+                    time.sleep(self.poll_interval)
+            finally:
+                self.driver.execute_cdp_cmd('Page.stopScreencast', {})
+
+            # Frames que chegaram entre o último poll e o stop
+            for frame in self.poll_frames():
+                future = pool.submit(decode_frame, frame['data'], self.analysis_width,
+                                     self.output_dir is not None)
+                pending.append((frame['metadata']['timestamp'], future))
+            drain(block=True)
+
+        if len(histograms) < 2:
+            return None
+
+        # Início da navegação (época, ms) como origem do tempo
+        time_origin = self.driver.execute_script("return performance.timeOrigin;") / 1000
+        return self.build_result(np.array(timestamps), np.stack(histograms), time_origin, thumbnails)
+
+    def build_result(self, timestamps: np.ndarray, histograms: np.ndarray, time_origin: float,
+                     thumbnails: Dict[int, tuple]) -> VisualProgressResult:
+        order = np.argsort(timestamps, kind='stable')
+        times_ms = np.maximum(0, (timestamps[order] - time_origin) * 1000)
+        progress = visual_progress(histograms[order])
+
+        changed = np.flatnonzero(progress > 0)
+        complete = {}
+        for threshold in VISUAL_COMPLETE_THRESHOLDS:
+            reached = np.flatnonzero(progress >= threshold)
+            complete[str(threshold)] = float(times_ms[reached[0]]) if len(reached) else 0.0
+
+        # Frames distintos: histograma diferente do anterior
+        changes = np.flatnonzero(np.any(np.diff(histograms[order], axis=0) != 0, axis=(1, 2)))
+
+        return VisualProgressResult(
+            speed_index=speed_index(times_ms, progress),
+            first_visual_change=float(times_ms[changed[0]]) if len(changed) else 0.0,
+            visually_complete=complete,
+            last_visual_change=float(times_ms[changes[-1] + 1]) if len(changes) else 0.0,
+            frames=len(times_ms),
+            distinct_frames=1 + len(changes),
+            filmstrip=self.save_filmstrip(thumbnails, timestamps[order], times_ms, progress, time_origin)
+        )
+
+    def save_filmstrip(self, thumbnails: Dict[int, tuple], timestamps: np.ndarray, times_ms: np.ndarray,
+                       progress: np.ndarray, time_origin: float) -> List[FilmstripFrame]:
+        """Grava as miniaturas do filmstrip (uma por intervalo) e um índice JSON"""
+        if not self.output_dir or not thumbnails:
+            return []
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        filmstrip = []
+        for bucket in sorted(thumbnails):
+            timestamp, data = thumbnails[bucket]
+            index = min(int(np.searchsorted(timestamps, timestamp, side='right')) - 1, len(progress) - 1)
+            time_ms = max(0.0, (timestamp - time_origin) * 1000)
+            path = self.output_dir / f"frame_{int(time_ms):06d}ms.jpg"
+            path.write_bytes(data)
+            filmstrip.append(FilmstripFrame(time_ms=time_ms, progress=float(progress[max(0, index)]), file=str(path)))
+
+        with open(self.output_dir / 'filmstrip.json', 'w', encoding='utf-8') as f:
+            json.dump([asdict(frame) for frame in filmstrip], f, indent=2)
+
+        return filmstrip